@@ -29,7 +29,7 @@ class FilesAPIUser(HttpUser):
         self.client.get("/v1/files", name="List Files")
 
         # 1. Upload file
-        files = {"file_content": (file_path, file_content, "text/plain")}
+        files = {"file": (file_path, file_content, "text/plain")}
         self.client.put(f"/v1/files/{file_path}", files=files, name="Upload File")
 
         # 2. Describe the file (HEAD request)
@@ -44,6 +44,30 @@ class FilesAPIUser(HttpUser):
         # 5. Delete the file
         self.client.delete(f"/v1/files/{file_path}", name="Delete File")
 
+    @task
+    def batch_file_operations_flow(self):
+        """Flow for uploading and deleting many small files with one request each."""
+        directory = f"test_batch_{str(uuid.uuid4())[:5]}/"
+        files = [
+            (
+                "files",
+                (
+                    f"{directory}file_{i}.txt",
+                    b"This is a test file content.",
+                    "text/plain",
+                ),
+            )
+            for i in range(20)
+        ]
+        self.client.post(
+            "/v1/files:batchUpload", files=files, name="Batch Upload Files"
+        )
+        self.client.post(
+            "/v1/files:batchDelete",
+            json={"directory": directory},
+            name="Batch Delete Files",
+        )
+
     @task
     def generate_ai_files_flow(self):
         """Flow for generating AI files."""
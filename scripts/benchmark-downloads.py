@@ -0,0 +1,202 @@
+"""Benchmark download throughput of `GET /v1/files/{file_path}` for a single worker.
+
+Starts a moto S3 server and one uvicorn worker running the app, uploads a test object
+and downloads it repeatedly, printing MB/s for:
+
+- `legacy`: botocore's `StreamingBody` handed straight to `StreamingResponse`, i.e. how
+  downloads were served before the chunked streamer (mounted under `/bench/legacy`).
+- `chunked`: the real route streaming a single GET, once per `--chunk-size-mib`.
+- `parallel`: the real route fetching concurrent byte ranges, once per `--parallel-concurrency`.
+
+Usage:
+    python scripts/benchmark-downloads.py --size-mib 256 --repeat 3 --chunk-size-mib 1 4 8 --parallel-concurrency 4 8
+"""
+
+import argparse
+import os
+import socket
+import threading
+import time
+from typing import NamedTuple
+
+import boto3
+import httpx
+import uvicorn
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from moto.server import ThreadedMotoServer
+
+from aws_python.main import create_app
+from aws_python.settings import Settings
+
+BUCKET_NAME = "benchmark-bucket"
+OBJECT_KEY = "benchmark.bin"
+MIB = 1024 * 1024
+
+
+class Args(NamedTuple):
+    """CLI arguments for the script."""
+
+    size_mib: int
+    repeat: int
+    chunk_sizes_mib: list[int]
+    read_ahead_chunks: int
+    parallel_concurrencies: list[int]
+
+
+def main() -> None:
+    args = parse_args()
+    moto_port = get_free_port()
+    moto_server = ThreadedMotoServer(port=moto_port, verbose=False)
+    moto_server.start()
+    os.environ.update(
+        {
+            "AWS_ENDPOINT_URL": f"http://127.0.0.1:{moto_port}",
+            "AWS_ACCESS_KEY_ID": "mock",
+            "AWS_SECRET_ACCESS_KEY": "mock",  # pragma: allowlist secret
+            "AWS_DEFAULT_REGION": "us-east-1",
+        }
+    )
+    try:
+        upload_test_object(args.size_mib)
+        print(
+            f"Downloading a {args.size_mib} MiB object {args.repeat} times per mode\n"
+        )
+        print(f"{'mode':<24}{'MB/s':>10}")
+
+        throughput = benchmark(
+            Settings(s3_bucket_name=BUCKET_NAME), "/bench/legacy", args
+        )
+        print(f"{'legacy (1 KiB chunks)':<24}{throughput:>10.1f}")
+        for chunk_size_mib in args.chunk_sizes_mib:
+            settings = Settings(
+                s3_bucket_name=BUCKET_NAME,
+                s3_download_chunk_size_bytes=chunk_size_mib * MIB,
+                s3_download_read_ahead_chunks=args.read_ahead_chunks,
+                s3_parallel_download_threshold_bytes=None,
+            )
+            throughput = benchmark(settings, "/v1/files", args)
+            print(f"{f'chunked ({chunk_size_mib} MiB)':<24}{throughput:>10.1f}")
+        for concurrency in args.parallel_concurrencies:
+            settings = Settings(
+                s3_bucket_name=BUCKET_NAME,
+                s3_parallel_download_threshold_bytes=0,
+                s3_parallel_download_max_concurrency=concurrency,
+            )
+            throughput = benchmark(settings, "/v1/files", args)
+            print(f"{f'parallel ({concurrency} ranges)':<24}{throughput:>10.1f}")
+    finally:
+        moto_server.stop()
+
+
+def benchmark(settings: Settings, route_prefix: str, args: Args) -> float:
+    """Serve the app with one uvicorn worker and return the mean download throughput in MB/s."""
+    app = create_app(settings=settings)
+
+    @app.get(
+        "/bench/legacy/{file_path:path}", tags=["Benchmark"], include_in_schema=False
+    )
+    async def get_file_legacy(request: Request, file_path: str) -> StreamingResponse:
+        response = request.app.state.s3_client.get_object(
+            Bucket=BUCKET_NAME, Key=file_path
+        )
+        return StreamingResponse(
+            content=response["Body"], media_type=response["ContentType"]
+        )
+
+    port = get_free_port()
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning")
+    )
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+
+    try:
+        url = f"http://127.0.0.1:{port}{route_prefix}/{OBJECT_KEY}"
+        elapsed_seconds = 0.0
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            size_bytes = download(url)
+            elapsed_seconds += time.perf_counter() - start
+            assert size_bytes == args.size_mib * MIB, "incomplete download"
+        return args.size_mib * MIB * args.repeat / elapsed_seconds / 1e6
+    finally:
+        server.should_exit = True
+        thread.join()
+
+
+def download(url: str) -> int:
+    """Download a URL, discarding the content, and return the number of bytes received."""
+    size_bytes = 0
+    with httpx.stream("GET", url, timeout=None) as response:
+        response.raise_for_status()
+        for chunk in response.iter_raw(chunk_size=MIB):
+            size_bytes += len(chunk)
+    return size_bytes
+
+
+def upload_test_object(size_mib: int) -> None:
+    """Create the bucket and upload an object of `size_mib` MiB."""
+    s3_client = boto3.client("s3")
+    s3_client.create_bucket(Bucket=BUCKET_NAME)
+    s3_client.put_object(
+        Bucket=BUCKET_NAME,
+        Key=OBJECT_KEY,
+        Body=os.urandom(size_mib * MIB),
+        ContentType="application/octet-stream",
+    )
+
+
+def get_free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def parse_args() -> Args:
+    """Parse command-line arguments.
+
+    Returns:
+        Args: Parsed command-line arguments as a NamedTuple.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark file download throughput")
+    parser.add_argument(
+        "--size-mib", type=int, default=256, help="Size of the downloaded object"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Downloads per mode to average over"
+    )
+    parser.add_argument(
+        "--chunk-size-mib",
+        type=int,
+        nargs="+",
+        default=[1, 4, 8],
+        help="Chunk sizes to benchmark the chunked streamer with",
+    )
+    parser.add_argument(
+        "--read-ahead-chunks",
+        type=int,
+        default=2,
+        help="Chunks read ahead of the client",
+    )
+    parser.add_argument(
+        "--parallel-concurrency",
+        type=int,
+        nargs="+",
+        default=[4, 8],
+        help="Concurrent ranges to benchmark parallel downloads with",
+    )
+    args = parser.parse_args()
+    return Args(
+        size_mib=args.size_mib,
+        repeat=args.repeat,
+        chunk_sizes_mib=args.chunk_size_mib,
+        read_ahead_chunks=args.read_ahead_chunks,
+        parallel_concurrencies=args.parallel_concurrency,
+    )
+
+
+if __name__ == "__main__":
+    main()
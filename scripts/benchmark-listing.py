@@ -0,0 +1,251 @@
+"""Benchmark listing every key of a large bucket sequentially and in parallel key ranges.
+
+Populates a moto S3 bucket (in-process, like the unit tests) and lists all keys with:
+
+- `sequential`: `list_objects_v2` calls chained through continuation tokens.
+- `parallel`: :func:`aws_python.s3.read_objects.fetch_s3_objects_in_parallel`, once per
+  `--concurrency`.
+
+Two changes make moto behave like S3 at this scale, without them moto would be measured
+instead of the listing:
+
+- moto sorts every key of the bucket on each `list_objects_v2` call, so one page of a
+  1M-key bucket takes seconds. Its listing is replaced with a binary search over the keys,
+  which are indexed once after populating the bucket.
+- moto answers instantly. Every `list_objects_v2` call sleeps `--latency-ms` plus
+  `--latency-us-per-key` for each returned entry to model the S3 round trip, which is
+  what parallel listing overlaps.
+
+moto still renders every response in this process, under the same GIL as the lister, at
+a CPU cost far above botocore's parsing of a real S3 response. That part cannot overlap,
+so the measured speedup is a lower bound, and is lowest on single-core machines.
+moto keeps about 3.5 KB per object, so 1M keys need roughly 4 GB of memory.
+
+Usage:
+    python scripts/benchmark-listing.py --keys 1000000 --concurrency 4 8 16
+"""
+
+import argparse
+import os
+import random
+import time
+from bisect import (
+    bisect_left,
+    bisect_right,
+)
+from typing import (
+    Any,
+    NamedTuple,
+)
+
+import boto3
+from moto import mock_aws
+from moto.core import DEFAULT_ACCOUNT_ID
+from moto.s3.models import (
+    FakeBucket,
+    S3Backend,
+    s3_backends,
+)
+
+from aws_python.s3.read_objects import (
+    S3KeyRange,
+    fetch_s3_key_range,
+    fetch_s3_objects_in_parallel,
+)
+
+BUCKET_NAME = "benchmark-bucket"
+
+
+class Args(NamedTuple):
+    """CLI arguments for the script."""
+
+    keys: int
+    layout: str
+    latency_ms: float
+    latency_us_per_key: float
+    concurrencies: list[int]
+
+
+def main() -> None:
+    args = parse_args()
+    os.environ.update(
+        {
+            "AWS_ACCESS_KEY_ID": "mock",
+            "AWS_SECRET_ACCESS_KEY": "mock",  # pragma: allowlist secret
+            "AWS_DEFAULT_REGION": "us-east-1",
+        }
+    )
+    with mock_aws():
+        s3_client = boto3.client("s3")
+        s3_client.create_bucket(Bucket=BUCKET_NAME)
+        start = time.perf_counter()
+        populate_bucket(args.keys, args.layout)
+        print(
+            f"Populated {args.keys:,} {args.layout} keys in {time.perf_counter() - start:.0f}s, "
+            f"simulating {args.latency_ms:g} ms + {args.latency_us_per_key:g} µs per key "
+            "per list_objects_v2 call\n"
+        )
+        calls = install_indexed_listing(
+            args.latency_ms / 1000, args.latency_us_per_key / 1e6
+        )
+
+        print(f"{'mode':<24}{'seconds':>10}{'keys/s':>12}{'calls':>8}")
+        calls.clear()
+        elapsed_seconds = benchmark(
+            lambda: fetch_s3_key_range(
+                BUCKET_NAME,
+                S3KeyRange(start_after=None, end_at=None),
+                s3_client=s3_client,
+            ),
+            args.keys,
+        )
+        print(
+            f"{'sequential':<24}{elapsed_seconds:>10.1f}"
+            f"{args.keys / elapsed_seconds:>12,.0f}{len(calls):>8}"
+        )
+        for concurrency in args.concurrencies:
+            calls.clear()
+            elapsed_seconds = benchmark(
+                lambda concurrency=concurrency: fetch_s3_objects_in_parallel(
+                    BUCKET_NAME, max_concurrency=concurrency, s3_client=s3_client
+                ),
+                args.keys,
+            )
+            print(
+                f"{f'parallel ({concurrency} ranges)':<24}"
+                f"{elapsed_seconds:>10.1f}{args.keys / elapsed_seconds:>12,.0f}{len(calls):>8}"
+            )
+
+
+def benchmark(list_pages, expected_keys: int) -> float:
+    """List all keys, check that they are complete and sorted, and return the seconds it took."""
+    start = time.perf_counter()
+    listed_keys = 0
+    last_key = ""
+    for page in list_pages():
+        assert page[0]["Key"] > last_key, "keys out of order"
+        listed_keys += len(page)
+        last_key = page[-1]["Key"]
+    elapsed_seconds = time.perf_counter() - start
+    assert listed_keys == expected_keys, f"listed {listed_keys} of {expected_keys} keys"
+    return elapsed_seconds
+
+
+def populate_bucket(keys: int, layout: str) -> None:
+    """Put empty objects into the bucket directly through moto's backend, skipping HTTP."""
+    backend = s3_backends[DEFAULT_ACCOUNT_ID]["aws"]
+    rng = random.Random(0)
+    for i in range(keys):
+        key = f"{rng.getrandbits(64):016x}"
+        if layout == "nested":
+            key = f"tenant-{i % 50:02d}/{key[:2]}/{key}.json"
+        backend.put_object(BUCKET_NAME, key, b"")
+
+
+def install_indexed_listing(
+    latency_seconds: float, latency_seconds_per_key: float
+) -> list[int]:
+    """
+    Replace moto's `list_objects_v2` with a binary search over a sorted index of the keys.
+
+    Returns:
+        list[int]: Number of entries returned by each call made from now on.
+    """
+    indexes: dict[str, list[str]] = {}
+    calls: list[int] = []
+
+    def list_objects_v2(
+        self: S3Backend,
+        bucket: FakeBucket,
+        prefix: str | None,
+        delimiter: str | None,
+        continuation_token: str | None,
+        start_after: str | None,
+        max_keys: int,
+    ) -> tuple[list[Any], bool, str | None]:
+        if bucket.name not in indexes:
+            indexes[bucket.name] = sorted(bucket.keys.keys())
+        names = indexes[bucket.name]
+        prefix = prefix or ""
+        # continuation tokens are the last key or directory of the previous page
+        after = continuation_token or start_after
+        i = bisect_left(names, prefix)
+        if after and delimiter and after.endswith(delimiter):
+            i = max(i, bisect_left(names, after[:-1] + chr(ord(delimiter) + 1)))
+        elif after:
+            i = max(i, bisect_right(names, after))
+
+        results: list[Any] = []
+        while (
+            i < len(names) and names[i].startswith(prefix) and len(results) <= max_keys
+        ):
+            name = names[i]
+            end = name.find(delimiter, len(prefix)) if delimiter else -1
+            if end == -1:
+                results.append(bucket.keys[name])
+                i += 1
+            else:
+                directory = name[: end + 1]
+                results.append(directory)
+                i = bisect_left(names, name[:end] + chr(ord(delimiter) + 1))  # type: ignore[arg-type]
+        is_truncated = len(results) > max_keys
+        results = results[:max_keys]
+        calls.append(len(results))
+        time.sleep(latency_seconds + latency_seconds_per_key * len(results))
+        if not is_truncated:
+            return results, False, None
+        last = results[-1]
+        return results, True, last if isinstance(last, str) else last.name
+
+    # moto annotates the result as a set, but returns a sorted list like this one
+    setattr(S3Backend, "list_objects_v2", list_objects_v2)
+    return calls
+
+
+def parse_args() -> Args:
+    """Parse command-line arguments.
+
+    Returns:
+        Args: Parsed command-line arguments as a NamedTuple.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark listing a large bucket")
+    parser.add_argument(
+        "--keys", type=int, default=1_000_000, help="Number of keys in the bucket"
+    )
+    parser.add_argument(
+        "--layout",
+        choices=["flat", "nested"],
+        default="flat",
+        help="`flat` random hex keys, or `nested` keys like `tenant-07/ab/<hex>.json`",
+    )
+    parser.add_argument(
+        "--latency-ms",
+        type=float,
+        default=20,
+        help="Simulated round trip of each list_objects_v2 call",
+    )
+    parser.add_argument(
+        "--latency-us-per-key",
+        type=float,
+        default=100,
+        help="Simulated transfer time of each listed key, i.e. 100 ms more for a full page by default",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        nargs="+",
+        default=[4, 8, 16],
+        help="Concurrent key ranges to benchmark parallel listing with",
+    )
+    args = parser.parse_args()
+    return Args(
+        keys=args.keys,
+        layout=args.layout,
+        latency_ms=args.latency_ms,
+        latency_us_per_key=args.latency_us_per_key,
+        concurrencies=args.concurrency,
+    )
+
+
+if __name__ == "__main__":
+    main()
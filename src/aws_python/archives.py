@@ -0,0 +1,188 @@
+"""Stream ZIP and TAR archives of many files, built on the fly while the files are still being read.
+
+Entries are written as their bytes arrive, without compression and without buffering
+an entry or the archive: ZIP entries are followed by a data descriptor carrying their
+CRC and size, so nothing needs to be known or rewritten up front, and TAR headers only
+need the size, which S3 reports before the body is read. Memory therefore stays
+constant however large the archive grows.
+
+The entries of an archive are fetched ahead of the one being written with
+:func:`iter_prefetched_async`, so many small files cost one pipelined stream instead of
+one round trip each.
+"""
+
+import asyncio
+import io
+import tarfile
+import zipfile
+from collections import deque
+from datetime import datetime
+from typing import (
+    AsyncGenerator,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    NamedTuple,
+    Optional,
+    TypeVar,
+)
+
+from typing_extensions import Buffer
+
+T = TypeVar("T")
+U = TypeVar("U")
+
+# the earliest timestamp a ZIP entry can hold
+_MIN_ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+
+class ArchiveEntry(NamedTuple):
+    """A file to write into an archive."""
+
+    name: str
+    size_bytes: int
+    last_modified: datetime
+    chunks: AsyncIterable[bytes]
+
+
+class _StreamBuffer(io.RawIOBase):
+    """Unseekable file object collecting what `zipfile` writes until it is drained into the stream."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._chunks: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Buffer) -> int:
+        chunk = bytes(data)
+        self._chunks.append(chunk)
+        return len(chunk)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def iter_zip_archive_async(
+    entries: AsyncIterable[ArchiveEntry],
+) -> AsyncIterator[bytes]:
+    """
+    Write entries into a ZIP archive, yielding the archive as it is built.
+
+    Entries are stored uncompressed. Entries and archives beyond 4 GiB use ZIP64 extensions.
+
+    Args:
+        entries (AsyncIterable[ArchiveEntry]): The files to archive, in the order they are written.
+
+    Yields:
+        bytes: The next piece of the archive.
+    """
+    buffer = _StreamBuffer()
+    with zipfile.ZipFile(buffer, mode="w", compression=zipfile.ZIP_STORED) as archive:
+        async for entry in entries:
+            zip_info = zipfile.ZipInfo(
+                entry.name,
+                date_time=max(entry.last_modified.timetuple()[:6], _MIN_ZIP_DATE_TIME),
+            )
+            zip_info.file_size = entry.size_bytes
+            zip_info.external_attr = 0o644 << 16
+            with archive.open(zip_info, mode="w") as archive_entry:
+                async for chunk in entry.chunks:
+                    archive_entry.write(chunk)
+                    # the first chunk follows the entry's header
+                    yield buffer.drain()
+            # the data descriptor, or the header of an empty entry
+            yield buffer.drain()
+    # closing the archive wrote the central directory
+    yield buffer.drain()
+
+
+async def iter_tar_archive_async(
+    entries: AsyncIterable[ArchiveEntry],
+) -> AsyncIterator[bytes]:
+    """
+    Write entries into a POSIX (pax) TAR archive, yielding the archive as it is built.
+
+    Args:
+        entries (AsyncIterable[ArchiveEntry]): The files to archive, in the order they are written.
+
+    Yields:
+        bytes: The next piece of the archive.
+
+    Raises:
+        ValueError: If an entry's chunks do not add up to its size, which its header already announced.
+    """
+    offset = 0
+    async for entry in entries:
+        tar_info = tarfile.TarInfo(entry.name)
+        tar_info.size = entry.size_bytes
+        tar_info.mtime = int(entry.last_modified.timestamp())
+        tar_info.mode = 0o644
+        header = tar_info.tobuf(format=tarfile.PAX_FORMAT)
+        offset += len(header)
+        yield header
+
+        written = 0
+        async for chunk in entry.chunks:
+            written += len(chunk)
+            yield chunk
+        if written != entry.size_bytes:
+            raise ValueError(
+                f"{entry.name} has {written} bytes instead of {entry.size_bytes}"
+            )
+        offset += written
+        if padding := -written % tarfile.BLOCKSIZE:
+            offset += padding
+            yield tarfile.NUL * padding
+
+    # two empty blocks end the archive, which is padded to a whole record like `tarfile` does
+    end_of_archive = 2 * tarfile.BLOCKSIZE
+    end_of_archive += -(offset + end_of_archive) % tarfile.RECORDSIZE
+    yield tarfile.NUL * end_of_archive
+
+
+async def iter_prefetched_async(
+    items: AsyncIterable[T],
+    fetch: Callable[[T], Awaitable[U]],
+    window: int,
+    discard: Optional[Callable[[U], None]] = None,
+) -> AsyncGenerator[U, None]:
+    """
+    Fetch each item, running up to ``window`` fetches ahead of the consumer, and yield the results in order.
+
+    Args:
+        items (AsyncIterable[T]): The items to fetch, e.g. listed objects.
+        fetch (Callable[[T], Awaitable[U]]): Fetches one item.
+        window (int): Maximum number of items fetched or waiting to be consumed at once.
+        discard (Optional[Callable[[U], None]], optional): Releases a fetched result that will not be consumed
+            because the consumer went away, e.g. closes an open body. Defaults to None.
+
+    Yields:
+        U: The result of fetching the next item, in the order of the items.
+    """
+    pending: deque[asyncio.Task[U]] = deque()
+    try:
+        async for item in items:
+            pending.append(asyncio.ensure_future(fetch(item)))
+            if len(pending) >= window:
+                # the task stays pending until it is done, so a consumer leaving meanwhile still discards it
+                result = await pending[0]
+                pending.popleft()
+                yield result
+        while pending:
+            result = await pending[0]
+            pending.popleft()
+            yield result
+    finally:
+        for task in pending:
+            task.cancel()
+        # a fetch may finish despite being cancelled, e.g. one running on an executor thread
+        results = await asyncio.gather(*pending, return_exceptions=True)
+        if discard is not None:
+            for fetched in results:
+                if not isinstance(fetched, BaseException):
+                    discard(fetched)
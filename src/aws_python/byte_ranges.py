@@ -0,0 +1,102 @@
+"""Parse HTTP `Range` request headers and build `multipart/byteranges` response bodies.
+
+Spec for range requests: https://httpwg.org/specs/rfc9110.html#range.requests
+"""
+
+import re
+from typing import (
+    Iterator,
+    NamedTuple,
+    Optional,
+)
+
+from botocore.response import StreamingBody
+
+# requests asking for more ranges than this are served in full, which the spec allows
+MAX_BYTE_RANGES = 16
+BYTE_RANGES_CHUNK_SIZE_BYTES = 64 * 1024
+
+_BYTE_RANGE_SPEC_PATTERN = re.compile(r"^\s*(\d*)\s*-\s*(\d*)\s*$")
+
+
+class ByteRange(NamedTuple):
+    """An inclusive byte range. A missing start means "the last `end` bytes"."""
+
+    start: Optional[int]
+    end: Optional[int]
+
+    def to_range_header(self) -> str:
+        """Format the range as a `Range` header value, e.g. for S3's `GetObject`."""
+        start = "" if self.start is None else str(self.start)
+        end = "" if self.end is None else str(self.end)
+        return f"bytes={start}-{end}"
+
+
+class ByteRangePart(NamedTuple):
+    """One part of a `multipart/byteranges` response."""
+
+    content_range: str
+    body: StreamingBody
+
+
+def parse_range_header(range_header: Optional[str]) -> Optional[list[ByteRange]]:
+    """
+    Parse a `Range` header such as `bytes=0-99,200-,-50`.
+
+    Args:
+        range_header (Optional[str]): The raw header value.
+
+    Returns:
+        Optional[list[ByteRange]]: The requested ranges, or None if the header is missing, malformed,
+            uses a unit other than bytes or asks for more than `MAX_BYTE_RANGES` ranges. Per the spec
+            such headers are ignored and the full representation is served.
+    """
+    if not range_header:
+        return None
+
+    unit, _, range_set = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or not range_set:
+        return None
+
+    byte_ranges: list[ByteRange] = []
+    for range_spec in range_set.split(","):
+        match = _BYTE_RANGE_SPEC_PATTERN.match(range_spec)
+        if not match or match.groups() == ("", ""):
+            return None
+        start = int(match.group(1)) if match.group(1) else None
+        end = int(match.group(2)) if match.group(2) else None
+        if start is not None and end is not None and start > end:
+            return None
+        byte_ranges.append(ByteRange(start=start, end=end))
+
+    if len(byte_ranges) > MAX_BYTE_RANGES:
+        return None
+    return byte_ranges
+
+
+def iter_multipart_byteranges(
+    parts: list[ByteRangePart], content_type: str, boundary: str
+) -> Iterator[bytes]:
+    """
+    Yield a `multipart/byteranges` body, streaming each part's content from S3.
+
+    Args:
+        parts (list[ByteRangePart]): The parts to send, in order.
+        content_type (str): Content type of the whole file, repeated in each part's headers.
+        boundary (str): Boundary separating the parts. Must match the response's `Content-Type`.
+
+    Yields:
+        bytes: The next chunk of the response body.
+    """
+    try:
+        for part in parts:
+            yield (
+                f"\r\n--{boundary}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Content-Range: {part.content_range}\r\n\r\n"
+            ).encode()
+            yield from part.body.iter_chunks(chunk_size=BYTE_RANGES_CHUNK_SIZE_BYTES)
+        yield f"\r\n--{boundary}--\r\n".encode()
+    finally:
+        for part in parts:
+            part.body.close()
@@ -0,0 +1,337 @@
+"""Compress stored files by content type and size, and negotiate their encoding with clients.
+
+Compressible uploads, e.g. text, JSON and logs, are compressed before they are written
+to S3 and stored with `Content-Encoding`, which saves storage and S3 transfer. Clients
+whose `Accept-Encoding` includes the stored encoding get the stored bytes as they are;
+for all others the content is decoded on the fly. Content is never compressed twice:
+uploads that are already encoded are stored as sent, and responses are not compressed
+again on the way out.
+
+`zstd` needs the optional `zstandard` package of the `zstd` extra; `gzip` only needs the standard library.
+
+Spec for content codings: https://httpwg.org/specs/rfc9110.html#field.accept-encoding
+"""
+
+import asyncio
+import zlib
+from fnmatch import fnmatchcase
+from typing import (
+    AsyncGenerator,
+    AsyncIterable,
+    AsyncIterator,
+    NamedTuple,
+    Optional,
+    Protocol,
+)
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+GZIP = "gzip"
+ZSTD = "zstd"
+# `identity` means no encoding at all
+IDENTITY = "identity"
+
+DEFAULT_COMPRESSION_MIN_SIZE_BYTES = 1024
+DEFAULT_COMPRESSIBLE_CONTENT_TYPES = (
+    "text/*",
+    "application/json",
+    "application/*+json",
+    "application/x-ndjson",
+    "application/xml",
+    "application/*+xml",
+    "application/javascript",
+    "application/yaml",
+    "application/x-yaml",
+    "image/svg+xml",
+)
+DEFAULT_COMPRESSION_LEVELS = {GZIP: 6, ZSTD: 3}
+# user metadata of compressed objects, sent as an `x-amz-meta-*` header
+UNCOMPRESSED_LENGTH_METADATA_KEY = "uncompressed-length"
+# smaller chunks are compressed on the event loop, a thread hop would cost more than the work
+MIN_OFFLOADED_CHUNK_SIZE_BYTES = 64 * 1024
+# decoded content is yielded in pieces of about this size, however well the content compressed
+DEFAULT_MAX_DECODED_CHUNK_SIZE_BYTES = 1024 * 1024
+# the most a zstd stream expands, a 128 KiB RLE block is encoded in 4 bytes
+_ZSTD_MAX_EXPANSION_RATIO = 32 * 1024
+# gzip wbits selecting a gzip header and trailer instead of a raw zlib stream
+_GZIP_WBITS = 16 + zlib.MAX_WBITS
+# raised while decoding content that is not valid in its encoding
+DECOMPRESSION_ERRORS: tuple[type[Exception], ...] = (
+    (zlib.error, zstandard.ZstdError) if zstandard is not None else (zlib.error,)
+)
+
+
+class Compressor(Protocol):
+    """Incremental encoder, like the objects returned by `zlib.compressobj`."""
+
+    def compress(self, data: bytes, /) -> bytes:
+        """Encode the next piece of content, returning what is ready of the encoded stream."""
+
+    def flush(self) -> bytes:
+        """Return the rest of the encoded stream once all content was passed in."""
+
+
+class Decompressor(Protocol):
+    """Incremental decoder with bounded output, like `bz2.BZ2Decompressor` and `lzma.LZMADecompressor`."""
+
+    @property
+    def needs_input(self) -> bool:
+        """False while input passed in earlier is left to decode, and `decompress` must be called again."""
+
+    def decompress(self, data: bytes, max_length: int, /) -> bytes:
+        """Decode the next piece of the encoded stream, about `max_length` bytes at most."""
+
+
+class CompressionPolicy(NamedTuple):
+    """Which uploads are compressed before they are stored, and how."""
+
+    content_encoding: str = GZIP
+    min_size_bytes: int = DEFAULT_COMPRESSION_MIN_SIZE_BYTES
+    content_types: tuple[str, ...] = DEFAULT_COMPRESSIBLE_CONTENT_TYPES
+    level: Optional[int] = None
+
+    def should_compress(
+        self,
+        content_type: Optional[str],
+        size_bytes: Optional[int],
+        content_encoding: Optional[str] = None,
+    ) -> bool:
+        """
+        Check if an upload is worth compressing.
+
+        Args:
+            content_type (Optional[str]): Content type of the upload in MIME format, parameters are ignored.
+            size_bytes (Optional[int]): Size of the upload, if known. Uploads of unknown size are compressed.
+            content_encoding (Optional[str], optional): Encoding the upload already has. Defaults to None.
+
+        Returns:
+            bool: True if the upload should be stored compressed with `content_encoding` of the policy.
+        """
+        if content_encoding not in (None, "", IDENTITY):
+            return False
+        if size_bytes is not None and size_bytes < self.min_size_bytes:
+            return False
+        return matches_content_type(content_type, self.content_types)
+
+
+def matches_content_type(
+    content_type: Optional[str], patterns: tuple[str, ...]
+) -> bool:
+    """Check if a content type like `text/plain; charset=utf-8` matches one of the patterns, e.g. `text/*`."""
+    if not content_type:
+        return False
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return any(fnmatchcase(media_type, pattern.lower()) for pattern in patterns)
+
+
+def get_supported_content_encodings() -> tuple[str, ...]:
+    """Return the encodings files can be stored in, depending on the installed packages."""
+    return (GZIP, ZSTD) if zstandard is not None else (GZIP,)
+
+
+def create_compressor(content_encoding: str, level: Optional[int] = None) -> Compressor:
+    """Create an incremental encoder for a content encoding."""
+    level = (
+        level if level is not None else DEFAULT_COMPRESSION_LEVELS.get(content_encoding)
+    )
+    if content_encoding == GZIP:
+        return zlib.compressobj(level, zlib.DEFLATED, _GZIP_WBITS)
+    if content_encoding == ZSTD and zstandard is not None:
+        return zstandard.ZstdCompressor(level=level).compressobj()
+    raise ValueError(f"Unsupported content encoding: {content_encoding}")
+
+
+def create_decompressor(content_encoding: str) -> Decompressor:
+    """Create an incremental decoder for a content encoding."""
+    if content_encoding == GZIP:
+        return _GzipDecompressor()
+    if content_encoding == ZSTD and zstandard is not None:
+        return _ZstdDecompressor()
+    raise ValueError(f"Unsupported content encoding: {content_encoding}")
+
+
+class _GzipDecompressor:
+    """Decode gzip, including files made of several concatenated gzip members as `gzip` writes them."""
+
+    def __init__(self):
+        self._decompressor = zlib.decompressobj(_GZIP_WBITS)
+        # zlib may hold back output once `max_length` is reached, even with all input consumed
+        self._output_pending = False
+
+    @property
+    def needs_input(self) -> bool:
+        if self._decompressor.eof:
+            return not self._decompressor.unused_data
+        return not self._decompressor.unconsumed_tail and not self._output_pending
+
+    def decompress(self, data: bytes, max_length: int, /) -> bytes:
+        if self._decompressor.eof:
+            data = self._decompressor.unused_data + data
+            if not data:
+                return b""
+            self._decompressor = zlib.decompressobj(_GZIP_WBITS)
+        else:
+            data = self._decompressor.unconsumed_tail + data
+        decoded = self._decompressor.decompress(data, max_length)
+        self._output_pending = len(decoded) == max_length
+        return decoded
+
+
+class _ZstdDecompressor:
+    """
+    Decode zstd with bounded output.
+
+    `zstandard` decodes all input it is given at once, so the input is passed in slices
+    small enough that even the most compressed ones cannot expand far beyond `max_length`.
+    """
+
+    def __init__(self):
+        self._decompressor = zstandard.ZstdDecompressor().decompressobj()
+        self._unconsumed_tail = b""
+
+    @property
+    def needs_input(self) -> bool:
+        return not self._unconsumed_tail
+
+    def decompress(self, data: bytes, max_length: int, /) -> bytes:
+        data = self._unconsumed_tail + data
+        slice_size = max(1, max_length // _ZSTD_MAX_EXPANSION_RATIO)
+        decoded: list[bytes] = []
+        decoded_size = offset = 0
+        while offset < len(data) and decoded_size < max_length:
+            piece = self._decompressor.decompress(data[offset : offset + slice_size])  # noqa: E203
+            decoded.append(piece)
+            decoded_size += len(piece)
+            offset += slice_size
+        self._unconsumed_tail = data[offset:]
+        return b"".join(decoded)
+
+
+def compress_bytes(
+    content: bytes, content_encoding: str, level: Optional[int] = None
+) -> bytes:
+    """Compress content that is in memory already, e.g. generated text."""
+    compressor = create_compressor(content_encoding, level)
+    return compressor.compress(content) + compressor.flush()
+
+
+async def compress_chunks_async(
+    chunks: AsyncIterable[bytes], content_encoding: str, level: Optional[int] = None
+) -> AsyncIterator[bytes]:
+    """
+    Compress a stream of bytes while it is being read.
+
+    Args:
+        chunks (AsyncIterable[bytes]): The uncompressed content.
+        content_encoding (str): Encoding to compress with, e.g. `gzip`.
+        level (Optional[int], optional): Compression level. Defaults to the encoding's default.
+
+    Yields:
+        bytes: The next piece of compressed content. Large chunks are compressed on a
+            worker thread, so the event loop keeps serving other requests meanwhile.
+    """
+    compressor = create_compressor(content_encoding, level)
+    async for chunk in chunks:
+        if len(chunk) >= MIN_OFFLOADED_CHUNK_SIZE_BYTES:
+            compressed = await asyncio.to_thread(compressor.compress, chunk)
+        else:
+            compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    if remainder := compressor.flush():
+        yield remainder
+
+
+async def decompress_chunks_async(
+    chunks: AsyncIterable[bytes],
+    content_encoding: str,
+    max_chunk_size: int = DEFAULT_MAX_DECODED_CHUNK_SIZE_BYTES,
+) -> AsyncGenerator[bytes, None]:
+    """
+    Decode a stream of compressed bytes while it is being read.
+
+    Args:
+        chunks (AsyncIterable[bytes]): The compressed content.
+        content_encoding (str): Encoding of the content, e.g. `gzip`.
+        max_chunk_size (int, optional): Size the decoded pieces are kept to, so that highly compressed
+            content, e.g. a gzip bomb, is never decoded into memory at once. Defaults to 1 MiB.
+
+    Yields:
+        bytes: The next piece of decoded content, about `max_chunk_size` bytes at most.
+    """
+    decompressor = create_decompressor(content_encoding)
+    async for chunk in chunks:
+        offload = len(chunk) >= MIN_OFFLOADED_CHUNK_SIZE_BYTES
+        data = chunk
+        while True:
+            if offload:
+                decoded = await asyncio.to_thread(
+                    decompressor.decompress, data, max_chunk_size
+                )
+            else:
+                decoded = decompressor.decompress(data, max_chunk_size)
+            data = b""
+            if decoded:
+                yield decoded
+            if decompressor.needs_input:
+                break
+
+
+def parse_accept_encoding(accept_encoding: str) -> dict[str, float]:
+    """
+    Parse an `Accept-Encoding` header into the quality value of each listed coding.
+
+    Args:
+        accept_encoding (str): The header value, e.g. `gzip, zstd;q=0.9, *;q=0`.
+
+    Returns:
+        dict[str, float]: Lower-cased codings, including `*`, mapped to their quality value. Codings
+            with a malformed quality value are left out.
+    """
+    qualities: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, *params = (part.strip() for part in item.split(";"))
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = -1.0
+        if quality >= 0:
+            qualities[coding.lower()] = quality
+    return qualities
+
+
+def accepts_content_encoding(
+    accept_encoding: Optional[str], content_encoding: str
+) -> bool:
+    """
+    Check if a client can take content in the given encoding as it is.
+
+    Clients that send no `Accept-Encoding` at all, like `curl` without `--compressed`, are
+    treated as accepting no encoding, so they never receive bytes they cannot read.
+
+    Args:
+        accept_encoding (Optional[str]): The client's `Accept-Encoding` header.
+        content_encoding (str): Encoding of the stored content.
+
+    Returns:
+        bool: True if the stored bytes can be sent with `Content-Encoding`, False if they must be decoded.
+    """
+    if accept_encoding is None:
+        return False
+    qualities = parse_accept_encoding(accept_encoding)
+    quality = qualities.get(content_encoding.lower(), qualities.get("*", 0.0))
+    return quality > 0
+
+
+def get_decoded_etag(etag: str) -> str:
+    """Return the entity tag of content decoded on the fly, a weak variant of the stored one since the bytes differ."""
+    return etag if etag.startswith("W/") else f"W/{etag}"
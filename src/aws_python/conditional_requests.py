@@ -0,0 +1,121 @@
+"""Evaluate `If-None-Match` and `If-Modified-Since` request headers to answer `304 Not Modified`.
+
+Spec for conditional requests: https://httpwg.org/specs/rfc9110.html#conditional.requests
+"""
+
+from datetime import (
+    datetime,
+    timezone,
+)
+from email.utils import (
+    format_datetime,
+    parsedate_to_datetime,
+)
+from typing import (
+    Mapping,
+    NamedTuple,
+    Optional,
+)
+
+
+class ConditionalHeaders(NamedTuple):
+    """The validators a client sent to revalidate its cached copy of a file."""
+
+    if_none_match: Optional[list[str]]
+    if_modified_since: Optional[datetime]
+
+    def s3_if_none_match(self) -> Optional[str]:
+        """
+        Return the `IfNoneMatch` value to forward to S3, if S3 can evaluate the condition itself.
+
+        S3 accepts a single entity tag. Weak tags are sent as strong ones, since `If-None-Match`
+        uses weak comparison anyway. Lists of tags are evaluated by the API after the fetch.
+        """
+        if self.if_none_match is None or len(self.if_none_match) != 1:
+            return None
+        return _strip_weak_prefix(self.if_none_match[0])
+
+    def s3_if_modified_since(self) -> Optional[datetime]:
+        """Return the `IfModifiedSince` value to forward to S3, which is ignored when `If-None-Match` is set."""
+        return self.if_modified_since if self.if_none_match is None else None
+
+
+def parse_conditional_headers(
+    headers: Mapping[str, str],
+) -> Optional[ConditionalHeaders]:
+    """
+    Parse the `If-None-Match` and `If-Modified-Since` request headers.
+
+    Args:
+        headers (Mapping[str, str]): The request headers.
+
+    Returns:
+        Optional[ConditionalHeaders]: The parsed validators, or None if the request is unconditional.
+            A malformed `If-Modified-Since` date is ignored, as the spec requires.
+    """
+    if_none_match_header = headers.get("If-None-Match")
+    if_none_match = (
+        [tag.strip() for tag in if_none_match_header.split(",") if tag.strip()]
+        if if_none_match_header
+        else None
+    )
+
+    if_modified_since: Optional[datetime] = None
+    if_modified_since_header = headers.get("If-Modified-Since")
+    if if_modified_since_header:
+        try:
+            if_modified_since = parsedate_to_datetime(if_modified_since_header)
+        except (TypeError, ValueError):
+            if_modified_since = None
+        if if_modified_since is not None and if_modified_since.tzinfo is None:
+            if_modified_since = if_modified_since.replace(tzinfo=timezone.utc)
+
+    if not if_none_match and if_modified_since is None:
+        return None
+    return ConditionalHeaders(
+        if_none_match=if_none_match or None, if_modified_since=if_modified_since
+    )
+
+
+def is_not_modified(
+    conditional_headers: Optional[ConditionalHeaders],
+    etag: Optional[str],
+    last_modified: Optional[datetime],
+) -> bool:
+    """
+    Check if the client's cached copy is still current, i.e. whether to answer `304 Not Modified`.
+
+    Args:
+        conditional_headers (Optional[ConditionalHeaders]): Validators sent by the client.
+        etag (Optional[str]): Current entity tag of the file.
+        last_modified (Optional[datetime]): Current last modified date of the file.
+
+    Returns:
+        bool: True if the file did not change since the client cached it.
+    """
+    if conditional_headers is None:
+        return False
+
+    # If-Modified-Since is only evaluated when If-None-Match is absent
+    if conditional_headers.if_none_match is not None:
+        if etag is None:
+            return False
+        if "*" in conditional_headers.if_none_match:
+            return True
+        return _strip_weak_prefix(etag) in {
+            _strip_weak_prefix(tag) for tag in conditional_headers.if_none_match
+        }
+
+    if conditional_headers.if_modified_since is None or last_modified is None:
+        return False
+    # HTTP dates have a precision of one second
+    return last_modified.replace(microsecond=0) <= conditional_headers.if_modified_since
+
+
+def format_http_date(value: datetime) -> str:
+    """Format a datetime as an HTTP date, e.g. `Thu, 01 Jan 2022 00:00:00 GMT`."""
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def _strip_weak_prefix(entity_tag: str) -> str:
+    return entity_tag[2:] if entity_tag.startswith("W/") else entity_tag
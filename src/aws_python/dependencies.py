@@ -0,0 +1,88 @@
+"""FastAPI dependencies that hand app-scoped resources to the routes."""
+
+from concurrent.futures import Executor
+from typing import Optional
+
+import httpx
+from fastapi import (
+    HTTPException,
+    Request,
+    status,
+)
+from openai import AsyncOpenAI
+
+from aws_python.generation_cache import GenerationCache
+from aws_python.jobs import (
+    JobQueue,
+    JobStore,
+)
+from aws_python.s3.coalesced_reads import CoalescedS3Reads
+from aws_python.s3.metadata_cache import ObjectMetadataCache
+from aws_python.s3.presigned_urls import PresignedUrlCache
+from aws_python.single_flight import SingleFlight
+
+try:
+    from mypy_boto3_s3 import S3Client
+except ImportError:
+    ...
+
+
+def get_s3_client(request: Request) -> "S3Client":
+    """Get the S3 client created by the app's lifespan hook."""
+    return request.app.state.s3_client
+
+
+def get_s3_executor(request: Request) -> Executor:
+    """Get the thread pool created by the app's lifespan hook for blocking S3 calls."""
+    return request.app.state.s3_executor
+
+
+def get_metadata_cache(request: Request) -> Optional[ObjectMetadataCache]:
+    """Get the object metadata cache, or None if it is disabled in the settings."""
+    return request.app.state.metadata_cache
+
+
+def get_coalesced_reads(request: Request) -> Optional[CoalescedS3Reads]:
+    """Get the coalescer of concurrent identical S3 reads, or None if coalescing is disabled in the settings."""
+    return request.app.state.coalesced_reads
+
+
+def get_generation_flights(request: Request) -> Optional[SingleFlight]:
+    """Get the coalescer of concurrent identical generations, or None if coalescing is disabled in the settings."""
+    return request.app.state.generation_flights
+
+
+def get_generation_cache(request: Request) -> Optional[GenerationCache]:
+    """Get the cache of generated files, or None if it is disabled in the settings."""
+    return request.app.state.generation_cache
+
+
+def get_job_queue(request: Request) -> JobQueue:
+    """Get the queue of generation jobs created by the app's lifespan hook."""
+    return request.app.state.job_queue
+
+
+def get_job_store(request: Request) -> JobStore:
+    """Get the store of job records created by the app's lifespan hook."""
+    return request.app.state.job_store
+
+
+def get_presigned_url_cache(request: Request) -> PresignedUrlCache:
+    """Get the cache of presigned URLs created by the app's lifespan hook."""
+    return request.app.state.presigned_url_cache
+
+
+def get_http_client(request: Request) -> httpx.AsyncClient:
+    """Get the HTTP client created by the app's lifespan hook, e.g. to download generated files."""
+    return request.app.state.http_client
+
+
+def get_openai_client(request: Request) -> AsyncOpenAI:
+    """Get the OpenAI client created by the app's lifespan hook, failing with 503 if no API key was configured."""
+    openai_client = request.app.state.openai_client
+    if openai_client is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Generating files is not configured",
+        )
+    return openai_client
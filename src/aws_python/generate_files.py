@@ -1,11 +1,19 @@
 """Generate files using the OpenAI API."""
 
+import base64
+from contextlib import asynccontextmanager
 from typing import (
+    AsyncIterable,
+    AsyncIterator,
+    Final,
     Literal,
+    NamedTuple,
+    Optional,
     Tuple,
     Union,
 )
 
+import httpx
 from loguru import logger
 from openai import AsyncOpenAI
 from openai.types.chat import ChatCompletion
@@ -13,54 +21,135 @@ from openai.types.chat import ChatCompletion
 SYSTEM_PROMPT = (
     "You are an autocompletion tool that produces text files given constraints."
 )
+# the models and the parameters that shape their output, which also key the generation cache
+TEXT_MODEL = "gpt-3.5-turbo"
+TEXT_MAX_TOKENS = 100
+IMAGE_MODEL = "dall-e-3"
+IMAGE_SIZE: Final = "1024x1024"
+IMAGE_QUALITY: Final = "standard"
+SPEECH_MODEL = "tts-1"
+SPEECH_VOICE: Final = "echo"
 
 
-async def get_text_chat_completion(prompt: str) -> str:
+class GeneratedFileStream(NamedTuple):
+    """A generated file read from the network as its bytes arrive."""
+
+    chunks: AsyncIterable[bytes]
+    content_type: Optional[str]
+
+
+async def get_text_chat_completion(
+    prompt: str, client: Optional[AsyncOpenAI] = None
+) -> str:
     """Generate a text chat completion from a given prompt."""
-    client = AsyncOpenAI()
+    client = client or AsyncOpenAI()
 
     response: ChatCompletion = await client.chat.completions.create(
-        model="gpt-3.5-turbo",
+        model=TEXT_MODEL,
         messages=[
             {"role": "system", "content": SYSTEM_PROMPT},
             {"role": "user", "content": prompt},
         ],
-        max_tokens=100,
+        max_tokens=TEXT_MAX_TOKENS,
         n=1,
     )
     logger.debug(response)
     return response.choices[0].message.content or ""
 
 
-async def generate_image(prompt: str) -> Union[str, None]:
+async def generate_image(
+    prompt: str, client: Optional[AsyncOpenAI] = None
+) -> Union[str, None]:
     """Generate an image from a given prompt."""
-    client = AsyncOpenAI()
+    client = client or AsyncOpenAI()
 
     image_response = await client.images.generate(
-        model="dall-e-3",
+        model=IMAGE_MODEL,
         prompt=prompt,
-        size="1024x1024",
-        quality="standard",
+        size=IMAGE_SIZE,
+        quality=IMAGE_QUALITY,
         n=1,
     )
     logger.debug(image_response)
     return image_response.data[0].url or None
 
 
+async def generate_image_b64_json(
+    prompt: str, client: Optional[AsyncOpenAI] = None
+) -> bytes:
+    """
+    Generate an image from a given prompt, returned inline in the response instead of as a URL.
+
+    This saves downloading the image in a second request, at the cost of a response a third
+    larger than the image, since it is base64 encoded.
+    """
+    client = client or AsyncOpenAI()
+
+    image_response = await client.images.generate(
+        model=IMAGE_MODEL,
+        prompt=prompt,
+        size=IMAGE_SIZE,
+        quality=IMAGE_QUALITY,
+        n=1,
+        response_format="b64_json",
+    )
+    return base64.b64decode(image_response.data[0].b64_json or "")  # type: ignore[index]
+
+
+@asynccontextmanager
+async def stream_image(
+    image_url: str, http_client: httpx.AsyncClient
+) -> AsyncIterator[GeneratedFileStream]:
+    """
+    Download a generated image, yielding its bytes as they arrive.
+
+    Raises:
+        httpx.HTTPStatusError: If the image could not be downloaded.
+    """
+    async with http_client.stream("GET", image_url) as image_response:
+        image_response.raise_for_status()
+        yield GeneratedFileStream(
+            chunks=image_response.aiter_bytes(),
+            content_type=image_response.headers.get("Content-Type"),
+        )
+
+
+@asynccontextmanager
+async def stream_text_to_speech(
+    prompt: str,
+    response_format: Literal["mp3", "opus", "aac", "flac", "wav", "pcm"] = "mp3",
+    client: Optional[AsyncOpenAI] = None,
+) -> AsyncIterator[GeneratedFileStream]:
+    """Generate text-to-speech audio from a given prompt, yielding the audio as it is synthesized."""
+    client = client or AsyncOpenAI()
+
+    async with client.audio.speech.with_streaming_response.create(
+        model=SPEECH_MODEL,
+        voice=SPEECH_VOICE,
+        input=prompt,
+        response_format=response_format,
+    ) as audio_response:
+        yield GeneratedFileStream(
+            chunks=audio_response.iter_bytes(),
+            content_type=audio_response.headers.get("Content-Type"),
+        )
+
+
 async def generate_text_to_speech(
     prompt: str,
     response_format: Literal["mp3", "opus", "aac", "flac", "wav", "pcm"] = "mp3",
+    client: Optional[AsyncOpenAI] = None,
 ) -> Tuple[bytes, str]:
     """
     Generate text-to-speech audio from a given prompt.
 
     Returns the audio content as bytes and the MIME type as a string.
     """
-    client = AsyncOpenAI()
+    client = client or AsyncOpenAI()
 
     audio_response = await client.audio.speech.with_raw_response.create(
-        model="tts-1",
-        voice="echo",
+        model=SPEECH_MODEL,
+        voice=SPEECH_VOICE,
         input=prompt,
         response_format=response_format,
     )
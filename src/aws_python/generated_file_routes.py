@@ -0,0 +1,615 @@
+"""Define the FastAPI routes generating files with OpenAI, right away or as background jobs."""
+
+import mimetypes
+from concurrent.futures import Executor
+from contextlib import AsyncExitStack
+from datetime import (
+    datetime,
+    timezone,
+)
+from typing import (
+    Annotated,
+    Awaitable,
+    Callable,
+    Optional,
+)
+from uuid import uuid4
+
+import httpx
+from botocore.exceptions import (
+    BotoCoreError,
+    ClientError,
+)
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Request,
+    Response,
+    status,
+)
+from loguru import logger
+from openai import (
+    AsyncOpenAI,
+    OpenAIError,
+)
+from starlette.datastructures import State
+
+from aws_python.compression import (
+    UNCOMPRESSED_LENGTH_METADATA_KEY,
+    compress_bytes,
+)
+from aws_python.dependencies import (
+    get_generation_cache,
+    get_generation_flights,
+    get_http_client,
+    get_job_queue,
+    get_job_store,
+    get_metadata_cache,
+    get_openai_client,
+    get_s3_client,
+    get_s3_executor,
+)
+from aws_python.generate_files import (
+    IMAGE_MODEL,
+    IMAGE_QUALITY,
+    IMAGE_SIZE,
+    SPEECH_MODEL,
+    SPEECH_VOICE,
+    SYSTEM_PROMPT,
+    TEXT_MAX_TOKENS,
+    TEXT_MODEL,
+    GeneratedFileStream,
+    generate_image,
+    generate_image_b64_json,
+    get_text_chat_completion,
+    stream_image,
+    stream_text_to_speech,
+)
+from aws_python.generation_cache import (
+    GenerationCache,
+    GenerationKey,
+)
+from aws_python.jobs import (
+    JobQueue,
+    JobQueueFullError,
+    JobStore,
+    WebhookNotAllowedError,
+    check_webhook_url,
+    send_webhook,
+)
+from aws_python.routes import (
+    INTERNAL_PATH_RESPONSE,
+    get_compression_policy,
+    get_multipart_copy_options,
+    iter_content_async,
+    reject_internal_path,
+)
+from aws_python.s3.async_objects import fetch_s3_object_metadata_async
+from aws_python.s3.copy_objects import (
+    MultipartCopyOptions,
+    copy_s3_object_async,
+)
+from aws_python.s3.metadata_cache import ObjectMetadataCache
+from aws_python.s3.multipart_upload import upload_s3_object_multipart_async
+from aws_python.s3.read_objects import is_not_found_error
+from aws_python.schemas import (
+    GeneratedFileType,
+    GenerateFilesQueryParams,
+    GenerationJob,
+    JobStatus,
+    PutGeneratedFileResponse,
+)
+from aws_python.settings import Settings
+from aws_python.single_flight import SingleFlight
+
+try:
+    from mypy_boto3_s3 import S3Client
+    from mypy_boto3_s3.type_defs import HeadObjectOutputTypeDef
+except ImportError:
+    ...
+
+GENERATED_FILES_ROUTER = APIRouter(tags=["Generated Files"])
+
+
+@GENERATED_FILES_ROUTER.post(
+    "/v1/files/generated/{file_path:path}",
+    status_code=status.HTTP_201_CREATED,
+    summary="AI Generated Files",
+    responses={
+        status.HTTP_201_CREATED: {
+            "model": PutGeneratedFileResponse,
+            "description": "Successful Response",
+            "content": {
+                "application/json": {
+                    "examples": {
+                        "text": PutGeneratedFileResponse.model_json_schema()[
+                            "examples"
+                        ][0],
+                        "image": PutGeneratedFileResponse.model_json_schema()[
+                            "examples"
+                        ][1],
+                        "text-to-speech": PutGeneratedFileResponse.model_json_schema()[
+                            "examples"
+                        ][2],
+                    },
+                },
+            },
+        },
+        status.HTTP_202_ACCEPTED: {
+            "model": GenerationJob,
+            "description": "The job was queued, with `run_as_job`. Poll the URL in `Location` for its status.",
+            "headers": {
+                "Location": {
+                    "description": "The URL of the job's status.",
+                    "schema": {"type": "string"},
+                },
+            },
+        },
+        status.HTTP_403_FORBIDDEN: INTERNAL_PATH_RESPONSE,
+        status.HTTP_503_SERVICE_UNAVAILABLE: {
+            "description": "Generating files is not configured, or the job queue cannot take more jobs.",
+        },
+    },
+)
+async def generate_file_using_openai(
+    request: Request,
+    response: Response,
+    query_params: Annotated[GenerateFilesQueryParams, Depends()],
+    s3_client: Annotated["S3Client", Depends(get_s3_client)],
+    s3_executor: Annotated[Executor, Depends(get_s3_executor)],
+    metadata_cache: Annotated[
+        Optional[ObjectMetadataCache], Depends(get_metadata_cache)
+    ],
+    openai_client: Annotated[AsyncOpenAI, Depends(get_openai_client)],
+    http_client: Annotated[httpx.AsyncClient, Depends(get_http_client)],
+    generation_cache: Annotated[
+        Optional[GenerationCache], Depends(get_generation_cache)
+    ],
+    generation_flights: Annotated[
+        Optional[SingleFlight], Depends(get_generation_flights)
+    ],
+    job_queue: Annotated[JobQueue, Depends(get_job_queue)],
+    job_store: Annotated[JobStore, Depends(get_job_store)],
+) -> PutGeneratedFileResponse | GenerationJob:
+    """
+    Generate a File using AI.
+
+    Supported file types:
+    - **text**: `.txt`
+    - **image**: `.png`, `.jpg`, `.jpeg`
+    - **text-to-speech**: `.mp3`, `.opus`, `.aac`, `.flac`, `.wav`, `.pcm`
+
+    Note: the generated file type is derived from the file_path extension. So the file_path must have
+    an extension matching one of the supported file types in the list above.
+
+    If the generation cache is enabled, a file generated before with the same type, prompt and
+    parameters is copied to the path instead of calling the model, unless `bypass_cache` is set.
+    Concurrent requests for the same generation share one call to the model.
+
+    With `run_as_job`, the file is generated in the background instead: the response is
+    `202 Accepted` with the queued job, whose status `GET /v1/jobs/{job_id}` reports. If
+    `webhook_url` is set, the finished job is POSTed to it as well.
+    """
+    settings: Settings = request.app.state.settings
+    reject_internal_path(settings, query_params.file_path)
+    if query_params.run_as_job:
+        if query_params.webhook_url is not None:
+            try:
+                check_webhook_url(
+                    str(query_params.webhook_url), settings.jobs_webhook_allowed_hosts
+                )
+            except WebhookNotAllowedError as e:
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e)
+                ) from e
+        job = await queue_generation_job(query_params, job_queue, job_store)
+        response.status_code = status.HTTP_202_ACCEPTED
+        response.headers["Location"] = str(
+            request.url_for("get_job", job_id=job.job_id)
+        )
+        return job
+
+    await run_generation(
+        settings=settings,
+        query_params=query_params,
+        s3_client=s3_client,
+        s3_executor=s3_executor,
+        metadata_cache=metadata_cache,
+        openai_client=openai_client,
+        http_client=http_client,
+        generation_cache=generation_cache,
+        generation_flights=generation_flights,
+    )
+
+    # return response
+    response.status_code = status.HTTP_201_CREATED
+    logger.info(
+        "New {file_type} file generated and uploaded at path: {file_path}",
+        file_type=query_params.file_type.value,
+        file_path=query_params.file_path,
+    )
+    return PutGeneratedFileResponse(
+        file_path=query_params.file_path,
+        message=f"New {query_params.file_type.value} file generated and uploaded at path: {query_params.file_path}",
+    )
+
+
+async def run_generation(
+    settings: Settings,
+    query_params: GenerateFilesQueryParams,
+    s3_client: "S3Client",
+    s3_executor: Executor,
+    metadata_cache: Optional[ObjectMetadataCache],
+    openai_client: AsyncOpenAI,
+    http_client: httpx.AsyncClient,
+    generation_cache: Optional[GenerationCache],
+    generation_flights: Optional[SingleFlight],
+) -> None:
+    """Generate a file to its path, copying it from the generation cache or a concurrent identical generation if possible."""
+    generation_key = get_generation_key(query_params)
+    multipart_copy_options = get_multipart_copy_options(settings)
+
+    async def generate() -> tuple[str, "HeadObjectOutputTypeDef"]:
+        await generate_and_store_file(
+            settings=settings,
+            query_params=query_params,
+            s3_client=s3_client,
+            s3_executor=s3_executor,
+            metadata_cache=metadata_cache,
+            openai_client=openai_client,
+            http_client=http_client,
+        )
+        generated_file = await fetch_s3_object_metadata_async(
+            settings.s3_bucket_name,
+            query_params.file_path,
+            s3_client=s3_client,
+            executor=s3_executor,
+            metadata_cache=metadata_cache,
+        )
+        if generation_cache is not None:
+            await generation_cache.store_async(
+                generation_key,
+                source_key=query_params.file_path,
+                size_bytes=generated_file["ContentLength"],  # type: ignore[index]
+                multipart_options=multipart_copy_options,
+                s3_client=s3_client,
+                executor=s3_executor,
+            )
+        return query_params.file_path, generated_file  # type: ignore[return-value]
+
+    if (
+        generation_cache is not None
+        and not query_params.bypass_cache
+        and await generation_cache.copy_cached_async(
+            generation_key,
+            destination_key=query_params.file_path,
+            multipart_options=multipart_copy_options,
+            s3_client=s3_client,
+            executor=s3_executor,
+            metadata_cache=metadata_cache,
+        )
+    ):
+        logger.info(
+            "Copied the cached {file_type} generation to {file_path}",
+            file_type=query_params.file_type.value,
+            file_path=query_params.file_path,
+        )
+    elif generation_flights is None:
+        await generate()
+    else:
+        # concurrent requests for the same generation share one call to the model
+        (source_key, generated_file), joined = await generation_flights.run(
+            generation_key, generate
+        )
+        if joined and source_key != query_params.file_path:
+            await copy_shared_generation(
+                settings,
+                source_key=source_key,
+                generated_file=generated_file,
+                destination_key=query_params.file_path,
+                generate=generate,
+                multipart_copy_options=multipart_copy_options,
+                s3_client=s3_client,
+                s3_executor=s3_executor,
+                metadata_cache=metadata_cache,
+            )
+
+
+async def copy_shared_generation(
+    settings: Settings,
+    source_key: str,
+    generated_file: "HeadObjectOutputTypeDef",
+    destination_key: str,
+    generate: Callable[[], Awaitable[object]],
+    multipart_copy_options: MultipartCopyOptions,
+    s3_client: "S3Client",
+    s3_executor: Executor,
+    metadata_cache: Optional[ObjectMetadataCache],
+) -> None:
+    """Copy a file generated for a concurrent request to this request's path, or generate it again if it changed since."""
+    try:
+        await copy_s3_object_async(
+            settings.s3_bucket_name,
+            source_key=source_key,
+            destination_key=destination_key,
+            size_bytes=generated_file["ContentLength"],
+            source_etag=generated_file["ETag"],
+            multipart_options=multipart_copy_options,
+            s3_client=s3_client,
+            executor=s3_executor,
+            metadata_cache=metadata_cache,
+        )
+    except ClientError as e:
+        if not (
+            is_not_found_error(e) or e.response["Error"]["Code"] == "PreconditionFailed"
+        ):
+            raise
+        logger.info(
+            "{source_key} changed before it was copied to {destination_key}, generating it again",
+            source_key=source_key,
+            destination_key=destination_key,
+        )
+        await generate()
+
+
+def get_generation_key(query_params: GenerateFilesQueryParams) -> GenerationKey:
+    """Return what determines the output of a generation, which keys the generation cache."""
+    if query_params.file_type == GeneratedFileType.TEXT:
+        return GenerationKey.from_parameters(
+            file_type=query_params.file_type.value,
+            model=TEXT_MODEL,
+            prompt=query_params.prompt,
+            parameters={"system_prompt": SYSTEM_PROMPT, "max_tokens": TEXT_MAX_TOKENS},
+        )
+    if query_params.file_type == GeneratedFileType.IMAGE:
+        return GenerationKey.from_parameters(
+            file_type=query_params.file_type.value,
+            model=IMAGE_MODEL,
+            prompt=query_params.prompt,
+            parameters={"size": IMAGE_SIZE, "quality": IMAGE_QUALITY},
+        )
+    return GenerationKey.from_parameters(
+        file_type=query_params.file_type.value,
+        model=SPEECH_MODEL,
+        prompt=query_params.prompt,
+        parameters={
+            "voice": SPEECH_VOICE,
+            "response_format": query_params.file_path.split(".")[-1],
+        },
+    )
+
+
+async def generate_and_store_file(
+    settings: Settings,
+    query_params: GenerateFilesQueryParams,
+    s3_client: "S3Client",
+    s3_executor: Executor,
+    metadata_cache: Optional[ObjectMetadataCache],
+    openai_client: AsyncOpenAI,
+    http_client: httpx.AsyncClient,
+) -> None:
+    """Generate a file with OpenAI and upload it to its path while it is still being downloaded."""
+    s3_bucket_name = settings.s3_bucket_name
+    content_encoding = None
+    metadata = None
+
+    async with AsyncExitStack() as stack:
+        # generate text
+        if query_params.file_type == GeneratedFileType.TEXT:
+            file_content = await get_text_chat_completion(
+                prompt=query_params.prompt, client=openai_client
+            )
+            file_content_bytes: bytes = file_content.encode(
+                "utf-8"
+            )  # convert string to bytes
+
+            # compress generated text, images and audio are compressed already
+            compression_policy = get_compression_policy(settings)
+            if compression_policy is not None and compression_policy.should_compress(
+                "text/plain", len(file_content_bytes)
+            ):
+                metadata = {
+                    UNCOMPRESSED_LENGTH_METADATA_KEY: str(len(file_content_bytes))
+                }
+                file_content_bytes = compress_bytes(
+                    file_content_bytes,
+                    compression_policy.content_encoding,
+                    compression_policy.level,
+                )
+                content_encoding = compression_policy.content_encoding
+            generated_file = GeneratedFileStream(
+                chunks=iter_content_async(file_content_bytes),
+                content_type="text/plain",
+            )
+
+        # generate an image returned inline
+        elif (
+            query_params.file_type == GeneratedFileType.IMAGE
+            and settings.openai_image_response_format == "b64_json"
+        ):
+            image_content = await generate_image_b64_json(
+                prompt=query_params.prompt, client=openai_client
+            )
+            # the content type is guessed from the file path below
+            generated_file = GeneratedFileStream(
+                chunks=iter_content_async(image_content), content_type=None
+            )
+
+        # generate/download an image
+        elif query_params.file_type == GeneratedFileType.IMAGE:
+            image_url = await generate_image(
+                prompt=query_params.prompt, client=openai_client
+            )
+            generated_file = await stack.enter_async_context(
+                stream_image(image_url, http_client)  # type: ignore[arg-type]
+            )
+
+        # generate audio
+        else:
+            response_audio_file_format = query_params.file_path.split(".")[
+                -1
+            ]  # the file extension
+            generated_file = await stack.enter_async_context(
+                stream_text_to_speech(
+                    prompt=query_params.prompt,
+                    response_format=response_audio_file_format,  # type: ignore
+                    client=openai_client,
+                )
+            )
+
+        # try to guess the mimetype from the file path's extension if we don't already know it
+        content_type: str | None = (
+            generated_file.content_type
+            or mimetypes.guess_type(query_params.file_path)[0]
+        )
+        logger.debug("content_type: {content_type}", content_type=content_type)
+        logger.debug("file_path: {file_path}", file_path=query_params.file_path)
+
+        # Upload the generated file to S3 while it is still being downloaded, part by part
+        await upload_s3_object_multipart_async(
+            bucket_name=s3_bucket_name,
+            object_key=query_params.file_path,
+            chunks=generated_file.chunks,
+            content_type=content_type,
+            part_size=settings.s3_multipart_part_size_bytes,
+            max_concurrency=settings.s3_multipart_max_concurrency,
+            s3_client=s3_client,
+            executor=s3_executor,
+            metadata_cache=metadata_cache,
+            content_encoding=content_encoding,
+            metadata=metadata,
+        )
+
+
+async def queue_generation_job(
+    query_params: GenerateFilesQueryParams, job_queue: JobQueue, job_store: JobStore
+) -> GenerationJob:
+    """Store a generation job's record and queue it, failing with 503 if the queue cannot take it."""
+    created_at = datetime.now(tz=timezone.utc)
+    job = GenerationJob(
+        job_id=uuid4().hex,
+        status=JobStatus.QUEUED,
+        file_path=query_params.file_path,
+        file_type=query_params.file_type,
+        created_at=created_at,
+        updated_at=created_at,
+    )
+    # stored first, so the job can be polled as soon as a worker may take it
+    await job_store.put_async(job.job_id, job.model_dump(mode="json"))
+    try:
+        await job_queue.send(
+            {
+                "job": job.model_dump(mode="json"),
+                "query_params": query_params.model_dump(mode="json"),
+            }
+        )
+    except (JobQueueFullError, ClientError, BotoCoreError) as e:
+        logger.opt(exception=e).warning(
+            "Could not queue generation job {job_id}", job_id=job.job_id
+        )
+        await update_job(
+            job_store,
+            job,
+            job_status=JobStatus.FAILED,
+            error="The job could not be queued",
+        )
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="The job queue cannot take more jobs, try again later",
+        ) from e
+    logger.info(
+        "Queued {file_type} generation job {job_id} for path: {file_path}",
+        file_type=query_params.file_type.value,
+        job_id=job.job_id,
+        file_path=query_params.file_path,
+    )
+    return job
+
+
+async def update_job(
+    job_store: JobStore,
+    job: GenerationJob,
+    job_status: JobStatus,
+    error: Optional[str] = None,
+) -> GenerationJob:
+    """Store a job's new status and return the updated job."""
+    job = job.model_copy(
+        update={
+            "status": job_status,
+            "error": error,
+            "updated_at": datetime.now(tz=timezone.utc),
+        }
+    )
+    await job_store.put_async(job.job_id, job.model_dump(mode="json"))
+    return job
+
+
+async def run_generation_job(state: State, body: dict) -> None:
+    """
+    Run a generation job taken from the job queue, recording its outcome and calling its webhook.
+
+    Args:
+        state (State): The app's state, holding the clients and caches created by its lifespan hook.
+        body (dict): The job, as sent by :func:`queue_generation_job`.
+    """
+    settings: Settings = state.settings
+    job_store: JobStore = state.job_store
+    job = GenerationJob.model_validate(body["job"])
+    query_params = GenerateFilesQueryParams.model_validate(body["query_params"])
+
+    # jobs are delivered at least once, don't generate a finished one again
+    stored_job = await job_store.get_async(job.job_id)
+    if stored_job is not None and stored_job["status"] in (
+        JobStatus.SUCCEEDED.value,
+        JobStatus.FAILED.value,
+    ):
+        logger.info("Skipping finished job {job_id}", job_id=job.job_id)
+        return
+
+    job = await update_job(job_store, job, job_status=JobStatus.RUNNING)
+    error = None
+    if state.openai_client is None:
+        error = "Generating files is not configured"
+    else:
+        try:
+            await run_generation(
+                settings=settings,
+                query_params=query_params,
+                s3_client=state.s3_client,
+                s3_executor=state.s3_executor,
+                metadata_cache=state.metadata_cache,
+                openai_client=state.openai_client,
+                http_client=state.http_client,
+                generation_cache=state.generation_cache,
+                generation_flights=state.generation_flights,
+            )
+        except OpenAIError as e:
+            logger.opt(exception=e).warning(
+                "Generation job {job_id} failed", job_id=job.job_id
+            )
+            error = f"OpenAI could not generate the file: {e}"
+        except Exception:
+            logger.exception("Generation job {job_id} failed", job_id=job.job_id)
+            error = "Generating the file failed"
+    job = await update_job(
+        job_store,
+        job,
+        job_status=JobStatus.FAILED if error is not None else JobStatus.SUCCEEDED,
+        error=error,
+    )
+    logger.info(
+        "Generation job {job_id} {status} for path: {file_path}",
+        job_id=job.job_id,
+        status=job.status.value,
+        file_path=job.file_path,
+    )
+
+    if query_params.webhook_url is not None:
+        await send_webhook(
+            state.http_client,
+            str(query_params.webhook_url),
+            payload=job.model_dump(mode="json"),
+            allowed_hosts=settings.jobs_webhook_allowed_hosts,
+            max_attempts=settings.jobs_webhook_max_attempts,
+        )
@@ -0,0 +1,243 @@
+"""Cache generated files, so identical generations are copied instead of asking the model again.
+
+A generation is identified by its file type, model, prompt and the parameters shaping the
+model's output. The first time it runs, the generated file is copied server-side to
+``<cache prefix><sha256 hex digest of the key>``; later generations with the same key copy
+that object to their own path instead of calling the model, from any process sharing the
+bucket.
+
+The cache has two tiers: the entries stored in S3, shared by every Lambda instance and
+worker, and an in-process LRU of the entries this process has seen, which saves the
+``head_object`` call on repeated hits. Entries expire a TTL after they were stored. Expired
+entries are deleted when they are looked up; a lifecycle rule on the prefix removes the
+ones that are never requested again.
+"""
+
+import hashlib
+import json
+from concurrent.futures import Executor
+from datetime import (
+    datetime,
+    timedelta,
+    timezone,
+)
+from typing import (
+    Mapping,
+    NamedTuple,
+    Optional,
+)
+
+from botocore.exceptions import ClientError
+from loguru import logger
+
+from aws_python.s3.async_objects import (
+    delete_s3_object_async,
+    fetch_s3_object_metadata_async,
+)
+from aws_python.s3.copy_objects import (
+    MultipartCopyOptions,
+    copy_s3_object_async,
+)
+from aws_python.s3.metadata_cache import ObjectMetadataCache
+from aws_python.s3.read_objects import is_not_found_error
+
+try:
+    from mypy_boto3_s3 import S3Client
+    from mypy_boto3_s3.type_defs import HeadObjectOutputTypeDef
+except ImportError:
+    ...
+
+DEFAULT_GENERATION_CACHE_PREFIX = ".generations/sha256/"
+DEFAULT_GENERATION_CACHE_TTL_SECONDS = 7 * 24 * 60 * 60.0
+DEFAULT_GENERATION_CACHE_MAX_ENTRIES = 10_000
+
+
+class GenerationKey(NamedTuple):
+    """What determines the output of a generation."""
+
+    file_type: str
+    model: str
+    prompt: str
+    # sorted (name, value) pairs, so the key stays hashable
+    parameters: tuple[tuple[str, str], ...] = ()
+
+    @classmethod
+    def from_parameters(
+        cls, file_type: str, model: str, prompt: str, parameters: Mapping[str, object]
+    ) -> "GenerationKey":
+        """Build a key from the parameters of a generation, in any order."""
+        return cls(
+            file_type=file_type,
+            model=model,
+            prompt=prompt,
+            parameters=tuple(
+                sorted((name, str(value)) for name, value in parameters.items())
+            ),
+        )
+
+    @property
+    def digest(self) -> str:
+        """Return the SHA-256 hex digest of the key."""
+        serialized_key = json.dumps(
+            {
+                "file_type": self.file_type,
+                "model": self.model,
+                "prompt": self.prompt,
+                "parameters": dict(self.parameters),
+            },
+            sort_keys=True,
+        )
+        return hashlib.sha256(serialized_key.encode("utf-8")).hexdigest()
+
+
+class GenerationCache:
+    """Two-tier cache of generated files: entries stored in S3, fronted by an in-process LRU."""
+
+    def __init__(
+        self,
+        bucket_name: str,
+        prefix: str = DEFAULT_GENERATION_CACHE_PREFIX,
+        ttl_seconds: float = DEFAULT_GENERATION_CACHE_TTL_SECONDS,
+        max_entries: int = DEFAULT_GENERATION_CACHE_MAX_ENTRIES,
+    ):
+        self.bucket_name = bucket_name
+        self.prefix = prefix
+        self.ttl_seconds = ttl_seconds
+        # misses are not cached, another process may store the entry any time
+        self.local_cache = ObjectMetadataCache(
+            max_entries=max_entries, ttl_seconds=ttl_seconds, negative_ttl_seconds=0
+        )
+
+    def object_key(self, key: GenerationKey) -> str:
+        """Return the key of the S3 object holding a generation's file."""
+        return f"{self.prefix}{key.digest}"
+
+    def is_expired(self, stored_at: datetime) -> bool:
+        """Check if an entry stored at the given time has outlived the TTL."""
+        return stored_at + timedelta(seconds=self.ttl_seconds) <= datetime.now(
+            tz=timezone.utc
+        )
+
+    async def lookup_async(
+        self,
+        key: GenerationKey,
+        s3_client: Optional["S3Client"] = None,
+        executor: Optional[Executor] = None,
+    ) -> Optional["HeadObjectOutputTypeDef"]:
+        """
+        Look up the cached file of a generation, deleting it if it expired.
+
+        Args:
+            key (GenerationKey): The generation.
+            s3_client (Optional[S3Client], optional): S3 client. Defaults to None.
+            executor (Optional[Executor], optional): Executor running the blocking S3 calls. Defaults to None.
+
+        Returns:
+            Optional[HeadObjectOutputTypeDef]: Metadata of the cached file, or None on a miss.
+        """
+        object_key = self.object_key(key)
+        cached = await fetch_s3_object_metadata_async(
+            self.bucket_name,
+            object_key,
+            s3_client=s3_client,
+            executor=executor,
+            metadata_cache=self.local_cache,
+        )
+        if cached is None or not self.is_expired(cached["LastModified"]):
+            return cached
+        await delete_s3_object_async(
+            self.bucket_name,
+            object_key,
+            s3_client=s3_client,
+            executor=executor,
+            metadata_cache=self.local_cache,
+        )
+        return None
+
+    async def copy_cached_async(
+        self,
+        key: GenerationKey,
+        destination_key: str,
+        multipart_options: MultipartCopyOptions = MultipartCopyOptions(),
+        s3_client: Optional["S3Client"] = None,
+        executor: Optional[Executor] = None,
+        metadata_cache: Optional[ObjectMetadataCache] = None,
+    ) -> bool:
+        """
+        Copy the cached file of a generation to a path, if it is cached.
+
+        Args:
+            key (GenerationKey): The generation.
+            destination_key (str): Path to copy the file to. An existing file is replaced.
+            multipart_options (MultipartCopyOptions, optional): When and how to copy as a multipart upload.
+            s3_client (Optional[S3Client], optional): S3 client. Defaults to None.
+            executor (Optional[Executor], optional): Executor running the blocking S3 calls. Defaults to None.
+            metadata_cache (Optional[ObjectMetadataCache], optional): Cache to invalidate for the replaced file.
+                Defaults to None.
+
+        Returns:
+            bool: True if the file was copied, False on a miss.
+        """
+        cached = await self.lookup_async(key, s3_client=s3_client, executor=executor)
+        if cached is None:
+            return False
+        object_key = self.object_key(key)
+        try:
+            await copy_s3_object_async(
+                self.bucket_name,
+                source_key=object_key,
+                destination_key=destination_key,
+                size_bytes=cached["ContentLength"],
+                multipart_options=multipart_options,
+                s3_client=s3_client,
+                executor=executor,
+                metadata_cache=metadata_cache,
+            )
+        except ClientError as e:
+            if not is_not_found_error(e):
+                raise
+            # deleted by another process or a lifecycle rule since it was cached in this one
+            self.local_cache.invalidate(self.bucket_name, object_key)
+            return False
+        return True
+
+    async def store_async(
+        self,
+        key: GenerationKey,
+        source_key: str,
+        size_bytes: int,
+        multipart_options: MultipartCopyOptions = MultipartCopyOptions(),
+        s3_client: Optional["S3Client"] = None,
+        executor: Optional[Executor] = None,
+    ) -> None:
+        """
+        Cache a generated file by copying it from the path it was written to.
+
+        Failing to cache is logged but not raised, since the file itself was generated fine.
+
+        Args:
+            key (GenerationKey): The generation.
+            source_key (str): Path the generated file was written to.
+            size_bytes (int): Size of the stored file.
+            multipart_options (MultipartCopyOptions, optional): When and how to copy as a multipart upload.
+            s3_client (Optional[S3Client], optional): S3 client. Defaults to None.
+            executor (Optional[Executor], optional): Executor running the blocking S3 calls. Defaults to None.
+        """
+        object_key = self.object_key(key)
+        try:
+            await copy_s3_object_async(
+                self.bucket_name,
+                source_key=source_key,
+                destination_key=object_key,
+                size_bytes=size_bytes,
+                multipart_options=multipart_options,
+                s3_client=s3_client,
+                executor=executor,
+                metadata_cache=self.local_cache,
+            )
+        except ClientError:
+            logger.opt(exception=True).warning(
+                "Could not cache the {file_type} generated at {source_key}",
+                file_type=key.file_type,
+                source_key=source_key,
+            )
@@ -0,0 +1,73 @@
+"""Create the long-lived HTTP and OpenAI clients shared by every request."""
+
+from typing import Optional
+
+import httpx
+from loguru import logger
+from openai import (
+    AsyncOpenAI,
+    OpenAIError,
+)
+
+from aws_python.settings import Settings
+
+
+def create_http_client(settings: Settings) -> httpx.AsyncClient:
+    """
+    Create an HTTP client with a tuned connection pool, for OpenAI and the files it generates.
+
+    Opening a connection to OpenAI costs a TCP and TLS handshake, i.e. several round trips,
+    so the app builds one client at startup and keeps its connections alive between requests.
+
+    Args:
+        settings (Settings): Settings holding the pool limits, keep-alive and timeouts.
+
+    Returns:
+        httpx.AsyncClient: The configured client. It must be closed on shutdown.
+    """
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=settings.openai_max_connections,
+            max_keepalive_connections=settings.openai_max_keepalive_connections,
+            keepalive_expiry=settings.openai_keepalive_expiry_seconds,
+        ),
+        timeout=httpx.Timeout(
+            settings.openai_timeout_seconds,
+            connect=settings.openai_connect_timeout_seconds,
+        ),
+        http2=settings.openai_http2,
+        # the generated images are served from a CDN that may redirect
+        follow_redirects=True,
+    )
+
+
+def create_openai_client(
+    settings: Settings, http_client: httpx.AsyncClient
+) -> Optional[AsyncOpenAI]:
+    """
+    Create an OpenAI client sending its requests through the shared HTTP client.
+
+    The API key and base URL are read from the `OPENAI_*` environment variables.
+
+    Args:
+        settings (Settings): Settings holding the timeout and retries.
+        http_client (httpx.AsyncClient): Client whose pooled connections the OpenAI client reuses.
+
+    Returns:
+        Optional[AsyncOpenAI]: The configured client, or None if no API key is set. The files
+            API works without one, only generating files is unavailable.
+    """
+    try:
+        return AsyncOpenAI(
+            http_client=http_client,
+            timeout=httpx.Timeout(
+                settings.openai_timeout_seconds,
+                connect=settings.openai_connect_timeout_seconds,
+            ),
+            max_retries=settings.openai_max_retries,
+        )
+    except OpenAIError as e:
+        logger.warning(
+            "OpenAI client not created, generating files is disabled: {e}", e=e
+        )
+        return None
@@ -0,0 +1,36 @@
+"""Define the FastAPI routes reporting the status of background jobs."""
+
+from typing import Annotated
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Path,
+    status,
+)
+
+from aws_python.dependencies import get_job_store
+from aws_python.jobs import JobStore
+from aws_python.schemas import GenerationJob
+
+JOBS_ROUTER = APIRouter(tags=["Jobs"])
+
+
+@JOBS_ROUTER.get(
+    "/v1/jobs/{job_id}",
+    responses={
+        status.HTTP_404_NOT_FOUND: {"description": "There is no job with this ID."},
+    },
+)
+async def get_job(
+    job_id: Annotated[str, Path(pattern=r"^[0-9a-f]{32}$")],
+    job_store: Annotated[JobStore, Depends(get_job_store)],
+) -> GenerationJob:
+    """Get the status of a background job, e.g. a file generated with `run_as_job`, and the path of its output."""
+    record = await job_store.get_async(job_id)
+    if record is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Job not found"
+        )
+    return GenerationJob.model_validate(record)
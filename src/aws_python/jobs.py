@@ -0,0 +1,375 @@
+"""Run jobs in the background, so requests return before slow work, e.g. generating a file, is done.
+
+A job is sent to a queue, and its record is stored in S3 as JSON under the jobs prefix, so any
+process sharing the bucket can report its status. A pool of asyncio workers takes jobs from the
+queue and runs them. The queue is pluggable: :class:`InMemoryJobQueue` keeps jobs in this process,
+:class:`SQSJobQueue` sends them to an SQS queue, or to an SQS-compatible stand-in such as ElasticMQ
+when `AWS_ENDPOINT_URL_SQS` points at it, so they survive restarts and any process can run them.
+
+Jobs are delivered at least once: an SQS message is only deleted once its job finished, so the job
+of a worker that died runs again when the message becomes visible again.
+"""
+
+import asyncio
+import ipaddress
+import json
+import socket
+from concurrent.futures import (
+    Executor,
+    ThreadPoolExecutor,
+)
+from functools import partial
+from typing import (
+    Awaitable,
+    Callable,
+    Collection,
+    NamedTuple,
+    Optional,
+    Protocol,
+    TypeVar,
+)
+
+import boto3
+import httpx
+from botocore.exceptions import (
+    BotoCoreError,
+    ClientError,
+)
+from loguru import logger
+
+from aws_python.s3.async_objects import (
+    fetch_s3_object_if_exists_async,
+    run_in_s3_executor,
+    upload_s3_object_async,
+)
+
+try:
+    from mypy_boto3_s3 import S3Client
+    from mypy_boto3_sqs import SQSClient
+except ImportError:
+    ...
+
+T = TypeVar("T")
+
+DEFAULT_JOBS_PREFIX = ".jobs/"
+DEFAULT_JOB_QUEUE_MAX_SIZE = 1_000
+DEFAULT_JOB_WORKER_COUNT = 4
+DEFAULT_WEBHOOK_MAX_ATTEMPTS = 3
+# SQS long polling waits at most 20 seconds for a message
+SQS_MAX_WAIT_TIME_SECONDS = 20
+
+
+class JobQueueFullError(Exception):
+    """Raised when a job is sent to a queue that cannot take more jobs."""
+
+
+class WebhookNotAllowedError(Exception):
+    """Raised when a webhook URL points at a host the server must not send requests to."""
+
+
+class JobMessage(NamedTuple):
+    """A job taken from a queue."""
+
+    body: dict
+    # identifies the delivery to delete once the job finished, e.g. an SQS receipt handle
+    receipt: Optional[str] = None
+
+
+class JobQueue(Protocol):
+    """Where jobs wait for a worker."""
+
+    async def send(self, body: dict) -> None:
+        """Add a job to the queue, raising `JobQueueFullError` if it cannot take more."""
+        ...
+
+    async def receive(self) -> JobMessage:
+        """Wait for the next job."""
+        ...
+
+    async def delete(self, message: JobMessage) -> None:
+        """Remove a finished job from the queue, so it is not delivered again."""
+        ...
+
+    def close(self) -> None:
+        """Release the queue's resources."""
+        ...
+
+
+class InMemoryJobQueue:
+    """Bounded queue of jobs run by the workers of this process. Queued jobs are lost when it stops."""
+
+    def __init__(self, max_size: int = DEFAULT_JOB_QUEUE_MAX_SIZE):
+        self._queue: asyncio.Queue[dict] = asyncio.Queue(maxsize=max_size)
+
+    def __len__(self) -> int:
+        """Return the number of jobs waiting for a worker."""
+        return self._queue.qsize()
+
+    async def send(self, body: dict) -> None:
+        """Add a job to the queue, raising `JobQueueFullError` if it holds `max_size` jobs already."""
+        try:
+            self._queue.put_nowait(body)
+        except asyncio.QueueFull as e:
+            raise JobQueueFullError("The job queue is full") from e
+
+    async def receive(self) -> JobMessage:
+        """Wait for the next job."""
+        return JobMessage(body=await self._queue.get())
+
+    async def delete(self, message: JobMessage) -> None:
+        """Do nothing, a job taken from the queue is not delivered again."""
+
+    def close(self) -> None:
+        """Do nothing, the queue holds no resources."""
+
+
+class SQSJobQueue:
+    """Queue of jobs in SQS, run by the workers of every process polling it.
+
+    Long polling blocks a thread per waiting worker, so the queue runs its calls on a thread pool of its
+    own instead of the one for S3 calls.
+    """
+
+    def __init__(
+        self,
+        queue_url: str,
+        sqs_client: Optional["SQSClient"] = None,
+        max_workers: int = DEFAULT_JOB_WORKER_COUNT + 1,
+        wait_time_seconds: int = SQS_MAX_WAIT_TIME_SECONDS,
+    ):
+        self.queue_url = queue_url
+        self.wait_time_seconds = wait_time_seconds
+        self._sqs_client = sqs_client or boto3.client("sqs")
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="sqs"
+        )
+
+    async def send(self, body: dict) -> None:
+        """Send a job to the SQS queue as a JSON message."""
+        await self._run_in_executor(
+            self._sqs_client.send_message,
+            QueueUrl=self.queue_url,
+            MessageBody=json.dumps(body),
+        )
+
+    async def receive(self) -> JobMessage:
+        """Long poll the SQS queue until a job arrives, retrying failed polls."""
+        while True:
+            try:
+                response = await self._run_in_executor(
+                    self._sqs_client.receive_message,
+                    QueueUrl=self.queue_url,
+                    MaxNumberOfMessages=1,
+                    WaitTimeSeconds=self.wait_time_seconds,
+                )
+            except (ClientError, BotoCoreError) as e:
+                logger.opt(exception=e).warning("Failed to receive jobs from SQS")
+                await asyncio.sleep(1)
+                continue
+            for message in response.get("Messages", []):
+                return JobMessage(
+                    body=json.loads(message["Body"]),
+                    receipt=message["ReceiptHandle"],
+                )
+
+    async def delete(self, message: JobMessage) -> None:
+        """Delete a finished job's message, so SQS does not deliver it again."""
+        await self._run_in_executor(
+            self._sqs_client.delete_message,
+            QueueUrl=self.queue_url,
+            ReceiptHandle=message.receipt,
+        )
+
+    async def _run_in_executor(self, func: Callable[..., T], **kwargs) -> T:
+        """Run a blocking SQS call on the queue's thread pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(func, **kwargs))
+
+    def close(self) -> None:
+        """Shut down the thread pool of the SQS calls."""
+        # a worker still long polling returns within `wait_time_seconds`
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class JobStore:
+    """Job records stored in S3 as JSON, readable by every process sharing the bucket."""
+
+    def __init__(
+        self,
+        bucket_name: str,
+        prefix: str = DEFAULT_JOBS_PREFIX,
+        s3_client: Optional["S3Client"] = None,
+        executor: Optional[Executor] = None,
+    ):
+        self.bucket_name = bucket_name
+        self.prefix = prefix
+        self._s3_client = s3_client
+        self._executor = executor
+
+    def object_key(self, job_id: str) -> str:
+        """Return the key of the S3 object holding a job's record."""
+        return f"{self.prefix}{job_id}.json"
+
+    async def put_async(self, job_id: str, record: dict) -> None:
+        """Store a job's record, replacing the previous one."""
+        await upload_s3_object_async(
+            self.bucket_name,
+            object_key=self.object_key(job_id),
+            file_content=json.dumps(record).encode("utf-8"),
+            content_type="application/json",
+            s3_client=self._s3_client,
+            executor=self._executor,
+        )
+
+    async def get_async(self, job_id: str) -> Optional[dict]:
+        """Return a job's record, or None if there is no such job."""
+        get_object_response = await fetch_s3_object_if_exists_async(
+            self.bucket_name,
+            object_key=self.object_key(job_id),
+            s3_client=self._s3_client,
+            executor=self._executor,
+        )
+        if get_object_response is None:
+            return None
+        body = get_object_response["Body"]
+        try:
+            content = await run_in_s3_executor(self._executor, body.read)
+        finally:
+            body.close()
+        return json.loads(content)
+
+
+async def run_job_workers(
+    queue: JobQueue,
+    run_job: Callable[[dict], Awaitable[None]],
+    worker_count: int = DEFAULT_JOB_WORKER_COUNT,
+) -> None:
+    """
+    Take jobs from a queue and run them, at most `worker_count` at once, until cancelled.
+
+    Args:
+        queue (JobQueue): Where the jobs wait.
+        run_job (Callable[[dict], Awaitable[None]]): Runs one job, given the body it was sent with.
+            It records the job's outcome itself; exceptions it raises are logged.
+        worker_count (int, optional): Number of workers.
+    """
+
+    async def work() -> None:
+        while True:
+            message = await queue.receive()
+            try:
+                await run_job(message.body)
+            except Exception:
+                logger.exception("Job failed: {body}", body=message.body)
+            try:
+                await queue.delete(message)
+            except (ClientError, BotoCoreError) as e:
+                # the job will be delivered again
+                logger.opt(exception=e).warning("Failed to delete a finished job")
+
+    await asyncio.gather(*(work() for _ in range(worker_count)))
+
+
+def is_public_address(address: ipaddress.IPv4Address | ipaddress.IPv6Address) -> bool:
+    """Check if an address is reachable on the public internet, i.e. not private, loopback, link-local or reserved."""
+    if isinstance(address, ipaddress.IPv6Address) and address.ipv4_mapped is not None:
+        address = address.ipv4_mapped
+    return address.is_global and not address.is_multicast
+
+
+def check_webhook_url(url: str, allowed_hosts: Collection[str] = ()) -> None:
+    """
+    Reject a webhook URL whose host is not on the allowlist, or is an address that is not public.
+
+    Host names are only checked against the allowlist here. The addresses they resolve to are
+    checked by :func:`send_webhook` right before each request.
+
+    Args:
+        url (str): The webhook's URL.
+        allowed_hosts (Collection[str], optional): Host names and addresses webhooks may be sent to.
+            Any host if empty.
+
+    Raises:
+        WebhookNotAllowedError: If the server must not send requests to the URL's host.
+    """
+    host = httpx.URL(url).host
+    if allowed_hosts and host not in {allowed.lower() for allowed in allowed_hosts}:
+        raise WebhookNotAllowedError(f"The webhook host {host} is not allowed")
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return
+    if not is_public_address(address):
+        raise WebhookNotAllowedError(f"The webhook address {host} is not public")
+
+
+async def check_webhook_addresses(url: str) -> None:
+    """
+    Resolve a webhook URL's host, rejecting it if any of its addresses is not public.
+
+    Raises:
+        WebhookNotAllowedError: If the host resolves to a private, loopback, link-local or reserved address.
+        socket.gaierror: If the host could not be resolved.
+    """
+    parsed_url = httpx.URL(url)
+    address_infos = await asyncio.get_running_loop().getaddrinfo(
+        parsed_url.host,
+        parsed_url.port or (443 if parsed_url.scheme == "https" else 80),
+        type=socket.SOCK_STREAM,
+    )
+    for *_, socket_address in address_infos:
+        if not is_public_address(ipaddress.ip_address(socket_address[0])):
+            raise WebhookNotAllowedError(
+                f"The webhook host {parsed_url.host} resolves to the address {socket_address[0]}, which is not public"
+            )
+
+
+async def send_webhook(
+    http_client: httpx.AsyncClient,
+    url: str,
+    payload: dict,
+    allowed_hosts: Collection[str] = (),
+    max_attempts: int = DEFAULT_WEBHOOK_MAX_ATTEMPTS,
+    backoff_seconds: float = 1.0,
+) -> bool:
+    """
+    POST a JSON payload to a webhook, retrying connection errors and error responses with exponential backoff.
+
+    Webhook URLs come from clients, so the request is only sent to public addresses of allowed
+    hosts, and redirects are not followed, so a webhook cannot make the server call internal
+    services such as the instance metadata endpoint.
+
+    Args:
+        http_client (httpx.AsyncClient): Client sending the request.
+        url (str): The webhook's URL.
+        payload (dict): The JSON body.
+        allowed_hosts (Collection[str], optional): Host names and addresses webhooks may be sent to.
+            Any host with public addresses if empty.
+        max_attempts (int, optional): Attempts before giving up.
+        backoff_seconds (float, optional): Wait before the second attempt, doubled for each further one.
+
+    Returns:
+        bool: True if the webhook answered with a success status.
+    """
+    for attempt in range(1, max_attempts + 1):
+        try:
+            check_webhook_url(url, allowed_hosts)
+            # resolved again for every attempt, the addresses of a host may change in between
+            await check_webhook_addresses(url)
+            response = await http_client.post(url, json=payload, follow_redirects=False)
+            response.raise_for_status()
+            return True
+        except WebhookNotAllowedError as e:
+            logger.warning("Webhook {url} refused: {e}", url=url, e=e)
+            return False
+        except (httpx.HTTPError, socket.gaierror) as e:
+            logger.warning(
+                "Webhook {url} failed (attempt {attempt} of {max_attempts}): {e}",
+                url=url,
+                attempt=attempt,
+                max_attempts=max_attempts,
+                e=e,
+            )
+        if attempt < max_attempts:
+            await asyncio.sleep(backoff_seconds * 2 ** (attempt - 1))
+    return False
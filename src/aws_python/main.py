@@ -1,6 +1,12 @@
 """Main module for the FastAPI application."""
 
+import asyncio
+from contextlib import (
+    asynccontextmanager,
+    suppress,
+)
 from textwrap import dedent
+from typing import AsyncIterator
 
 import pydantic
 from fastapi import FastAPI
@@ -10,10 +16,35 @@ from aws_python.errors import (
     handle_broad_exceptions,
     handle_pydantic_validation_errors,
 )
+from aws_python.generated_file_routes import (
+    GENERATED_FILES_ROUTER,
+    run_generation_job,
+)
+from aws_python.generation_cache import GenerationCache
+from aws_python.http_clients import (
+    create_http_client,
+    create_openai_client,
+)
+from aws_python.job_routes import JOBS_ROUTER
+from aws_python.jobs import (
+    InMemoryJobQueue,
+    JobQueue,
+    JobStore,
+    SQSJobQueue,
+    run_job_workers,
+)
 from aws_python.monitoring.logger import inject_lambda_context__middleware
 from aws_python.route_handler import RouteHandler
-from aws_python.routes import GENERATED_FILES_ROUTER, ROUTER
+from aws_python.routes import ROUTER
+from aws_python.s3.async_objects import create_s3_executor
+from aws_python.s3.client import create_s3_client
+from aws_python.s3.coalesced_reads import CoalescedS3Reads
+from aws_python.s3.metadata_cache import ObjectMetadataCache
+from aws_python.s3.presigned_urls import PresignedUrlCache
+from aws_python.s3.upload_sessions import sweep_stale_multipart_uploads_async
 from aws_python.settings import Settings
+from aws_python.single_flight import SingleFlight
+from aws_python.upload_session_routes import UPLOAD_SESSIONS_ROUTER
 
 
 def custom_generate_unique_id(route: APIRoute):
@@ -25,6 +56,104 @@ def custom_generate_unique_id(route: APIRoute):
     return f"{route.tags[0]}-{route.name}"
 
 
+def create_job_queue(settings: Settings) -> JobQueue:
+    """Create the queue of generation jobs chosen in the settings."""
+    if settings.jobs_queue == "sqs":
+        return SQSJobQueue(
+            queue_url=settings.jobs_sqs_queue_url,  # type: ignore[arg-type]
+            max_workers=settings.jobs_worker_count + 1,
+        )
+    return InMemoryJobQueue(max_size=settings.jobs_queue_max_size)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Create the app-scoped clients on startup and release them on shutdown."""
+    settings: Settings = app.state.settings
+    app.state.s3_client = create_s3_client(settings)
+    app.state.s3_executor = create_s3_executor(settings.s3_executor_max_workers)
+    app.state.metadata_cache = (
+        ObjectMetadataCache(
+            max_entries=settings.metadata_cache_max_entries,
+            ttl_seconds=settings.metadata_cache_ttl_seconds,
+            negative_ttl_seconds=settings.metadata_cache_negative_ttl_seconds,
+        )
+        if settings.metadata_cache_enabled
+        else None
+    )
+    app.state.generation_cache = (
+        GenerationCache(
+            bucket_name=settings.s3_bucket_name,
+            prefix=settings.generation_cache_prefix,
+            ttl_seconds=settings.generation_cache_ttl_seconds,
+            max_entries=settings.generation_cache_max_entries,
+        )
+        if settings.generation_cache_enabled
+        else None
+    )
+    app.state.coalesced_reads = (
+        CoalescedS3Reads(max_body_bytes=settings.request_coalescing_max_body_bytes)
+        if settings.request_coalescing_enabled
+        else None
+    )
+    app.state.generation_flights = (
+        SingleFlight() if settings.request_coalescing_enabled else None
+    )
+    app.state.presigned_url_cache = PresignedUrlCache(
+        max_entries=settings.presigned_url_cache_max_entries
+    )
+    app.state.http_client = create_http_client(settings)
+    app.state.openai_client = create_openai_client(settings, app.state.http_client)
+    upload_sweeper = (
+        asyncio.create_task(
+            sweep_stale_multipart_uploads_async(
+                settings.s3_bucket_name,
+                max_age_seconds=settings.upload_session_max_age_seconds,
+                interval_seconds=settings.upload_session_sweep_interval_seconds,
+                s3_client=app.state.s3_client,
+                executor=app.state.s3_executor,
+            )
+        )
+        if settings.upload_session_sweep_interval_seconds is not None
+        else None
+    )
+    app.state.job_store = JobStore(
+        bucket_name=settings.s3_bucket_name,
+        prefix=settings.jobs_prefix,
+        s3_client=app.state.s3_client,
+        executor=app.state.s3_executor,
+    )
+    app.state.job_queue = create_job_queue(settings)
+    job_workers = (
+        asyncio.create_task(
+            run_job_workers(
+                app.state.job_queue,
+                lambda body: run_generation_job(app.state, body),
+                worker_count=settings.jobs_worker_count,
+            )
+        )
+        if settings.jobs_worker_count > 0
+        else None
+    )
+    try:
+        yield
+    finally:
+        if job_workers is not None:
+            # running jobs are abandoned: SQS delivers them again, in-memory ones stay `running`
+            job_workers.cancel()
+            with suppress(asyncio.CancelledError):
+                await job_workers
+        app.state.job_queue.close()
+        if upload_sweeper is not None:
+            upload_sweeper.cancel()
+            with suppress(asyncio.CancelledError):
+                await upload_sweeper
+        # the OpenAI client sends through the shared HTTP client, so this closes both
+        await app.state.http_client.aclose()
+        app.state.s3_executor.shutdown(wait=True, cancel_futures=True)
+        app.state.s3_client.close()
+
+
 def create_app(settings: Settings | None = None) -> FastAPI:
     """Create a FastAPI application."""
     settings = settings or Settings()
@@ -37,12 +166,15 @@ def create_app(settings: Settings | None = None) -> FastAPI:
         docs_url="/",  # its easier to find the docs when they live on the base url
         root_path="/prod",
         generate_unique_id_function=custom_generate_unique_id,
+        lifespan=lifespan,
     )
     app.state.settings = settings
 
     app.router.route_class = RouteHandler
     app.include_router(ROUTER)
     app.include_router(GENERATED_FILES_ROUTER)
+    app.include_router(UPLOAD_SESSIONS_ROUTER)
+    app.include_router(JOBS_ROUTER)
 
     app.add_exception_handler(
         exc_class_or_status_code=pydantic.ValidationError,
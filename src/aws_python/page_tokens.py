@@ -0,0 +1,57 @@
+"""Opaque page tokens for `GET /v1/files` that remember how the first page was listed.
+
+S3 continuation tokens do not carry the `Prefix` and `Delimiter` of the listing they
+continue, and the API only accepts the token on later pages. The token handed to
+clients therefore bundles the continuation token with the directory, page size and
+listing mode as URL-safe base64 JSON, so every page stays inside the same directory.
+"""
+
+import base64
+import binascii
+import json
+from typing import (
+    NamedTuple,
+    Optional,
+)
+
+
+class FilesPageToken(NamedTuple):
+    """Where a listing of files continues and how it was started."""
+
+    continuation_token: str
+    directory: str
+    page_size: Optional[int] = None
+    shallow: bool = False
+
+
+def encode_page_token(page_token: FilesPageToken) -> str:
+    """Serialize a page token into the opaque string handed to clients."""
+    payload = json.dumps(page_token._asdict(), separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_page_token(page_token: str) -> FilesPageToken:
+    """
+    Parse a page token from a client.
+
+    Tokens that are not produced by :func:`encode_page_token` are taken as raw S3
+    continuation tokens of a listing of the whole bucket, as returned before page
+    tokens remembered the listing.
+
+    Args:
+        page_token (str): The `page_token` query parameter.
+
+    Returns:
+        FilesPageToken: The continuation token and the parameters of the first page.
+    """
+    try:
+        padded = page_token + "=" * (-len(page_token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return FilesPageToken(
+            continuation_token=str(payload["continuation_token"]),
+            directory=str(payload["directory"]),
+            page_size=payload.get("page_size"),
+            shallow=bool(payload.get("shallow", False)),
+        )
+    except (binascii.Error, UnicodeDecodeError, ValueError, KeyError, TypeError):
+        return FilesPageToken(continuation_token=page_token, directory="")
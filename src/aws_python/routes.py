@@ -1,63 +1,325 @@
 """Define the FastAPI routes for the AWS Python application."""
 
+import asyncio
 import mimetypes
-from typing import Annotated
+from concurrent.futures import Executor
+from datetime import datetime
+from pathlib import PurePosixPath
+from typing import (
+    Annotated,
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Mapping,
+    Optional,
+)
+from urllib.parse import quote
+from uuid import uuid4
 
-import httpx
+from botocore.exceptions import (
+    BotoCoreError,
+    ClientError,
+)
+from botocore.response import StreamingBody
 from fastapi import (
     APIRouter,
     Depends,
+    Form,
     HTTPException,
     Request,
     Response,
     UploadFile,
     status,
 )
-from fastapi.responses import StreamingResponse
+from fastapi.responses import (
+    RedirectResponse,
+    StreamingResponse,
+)
 from loguru import logger
+from starlette.background import BackgroundTask
 
-from aws_python.generate_files import (
-    generate_image,
-    generate_text_to_speech,
-    get_text_chat_completion,
+from aws_python.archives import (
+    ArchiveEntry,
+    iter_prefetched_async,
+    iter_tar_archive_async,
+    iter_zip_archive_async,
+)
+from aws_python.byte_ranges import (
+    ByteRange,
+    ByteRangePart,
+    iter_multipart_byteranges,
+    parse_range_header,
+)
+from aws_python.compression import (
+    DECOMPRESSION_ERRORS,
+    UNCOMPRESSED_LENGTH_METADATA_KEY,
+    CompressionPolicy,
+    accepts_content_encoding,
+    compress_chunks_async,
+    decompress_chunks_async,
+    get_decoded_etag,
+    get_supported_content_encodings,
+)
+from aws_python.conditional_requests import (
+    ConditionalHeaders,
+    format_http_date,
+    is_not_modified,
+    parse_conditional_headers,
+)
+from aws_python.dependencies import (
+    get_coalesced_reads,
+    get_metadata_cache,
+    get_presigned_url_cache,
+    get_s3_client,
+    get_s3_executor,
+)
+from aws_python.page_tokens import (
+    FilesPageToken,
+    decode_page_token,
+    encode_page_token,
+)
+from aws_python.s3.async_objects import (
+    delete_s3_object_async,
+    fetch_s3_object_async,
+    fetch_s3_object_if_exists_async,
+    fetch_s3_object_metadata_async,
+    fetch_s3_objects_page_async,
+    object_exists_in_s3_async,
+    run_in_s3_executor,
+)
+from aws_python.s3.batch_delete import (
+    delete_s3_objects_in_batches_async,
+    list_s3_object_keys_async,
+)
+from aws_python.s3.coalesced_reads import CoalescedS3Reads
+from aws_python.s3.content_addressed import (
+    ContentAddress,
+    upload_s3_object_content_addressed_async,
+)
+from aws_python.s3.copy_objects import (
+    CopyObjectResult,
+    MultipartCopyOptions,
+    copy_s3_object_async,
+    transfer_s3_objects_async,
+)
+from aws_python.s3.download_stream import iter_s3_body_async
+from aws_python.s3.list_objects import (
+    iter_s3_object_pages_async,
+    iter_s3_objects_async,
+)
+from aws_python.s3.metadata_cache import ObjectMetadataCache
+from aws_python.s3.multipart_upload import upload_s3_object_multipart_async
+from aws_python.s3.parallel_download import iter_s3_object_in_parallel_async
+from aws_python.s3.presigned_urls import (
+    PresignedUrlCache,
+    create_presigned_multipart_upload,
+    generate_presigned_object_url,
 )
-from aws_python.s3.delete_objects import delete_s3_object
 from aws_python.s3.read_objects import (
-    fetch_s3_object,
-    fetch_s3_objects_metadata,
-    fetch_s3_objects_using_page_token,
-    object_exists_in_s3,
+    is_not_found_error,
+    is_not_modified_error,
 )
-from aws_python.s3.write_objects import upload_s3_object
 from aws_python.schemas import (
+    DIRECTORY_DELIMITER,
+    ArchiveFilesQueryParams,
+    ArchiveFormat,
+    BatchDeleteFileResult,
+    BatchDeleteFilesRequest,
+    BatchUploadFileResult,
+    BatchUploadFilesResponse,
+    CopyFileResult,
+    CopyFilesRequest,
+    ExportFilesQueryParams,
     FileMetadata,
-    GeneratedFileType,
-    GenerateFilesQueryParams,
+    GetFileQueryParams,
     GetFilesQueryParams,
     GetFilesResponse,
+    PresignedMultipartUploadUrls,
+    PresignedUploadResponse,
+    PutFileQueryParams,
     PutFileResponse,
-    PutGeneratedFileResponse,
+    UploadStatus,
 )
 from aws_python.settings import Settings
 
+try:
+    from mypy_boto3_s3 import S3Client
+    from mypy_boto3_s3.type_defs import (
+        GetObjectOutputTypeDef,
+        HeadObjectOutputTypeDef,
+        ObjectTypeDef,
+    )
+except ImportError:
+    ...
+
 ROUTER = APIRouter(tags=["Files"])
-GENERATED_FILES_ROUTER = APIRouter(tags=["Generated Files"])
+
+VALIDATOR_RESPONSE_HEADERS = {
+    "ETag": {
+        "description": "The entity tag of the file, to send back in `If-None-Match`.",
+        "example": '"d41d8cd98f00b204e9800998ecf8427e"',
+        "schema": {"type": "string"},
+    },
+    "Cache-Control": {
+        "description": "How clients and caches may store the response.",
+        "example": "no-cache",
+        "schema": {"type": "string"},
+    },
+}
+INTERNAL_PATH_RESPONSE = {
+    "description": "The path is reserved for the API's internal objects, e.g. content-addressed blobs or job records.",
+}
+NOT_MODIFIED_RESPONSE = {
+    "description": (
+        "The file did not change since the version identified by `If-None-Match` "
+        "(or, if absent, since the date in `If-Modified-Since`)."
+    ),
+}
+
+
+def get_validator_headers(
+    etag: str, last_modified: datetime | str, cache_control: str
+) -> dict[str, str]:
+    """Get the headers clients need to cache a file and revalidate it with conditional requests."""
+    return {
+        "ETag": etag,
+        "Last-Modified": (
+            format_http_date(last_modified)
+            if isinstance(last_modified, datetime)
+            else last_modified
+        ),
+        "Cache-Control": cache_control,
+    }
+
+
+def exceeds_presigned_url_size_threshold(
+    settings: Settings, size_bytes: Optional[int]
+) -> bool:
+    """Check if a file is large enough to always be transferred through presigned S3 URLs."""
+    threshold = settings.presigned_url_size_threshold_bytes
+    return threshold is not None and size_bytes is not None and size_bytes > threshold
+
+
+def should_use_presigned_urls(
+    settings: Settings, redirect: Optional[bool], size_bytes: Optional[int]
+) -> bool:
+    """Decide whether to transfer a file through presigned S3 URLs. An explicit `redirect` wins over the settings."""
+    if redirect is not None:
+        return redirect
+    return settings.presigned_urls_enabled or exceeds_presigned_url_size_threshold(
+        settings, size_bytes
+    )
+
+
+def redirect_to_presigned_url(
+    settings: Settings,
+    file_path: str,
+    s3_client: "S3Client",
+    presigned_url_cache: PresignedUrlCache,
+) -> RedirectResponse:
+    """Redirect a download to a presigned S3 URL."""
+    presigned_url = generate_presigned_object_url(
+        "get_object",
+        bucket_name=settings.s3_bucket_name,
+        object_key=file_path,
+        expires_in=settings.presigned_url_expiration_seconds,
+        s3_client=s3_client,
+        presigned_url_cache=presigned_url_cache,
+    )
+    # handed-out URLs have at least half of their validity left, so the redirect may be cached that long
+    return RedirectResponse(
+        url=presigned_url.url,
+        status_code=status.HTTP_307_TEMPORARY_REDIRECT,
+        headers={
+            "Cache-Control": f"private, max-age={settings.presigned_url_expiration_seconds // 2}"
+        },
+    )
+
+
+def stream_s3_object_body(
+    body: StreamingBody, settings: Settings, s3_executor: Executor, **response_kwargs
+) -> StreamingResponse:
+    """Stream an S3 object's body to the client in large chunks, reading ahead of the socket."""
+    return StreamingResponse(
+        content=iter_s3_body_async(
+            body,
+            chunk_size=settings.s3_download_chunk_size_bytes,
+            read_ahead_chunks=settings.s3_download_read_ahead_chunks,
+            executor=s3_executor,
+        ),
+        # the iterator closes the body itself, unless the client left before it was started
+        background=BackgroundTask(body.close),
+        **response_kwargs,
+    )
+
+
+async def read_upload_file_in_chunks(
+    file: UploadFile, chunk_size: int
+) -> AsyncIterator[bytes]:
+    """Read an uploaded file chunk by chunk instead of loading it into memory at once."""
+    while chunk := await file.read(chunk_size):
+        yield chunk
+
+
+async def iter_content_async(content: bytes) -> AsyncIterator[bytes]:
+    """Yield content that is already in memory as a single chunk."""
+    yield content
 
 
 @ROUTER.put(
     "/v1/files/{file_path:path}",
     responses={
-        status.HTTP_200_OK: {"model": PutFileResponse},
+        status.HTTP_200_OK: {
+            "model": PutFileResponse | PresignedUploadResponse,
+            "description": "The file was overwritten, or presigned URLs to upload it directly to S3.",
+        },
         status.HTTP_201_CREATED: {"model": PutFileResponse},
+        status.HTTP_403_FORBIDDEN: INTERNAL_PATH_RESPONSE,
+        status.HTTP_422_UNPROCESSABLE_ENTITY: {
+            "description": "No file was sent and presigned upload URLs were not requested.",
+        },
     },
 )
 async def upload_file(
-    request: Request, file_path: str, file: UploadFile, response: Response
-) -> PutFileResponse:
-    """Upload a file."""
+    request: Request,
+    file_path: str,
+    response: Response,
+    s3_client: Annotated["S3Client", Depends(get_s3_client)],
+    s3_executor: Annotated[Executor, Depends(get_s3_executor)],
+    metadata_cache: Annotated[
+        Optional[ObjectMetadataCache], Depends(get_metadata_cache)
+    ],
+    presigned_url_cache: Annotated[PresignedUrlCache, Depends(get_presigned_url_cache)],
+    file: Optional[UploadFile] = None,
+    query_params: PutFileQueryParams = Depends(),  # noqa: B008
+) -> PutFileResponse | PresignedUploadResponse:
+    """Upload a file, or get presigned URLs to upload it directly to S3."""
     settings: Settings = request.app.state.settings
-    object_exists = object_exists_in_s3(
-        bucket_name=settings.s3_bucket_name, object_key=file_path
+    reject_internal_path(settings, file_path)
+    if file is None:
+        if not should_use_presigned_urls(
+            settings, query_params.redirect, query_params.size_bytes
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Send the file in the `file` form field, or request presigned upload URLs with `redirect=true`",
+            )
+        return await get_presigned_upload_urls(
+            settings=settings,
+            file_path=file_path,
+            size_bytes=query_params.size_bytes,
+            s3_client=s3_client,
+            s3_executor=s3_executor,
+            metadata_cache=metadata_cache,
+            presigned_url_cache=presigned_url_cache,
+        )
+
+    object_exists = await object_exists_in_s3_async(
+        bucket_name=settings.s3_bucket_name,
+        object_key=file_path,
+        s3_client=s3_client,
+        executor=s3_executor,
+        metadata_cache=metadata_cache,
     )
 
     if object_exists:
@@ -67,13 +329,13 @@ async def upload_file(
         response_message = f"File uploaded successfully to path: /{file_path}"
         response.status_code = status.HTTP_201_CREATED
 
-    file_content: bytes = await file.read()
-    logger.debug("file_content: {file_content}", file_content=file_content)
-    upload_s3_object(
-        bucket_name=settings.s3_bucket_name,
-        object_key=file_path,
-        file_content=file_content,
-        content_type=file.content_type,
+    await store_upload_file(
+        settings=settings,
+        file_path=file_path,
+        file=file,
+        s3_client=s3_client,
+        s3_executor=s3_executor,
+        metadata_cache=metadata_cache,
     )
     logger.info("response.status_code: {response.status_code}", response=response)
     logger.info(
@@ -85,25 +347,458 @@ async def upload_file(
     )
 
 
+async def store_upload_file(
+    settings: Settings,
+    file_path: str,
+    file: UploadFile,
+    s3_client: "S3Client",
+    s3_executor: Executor,
+    metadata_cache: Optional[ObjectMetadataCache],
+) -> None:
+    """
+    Write an uploaded file to S3, as a content-addressed blob and pointer if enabled.
+
+    Compressible files are compressed on the way unless they are content-addressed, since
+    blobs are shared by every path with the same content, whatever its content type.
+    """
+    if not settings.content_addressed_storage_enabled:
+        chunks = read_upload_file_in_chunks(
+            file, chunk_size=settings.s3_multipart_part_size_bytes
+        )
+        content_encoding = get_upload_content_encoding(settings, file)
+        metadata = None
+        compression_policy = get_compression_policy(settings)
+        if compression_policy is not None and compression_policy.should_compress(
+            file.content_type, file.size, content_encoding
+        ):
+            chunks = compress_chunks_async(
+                chunks, compression_policy.content_encoding, compression_policy.level
+            )
+            content_encoding = compression_policy.content_encoding
+            if file.size is not None:
+                metadata = {UNCOMPRESSED_LENGTH_METADATA_KEY: str(file.size)}
+        elif content_encoding is not None:
+            # archives and HEAD responses need the decoded size, which the client did not send
+            uncompressed_length = await count_decoded_upload_bytes(
+                settings, file, content_encoding
+            )
+            if uncompressed_length is not None:
+                metadata = {UNCOMPRESSED_LENGTH_METADATA_KEY: str(uncompressed_length)}
+        await upload_s3_object_multipart_async(
+            bucket_name=settings.s3_bucket_name,
+            object_key=file_path,
+            chunks=chunks,
+            content_type=file.content_type,
+            part_size=settings.s3_multipart_part_size_bytes,
+            max_concurrency=settings.s3_multipart_max_concurrency,
+            s3_client=s3_client,
+            executor=s3_executor,
+            metadata_cache=metadata_cache,
+            content_encoding=content_encoding,
+            metadata=metadata,
+        )
+        return
+
+    async def read_from_start() -> AsyncIterator[bytes]:
+        # the form body is spooled to disk before the route runs, so reading it twice is cheap
+        await file.seek(0)
+        async for chunk in read_upload_file_in_chunks(
+            file, chunk_size=settings.s3_multipart_part_size_bytes
+        ):
+            yield chunk
+
+    content_address, blob_uploaded = await upload_s3_object_content_addressed_async(
+        bucket_name=settings.s3_bucket_name,
+        object_key=file_path,
+        read_chunks=read_from_start,
+        content_type=file.content_type,
+        blob_prefix=settings.content_addressed_blob_prefix,
+        part_size=settings.s3_multipart_part_size_bytes,
+        max_concurrency=settings.s3_multipart_max_concurrency,
+        s3_client=s3_client,
+        executor=s3_executor,
+        metadata_cache=metadata_cache,
+    )
+    logger.info(
+        "Stored /{file_path} as blob {sha256} ({outcome})",
+        file_path=file_path,
+        sha256=content_address.sha256,
+        outcome="uploaded" if blob_uploaded else "deduplicated",
+    )
+
+
+async def count_decoded_upload_bytes(
+    settings: Settings, file: UploadFile, content_encoding: str
+) -> Optional[int]:
+    """
+    Count the bytes of an upload sent with `Content-Encoding` once decoded, without keeping them.
+
+    The form body is spooled to disk before the route runs, so it is decoded from the start
+    and rewound for the upload afterwards.
+
+    Args:
+        settings (Settings): Application settings.
+        file (UploadFile): The uploaded file, in `content_encoding`.
+        content_encoding (str): Encoding the client sent the file in, e.g. `gzip`.
+
+    Returns:
+        Optional[int]: Size of the decoded content, or None if the upload is not valid in its encoding.
+    """
+    await file.seek(0)
+    uncompressed_length = 0
+    try:
+        async for chunk in decompress_chunks_async(
+            read_upload_file_in_chunks(
+                file, chunk_size=settings.s3_multipart_part_size_bytes
+            ),
+            content_encoding,
+            max_chunk_size=settings.s3_download_chunk_size_bytes,
+        ):
+            uncompressed_length += len(chunk)
+    except DECOMPRESSION_ERRORS:
+        logger.opt(exception=True).warning(
+            "Upload sent as {content_encoding} cannot be decoded, storing it as is",
+            content_encoding=content_encoding,
+        )
+        return None
+    finally:
+        await file.seek(0)
+    return uncompressed_length
+
+
+def get_compression_policy(settings: Settings) -> Optional[CompressionPolicy]:
+    """Return which uploads to store compressed, or None if compression is disabled."""
+    if not settings.compression_enabled:
+        return None
+    return CompressionPolicy(
+        content_encoding=settings.compression_content_encoding,
+        min_size_bytes=settings.compression_min_size_bytes,
+        content_types=tuple(settings.compression_content_types),
+        level=settings.compression_level,
+    )
+
+
+def get_multipart_copy_options(settings: Settings) -> MultipartCopyOptions:
+    """Return when and how server-side copies are split into parts."""
+    return MultipartCopyOptions(
+        threshold_bytes=settings.s3_multipart_copy_threshold_bytes,
+        part_size_bytes=settings.s3_multipart_copy_part_size_bytes,
+        max_concurrency=settings.s3_multipart_max_concurrency,
+    )
+
+
+def get_upload_content_encoding(settings: Settings, file: UploadFile) -> Optional[str]:
+    """Return the encoding an uploaded file was sent in, so it is stored as is instead of compressed twice."""
+    content_encoding = file.headers.get("Content-Encoding")
+    if not settings.compression_enabled or content_encoding is None:
+        return None
+    content_encoding = content_encoding.strip().lower()
+    # the content cannot be decoded for clients not accepting other encodings, so it is stored as opaque bytes
+    return (
+        content_encoding
+        if content_encoding in get_supported_content_encodings()
+        else None
+    )
+
+
+def get_stored_content_encoding(s3_object: Mapping) -> Optional[str]:
+    """Return the encoding an object is stored in, or None if it is stored as is or in an encoding we cannot decode."""
+    content_encoding = s3_object.get("ContentEncoding")
+    return (
+        content_encoding
+        if content_encoding in get_supported_content_encodings()
+        else None
+    )
+
+
+def should_decode_content(request: Request, content_encoding: Optional[str]) -> bool:
+    """Check if stored content must be decoded for the client, i.e. whether its `Accept-Encoding` lacks the encoding."""
+    return content_encoding is not None and not accepts_content_encoding(
+        request.headers.get("Accept-Encoding"), content_encoding
+    )
+
+
+def get_representation_etag(
+    request: Request, etag: str, content_encoding: Optional[str]
+) -> str:
+    """Return the ETag of the bytes sent to the client, which is weak if the stored content is decoded for it."""
+    if should_decode_content(request, content_encoding):
+        return get_decoded_etag(etag)
+    return etag
+
+
+async def get_presigned_upload_urls(
+    settings: Settings,
+    file_path: str,
+    size_bytes: Optional[int],
+    s3_client: "S3Client",
+    s3_executor: Executor,
+    metadata_cache: Optional[ObjectMetadataCache],
+    presigned_url_cache: PresignedUrlCache,
+) -> PresignedUploadResponse:
+    """Presign a single `PUT` URL, or a multipart URL set for files larger than one part."""
+    # the client writes to S3 behind our back, so forget what we knew about the object
+    if metadata_cache is not None:
+        metadata_cache.invalidate(settings.s3_bucket_name, file_path)
+
+    if size_bytes is None or size_bytes <= settings.s3_multipart_part_size_bytes:
+        presigned_url = generate_presigned_object_url(
+            "put_object",
+            bucket_name=settings.s3_bucket_name,
+            object_key=file_path,
+            expires_in=settings.presigned_url_expiration_seconds,
+            s3_client=s3_client,
+            presigned_url_cache=presigned_url_cache,
+        )
+        return PresignedUploadResponse(
+            file_path=file_path,
+            message=f"Upload the file to the presigned URL to store it at path: /{file_path}",
+            expires_at=presigned_url.expires_at,
+            upload_url=presigned_url.url,
+        )
+
+    multipart_upload = await run_in_s3_executor(
+        s3_executor,
+        create_presigned_multipart_upload,
+        bucket_name=settings.s3_bucket_name,
+        object_key=file_path,
+        size_bytes=size_bytes,
+        part_size=settings.s3_multipart_part_size_bytes,
+        content_type=mimetypes.guess_type(file_path)[0],
+        expires_in=settings.presigned_url_expiration_seconds,
+        s3_client=s3_client,
+    )
+    return PresignedUploadResponse(
+        file_path=file_path,
+        message=f"Upload the parts to the presigned URLs and complete the upload to store the file at path: /{file_path}",
+        expires_at=multipart_upload.expires_at,
+        multipart_upload=PresignedMultipartUploadUrls(
+            upload_id=multipart_upload.upload_id,
+            part_size_bytes=multipart_upload.part_size,
+            part_urls=multipart_upload.part_urls,
+            complete_url=multipart_upload.complete_url,
+            abort_url=multipart_upload.abort_url,
+        ),
+    )
+
+
+@ROUTER.post(
+    "/v1/files:batchUpload",
+    responses={
+        status.HTTP_200_OK: {
+            "description": "The outcome for each file. Failures of single files do not fail the request.",
+        },
+        status.HTTP_403_FORBIDDEN: INTERNAL_PATH_RESPONSE,
+        status.HTTP_422_UNPROCESSABLE_ENTITY: {
+            "description": "`file_paths` was sent but does not have one path per file.",
+        },
+    },
+)
+async def batch_upload_files(
+    request: Request,
+    files: list[UploadFile],
+    s3_client: Annotated["S3Client", Depends(get_s3_client)],
+    s3_executor: Annotated[Executor, Depends(get_s3_executor)],
+    metadata_cache: Annotated[
+        Optional[ObjectMetadataCache], Depends(get_metadata_cache)
+    ],
+    file_paths: Annotated[
+        Optional[list[str]],
+        Form(
+            description=(
+                "The path to store each file at, in the order of `files`. "
+                "Defaults to each part's filename."
+            )
+        ),
+    ] = None,
+) -> BatchUploadFilesResponse:
+    """Upload many files with one request, storing them in S3 concurrently."""
+    settings: Settings = request.app.state.settings
+    if file_paths is None:
+        file_paths = [file.filename or "" for file in files]
+    if len(file_paths) != len(files) or not all(file_paths):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Send one non-empty path per file, either in `file_paths` or as the files' filenames",
+        )
+    for file_path in file_paths:
+        reject_internal_path(settings, file_path)
+
+    slots = asyncio.Semaphore(settings.s3_batch_upload_max_concurrency)
+
+    async def upload_one_file(
+        file_path: str, file: UploadFile
+    ) -> BatchUploadFileResult:
+        async with slots:
+            return await upload_file_of_batch(
+                settings=settings,
+                file_path=file_path,
+                file=file,
+                s3_client=s3_client,
+                s3_executor=s3_executor,
+                metadata_cache=metadata_cache,
+            )
+
+    results = await asyncio.gather(
+        *(
+            upload_one_file(file_path, file)
+            for file_path, file in zip(file_paths, files)
+        )
+    )
+    return BatchUploadFilesResponse(files=list(results))
+
+
+async def upload_file_of_batch(
+    settings: Settings,
+    file_path: str,
+    file: UploadFile,
+    s3_client: "S3Client",
+    s3_executor: Executor,
+    metadata_cache: Optional[ObjectMetadataCache],
+) -> BatchUploadFileResult:
+    """Upload one file of a batch, turning S3 errors into a `failed` result."""
+    try:
+        object_exists = await object_exists_in_s3_async(
+            bucket_name=settings.s3_bucket_name,
+            object_key=file_path,
+            s3_client=s3_client,
+            executor=s3_executor,
+            metadata_cache=metadata_cache,
+        )
+        await store_upload_file(
+            settings=settings,
+            file_path=file_path,
+            file=file,
+            s3_client=s3_client,
+            s3_executor=s3_executor,
+            metadata_cache=metadata_cache,
+        )
+    except (ClientError, BotoCoreError) as e:
+        logger.opt(exception=e).error(
+            "Failed to upload file to path: {file_path}", file_path=file_path
+        )
+        return BatchUploadFileResult(
+            file_path=file_path,
+            message=f"Failed to upload file to path: /{file_path}",
+            status=UploadStatus.FAILED,
+        )
+
+    if object_exists:
+        return BatchUploadFileResult(
+            file_path=file_path,
+            message=f"File already exists at path: /{file_path}",
+            status=UploadStatus.OVERWRITTEN,
+        )
+    return BatchUploadFileResult(
+        file_path=file_path,
+        message=f"File uploaded successfully to path: /{file_path}",
+        status=UploadStatus.CREATED,
+    )
+
+
+def get_internal_prefixes(settings: Settings) -> list[str]:
+    """
+    Return the prefixes of the objects the API stores for itself, which clients must not write or delete.
+
+    Content-addressed blobs are shared by every file with the same digest, cached generations
+    are copied to the paths of other requests, and job records report the outcome of jobs.
+    The prefixes are reserved even while their feature is disabled: objects seeded before it
+    is enabled would be trusted as is.
+    """
+    return [
+        settings.content_addressed_blob_prefix,
+        settings.generation_cache_prefix,
+        settings.jobs_prefix,
+    ]
+
+
+def is_under_prefixes(path: str, prefixes: list[str], is_directory: bool) -> bool:
+    """Check if a path is inside one of the prefixes or, for a directory, holds one."""
+    return any(
+        path.startswith(prefix) or (is_directory and prefix.startswith(path))
+        for prefix in prefixes
+    )
+
+
+def is_hidden_from_listings(
+    settings: Settings, path: str, is_directory: bool = False
+) -> bool:
+    """
+    Check if a listed file is a content-addressed blob, cached generation or job record, which are not files of their own.
+
+    A directory is hidden if it is inside one of their prefixes, or holds one, e.g. `.generations/`
+    for `.generations/sha256/`. A file is only hidden if it is inside one.
+    """
+    return is_under_prefixes(path, get_internal_prefixes(settings), is_directory)
+
+
+def reject_internal_path(
+    settings: Settings, path: str, is_directory: bool = False
+) -> None:
+    """
+    Fail with 403 if a request would write or delete the API's internal objects.
+
+    Args:
+        settings (Settings): Settings holding the internal prefixes.
+        path (str): The file written or deleted, or the directory files are written to.
+        is_directory (bool, optional): Reject directories holding an internal prefix too, since
+            the files written to them may land inside it.
+
+    Raises:
+        HTTPException: 403 if the path is reserved.
+    """
+    if is_under_prefixes(path, get_internal_prefixes(settings), is_directory):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"The path {path} is reserved for internal use",
+        )
+
+
+def reject_hidden_file(settings: Settings, file_path: str) -> None:
+    """Fail with 404 if a file is one of the API's internal objects, e.g. a job record holding a webhook URL."""
+    if is_hidden_from_listings(settings, file_path):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="File not found"
+        )
+
+
 @ROUTER.get("/v1/files")
 async def list_files(
     request: Request,
+    s3_client: Annotated["S3Client", Depends(get_s3_client)],
+    s3_executor: Annotated[Executor, Depends(get_s3_executor)],
+    metadata_cache: Annotated[
+        Optional[ObjectMetadataCache], Depends(get_metadata_cache)
+    ],
     query_params: GetFilesQueryParams = Depends(),  # noqa: B008
 ) -> GetFilesResponse:
-    """List files with pagination."""
+    """
+    List files with pagination.
+
+    With `shallow=true` only the direct children of `directory` are listed, using S3's
+    `Delimiter`: files in the directory and one entry per sub-directory in `directories`.
+    The `next_page_token` continues the listing with the same directory, page size and mode.
+    """
     settings: Settings = request.app.state.settings
     if query_params.page_token:
-        files, next_page_token = fetch_s3_objects_using_page_token(
-            bucket_name=settings.s3_bucket_name,
-            continuation_token=query_params.page_token,
-            max_keys=query_params.page_size,
-        )
+        page_token = decode_page_token(query_params.page_token)
     else:
-        files, next_page_token = fetch_s3_objects_metadata(
-            bucket_name=settings.s3_bucket_name,
-            prefix=query_params.directory,
-            max_keys=query_params.page_size,
+        page_token = FilesPageToken(
+            continuation_token="",
+            directory=query_params.prefix,
+            page_size=query_params.page_size,
+            shallow=bool(query_params.shallow),
         )
+    page = await fetch_s3_objects_page_async(
+        bucket_name=settings.s3_bucket_name,
+        prefix=page_token.directory,
+        delimiter=DIRECTORY_DELIMITER if page_token.shallow else None,
+        continuation_token=page_token.continuation_token or None,
+        max_keys=page_token.page_size or query_params.page_size,
+        s3_client=s3_client,
+        executor=s3_executor,
+        metadata_cache=metadata_cache,
+    )
 
     logger.debug("query_params: {query_params}", query_params=query_params)
     file_metadata_objs = [
@@ -112,18 +807,260 @@ async def list_files(
             last_modified=item["LastModified"],
             size_bytes=item["Size"],
         )
-        for item in files
+        for item in page.files
+        if not is_hidden_from_listings(settings, item["Key"])
     ]
     logger.debug(
         "file_metadata_objs: {file_metadata_objs}",
         file_metadata_objs=file_metadata_objs,
     )
+    next_page_token = None
+    if page.next_continuation_token:
+        next_page_token = encode_page_token(
+            page_token._replace(continuation_token=page.next_continuation_token)
+        )
     return GetFilesResponse(
         files=file_metadata_objs,
-        next_page_token=next_page_token if next_page_token else None,
+        directories=[
+            directory
+            for directory in page.directories
+            if not is_hidden_from_listings(settings, directory, is_directory=True)
+        ],
+        next_page_token=next_page_token,
+    )
+
+
+@ROUTER.get(
+    "/v1/files:export",
+    responses={
+        status.HTTP_200_OK: {
+            "description": (
+                "The metadata of every file as newline-delimited JSON, in lexicographic order of the paths."
+            ),
+            "content": {
+                "application/x-ndjson": {
+                    "schema": FileMetadata.model_json_schema(),
+                },
+            },
+        },
+    },
+)
+async def export_files(
+    request: Request,
+    s3_client: Annotated["S3Client", Depends(get_s3_client)],
+    s3_executor: Annotated[Executor, Depends(get_s3_executor)],
+    query_params: ExportFilesQueryParams = Depends(),  # noqa: B008
+) -> StreamingResponse:
+    """
+    Stream the metadata of all files in one response instead of paging through `GET /v1/files`.
+
+    S3 is listed 1,000 files at a time, in several key ranges at once for large directories,
+    and pages are fetched while earlier ones are sent, so memory use does not grow with the
+    number of files.
+    """
+    settings: Settings = request.app.state.settings
+
+    async def iter_lines() -> AsyncIterator[str]:
+        async for page in iter_s3_object_pages_async(
+            settings.s3_bucket_name,
+            prefix=query_params.directory,
+            s3_client=s3_client,
+            executor=s3_executor,
+            max_concurrency=settings.s3_listing_max_concurrency,
+        ):
+            # one chunk per page instead of per file keeps the number of socket writes low
+            yield "".join(
+                FileMetadata(
+                    file_path=item["Key"],
+                    last_modified=item["LastModified"],
+                    size_bytes=item["Size"],
+                ).model_dump_json()
+                + "\n"
+                for item in page
+                if not is_hidden_from_listings(settings, item["Key"])
+            )
+
+    return StreamingResponse(content=iter_lines(), media_type="application/x-ndjson")
+
+
+@ROUTER.get(
+    "/v1/files:archive",
+    responses={
+        status.HTTP_200_OK: {
+            "description": (
+                "Every file of the directory in one archive, in lexicographic order of the paths, "
+                "streamed while it is built."
+            ),
+            "content": {
+                "application/zip": {
+                    "schema": {"type": "string", "format": "binary"},
+                },
+                "application/x-tar": {
+                    "schema": {"type": "string", "format": "binary"},
+                },
+            },
+        },
+    },
+)
+async def archive_files(
+    request: Request,
+    s3_client: Annotated["S3Client", Depends(get_s3_client)],
+    s3_executor: Annotated[Executor, Depends(get_s3_executor)],
+    query_params: ArchiveFilesQueryParams = Depends(),  # noqa: B008
+) -> StreamingResponse:
+    """
+    Download every file of a directory as one ZIP or TAR archive instead of one request per file.
+
+    The archive is built while it is sent: upcoming files are fetched from S3 while earlier
+    ones are written, and nothing is buffered beyond a bounded window of files, so it
+    starts at once and memory use does not grow with the size of the directory.
+    Compressed files are archived decoded, except files uploaded with a `Content-Encoding` their
+    content is not valid in, which are archived as stored.
+    """
+    settings: Settings = request.app.state.settings
+
+    async def iter_sources() -> AsyncIterator["ObjectTypeDef"]:
+        async for s3_object in iter_s3_objects_async(
+            settings.s3_bucket_name,
+            prefix=query_params.directory,
+            s3_client=s3_client,
+            executor=s3_executor,
+            max_concurrency=settings.s3_listing_max_concurrency,
+        ):
+            # keys ending with the delimiter are directory markers, not files
+            if not s3_object["Key"].endswith(
+                DIRECTORY_DELIMITER
+            ) and not is_hidden_from_listings(settings, s3_object["Key"]):
+                yield s3_object
+
+    async def fetch_entry(
+        s3_object: "ObjectTypeDef",
+    ) -> Optional[tuple[ArchiveEntry, StreamingBody]]:
+        return await fetch_archive_entry(
+            settings,
+            s3_object,
+            name=s3_object["Key"].removeprefix(query_params.directory),
+            s3_client=s3_client,
+            s3_executor=s3_executor,
+        )
+
+    async def iter_entries() -> AsyncIterator[ArchiveEntry]:
+        async for fetched in iter_prefetched_async(
+            iter_sources(),
+            fetch_entry,
+            window=settings.s3_archive_prefetch_window,
+            discard=lambda fetched: fetched[1].close() if fetched else None,
+        ):
+            if fetched is not None:
+                yield fetched[0]
+
+    archive_name = PurePosixPath(query_params.directory).name or settings.s3_bucket_name
+    if query_params.format is ArchiveFormat.ZIP:
+        content, media_type = iter_zip_archive_async(iter_entries()), "application/zip"
+    else:
+        content, media_type = (
+            iter_tar_archive_async(iter_entries()),
+            "application/x-tar",
+        )
+    return StreamingResponse(
+        content=content,
+        media_type=media_type,
+        headers={
+            "Content-Disposition": (
+                f"attachment; filename*=UTF-8''{quote(archive_name)}.{query_params.format.value}"
+            ),
+        },
     )
 
 
+async def fetch_archive_entry(
+    settings: Settings,
+    s3_object: "ObjectTypeDef",
+    name: str,
+    s3_client: "S3Client",
+    s3_executor: Executor,
+) -> Optional[tuple[ArchiveEntry, StreamingBody]]:
+    """
+    Fetch a listed file for an archive, following content-addressed pointers to their blob.
+
+    Files that fit into one download chunk are read in full right away. Larger files are
+    only opened, and their body is streamed once the entry is written.
+
+    Args:
+        settings (Settings): Application settings.
+        s3_object (ObjectTypeDef): The file as listed by `list_objects_v2`.
+        name (str): Name of the entry in the archive.
+        s3_client (S3Client): S3 client.
+        s3_executor (Executor): Executor running the blocking S3 calls.
+
+    Returns:
+        Optional[tuple[ArchiveEntry, StreamingBody]]: The entry and the body it reads from, which must be closed
+            if the entry is not written. None if the file was deleted since it was listed.
+    """
+    get_object_response = await fetch_s3_object_if_exists_async(
+        settings.s3_bucket_name,
+        object_key=s3_object["Key"],
+        s3_client=s3_client,
+        executor=s3_executor,
+    )
+    content_address = get_content_address(settings, get_object_response)
+    if content_address is not None:
+        get_object_response["Body"].close()  # type: ignore[index]
+        get_object_response = await fetch_s3_object_if_exists_async(
+            settings.s3_bucket_name,
+            object_key=content_address.blob_key(settings.content_addressed_blob_prefix),
+            s3_client=s3_client,
+            executor=s3_executor,
+        )
+    if get_object_response is None:
+        logger.warning(
+            "Skipping {file_path} in an archive, it was deleted since it was listed",
+            file_path=s3_object["Key"],
+        )
+        return None
+
+    body = get_object_response["Body"]
+    size_bytes = get_object_response["ContentLength"]
+    chunks: AsyncIterable[bytes]
+    if size_bytes <= settings.s3_download_chunk_size_bytes:
+        try:
+            content = await run_in_s3_executor(s3_executor, body.read)
+        finally:
+            # also when the fetch is cancelled mid-read, a read running on the executor finishes on its own
+            body.close()
+
+        async def iter_content() -> AsyncIterator[bytes]:
+            yield content
+
+        chunks = iter_content()
+    else:
+        chunks = iter_s3_body_async(
+            body,
+            chunk_size=settings.s3_download_chunk_size_bytes,
+            read_ahead_chunks=settings.s3_download_read_ahead_chunks,
+            executor=s3_executor,
+        )
+
+    content_encoding = get_stored_content_encoding(get_object_response)
+    uncompressed_length = get_uncompressed_length(get_object_response)
+    # TAR headers need the size up front, so files whose decoded size was not recorded, i.e. ones uploaded
+    # already encoded but not decodable, are archived as stored
+    if content_encoding is not None and uncompressed_length is not None:
+        chunks = decompress_chunks_async(
+            chunks,
+            content_encoding,
+            max_chunk_size=settings.s3_download_chunk_size_bytes,
+        )
+        size_bytes = uncompressed_length
+    entry = ArchiveEntry(
+        name=name,
+        size_bytes=size_bytes,
+        last_modified=s3_object["LastModified"],
+        chunks=chunks,
+    )
+    return entry, body
+
+
 @ROUTER.head(
     "/v1/files/{file_path:path}",
     responses={
@@ -147,19 +1084,41 @@ async def list_files(
                     "example": "Thu, 01 Jan 2022 00:00:00 GMT",
                     "schema": {"type": "string", "format": "date-time"},
                 },
+                **VALIDATOR_RESPONSE_HEADERS,
             }
         },
+        status.HTTP_304_NOT_MODIFIED: NOT_MODIFIED_RESPONSE,
     },
 )
 async def get_file_metadata(
-    request: Request, file_path: str, response: Response
+    request: Request,
+    file_path: str,
+    response: Response,
+    s3_client: Annotated["S3Client", Depends(get_s3_client)],
+    s3_executor: Annotated[Executor, Depends(get_s3_executor)],
+    metadata_cache: Annotated[
+        Optional[ObjectMetadataCache], Depends(get_metadata_cache)
+    ],
+    coalesced_reads: Annotated[
+        Optional[CoalescedS3Reads], Depends(get_coalesced_reads)
+    ],
 ) -> Response:
     """Retrieve file metadata."""
     settings: Settings = request.app.state.settings
-    object_exists = object_exists_in_s3(
-        bucket_name=settings.s3_bucket_name, object_key=file_path
+    reject_hidden_file(settings, file_path)
+    fetch_metadata = (
+        coalesced_reads.fetch_s3_object_metadata_async
+        if coalesced_reads is not None
+        else fetch_s3_object_metadata_async
+    )
+    head_object_response = await fetch_metadata(
+        bucket_name=settings.s3_bucket_name,
+        object_key=file_path,
+        s3_client=s3_client,
+        executor=s3_executor,
+        metadata_cache=metadata_cache,
     )
-    if not object_exists:
+    if head_object_response is None:
         logger.error(
             "File not found for the given `file_path`: {file_path}", file_path=file_path
         )
@@ -167,20 +1126,60 @@ async def get_file_metadata(
             status_code=status.HTTP_404_NOT_FOUND, detail="File not found"
         )
 
-    get_object_response = fetch_s3_object(settings.s3_bucket_name, object_key=file_path)
     logger.debug(
-        "get_object_response: {get_object_response}",
-        get_object_response=get_object_response,
+        "head_object_response: {head_object_response}",
+        head_object_response=head_object_response,
     )
-    response.headers["Content-Type"] = get_object_response["ContentType"]
-    response.headers["Content-Length"] = str(get_object_response["ContentLength"])
-    response.headers["Last-Modified"] = get_object_response["LastModified"].strftime(
-        "%a, %d %b %Y %H:%M:%S GMT"
+    etag = head_object_response["ETag"]
+    content_length: Optional[int] = head_object_response["ContentLength"]
+    content_address = get_content_address(settings, head_object_response)
+    if content_address is not None:
+        etag = content_address.etag
+        content_length = content_address.size_bytes
+    content_encoding = get_stored_content_encoding(head_object_response)
+    decode_content = should_decode_content(request, content_encoding)
+    if decode_content:
+        etag = get_decoded_etag(etag)
+        content_length = get_uncompressed_length(head_object_response)
+    validator_headers = get_validator_headers(
+        etag=etag,
+        last_modified=head_object_response["LastModified"],
+        cache_control=settings.cache_control_header,
     )
+    if is_not_modified(
+        parse_conditional_headers(request.headers),
+        etag=etag,
+        last_modified=head_object_response["LastModified"],
+    ):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers=validator_headers
+        )
+
+    response.headers["Content-Type"] = head_object_response["ContentType"]
+    if content_length is not None:
+        response.headers["Content-Length"] = str(content_length)
+    else:
+        del response.headers["Content-Length"]
+    response.headers.update(validator_headers)
+    if content_encoding is not None:
+        response.headers["Vary"] = "Accept-Encoding"
+    # ranges are served from the stored bytes, so decoded content cannot be requested in ranges
+    if not decode_content:
+        if content_encoding is not None:
+            response.headers["Content-Encoding"] = content_encoding
+        response.headers["Accept-Ranges"] = "bytes"
     response.status_code = status.HTTP_200_OK
     return response
 
 
+def get_uncompressed_length(s3_object: Mapping) -> Optional[int]:
+    """Return the size of a compressed object's decoded content, if it was recorded on upload."""
+    uncompressed_length = (s3_object.get("Metadata") or {}).get(
+        UNCOMPRESSED_LENGTH_METADATA_KEY
+    )
+    return int(uncompressed_length) if uncompressed_length is not None else None
+
+
 @ROUTER.get(
     "/v1/files/{file_path:path}",
     responses={
@@ -189,35 +1188,552 @@ async def get_file_metadata(
         },
         status.HTTP_200_OK: {
             "description": "The file content.",
+            "headers": VALIDATOR_RESPONSE_HEADERS,
+            "content": {
+                "application/octet-stream": {
+                    "schema": {"type": "string", "format": "binary"},
+                },
+            },
+        },
+        status.HTTP_206_PARTIAL_CONTENT: {
+            "description": (
+                "The byte ranges requested with the `Range` header. A single range is returned as is, "
+                "multiple ranges as a `multipart/byteranges` body."
+            ),
             "content": {
                 "application/octet-stream": {
                     "schema": {"type": "string", "format": "binary"},
                 },
+                "multipart/byteranges": {
+                    "schema": {"type": "string", "format": "binary"},
+                },
             },
         },
+        status.HTTP_304_NOT_MODIFIED: NOT_MODIFIED_RESPONSE,
+        status.HTTP_307_TEMPORARY_REDIRECT: {
+            "description": "Download the file from the presigned S3 URL in the `Location` header.",
+        },
+        status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE: {
+            "description": "None of the requested byte ranges overlap the file.",
+        },
     },
 )
 async def get_file(
     request: Request,
     file_path: str,
-) -> StreamingResponse:
-    """Retrieve a file."""
+    s3_client: Annotated["S3Client", Depends(get_s3_client)],
+    s3_executor: Annotated[Executor, Depends(get_s3_executor)],
+    metadata_cache: Annotated[
+        Optional[ObjectMetadataCache], Depends(get_metadata_cache)
+    ],
+    presigned_url_cache: Annotated[PresignedUrlCache, Depends(get_presigned_url_cache)],
+    coalesced_reads: Annotated[
+        Optional[CoalescedS3Reads], Depends(get_coalesced_reads)
+    ],
+    query_params: GetFileQueryParams = Depends(),  # noqa: B008
+) -> Response:
+    """Retrieve a file, or a redirect to download it directly from S3."""
     settings: Settings = request.app.state.settings
-    object_exists = object_exists_in_s3(
-        bucket_name=settings.s3_bucket_name, object_key=file_path
+    reject_hidden_file(settings, file_path)
+    conditional_headers = parse_conditional_headers(request.headers)
+    cached_metadata = (
+        metadata_cache.lookup(settings.s3_bucket_name, file_path)[1]
+        if metadata_cache is not None
+        else None
     )
+    # True while the file may turn out to be a pointer to a content-addressed blob
+    maybe_pointer = False
+    if settings.content_addressed_storage_enabled:
+        if cached_metadata is not None and cached_metadata.content_type is None:
+            # listed objects are cached without their user metadata, so they may be pointers
+            cached_metadata = None
+        pointer: Optional["HeadObjectOutputTypeDef"] = (
+            cached_metadata.to_head_object_response()  # type: ignore[assignment]
+            if cached_metadata is not None
+            else None
+        )
+        # ranges and redirects must refer to the blob; plain downloads learn of a pointer from the GET below
+        if pointer is None and (
+            request.headers.get("Range")
+            or should_use_presigned_urls(settings, query_params.redirect, None)
+        ):
+            fetch_metadata = (
+                coalesced_reads.fetch_s3_object_metadata_async
+                if coalesced_reads is not None
+                else fetch_s3_object_metadata_async
+            )
+            pointer = await fetch_metadata(
+                bucket_name=settings.s3_bucket_name,
+                object_key=file_path,
+                s3_client=s3_client,
+                executor=s3_executor,
+                metadata_cache=metadata_cache,
+            )
+            if pointer is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND, detail="File not found"
+                )
+        content_address = get_content_address(settings, pointer)
+        if content_address is not None:
+            return await get_content_addressed_file(
+                request,
+                settings=settings,
+                pointer=pointer,  # type: ignore[arg-type]
+                content_address=content_address,
+                redirect=query_params.redirect,
+                s3_client=s3_client,
+                s3_executor=s3_executor,
+                presigned_url_cache=presigned_url_cache,
+            )
+        # files stored before content addressing was enabled are served as they are
+        maybe_pointer = pointer is None
+    if cached_metadata is not None and is_not_modified(
+        conditional_headers,
+        etag=cached_metadata.etag,
+        last_modified=cached_metadata.last_modified,
+    ):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers=get_validator_headers(
+                etag=get_representation_etag(
+                    request,
+                    cached_metadata.etag,
+                    get_stored_content_encoding(
+                        cached_metadata.to_head_object_response()
+                    ),
+                ),
+                last_modified=cached_metadata.last_modified,
+                cache_control=settings.cache_control_header,
+            ),
+        )
+    if should_use_presigned_urls(
+        settings,
+        query_params.redirect,
+        size_bytes=cached_metadata.content_length if cached_metadata else None,
+    ):
+        return redirect_to_presigned_url(
+            settings, file_path, s3_client, presigned_url_cache
+        )
+
+    byte_ranges = parse_range_header(request.headers.get("Range"))
+    if byte_ranges:
+        partial_response = await get_partial_file(
+            request,
+            settings=settings,
+            file_path=file_path,
+            byte_ranges=byte_ranges,
+            conditional_headers=conditional_headers,
+            s3_client=s3_client,
+            s3_executor=s3_executor,
+        )
+        if partial_response is not None:
+            return partial_response
 
-    if not object_exists:
+    fetch_s3_object_kwargs = dict(
+        bucket_name=settings.s3_bucket_name,
+        object_key=file_path,
+        s3_client=s3_client,
+        executor=s3_executor,
+        metadata_cache=metadata_cache,
+        # a pointer's own validators are not the file's, so its conditions are checked once it is resolved
+        if_none_match=conditional_headers.s3_if_none_match()
+        if conditional_headers and not maybe_pointer
+        else None,
+        if_modified_since=conditional_headers.s3_if_modified_since()
+        if conditional_headers and not maybe_pointer
+        else None,
+    )
+    try:
+        get_object_response = (
+            await coalesced_reads.fetch_s3_object_if_exists_async(
+                **fetch_s3_object_kwargs,  # type: ignore[arg-type]
+                size_bytes=cached_metadata.content_length if cached_metadata else None,
+            )
+            if coalesced_reads is not None
+            else await fetch_s3_object_if_exists_async(**fetch_s3_object_kwargs)  # type: ignore[arg-type]
+        )
+    except ClientError as e:
+        if not is_not_modified_error(e):
+            raise
+        s3_response_headers = e.response["ResponseMetadata"]["HTTPHeaders"]
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers=get_validator_headers(
+                etag=s3_response_headers["etag"],
+                last_modified=s3_response_headers["last-modified"],
+                cache_control=settings.cache_control_header,
+            ),
+        )
+
+    if get_object_response is None:
         logger.error(
             "File not found for the given `file_path`: {file_path}", file_path=file_path
         )
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="File not found"
         )
-    get_object_response = fetch_s3_object(settings.s3_bucket_name, object_key=file_path)
+    content_address = (
+        get_content_address(settings, get_object_response) if maybe_pointer else None
+    )
+    if content_address is not None:
+        get_object_response["Body"].close()
+        return await get_content_addressed_file(
+            request,
+            settings=settings,
+            pointer=get_object_response,
+            content_address=content_address,
+            redirect=query_params.redirect,
+            s3_client=s3_client,
+            s3_executor=s3_executor,
+            presigned_url_cache=presigned_url_cache,
+        )
+
+    if query_params.redirect is None and exceeds_presigned_url_size_threshold(
+        settings, get_object_response["ContentLength"]
+    ):
+        # the size was not cached, so it is only known now
+        get_object_response["Body"].close()
+        return redirect_to_presigned_url(
+            settings, file_path, s3_client, presigned_url_cache
+        )
+
+    validator_headers = get_validator_headers(
+        etag=get_representation_etag(
+            request,
+            get_object_response["ETag"],
+            get_stored_content_encoding(get_object_response),
+        ),
+        last_modified=get_object_response["LastModified"],
+        cache_control=settings.cache_control_header,
+    )
+    # S3 only evaluates a single entity tag, so lists of tags are checked here
+    if is_not_modified(
+        conditional_headers,
+        etag=get_object_response["ETag"],
+        last_modified=get_object_response["LastModified"],
+    ):
+        get_object_response["Body"].close()
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers=validator_headers
+        )
+    return stream_s3_object(
+        request,
+        get_object_response,
+        settings=settings,
+        file_path=file_path,
+        s3_client=s3_client,
+        s3_executor=s3_executor,
+        validator_headers=validator_headers,
+    )
+
+
+def stream_s3_object(
+    request: Request,
+    get_object_response: "GetObjectOutputTypeDef",
+    settings: Settings,
+    file_path: str,
+    s3_client: "S3Client",
+    s3_executor: Executor,
+    validator_headers: dict[str, str],
+) -> StreamingResponse:
+    """Stream a fetched file as stored, or decoded for clients that do not accept the encoding it is stored in."""
+    content_encoding = get_stored_content_encoding(get_object_response)
+    headers = {"Accept-Ranges": "bytes", **validator_headers}
+    if content_encoding is not None:
+        headers["Vary"] = "Accept-Encoding"
+        if should_decode_content(request, content_encoding):
+            return stream_decoded_s3_object_body(
+                get_object_response,
+                content_encoding=content_encoding,
+                settings=settings,
+                s3_executor=s3_executor,
+                headers={**validator_headers, "Vary": "Accept-Encoding"},
+            )
+        headers["Content-Encoding"] = content_encoding
+    threshold = settings.s3_parallel_download_threshold_bytes
+    if threshold is not None and get_object_response["ContentLength"] > threshold:
+        return stream_s3_object_in_parallel(
+            get_object_response,
+            settings=settings,
+            file_path=file_path,
+            s3_client=s3_client,
+            s3_executor=s3_executor,
+            headers=headers,
+        )
+    return stream_s3_object_body(
+        get_object_response["Body"],
+        settings=settings,
+        s3_executor=s3_executor,
+        media_type=get_object_response["ContentType"],
+        headers=headers,
+    )
+
+
+def stream_decoded_s3_object_body(
+    get_object_response: "GetObjectOutputTypeDef",
+    content_encoding: str,
+    settings: Settings,
+    s3_executor: Executor,
+    headers: dict[str, str],
+) -> StreamingResponse:
+    """Stream a compressed file's body to the client, decoding it on the fly."""
+    body = get_object_response["Body"]
+    uncompressed_length = get_uncompressed_length(get_object_response)
+    if uncompressed_length is not None:
+        headers = {"Content-Length": str(uncompressed_length), **headers}
     return StreamingResponse(
-        content=get_object_response["Body"],
+        content=decompress_chunks_async(
+            iter_s3_body_async(
+                body,
+                chunk_size=settings.s3_download_chunk_size_bytes,
+                read_ahead_chunks=settings.s3_download_read_ahead_chunks,
+                executor=s3_executor,
+            ),
+            content_encoding,
+            max_chunk_size=settings.s3_download_chunk_size_bytes,
+        ),
+        background=BackgroundTask(body.close),
         media_type=get_object_response["ContentType"],
+        headers=headers,
+    )
+
+
+def get_content_address(
+    settings: Settings, head_object_response: Optional[Mapping]
+) -> Optional[ContentAddress]:
+    """Return the blob a file's pointer object refers to, or None if the file is not content-addressed."""
+    if not settings.content_addressed_storage_enabled or head_object_response is None:
+        return None
+    return ContentAddress.from_metadata(head_object_response.get("Metadata") or {})
+
+
+async def get_content_addressed_file(
+    request: Request,
+    settings: Settings,
+    pointer: "HeadObjectOutputTypeDef | GetObjectOutputTypeDef",
+    content_address: ContentAddress,
+    redirect: Optional[bool],
+    s3_client: "S3Client",
+    s3_executor: Executor,
+    presigned_url_cache: PresignedUrlCache,
+) -> Response:
+    """Serve a file from the blob its pointer refers to, with the content digest as the ETag."""
+    validator_headers = get_validator_headers(
+        etag=content_address.etag,
+        last_modified=pointer["LastModified"],
+        cache_control=settings.cache_control_header,
+    )
+    conditional_headers = parse_conditional_headers(request.headers)
+    # the digest identifies the content, so revalidation needs no request for the blob
+    if is_not_modified(
+        conditional_headers,
+        etag=content_address.etag,
+        last_modified=pointer["LastModified"],
+    ):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers=validator_headers
+        )
+
+    blob_key = content_address.blob_key(settings.content_addressed_blob_prefix)
+    if should_use_presigned_urls(settings, redirect, content_address.size_bytes):
+        return redirect_to_presigned_url(
+            settings, blob_key, s3_client, presigned_url_cache
+        )
+
+    byte_ranges = parse_range_header(request.headers.get("Range"))
+    if byte_ranges:
+        partial_response = await get_partial_file(
+            request,
+            settings=settings,
+            file_path=blob_key,
+            byte_ranges=byte_ranges,
+            conditional_headers=None,
+            s3_client=s3_client,
+            s3_executor=s3_executor,
+        )
+        if partial_response is not None:
+            partial_response.headers.update(validator_headers)
+            return partial_response
+
+    get_object_response = await fetch_s3_object_if_exists_async(
+        settings.s3_bucket_name,
+        object_key=blob_key,
+        s3_client=s3_client,
+        executor=s3_executor,
+    )
+    if get_object_response is None:
+        logger.error("Blob {blob_key} of a pointer is missing", blob_key=blob_key)
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="File not found"
+        )
+    # the blob keeps the content type of its first upload, the pointer the one of this path
+    get_object_response["ContentType"] = pointer["ContentType"]
+    return stream_s3_object(
+        request,
+        get_object_response,
+        settings=settings,
+        file_path=blob_key,
+        s3_client=s3_client,
+        s3_executor=s3_executor,
+        validator_headers=validator_headers,
+    )
+
+
+def stream_s3_object_in_parallel(
+    get_object_response: "GetObjectOutputTypeDef",
+    settings: Settings,
+    file_path: str,
+    s3_client: "S3Client",
+    s3_executor: Executor,
+    headers: dict[str, str],
+) -> StreamingResponse:
+    """Stream a large file as concurrent byte-range GETs, reading the first range from the GET already made."""
+    body = get_object_response["Body"]
+    return StreamingResponse(
+        content=iter_s3_object_in_parallel_async(
+            settings.s3_bucket_name,
+            object_key=file_path,
+            object_size=get_object_response["ContentLength"],
+            etag=get_object_response["ETag"],
+            first_body=body,
+            part_size=settings.s3_parallel_download_part_size_bytes,
+            max_concurrency=settings.s3_parallel_download_max_concurrency,
+            max_attempts=settings.s3_parallel_download_max_attempts,
+            s3_client=s3_client,
+            executor=s3_executor,
+        ),
+        background=BackgroundTask(body.close),
+        media_type=get_object_response["ContentType"],
+        headers={
+            "Content-Length": str(get_object_response["ContentLength"]),
+            **headers,
+        },
+    )
+
+
+async def get_partial_file(
+    request: Request,
+    settings: Settings,
+    file_path: str,
+    byte_ranges: list[ByteRange],
+    conditional_headers: Optional[ConditionalHeaders],
+    s3_client: "S3Client",
+    s3_executor: Executor,
+) -> Optional[Response]:
+    """
+    Serve the requested byte ranges of a file as `206 Partial Content`, fetching each range from S3.
+
+    Ranges of compressed files refer to the stored bytes. They are only served to clients accepting
+    the encoding, and only one at a time, since the parts of a `multipart/byteranges` body cannot
+    carry a `Content-Encoding`. Otherwise None is returned and the whole file should be sent instead,
+    which the spec allows for any `Range` request.
+    """
+    results = await asyncio.gather(
+        *(
+            fetch_s3_object_async(
+                settings.s3_bucket_name,
+                object_key=file_path,
+                s3_client=s3_client,
+                executor=s3_executor,
+                byte_range=byte_range.to_range_header(),
+            )
+            for byte_range in byte_ranges
+        ),
+        return_exceptions=True,
+    )
+    get_object_responses = [
+        result for result in results if not isinstance(result, BaseException)
+    ]
+    errors = [result for result in results if isinstance(result, BaseException)]
+
+    for error in errors:
+        if (
+            isinstance(error, ClientError)
+            and error.response["Error"]["Code"] == "InvalidRange"
+        ):
+            continue
+        for get_object_response in get_object_responses:
+            get_object_response["Body"].close()
+        if isinstance(error, ClientError) and is_not_found_error(error):
+            logger.error(
+                "File not found for the given `file_path`: {file_path}",
+                file_path=file_path,
+            )
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="File not found"
+            )
+        raise error
+
+    if not get_object_responses:
+        object_size = errors[0].response["Error"].get("ActualObjectSize", "*")  # type: ignore[attr-defined]
+        raise HTTPException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{object_size}"},
+        )
+
+    content_encoding = get_stored_content_encoding(get_object_responses[0])
+    if content_encoding is not None and (
+        len(get_object_responses) > 1
+        or should_decode_content(request, content_encoding)
+    ):
+        for get_object_response in get_object_responses:
+            get_object_response["Body"].close()
+        return None
+
+    validator_headers = get_validator_headers(
+        etag=get_object_responses[0]["ETag"],
+        last_modified=get_object_responses[0]["LastModified"],
+        cache_control=settings.cache_control_header,
+    )
+    if is_not_modified(
+        conditional_headers,
+        etag=get_object_responses[0]["ETag"],
+        last_modified=get_object_responses[0]["LastModified"],
+    ):
+        for get_object_response in get_object_responses:
+            get_object_response["Body"].close()
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers=validator_headers
+        )
+
+    if len(get_object_responses) == 1:
+        get_object_response = get_object_responses[0]
+        return stream_s3_object_body(
+            get_object_response["Body"],
+            settings=settings,
+            s3_executor=s3_executor,
+            status_code=status.HTTP_206_PARTIAL_CONTENT,
+            media_type=get_object_response["ContentType"],
+            headers={
+                "Accept-Ranges": "bytes",
+                "Content-Range": get_object_response["ContentRange"],
+                "Content-Length": str(get_object_response["ContentLength"]),
+                **validator_headers,
+                **(
+                    {"Content-Encoding": content_encoding, "Vary": "Accept-Encoding"}
+                    if content_encoding is not None
+                    else {}
+                ),
+            },
+        )
+
+    boundary = uuid4().hex
+    return StreamingResponse(
+        content=iter_multipart_byteranges(
+            parts=[
+                ByteRangePart(
+                    content_range=get_object_response["ContentRange"],
+                    body=get_object_response["Body"],
+                )
+                for get_object_response in get_object_responses
+            ],
+            content_type=get_object_responses[0]["ContentType"],
+            boundary=boundary,
+        ),
+        status_code=status.HTTP_206_PARTIAL_CONTENT,
+        media_type=f"multipart/byteranges; boundary={boundary}",
+        headers={"Accept-Ranges": "bytes", **validator_headers},
     )
 
 
@@ -230,125 +1746,320 @@ async def get_file(
         status.HTTP_204_NO_CONTENT: {
             "description": "File deleted successfully.",
         },
+        status.HTTP_403_FORBIDDEN: INTERNAL_PATH_RESPONSE,
     },
 )
 async def delete_file(
     request: Request,
     file_path: str,
     response: Response,
+    s3_client: Annotated["S3Client", Depends(get_s3_client)],
+    s3_executor: Annotated[Executor, Depends(get_s3_executor)],
+    metadata_cache: Annotated[
+        Optional[ObjectMetadataCache], Depends(get_metadata_cache)
+    ],
 ) -> Response:
     """Delete a file."""
     settings: Settings = request.app.state.settings
-    object_exists = object_exists_in_s3(
-        bucket_name=settings.s3_bucket_name, object_key=file_path
+    reject_internal_path(settings, file_path)
+    # S3's DeleteObject succeeds for missing keys too, so a HEAD is needed to answer 404
+    head_object_response = await fetch_s3_object_metadata_async(
+        bucket_name=settings.s3_bucket_name,
+        object_key=file_path,
+        s3_client=s3_client,
+        executor=s3_executor,
+        metadata_cache=metadata_cache,
     )
 
-    if not object_exists:
+    if head_object_response is None:
         logger.error(
             "File not found for the given `file_path`: {file_path}", file_path=file_path
         )
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="File not found"
         )
-    delete_s3_object(settings.s3_bucket_name, object_key=file_path)
+    await delete_s3_object_async(
+        settings.s3_bucket_name,
+        object_key=file_path,
+        s3_client=s3_client,
+        executor=s3_executor,
+        metadata_cache=metadata_cache,
+    )
     response.status_code = status.HTTP_204_NO_CONTENT
     return response
 
 
-@GENERATED_FILES_ROUTER.post(
-    "/v1/files/generated/{file_path:path}",
-    status_code=status.HTTP_201_CREATED,
-    summary="AI Generated Files",
+@ROUTER.post(
+    "/v1/files:batchDelete",
     responses={
-        status.HTTP_201_CREATED: {
-            "model": PutGeneratedFileResponse,
-            "description": "Successful Response",
+        status.HTTP_200_OK: {
+            "description": (
+                "The outcome for each file as newline-delimited JSON, streamed as the batches finish. "
+                "Files that did not exist count as deleted."
+            ),
             "content": {
-                "application/json": {
-                    "examples": {
-                        "text": PutGeneratedFileResponse.model_json_schema()[
-                            "examples"
-                        ][0],
-                        "image": PutGeneratedFileResponse.model_json_schema()[
-                            "examples"
-                        ][1],
-                        "text-to-speech": PutGeneratedFileResponse.model_json_schema()[
-                            "examples"
-                        ][2],
-                    },
+                "application/x-ndjson": {
+                    "schema": BatchDeleteFileResult.model_json_schema(),
                 },
             },
         },
+        status.HTTP_403_FORBIDDEN: INTERNAL_PATH_RESPONSE,
     },
 )
-async def generate_file_using_openai(
+async def batch_delete_files(
     request: Request,
-    response: Response,
-    query_params: Annotated[GenerateFilesQueryParams, Depends()],
-) -> PutGeneratedFileResponse:
-    """
-    Generate a File using AI.
-
-    Supported file types:
-    - **text**: `.txt`
-    - **image**: `.png`, `.jpg`, `.jpeg`
-    - **text-to-speech**: `.mp3`, `.opus`, `.aac`, `.flac`, `.wav`, `.pcm`
-
-    Note: the generated file type is derived from the file_path extension. So the file_path must have
-    an extension matching one of the supported file types in the list above.
-    """
+    body: BatchDeleteFilesRequest,
+    s3_client: Annotated["S3Client", Depends(get_s3_client)],
+    s3_executor: Annotated[Executor, Depends(get_s3_executor)],
+    metadata_cache: Annotated[
+        Optional[ObjectMetadataCache], Depends(get_metadata_cache)
+    ],
+) -> StreamingResponse:
+    """Delete a list of files, or every file in a directory, with up to 1,000 files per S3 request."""
     settings: Settings = request.app.state.settings
-    s3_bucket_name = settings.s3_bucket_name
-
-    # generate text
-    if query_params.file_type == GeneratedFileType.TEXT:
-        file_content = await get_text_chat_completion(prompt=query_params.prompt)
-        file_content_bytes: bytes = file_content.encode(
-            "utf-8"
-        )  # convert string to bytes
-        content_type = "text/plain"  # type: ignore
-
-    # generate/download an image
-    elif query_params.file_type == GeneratedFileType.IMAGE:
-        image_url = await generate_image(prompt=query_params.prompt)
-        async with httpx.AsyncClient() as client:
-            image_response = await client.get(image_url)
-        file_content_bytes = image_response.content
-        content_type = image_response.headers["Content-Type"]
-
-    # generate audio
+    object_keys: AsyncIterable[str] | list[str]
+    if body.file_paths is not None:
+        for file_path in body.file_paths:
+            reject_internal_path(settings, file_path)
+        object_keys = body.file_paths
     else:
-        response_audio_file_format = query_params.file_path.split(".")[
-            -1
-        ]  # the file extension
-        file_content_bytes, content_type = await generate_text_to_speech(
-            prompt=query_params.prompt,
-            response_format=response_audio_file_format,  # type: ignore
+        reject_internal_path(settings, body.directory or "")
+        object_keys = iter_directory_file_keys(
+            settings,
+            directory=body.directory or "",
+            s3_client=s3_client,
+            s3_executor=s3_executor,
         )
 
-    # try to guess the mimetype from the file path's extension if we don't already know it
-    content_type: str | None = (  # type: ignore
-        content_type or mimetypes.guess_type(query_params.file_path)[0]
+    async def iter_results() -> AsyncIterator[str]:
+        async for result in delete_s3_objects_in_batches_async(
+            settings.s3_bucket_name,
+            object_keys=object_keys,
+            max_concurrency=settings.s3_batch_delete_max_concurrency,
+            s3_client=s3_client,
+            executor=s3_executor,
+            metadata_cache=metadata_cache,
+        ):
+            yield (
+                BatchDeleteFileResult(
+                    file_path=result.object_key,
+                    deleted=result.deleted,
+                    error_code=result.error_code,
+                    error_message=result.error_message,
+                ).model_dump_json()
+                + "\n"
+            )
+
+    return StreamingResponse(content=iter_results(), media_type="application/x-ndjson")
+
+
+async def iter_directory_file_keys(
+    settings: Settings, directory: str, s3_client: "S3Client", s3_executor: Executor
+) -> AsyncIterator[str]:
+    """Yield the paths of the files in a directory, leaving out internal objects, e.g. the blobs under `.`."""
+    async for object_key in list_s3_object_keys_async(
+        settings.s3_bucket_name,
+        prefix=directory,
+        s3_client=s3_client,
+        executor=s3_executor,
+        max_concurrency=settings.s3_listing_max_concurrency,
+    ):
+        if not is_hidden_from_listings(settings, object_key):
+            yield object_key
+
+
+COPY_FILES_RESPONSES: dict[int | str, dict[str, Any]] = {
+    status.HTTP_200_OK: {
+        "description": (
+            "For `source_path`, the outcome as JSON. For `source_directory`, the outcome for each file "
+            "as newline-delimited JSON, streamed as the files finish."
+        ),
+        "content": {
+            "application/json": {
+                "schema": CopyFileResult.model_json_schema(),
+            },
+            "application/x-ndjson": {
+                "schema": CopyFileResult.model_json_schema(),
+            },
+        },
+    },
+    status.HTTP_403_FORBIDDEN: INTERNAL_PATH_RESPONSE,
+    status.HTTP_404_NOT_FOUND: {
+        "description": "File not found for the given `source_path`.",
+    },
+}
+
+
+@ROUTER.post("/v1/files:copy", responses=COPY_FILES_RESPONSES)
+async def copy_files(
+    request: Request,
+    body: CopyFilesRequest,
+    s3_client: Annotated["S3Client", Depends(get_s3_client)],
+    s3_executor: Annotated[Executor, Depends(get_s3_executor)],
+    metadata_cache: Annotated[
+        Optional[ObjectMetadataCache], Depends(get_metadata_cache)
+    ],
+) -> Response:
+    """
+    Copy a file, or every file in a directory, within S3 without downloading it.
+
+    Files of a directory are copied several at a time while the directory is still being listed.
+    """
+    return await transfer_files(
+        request,
+        body,
+        delete_sources=False,
+        s3_client=s3_client,
+        s3_executor=s3_executor,
+        metadata_cache=metadata_cache,
     )
-    logger.debug("content_type: {content_type}", content_type=content_type)
-    logger.debug("file_path: {file_path}", file_path=query_params.file_path)
 
-    # Upload the generated file to S3
-    upload_s3_object(
-        bucket_name=s3_bucket_name,
-        object_key=query_params.file_path,
-        file_content=file_content_bytes,
-        content_type=content_type,
+
+@ROUTER.post("/v1/files:move", responses=COPY_FILES_RESPONSES)
+async def move_files(
+    request: Request,
+    body: CopyFilesRequest,
+    s3_client: Annotated["S3Client", Depends(get_s3_client)],
+    s3_executor: Annotated[Executor, Depends(get_s3_executor)],
+    metadata_cache: Annotated[
+        Optional[ObjectMetadataCache], Depends(get_metadata_cache)
+    ],
+) -> Response:
+    """
+    Move, i.e. rename, a file or every file in a directory within S3 without downloading it.
+
+    S3 has no rename, so each file is copied and its source deleted once the copy succeeded.
+    A file that could not be copied keeps its source.
+    """
+    return await transfer_files(
+        request,
+        body,
+        delete_sources=True,
+        s3_client=s3_client,
+        s3_executor=s3_executor,
+        metadata_cache=metadata_cache,
     )
 
-    # return response
-    response.status_code = status.HTTP_201_CREATED
-    logger.info(
-        "New {file_type} file generated and uploaded at path: {file_path}",
-        file_type=query_params.file_type.value,
-        file_path=query_params.file_path,
+
+async def transfer_files(
+    request: Request,
+    body: CopyFilesRequest,
+    delete_sources: bool,
+    s3_client: "S3Client",
+    s3_executor: Executor,
+    metadata_cache: Optional[ObjectMetadataCache],
+) -> Response:
+    """
+    Copy or move the file or directory selected by the request body.
+
+    Args:
+        request (Request): The incoming request.
+        body (CopyFilesRequest): The source and destination.
+        delete_sources (bool): Delete each source once it was copied, i.e. move it.
+        s3_client (S3Client): S3 client.
+        s3_executor (Executor): Executor running the blocking S3 calls.
+        metadata_cache (Optional[ObjectMetadataCache]): Cache to update for the written and deleted files.
+
+    Returns:
+        Response: A `CopyFileResult` for a file, or a stream of them for a directory.
+    """
+    settings: Settings = request.app.state.settings
+    multipart_options = get_multipart_copy_options(settings)
+    reject_internal_path(
+        settings, body.destination_path, is_directory=body.source_directory is not None
     )
-    return PutGeneratedFileResponse(
-        file_path=query_params.file_path,
-        message=f"New {query_params.file_type.value} file generated and uploaded at path: {query_params.file_path}",
+    if delete_sources and body.source_path is not None:
+        reject_internal_path(settings, body.source_path)
+
+    if body.source_path is not None:
+        # not served from the metadata cache: a stale ETag would fail the copy's precondition
+        source = await fetch_s3_object_metadata_async(
+            bucket_name=settings.s3_bucket_name,
+            object_key=body.source_path,
+            s3_client=s3_client,
+            executor=s3_executor,
+        )
+        if source is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="File not found"
+            )
+        try:
+            await copy_s3_object_async(
+                settings.s3_bucket_name,
+                source_key=body.source_path,
+                destination_key=body.destination_path,
+                size_bytes=source["ContentLength"],
+                source_etag=source["ETag"],
+                multipart_options=multipart_options,
+                s3_client=s3_client,
+                executor=s3_executor,
+                metadata_cache=metadata_cache,
+            )
+        except ClientError as e:
+            if is_not_found_error(e):
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND, detail="File not found"
+                ) from e
+            if e.response["Error"]["Code"] == "PreconditionFailed":
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="File changed while it was being copied",
+                ) from e
+            raise
+        if delete_sources:
+            await delete_s3_object_async(
+                settings.s3_bucket_name,
+                object_key=body.source_path,
+                s3_client=s3_client,
+                executor=s3_executor,
+                metadata_cache=metadata_cache,
+            )
+        result = CopyFileResult(
+            source_path=body.source_path,
+            destination_path=body.destination_path,
+            copied=True,
+            source_deleted=True if delete_sources else None,
+        )
+        return Response(content=result.model_dump_json(), media_type="application/json")
+
+    source_directory = body.source_directory or ""
+
+    async def iter_sources() -> AsyncIterator["ObjectTypeDef"]:
+        async for s3_object in iter_s3_objects_async(
+            settings.s3_bucket_name,
+            prefix=source_directory,
+            s3_client=s3_client,
+            executor=s3_executor,
+            max_concurrency=settings.s3_listing_max_concurrency,
+        ):
+            if not is_hidden_from_listings(settings, s3_object["Key"]):
+                yield s3_object
+
+    async def iter_results() -> AsyncIterator[str]:
+        async for result in transfer_s3_objects_async(
+            settings.s3_bucket_name,
+            iter_sources(),
+            source_prefix=source_directory,
+            destination_prefix=body.destination_path,
+            delete_sources=delete_sources,
+            max_concurrency=settings.s3_copy_max_concurrency,
+            multipart_options=multipart_options,
+            s3_client=s3_client,
+            executor=s3_executor,
+            metadata_cache=metadata_cache,
+        ):
+            yield to_copy_file_result(result).model_dump_json() + "\n"
+
+    return StreamingResponse(content=iter_results(), media_type="application/x-ndjson")
+
+
+def to_copy_file_result(result: CopyObjectResult) -> CopyFileResult:
+    """Convert the outcome of copying an object into its API representation."""
+    return CopyFileResult(
+        source_path=result.source_key,
+        destination_path=result.destination_key,
+        copied=result.copied,
+        source_deleted=result.source_deleted,
+        error_code=result.error_code,
+        error_message=result.error_message,
     )
@@ -0,0 +1,341 @@
+"""Async variants of the S3 CRUD functions for use from the async route handlers.
+
+boto3 is blocking, so each call is run on a dedicated, bounded thread pool instead of
+the event loop (or the anyio pool Starlette also uses for file uploads and sync
+iterators). The pool size caps the number of S3 calls in flight per worker and should
+not exceed the S3 client's ``max_pool_connections``. Calls returning an open body close it
+themselves if their caller is cancelled while they run.
+"""
+
+import asyncio
+from concurrent.futures import (
+    Executor,
+    ThreadPoolExecutor,
+)
+from datetime import datetime
+from functools import partial
+from typing import (
+    Callable,
+    Optional,
+    TypeVar,
+)
+
+from aws_python.s3.delete_objects import (
+    DeleteObjectResult,
+    delete_s3_object,
+    delete_s3_objects,
+)
+from aws_python.s3.metadata_cache import ObjectMetadataCache
+from aws_python.s3.read_objects import (
+    DEFAULT_MAX_KEYS,
+    S3ObjectsPage,
+    fetch_s3_object,
+    fetch_s3_object_if_exists,
+    fetch_s3_object_metadata,
+    fetch_s3_objects_metadata,
+    fetch_s3_objects_page,
+    fetch_s3_objects_using_page_token,
+    object_exists_in_s3,
+)
+from aws_python.s3.write_objects import upload_s3_object
+
+try:
+    from mypy_boto3_s3 import S3Client
+    from mypy_boto3_s3.type_defs import (
+        GetObjectOutputTypeDef,
+        HeadObjectOutputTypeDef,
+        ObjectTypeDef,
+    )
+except ImportError:
+    ...
+
+T = TypeVar("T")
+
+S3_EXECUTOR_THREAD_NAME_PREFIX = "s3-io"
+
+
+def create_s3_executor(max_workers: int) -> ThreadPoolExecutor:
+    """
+    Create the thread pool that runs blocking S3 calls.
+
+    Args:
+        max_workers (int): Maximum number of S3 calls that can be in flight at once.
+
+    Returns:
+        ThreadPoolExecutor: The executor to pass to the async S3 functions.
+    """
+    return ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix=S3_EXECUTOR_THREAD_NAME_PREFIX
+    )
+
+
+async def run_in_s3_executor(
+    executor: Optional[Executor], func: Callable[..., T], *args, **kwargs
+) -> T:
+    """
+    Run a blocking S3 call on the executor without blocking the event loop.
+
+    Args:
+        executor (Optional[Executor]): Executor to run the call on. If not provided, the loop's default executor is used.
+        func (Callable[..., T]): Blocking function to run.
+        *args: Positional arguments for ``func``.
+        **kwargs: Keyword arguments for ``func``.
+
+    Returns:
+        T: The return value of ``func``.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, partial(func, *args, **kwargs))
+
+
+async def run_in_s3_executor_or_release(
+    executor: Optional[Executor],
+    release: Callable[[T], None],
+    func: Callable[..., T],
+    *args,
+    **kwargs,
+) -> T:
+    """
+    Run a blocking S3 call returning a resource, e.g. an open body, that must be released if nobody takes it.
+
+    A call running on the executor cannot be stopped, so if the caller is cancelled meanwhile,
+    whatever the call returns would be dropped, e.g. leaking an open body's pooled connection
+    until garbage collection. It is passed to ``release`` once the call is done instead.
+
+    Args:
+        executor (Optional[Executor]): Executor to run the call on. If not provided, the loop's default executor is used.
+        release (Callable[[T], None]): Releases the return value of ``func`` if the caller was cancelled.
+        func (Callable[..., T]): Blocking function to run.
+        *args: Positional arguments for ``func``.
+        **kwargs: Keyword arguments for ``func``.
+
+    Returns:
+        T: The return value of ``func``.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(executor, partial(func, *args, **kwargs))
+    try:
+        return await asyncio.shield(future)
+    except asyncio.CancelledError:
+        future.add_done_callback(
+            lambda future: release(future.result())
+            if not future.cancelled() and future.exception() is None
+            else None
+        )
+        raise
+
+
+def close_s3_object_body(
+    get_object_response: Optional["GetObjectOutputTypeDef"],
+) -> None:
+    """Close the body of a `get_object` response that will not be read, returning its connection to the pool."""
+    if get_object_response is not None:
+        get_object_response["Body"].close()
+
+
+async def object_exists_in_s3_async(
+    bucket_name: str,
+    object_key: str,
+    s3_client: Optional["S3Client"] = None,
+    executor: Optional[Executor] = None,
+    metadata_cache: Optional[ObjectMetadataCache] = None,
+) -> bool:
+    """Async variant of :func:`aws_python.s3.read_objects.object_exists_in_s3`."""
+    return await run_in_s3_executor(
+        executor,
+        object_exists_in_s3,
+        bucket_name=bucket_name,
+        object_key=object_key,
+        s3_client=s3_client,
+        metadata_cache=metadata_cache,
+    )
+
+
+async def fetch_s3_object_async(
+    bucket_name: str,
+    object_key: str,
+    s3_client: Optional["S3Client"] = None,
+    executor: Optional[Executor] = None,
+    byte_range: Optional[str] = None,
+) -> "GetObjectOutputTypeDef":
+    """Async variant of :func:`aws_python.s3.read_objects.fetch_s3_object`."""
+    return await run_in_s3_executor_or_release(
+        executor,
+        close_s3_object_body,
+        fetch_s3_object,
+        bucket_name=bucket_name,
+        object_key=object_key,
+        s3_client=s3_client,
+        byte_range=byte_range,
+    )
+
+
+async def fetch_s3_object_metadata_async(
+    bucket_name: str,
+    object_key: str,
+    s3_client: Optional["S3Client"] = None,
+    executor: Optional[Executor] = None,
+    metadata_cache: Optional[ObjectMetadataCache] = None,
+) -> Optional["HeadObjectOutputTypeDef"]:
+    """Async variant of :func:`aws_python.s3.read_objects.fetch_s3_object_metadata`."""
+    return await run_in_s3_executor(
+        executor,
+        fetch_s3_object_metadata,
+        bucket_name=bucket_name,
+        object_key=object_key,
+        s3_client=s3_client,
+        metadata_cache=metadata_cache,
+    )
+
+
+async def fetch_s3_object_if_exists_async(
+    bucket_name: str,
+    object_key: str,
+    s3_client: Optional["S3Client"] = None,
+    executor: Optional[Executor] = None,
+    byte_range: Optional[str] = None,
+    metadata_cache: Optional[ObjectMetadataCache] = None,
+    if_none_match: Optional[str] = None,
+    if_modified_since: Optional[datetime] = None,
+) -> Optional["GetObjectOutputTypeDef"]:
+    """Async variant of :func:`aws_python.s3.read_objects.fetch_s3_object_if_exists`."""
+    return await run_in_s3_executor_or_release(
+        executor,
+        close_s3_object_body,
+        fetch_s3_object_if_exists,
+        bucket_name=bucket_name,
+        object_key=object_key,
+        s3_client=s3_client,
+        metadata_cache=metadata_cache,
+        byte_range=byte_range,
+        if_none_match=if_none_match,
+        if_modified_since=if_modified_since,
+    )
+
+
+async def fetch_s3_objects_page_async(
+    bucket_name: str,
+    prefix: Optional[str] = None,
+    delimiter: Optional[str] = None,
+    continuation_token: Optional[str] = None,
+    max_keys: Optional[int] = DEFAULT_MAX_KEYS,
+    s3_client: Optional["S3Client"] = None,
+    executor: Optional[Executor] = None,
+    metadata_cache: Optional[ObjectMetadataCache] = None,
+) -> S3ObjectsPage:
+    """Async variant of :func:`aws_python.s3.read_objects.fetch_s3_objects_page`."""
+    return await run_in_s3_executor(
+        executor,
+        fetch_s3_objects_page,
+        bucket_name=bucket_name,
+        prefix=prefix,
+        delimiter=delimiter,
+        continuation_token=continuation_token,
+        max_keys=max_keys,
+        s3_client=s3_client,
+        metadata_cache=metadata_cache,
+    )
+
+
+async def fetch_s3_objects_using_page_token_async(
+    bucket_name: str,
+    continuation_token: str,
+    max_keys: int | None = None,
+    s3_client: Optional["S3Client"] = None,
+    executor: Optional[Executor] = None,
+    metadata_cache: Optional[ObjectMetadataCache] = None,
+    prefix: Optional[str] = None,
+) -> tuple[list["ObjectTypeDef"], Optional[str]]:
+    """Async variant of :func:`aws_python.s3.read_objects.fetch_s3_objects_using_page_token`."""
+    return await run_in_s3_executor(
+        executor,
+        fetch_s3_objects_using_page_token,
+        bucket_name=bucket_name,
+        continuation_token=continuation_token,
+        max_keys=max_keys,
+        prefix=prefix,
+        s3_client=s3_client,
+        metadata_cache=metadata_cache,
+    )
+
+
+async def fetch_s3_objects_metadata_async(
+    bucket_name: str,
+    prefix: Optional[str] = None,
+    max_keys: Optional[int] = DEFAULT_MAX_KEYS,
+    s3_client: Optional["S3Client"] = None,
+    executor: Optional[Executor] = None,
+    metadata_cache: Optional[ObjectMetadataCache] = None,
+) -> tuple[list["ObjectTypeDef"], Optional[str]]:
+    """Async variant of :func:`aws_python.s3.read_objects.fetch_s3_objects_metadata`."""
+    return await run_in_s3_executor(
+        executor,
+        fetch_s3_objects_metadata,
+        bucket_name=bucket_name,
+        prefix=prefix,
+        max_keys=max_keys,
+        s3_client=s3_client,
+        metadata_cache=metadata_cache,
+    )
+
+
+async def upload_s3_object_async(
+    bucket_name: str,
+    object_key: str,
+    file_content: bytes,
+    content_type: Optional[str] = None,
+    s3_client: Optional["S3Client"] = None,
+    executor: Optional[Executor] = None,
+    metadata_cache: Optional[ObjectMetadataCache] = None,
+    content_encoding: Optional[str] = None,
+    metadata: Optional[dict[str, str]] = None,
+) -> None:
+    """Async variant of :func:`aws_python.s3.write_objects.upload_s3_object`."""
+    await run_in_s3_executor(
+        executor,
+        upload_s3_object,
+        bucket_name=bucket_name,
+        object_key=object_key,
+        file_content=file_content,
+        content_type=content_type,
+        s3_client=s3_client,
+        metadata_cache=metadata_cache,
+        content_encoding=content_encoding,
+        metadata=metadata,
+    )
+
+
+async def delete_s3_object_async(
+    bucket_name: str,
+    object_key: str,
+    s3_client: Optional["S3Client"] = None,
+    executor: Optional[Executor] = None,
+    metadata_cache: Optional[ObjectMetadataCache] = None,
+) -> None:
+    """Async variant of :func:`aws_python.s3.delete_objects.delete_s3_object`."""
+    await run_in_s3_executor(
+        executor,
+        delete_s3_object,
+        bucket_name=bucket_name,
+        object_key=object_key,
+        s3_client=s3_client,
+        metadata_cache=metadata_cache,
+    )
+
+
+async def delete_s3_objects_async(
+    bucket_name: str,
+    object_keys: list[str],
+    s3_client: Optional["S3Client"] = None,
+    executor: Optional[Executor] = None,
+    metadata_cache: Optional[ObjectMetadataCache] = None,
+) -> list[DeleteObjectResult]:
+    """Async variant of :func:`aws_python.s3.delete_objects.delete_s3_objects`."""
+    return await run_in_s3_executor(
+        executor,
+        delete_s3_objects,
+        bucket_name=bucket_name,
+        object_keys=object_keys,
+        s3_client=s3_client,
+        metadata_cache=metadata_cache,
+    )
@@ -0,0 +1,146 @@
+"""Delete many objects with batched `delete_objects` calls instead of one request per key.
+
+Keys are grouped into batches of up to 1,000 and up to ``max_concurrency`` batches are
+deleted at once while the next keys are still being listed. Results are yielded as soon
+as a batch finishes, so callers can stream them without holding all keys in memory.
+"""
+
+import asyncio
+from concurrent.futures import Executor
+from typing import (
+    AsyncIterable,
+    AsyncIterator,
+    Iterable,
+    Optional,
+)
+
+from aws_python.s3.async_objects import delete_s3_objects_async
+from aws_python.s3.delete_objects import (
+    DELETE_OBJECTS_MAX_KEYS,
+    DeleteObjectResult,
+)
+from aws_python.s3.list_objects import iter_s3_objects_async
+from aws_python.s3.metadata_cache import ObjectMetadataCache
+
+try:
+    from mypy_boto3_s3 import S3Client
+except ImportError:
+    ...
+
+DEFAULT_BATCH_DELETE_MAX_CONCURRENCY = 4
+
+
+async def list_s3_object_keys_async(
+    bucket_name: str,
+    prefix: str,
+    s3_client: Optional["S3Client"] = None,
+    executor: Optional[Executor] = None,
+    max_concurrency: int = 1,
+) -> AsyncIterator[str]:
+    """
+    Yield the key of every object under a prefix, page by page.
+
+    Args:
+        bucket_name (str): Name of the S3 bucket.
+        prefix (str): Prefix the keys start with.
+        s3_client (Optional[S3Client], optional): S3 client. Defaults to None.
+        executor (Optional[Executor], optional): Executor running the blocking S3 calls. Defaults to None.
+        max_concurrency (int, optional): Maximum number of key ranges listed at once. Defaults to 1.
+
+    Yields:
+        str: The next object key, in lexicographic order.
+    """
+    async for s3_object in iter_s3_objects_async(
+        bucket_name,
+        prefix=prefix,
+        s3_client=s3_client,
+        executor=executor,
+        max_concurrency=max_concurrency,
+    ):
+        yield s3_object["Key"]
+
+
+async def iter_batches(
+    object_keys: AsyncIterable[str] | Iterable[str], batch_size: int
+) -> AsyncIterator[list[str]]:
+    """
+    Group keys into lists of ``batch_size`` keys.
+
+    Repeated keys of an in-memory list are dropped. Keys streamed from an async iterable, i.e. a
+    listing, are passed through as is: S3 never lists a key twice, and remembering every key of
+    a large prefix would hold it all in memory.
+    """
+    batch: list[str] = []
+
+    async def all_keys() -> AsyncIterator[str]:
+        if isinstance(object_keys, AsyncIterable):
+            async for object_key in object_keys:
+                yield object_key
+        else:
+            # dicts keep the first occurrence of each key, in order
+            for object_key in dict.fromkeys(object_keys):
+                yield object_key
+
+    async for object_key in all_keys():
+        batch.append(object_key)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def delete_s3_objects_in_batches_async(
+    bucket_name: str,
+    object_keys: AsyncIterable[str] | Iterable[str],
+    batch_size: int = DELETE_OBJECTS_MAX_KEYS,
+    max_concurrency: int = DEFAULT_BATCH_DELETE_MAX_CONCURRENCY,
+    s3_client: Optional["S3Client"] = None,
+    executor: Optional[Executor] = None,
+    metadata_cache: Optional[ObjectMetadataCache] = None,
+) -> AsyncIterator[DeleteObjectResult]:
+    """
+    Delete objects in batches, several batches at a time, yielding each key's result.
+
+    Args:
+        bucket_name (str): Name of the S3 bucket.
+        object_keys (AsyncIterable[str] | Iterable[str]): Keys to delete, e.g. from :func:`list_s3_object_keys_async`.
+        batch_size (int, optional): Keys per `delete_objects` call. At most 1,000.
+        max_concurrency (int, optional): Maximum number of batches deleted at once.
+        s3_client (Optional[S3Client], optional): S3 client. Defaults to None.
+        executor (Optional[Executor], optional): Executor running the blocking S3 calls. Defaults to None.
+        metadata_cache (Optional[ObjectMetadataCache], optional): Cache to record the deleted objects as missing in. Defaults to None.
+
+    Yields:
+        DeleteObjectResult: The outcome for each key, in the order the batches finish.
+    """
+    pending: set[asyncio.Task[list[DeleteObjectResult]]] = set()
+
+    async def wait_for_a_batch() -> list[DeleteObjectResult]:
+        nonlocal pending
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        return [result for task in done for result in task.result()]
+
+    try:
+        async for batch in iter_batches(object_keys, batch_size):
+            if len(pending) >= max_concurrency:
+                for result in await wait_for_a_batch():
+                    yield result
+            pending.add(
+                asyncio.create_task(
+                    delete_s3_objects_async(
+                        bucket_name,
+                        object_keys=batch,
+                        s3_client=s3_client,
+                        executor=executor,
+                        metadata_cache=metadata_cache,
+                    )
+                )
+            )
+        while pending:
+            for result in await wait_for_a_batch():
+                yield result
+    finally:
+        # the consumer went away, e.g. the client disconnected: do not start more deletes
+        for task in pending:
+            task.cancel()
@@ -0,0 +1,40 @@
+"""Create the long-lived S3 client shared by every request."""
+
+import boto3
+from botocore.config import Config
+
+from aws_python.settings import Settings
+
+try:
+    from mypy_boto3_s3 import S3Client
+except ImportError:
+    ...
+
+
+def create_s3_client(settings: Settings) -> "S3Client":
+    """
+    Create an S3 client with a tuned connection pool.
+
+    Building a boto3 client resolves endpoints, loads the service model and walks the
+    credential chain, so the app builds one at startup and reuses it (and its pooled
+    connections) for all requests. boto3 clients are thread-safe.
+
+    Args:
+        settings (Settings): Settings holding the botocore client configuration.
+
+    Returns:
+        S3Client: The configured S3 client.
+    """
+    config = Config(
+        max_pool_connections=settings.s3_max_pool_connections,
+        tcp_keepalive=settings.s3_tcp_keepalive,
+        connect_timeout=settings.s3_connect_timeout_seconds,
+        read_timeout=settings.s3_read_timeout_seconds,
+        retries={
+            "max_attempts": settings.s3_max_retry_attempts,
+            "mode": settings.s3_retry_mode,
+        },
+        # presigned URLs otherwise fall back to SigV2 in some regions, which newer regions and SSE-KMS reject
+        signature_version="s3v4",
+    )
+    return boto3.client("s3", config=config)
@@ -0,0 +1,152 @@
+"""Collapse concurrent identical S3 reads of this process into one request to S3.
+
+A popular file requested by many clients at once would otherwise cost one ``head_object``
+or ``get_object`` call per client. Here concurrent lookups of the same object share one
+call with :class:`aws_python.single_flight.SingleFlight`.
+
+A body can only be read once, so a shared ``get_object`` reads small bodies into memory
+and hands every caller its own copy. Bodies larger than ``max_body_bytes`` are left to the
+first caller, which streams it as usual, or closed if the first caller went away, while
+the callers that joined fetch the object themselves. Objects whose size is known to be
+too large skip coalescing altogether.
+"""
+
+import io
+from concurrent.futures import Executor
+from datetime import datetime
+from typing import Optional
+
+from botocore.response import StreamingBody
+
+from aws_python.s3.async_objects import (
+    close_s3_object_body,
+    fetch_s3_object_if_exists_async,
+    fetch_s3_object_metadata_async,
+    run_in_s3_executor,
+)
+from aws_python.s3.metadata_cache import ObjectMetadataCache
+from aws_python.single_flight import SingleFlight
+
+try:
+    from mypy_boto3_s3 import S3Client
+    from mypy_boto3_s3.type_defs import (
+        GetObjectOutputTypeDef,
+        HeadObjectOutputTypeDef,
+    )
+except ImportError:
+    ...
+
+DEFAULT_COALESCED_MAX_BODY_BYTES = 1024 * 1024
+
+
+class CoalescedS3Reads:
+    """Share `head_object` and `get_object` calls between concurrent callers reading the same object."""
+
+    def __init__(self, max_body_bytes: int = DEFAULT_COALESCED_MAX_BODY_BYTES):
+        self.max_body_bytes = max_body_bytes
+        self._metadata_flights: SingleFlight[
+            tuple[str, str], Optional["HeadObjectOutputTypeDef"]
+        ] = SingleFlight()
+        self._object_flights: SingleFlight[
+            tuple, tuple[Optional["GetObjectOutputTypeDef"], Optional[bytes]]
+        ] = SingleFlight()
+
+    async def fetch_s3_object_metadata_async(
+        self,
+        bucket_name: str,
+        object_key: str,
+        s3_client: Optional["S3Client"] = None,
+        executor: Optional[Executor] = None,
+        metadata_cache: Optional[ObjectMetadataCache] = None,
+    ) -> Optional["HeadObjectOutputTypeDef"]:
+        """Coalesced variant of :func:`aws_python.s3.async_objects.fetch_s3_object_metadata_async`."""
+        head_object_response, _ = await self._metadata_flights.run(
+            (bucket_name, object_key),
+            lambda: fetch_s3_object_metadata_async(
+                bucket_name,
+                object_key,
+                s3_client=s3_client,
+                executor=executor,
+                metadata_cache=metadata_cache,
+            ),
+        )
+        # every caller gets a dict of its own to change
+        return dict(head_object_response) if head_object_response is not None else None  # type: ignore[return-value]
+
+    async def fetch_s3_object_if_exists_async(
+        self,
+        bucket_name: str,
+        object_key: str,
+        s3_client: Optional["S3Client"] = None,
+        executor: Optional[Executor] = None,
+        metadata_cache: Optional[ObjectMetadataCache] = None,
+        if_none_match: Optional[str] = None,
+        if_modified_since: Optional[datetime] = None,
+        size_bytes: Optional[int] = None,
+    ) -> Optional["GetObjectOutputTypeDef"]:
+        """
+        Coalesced variant of :func:`aws_python.s3.async_objects.fetch_s3_object_if_exists_async`.
+
+        Only callers with the same conditions share a call, so every caller gets the answer to its
+        own conditions, including the `304` error. Objects known to be larger than `max_body_bytes`,
+        e.g. from the metadata cache passed as `size_bytes`, are fetched without coalescing.
+        """
+
+        def fetch_s3_object():
+            return fetch_s3_object_if_exists_async(
+                bucket_name,
+                object_key,
+                s3_client=s3_client,
+                executor=executor,
+                metadata_cache=metadata_cache,
+                if_none_match=if_none_match,
+                if_modified_since=if_modified_since,
+            )
+
+        if size_bytes is not None and size_bytes > self.max_body_bytes:
+            return await fetch_s3_object()
+
+        # only set and read in the first caller's call, which owns a body too large to share
+        first_caller_gone = False
+        streamed_responses: list["GetObjectOutputTypeDef"] = []
+
+        async def fetch_s3_object_into_memory() -> tuple[
+            Optional["GetObjectOutputTypeDef"], Optional[bytes]
+        ]:
+            get_object_response = await fetch_s3_object()
+            if get_object_response is None:
+                return None, None
+            if get_object_response["ContentLength"] > self.max_body_bytes:
+                if first_caller_gone:
+                    # nobody is left to stream the body, the callers that joined fetch their own
+                    close_s3_object_body(get_object_response)
+                else:
+                    streamed_responses.append(get_object_response)
+                return get_object_response, None
+            body = get_object_response["Body"]
+            try:
+                content = await run_in_s3_executor(executor, body.read)
+            finally:
+                body.close()
+            return get_object_response, content
+
+        try:
+            (get_object_response, content), joined = await self._object_flights.run(
+                (bucket_name, object_key, if_none_match, if_modified_since),
+                fetch_s3_object_into_memory,
+            )
+        except BaseException:
+            # e.g. the client disconnected, the call goes on for the others but its body is nobody's
+            first_caller_gone = True
+            for streamed_response in streamed_responses:
+                close_s3_object_body(streamed_response)
+            raise
+        if get_object_response is None:
+            return None
+        if content is None:
+            # the body is too large to share; the first caller streams it, the others fetch their own
+            return await fetch_s3_object() if joined else get_object_response
+        return {  # type: ignore[return-value]
+            **get_object_response,
+            "Body": StreamingBody(io.BytesIO(content), len(content)),
+        }
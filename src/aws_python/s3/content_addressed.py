@@ -0,0 +1,195 @@
+"""Store file content once per distinct content, under the SHA-256 digest of its bytes.
+
+In content-addressed mode an upload is hashed first, its bytes are stored as a blob at
+``<blob prefix><sha256 hex digest>`` unless that blob exists already, and the file's path
+becomes an empty pointer object whose user metadata names the blob. Uploading the same
+content again, under any path, only writes a new pointer. Blobs never change, so the
+digest is a strong ETag for every path pointing at them.
+
+Deleting or overwriting a path only replaces its pointer; blobs that are no longer
+referenced are left for a separate garbage collection.
+"""
+
+import hashlib
+from concurrent.futures import Executor
+from typing import (
+    AsyncIterable,
+    Callable,
+    Mapping,
+    NamedTuple,
+    Optional,
+)
+
+import boto3
+
+from aws_python.s3.async_objects import (
+    object_exists_in_s3_async,
+    run_in_s3_executor,
+)
+from aws_python.s3.metadata_cache import (
+    ObjectMetadata,
+    ObjectMetadataCache,
+)
+from aws_python.s3.multipart_upload import (
+    DEFAULT_MULTIPART_MAX_CONCURRENCY,
+    DEFAULT_MULTIPART_PART_SIZE_BYTES,
+    upload_s3_object_multipart_async,
+)
+
+try:
+    from mypy_boto3_s3 import S3Client
+except ImportError:
+    ...
+
+DEFAULT_BLOB_PREFIX = ".blobs/sha256/"
+# user metadata of pointer objects, sent as `x-amz-meta-*` headers
+CONTENT_SHA256_METADATA_KEY = "content-sha256"
+CONTENT_LENGTH_METADATA_KEY = "content-length"
+
+
+class ContentAddress(NamedTuple):
+    """The digest and size of a file's content, which identify its blob."""
+
+    sha256: str
+    size_bytes: int
+
+    @property
+    def etag(self) -> str:
+        """Return the digest as a strong entity tag."""
+        return f'"{self.sha256}"'
+
+    def blob_key(self, blob_prefix: str = DEFAULT_BLOB_PREFIX) -> str:
+        """Return the key of the blob holding the content."""
+        return f"{blob_prefix}{self.sha256}"
+
+    def to_metadata(self) -> dict[str, str]:
+        """Return the user metadata of a pointer object to this content."""
+        return {
+            CONTENT_SHA256_METADATA_KEY: self.sha256,
+            CONTENT_LENGTH_METADATA_KEY: str(self.size_bytes),
+        }
+
+    @classmethod
+    def from_metadata(cls, metadata: Mapping[str, str]) -> Optional["ContentAddress"]:
+        """Read the content address from an object's user metadata, or None if it is not a pointer."""
+        try:
+            return cls(
+                sha256=metadata[CONTENT_SHA256_METADATA_KEY],
+                size_bytes=int(metadata[CONTENT_LENGTH_METADATA_KEY]),
+            )
+        except (KeyError, ValueError):
+            return None
+
+
+async def hash_chunks_async(chunks: AsyncIterable[bytes]) -> ContentAddress:
+    """Compute the content address of a stream of bytes."""
+    sha256 = hashlib.sha256()
+    size_bytes = 0
+    async for chunk in chunks:
+        sha256.update(chunk)
+        size_bytes += len(chunk)
+    return ContentAddress(sha256=sha256.hexdigest(), size_bytes=size_bytes)
+
+
+def put_pointer_object(
+    bucket_name: str,
+    object_key: str,
+    content_address: ContentAddress,
+    content_type: Optional[str] = None,
+    s3_client: Optional["S3Client"] = None,
+    metadata_cache: Optional[ObjectMetadataCache] = None,
+) -> None:
+    """
+    Write the pointer object making a path refer to a blob.
+
+    Args:
+        bucket_name (str): Bucket name.
+        object_key (str): Key of the pointer, i.e. the path of the file.
+        content_address (ContentAddress): The content the path refers to.
+        content_type (Optional[str], optional): Content type of the file in MIME format. Defaults to None.
+        s3_client (Optional[S3Client], optional): S3 client. Defaults to None.
+        metadata_cache (Optional[ObjectMetadataCache], optional): Cache to update with the pointer's metadata. Defaults to None.
+    """
+    content_type = content_type or "application/octet-stream"
+    s3_client = s3_client or boto3.client("s3")
+    metadata = content_address.to_metadata()
+    response = s3_client.put_object(
+        Bucket=bucket_name,
+        Key=object_key,
+        Body=b"",
+        ContentType=content_type,
+        Metadata=metadata,
+    )
+    if metadata_cache is not None:
+        metadata_cache.put(
+            bucket_name,
+            object_key,
+            ObjectMetadata.from_put_object_response(
+                response, content_length=0, content_type=content_type, metadata=metadata
+            ),
+        )
+
+
+async def upload_s3_object_content_addressed_async(
+    bucket_name: str,
+    object_key: str,
+    read_chunks: Callable[[], AsyncIterable[bytes]],
+    content_type: Optional[str] = None,
+    blob_prefix: str = DEFAULT_BLOB_PREFIX,
+    part_size: int = DEFAULT_MULTIPART_PART_SIZE_BYTES,
+    max_concurrency: int = DEFAULT_MULTIPART_MAX_CONCURRENCY,
+    s3_client: Optional["S3Client"] = None,
+    executor: Optional[Executor] = None,
+    metadata_cache: Optional[ObjectMetadataCache] = None,
+) -> tuple[ContentAddress, bool]:
+    """
+    Store content as a blob unless it is stored already, then point the object key at it.
+
+    Args:
+        bucket_name (str): Bucket name.
+        object_key (str): Key of the pointer, i.e. the path of the file.
+        read_chunks (Callable[[], AsyncIterable[bytes]]): Returns the content from its start. It is called
+            once to hash the content and once more to upload it if the blob does not exist yet.
+        content_type (Optional[str], optional): Content type in MIME format. Defaults to None.
+        blob_prefix (str, optional): Prefix of the blob keys.
+        part_size (int, optional): Size of each uploaded part of large blobs.
+        max_concurrency (int, optional): Maximum number of parts uploaded at once.
+        s3_client (Optional[S3Client], optional): S3 client. Defaults to None.
+        executor (Optional[Executor], optional): Executor running the blocking S3 calls. Defaults to None.
+        metadata_cache (Optional[ObjectMetadataCache], optional): Cache to update for the written objects. Defaults to None.
+
+    Returns:
+        tuple[ContentAddress, bool]: The content address, and whether the blob had to be uploaded.
+    """
+    content_address = await hash_chunks_async(read_chunks())
+    blob_key = content_address.blob_key(blob_prefix)
+    blob_exists = await object_exists_in_s3_async(
+        bucket_name=bucket_name,
+        object_key=blob_key,
+        s3_client=s3_client,
+        executor=executor,
+        metadata_cache=metadata_cache,
+    )
+    if not blob_exists:
+        await upload_s3_object_multipart_async(
+            bucket_name=bucket_name,
+            object_key=blob_key,
+            chunks=read_chunks(),
+            content_type=content_type,
+            part_size=part_size,
+            max_concurrency=max_concurrency,
+            s3_client=s3_client,
+            executor=executor,
+            metadata_cache=metadata_cache,
+        )
+    await run_in_s3_executor(
+        executor,
+        put_pointer_object,
+        bucket_name=bucket_name,
+        object_key=object_key,
+        content_address=content_address,
+        content_type=content_type,
+        s3_client=s3_client,
+        metadata_cache=metadata_cache,
+    )
+    return content_address, not blob_exists
@@ -0,0 +1,414 @@
+"""Copy and move objects within the bucket without their bytes passing through the API.
+
+Objects of up to 5 GiB are copied with one `copy_object` call. Larger objects, which
+`copy_object` rejects, are copied as a multipart upload whose parts are byte ranges of
+the source copied with `upload_part_copy`, several at a time. Either way S3 copies the
+data internally and the API only sends the requests.
+
+A move is a copy followed by deleting the source, since S3 has no rename. Whole
+directories are copied or moved one object at a time, with up to ``max_concurrency``
+objects in flight while the rest of the directory is still being listed, and each
+object's result is yielded as soon as it finishes.
+"""
+
+import asyncio
+from concurrent.futures import Executor
+from typing import (
+    AsyncIterable,
+    AsyncIterator,
+    NamedTuple,
+    Optional,
+)
+
+import boto3
+from botocore.exceptions import ClientError
+from loguru import logger
+
+from aws_python.s3.async_objects import (
+    delete_s3_object_async,
+    run_in_s3_executor,
+)
+from aws_python.s3.metadata_cache import ObjectMetadataCache
+from aws_python.s3.multipart_upload import (
+    DEFAULT_MULTIPART_MAX_CONCURRENCY,
+    MIN_MULTIPART_PART_SIZE_BYTES,
+)
+from aws_python.s3.presigned_urls import MAX_MULTIPART_PARTS
+from aws_python.s3.write_objects import (
+    abort_multipart_upload,
+    complete_multipart_upload,
+    copy_s3_object,
+    create_multipart_upload,
+    upload_part_copy,
+)
+
+try:
+    from mypy_boto3_s3 import S3Client
+    from mypy_boto3_s3.type_defs import (
+        CompletedPartTypeDef,
+        ObjectTypeDef,
+    )
+except ImportError:
+    ...
+
+# `copy_object` rejects larger sources, and `upload_part_copy` larger ranges
+MAX_COPY_OBJECT_SIZE_BYTES = 5 * 1024 * 1024 * 1024
+DEFAULT_MULTIPART_COPY_PART_SIZE_BYTES = 512 * 1024 * 1024
+DEFAULT_COPY_MAX_CONCURRENCY = 16
+
+
+class MultipartCopyOptions(NamedTuple):
+    """When and how objects are copied as multipart uploads instead of with one `copy_object` call."""
+
+    threshold_bytes: int = MAX_COPY_OBJECT_SIZE_BYTES
+    part_size_bytes: int = DEFAULT_MULTIPART_COPY_PART_SIZE_BYTES
+    max_concurrency: int = DEFAULT_MULTIPART_MAX_CONCURRENCY
+
+
+class CopyObjectResult(NamedTuple):
+    """The outcome of copying or moving one object of a directory."""
+
+    source_key: str
+    destination_key: str
+    copied: bool
+    # only set for moves
+    source_deleted: Optional[bool] = None
+    error_code: Optional[str] = None
+    error_message: Optional[str] = None
+
+
+def get_copy_part_ranges(size_bytes: int, part_size_bytes: int) -> list[str]:
+    """
+    Split an object into the byte ranges copied as the parts of a multipart copy.
+
+    Args:
+        size_bytes (int): Size of the source object.
+        part_size_bytes (int): Size of every part but the last one. Raised if the object would need more than
+            10,000 parts.
+
+    Returns:
+        list[str]: `CopySourceRange` values like `bytes=0-536870911`, in order of the part numbers.
+    """
+    part_size_bytes = max(part_size_bytes, -(-size_bytes // MAX_MULTIPART_PARTS))
+    return [
+        f"bytes={start}-{min(start + part_size_bytes, size_bytes) - 1}"
+        for start in range(0, size_bytes, part_size_bytes)
+    ]
+
+
+def create_multipart_copy(
+    bucket_name: str,
+    source_key: str,
+    destination_key: str,
+    s3_client: Optional["S3Client"] = None,
+) -> str:
+    """
+    Start the multipart upload of a copy, with the source's content type, content encoding and user metadata.
+
+    Unlike `copy_object`, `upload_part_copy` copies bytes only, so the rest is read from the source first.
+
+    Args:
+        bucket_name (str): Bucket name.
+        source_key (str): Key of the object to copy.
+        destination_key (str): Key of the copy.
+        s3_client (Optional[S3Client], optional): S3 client. Defaults to None.
+
+    Returns:
+        str: The upload ID identifying the multipart upload in the following calls.
+    """
+    s3_client = s3_client or boto3.client("s3")
+    source = s3_client.head_object(Bucket=bucket_name, Key=source_key)
+    return create_multipart_upload(
+        bucket_name,
+        object_key=destination_key,
+        content_type=source.get("ContentType"),
+        s3_client=s3_client,
+        content_encoding=source.get("ContentEncoding"),
+        metadata=source.get("Metadata"),
+    )
+
+
+async def copy_s3_object_multipart_async(
+    bucket_name: str,
+    source_key: str,
+    destination_key: str,
+    size_bytes: int,
+    source_etag: Optional[str] = None,
+    part_size_bytes: int = DEFAULT_MULTIPART_COPY_PART_SIZE_BYTES,
+    max_concurrency: int = DEFAULT_MULTIPART_MAX_CONCURRENCY,
+    s3_client: Optional["S3Client"] = None,
+    executor: Optional[Executor] = None,
+    metadata_cache: Optional[ObjectMetadataCache] = None,
+) -> None:
+    """
+    Copy an object of any size within the bucket as a multipart upload of byte ranges of the source.
+
+    If a part fails (or the caller is cancelled), the multipart upload is aborted so no
+    incomplete parts are left behind.
+
+    Args:
+        bucket_name (str): Bucket name.
+        source_key (str): Key of the object to copy.
+        destination_key (str): Key of the copy. An existing object is replaced.
+        size_bytes (int): Size of the source object.
+        source_etag (Optional[str], optional): ETag of the source. Parts are only copied from this version, so a
+            source overwritten during the copy fails it instead of mixing two versions. Defaults to None.
+        part_size_bytes (int, optional): Size of each copied part. Must be at least 5 MiB.
+        max_concurrency (int, optional): Maximum number of parts copied at once.
+        s3_client (Optional[S3Client], optional): S3 client. Defaults to None.
+        executor (Optional[Executor], optional): Executor running the blocking S3 calls. Defaults to None.
+        metadata_cache (Optional[ObjectMetadataCache], optional): Cache to invalidate for the replaced object. Defaults to None.
+    """
+    if part_size_bytes < MIN_MULTIPART_PART_SIZE_BYTES:
+        raise ValueError(
+            f"part_size_bytes must be at least {MIN_MULTIPART_PART_SIZE_BYTES} bytes"
+        )
+
+    upload_id: str = await run_in_s3_executor(
+        executor,
+        create_multipart_copy,
+        bucket_name=bucket_name,
+        source_key=source_key,
+        destination_key=destination_key,
+        s3_client=s3_client,
+    )
+    slots = asyncio.Semaphore(max_concurrency)
+    failed = asyncio.Event()
+
+    async def copy_one_part(part_number: int, byte_range: str):
+        async with slots:
+            if failed.is_set():
+                raise asyncio.CancelledError
+            return await run_in_s3_executor(
+                executor,
+                upload_part_copy,
+                bucket_name=bucket_name,
+                object_key=destination_key,
+                upload_id=upload_id,
+                part_number=part_number,
+                source_key=source_key,
+                byte_range=byte_range,
+                s3_client=s3_client,
+                source_etag=source_etag,
+            )
+
+    tasks: list[asyncio.Task["CompletedPartTypeDef"]] = [
+        asyncio.create_task(copy_one_part(part_number, byte_range))
+        for part_number, byte_range in enumerate(
+            get_copy_part_ranges(size_bytes, part_size_bytes), start=1
+        )
+    ]
+    try:
+        completed_parts = list(await asyncio.gather(*tasks))
+        await run_in_s3_executor(
+            executor,
+            complete_multipart_upload,
+            bucket_name=bucket_name,
+            object_key=destination_key,
+            upload_id=upload_id,
+            parts=completed_parts,
+            s3_client=s3_client,
+            metadata_cache=metadata_cache,
+        )
+    except BaseException:
+        logger.opt(exception=True).warning(
+            "Aborting multipart copy of {source_key} to {destination_key}",
+            source_key=source_key,
+            destination_key=destination_key,
+        )
+        # skip the parts that did not start and let in-flight parts finish, otherwise they could land after the abort
+        failed.set()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await asyncio.shield(
+            run_in_s3_executor(
+                executor,
+                abort_multipart_upload,
+                bucket_name=bucket_name,
+                object_key=destination_key,
+                upload_id=upload_id,
+                s3_client=s3_client,
+            )
+        )
+        raise
+
+
+async def copy_s3_object_async(
+    bucket_name: str,
+    source_key: str,
+    destination_key: str,
+    size_bytes: int,
+    source_etag: Optional[str] = None,
+    multipart_options: MultipartCopyOptions = MultipartCopyOptions(),
+    s3_client: Optional["S3Client"] = None,
+    executor: Optional[Executor] = None,
+    metadata_cache: Optional[ObjectMetadataCache] = None,
+) -> None:
+    """
+    Copy an object within the bucket, as a multipart copy if it exceeds the threshold.
+
+    Args:
+        bucket_name (str): Bucket name.
+        source_key (str): Key of the object to copy.
+        destination_key (str): Key of the copy. An existing object is replaced.
+        size_bytes (int): Size of the source object, e.g. from its listing or `head_object`.
+        source_etag (Optional[str], optional): Only copy the source if it still has this ETag. Defaults to None.
+        multipart_options (MultipartCopyOptions, optional): When and how to copy as a multipart upload.
+        s3_client (Optional[S3Client], optional): S3 client. Defaults to None.
+        executor (Optional[Executor], optional): Executor running the blocking S3 calls. Defaults to None.
+        metadata_cache (Optional[ObjectMetadataCache], optional): Cache to invalidate for the replaced object. Defaults to None.
+    """
+    if size_bytes <= multipart_options.threshold_bytes:
+        await run_in_s3_executor(
+            executor,
+            copy_s3_object,
+            bucket_name=bucket_name,
+            source_key=source_key,
+            destination_key=destination_key,
+            s3_client=s3_client,
+            metadata_cache=metadata_cache,
+            source_etag=source_etag,
+        )
+        return
+    await copy_s3_object_multipart_async(
+        bucket_name,
+        source_key=source_key,
+        destination_key=destination_key,
+        size_bytes=size_bytes,
+        source_etag=source_etag,
+        part_size_bytes=multipart_options.part_size_bytes,
+        max_concurrency=multipart_options.max_concurrency,
+        s3_client=s3_client,
+        executor=executor,
+        metadata_cache=metadata_cache,
+    )
+
+
+async def transfer_s3_object_async(
+    bucket_name: str,
+    source: "ObjectTypeDef",
+    destination_key: str,
+    delete_source: bool = False,
+    multipart_options: MultipartCopyOptions = MultipartCopyOptions(),
+    s3_client: Optional["S3Client"] = None,
+    executor: Optional[Executor] = None,
+    metadata_cache: Optional[ObjectMetadataCache] = None,
+) -> CopyObjectResult:
+    """
+    Copy or move one listed object, reporting S3 errors in the result instead of raising them.
+
+    Args:
+        bucket_name (str): Bucket name.
+        source (ObjectTypeDef): The object to copy, as listed by `list_objects_v2`.
+        destination_key (str): Key of the copy. An existing object is replaced.
+        delete_source (bool, optional): Delete the source once it was copied, i.e. move it. Defaults to False.
+        multipart_options (MultipartCopyOptions, optional): When and how to copy as a multipart upload.
+        s3_client (Optional[S3Client], optional): S3 client. Defaults to None.
+        executor (Optional[Executor], optional): Executor running the blocking S3 calls. Defaults to None.
+        metadata_cache (Optional[ObjectMetadataCache], optional): Cache to update for the written and deleted objects.
+            Defaults to None.
+
+    Returns:
+        CopyObjectResult: Whether the object was copied and, for moves, whether the source was deleted.
+    """
+    result = CopyObjectResult(
+        source_key=source["Key"],
+        destination_key=destination_key,
+        copied=False,
+        source_deleted=False if delete_source else None,
+    )
+    try:
+        await copy_s3_object_async(
+            bucket_name,
+            source_key=source["Key"],
+            destination_key=destination_key,
+            size_bytes=source["Size"],
+            source_etag=source.get("ETag"),
+            multipart_options=multipart_options,
+            s3_client=s3_client,
+            executor=executor,
+            metadata_cache=metadata_cache,
+        )
+        result = result._replace(copied=True)
+        if delete_source:
+            await delete_s3_object_async(
+                bucket_name,
+                object_key=source["Key"],
+                s3_client=s3_client,
+                executor=executor,
+                metadata_cache=metadata_cache,
+            )
+            result = result._replace(source_deleted=True)
+    except ClientError as e:
+        return result._replace(
+            error_code=e.response["Error"]["Code"],
+            error_message=e.response["Error"].get("Message"),
+        )
+    return result
+
+
+async def transfer_s3_objects_async(
+    bucket_name: str,
+    sources: AsyncIterable["ObjectTypeDef"],
+    source_prefix: str,
+    destination_prefix: str,
+    delete_sources: bool = False,
+    max_concurrency: int = DEFAULT_COPY_MAX_CONCURRENCY,
+    multipart_options: MultipartCopyOptions = MultipartCopyOptions(),
+    s3_client: Optional["S3Client"] = None,
+    executor: Optional[Executor] = None,
+    metadata_cache: Optional[ObjectMetadataCache] = None,
+) -> AsyncIterator[CopyObjectResult]:
+    """
+    Copy or move objects from one prefix to another, several at a time, yielding each object's result.
+
+    Args:
+        bucket_name (str): Bucket name.
+        sources (AsyncIterable[ObjectTypeDef]): The objects to copy, e.g. from
+            :func:`aws_python.s3.list_objects.iter_s3_objects_async`. Every key must start with ``source_prefix``.
+        source_prefix (str): Prefix replaced in the key of every object.
+        destination_prefix (str): Prefix it is replaced with.
+        delete_sources (bool, optional): Delete each source once it was copied, i.e. move them. Defaults to False.
+        max_concurrency (int, optional): Maximum number of objects copied at once.
+        multipart_options (MultipartCopyOptions, optional): When and how to copy large objects as multipart uploads.
+        s3_client (Optional[S3Client], optional): S3 client. Defaults to None.
+        executor (Optional[Executor], optional): Executor running the blocking S3 calls. Defaults to None.
+        metadata_cache (Optional[ObjectMetadataCache], optional): Cache to update for the written and deleted objects.
+            Defaults to None.
+
+    Yields:
+        CopyObjectResult: The outcome for each object, in the order the copies finish.
+    """
+    pending: set[asyncio.Task[CopyObjectResult]] = set()
+
+    async def wait_for_a_copy() -> list[CopyObjectResult]:
+        nonlocal pending
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        return [task.result() for task in done]
+
+    try:
+        async for source in sources:
+            if len(pending) >= max_concurrency:
+                for result in await wait_for_a_copy():
+                    yield result
+            pending.add(
+                asyncio.create_task(
+                    transfer_s3_object_async(
+                        bucket_name,
+                        source=source,
+                        destination_key=destination_prefix
+                        + source["Key"].removeprefix(source_prefix),
+                        delete_source=delete_sources,
+                        multipart_options=multipart_options,
+                        s3_client=s3_client,
+                        executor=executor,
+                        metadata_cache=metadata_cache,
+                    )
+                )
+            )
+        while pending:
+            for result in await wait_for_a_copy():
+                yield result
+    finally:
+        # the consumer went away, e.g. the client disconnected: do not start more copies
+        for task in pending:
+            task.cancel()
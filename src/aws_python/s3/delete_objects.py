@@ -1,17 +1,38 @@
 """Functions for deleting objects from an S3 bucket--the "D" in CRUD."""
 
-from typing import Optional
+from typing import (
+    NamedTuple,
+    Optional,
+)
 
 import boto3
+from botocore.exceptions import ClientError
+
+from aws_python.s3.metadata_cache import ObjectMetadataCache
 
 try:
     from mypy_boto3_s3 import S3Client
 except ImportError:
     ...
 
+# S3 deletes at most this many keys per `delete_objects` call
+DELETE_OBJECTS_MAX_KEYS = 1_000
+
+
+class DeleteObjectResult(NamedTuple):
+    """The outcome of deleting one key in a batch."""
+
+    object_key: str
+    deleted: bool
+    error_code: Optional[str] = None
+    error_message: Optional[str] = None
+
 
 def delete_s3_object(
-    bucket_name: str, object_key: str, s3_client: Optional["S3Client"] = None
+    bucket_name: str,
+    object_key: str,
+    s3_client: Optional["S3Client"] = None,
+    metadata_cache: Optional[ObjectMetadataCache] = None,
 ) -> None:
     """
     Delete an object from the S3 bucket.
@@ -20,7 +41,78 @@ def delete_s3_object(
         bucket_name (str): Name of the S3 bucket.
         object_key (str): Key of the object to delete.
         s3_client (Optional[S3Client]): Optional S3 client to use. If not provided, a new client will be created.
+        metadata_cache (Optional[ObjectMetadataCache]): Optional cache to record the object as missing in.
 
     """
     s3_client = s3_client or boto3.client("s3")
     s3_client.delete_object(Bucket=bucket_name, Key=object_key)
+    if metadata_cache is not None:
+        metadata_cache.put_missing(bucket_name, object_key)
+
+
+def delete_s3_objects(
+    bucket_name: str,
+    object_keys: list[str],
+    s3_client: Optional["S3Client"] = None,
+    metadata_cache: Optional[ObjectMetadataCache] = None,
+) -> list[DeleteObjectResult]:
+    """
+    Delete up to 1,000 objects from the S3 bucket with a single request.
+
+    Like `delete_object`, deleting a key that does not exist counts as a success. If the whole
+    request fails, every key is reported with the request's error instead of raising, so one
+    failed batch does not hide the outcome of the others.
+
+    Args:
+        bucket_name (str): Name of the S3 bucket.
+        object_keys (list[str]): Keys of the objects to delete. At most 1,000.
+        s3_client (Optional[S3Client]): Optional S3 client to use. If not provided, a new client will be created.
+        metadata_cache (Optional[ObjectMetadataCache]): Optional cache to record the deleted objects as missing in.
+
+    Returns:
+        list[DeleteObjectResult]: The outcome for each key, deleted keys first.
+    """
+    if len(object_keys) > DELETE_OBJECTS_MAX_KEYS:
+        raise ValueError(
+            f"Cannot delete more than {DELETE_OBJECTS_MAX_KEYS} objects at once"
+        )
+    if not object_keys:
+        return []
+
+    s3_client = s3_client or boto3.client("s3")
+    try:
+        response = s3_client.delete_objects(
+            Bucket=bucket_name,
+            Delete={"Objects": [{"Key": object_key} for object_key in object_keys]},
+        )
+    except ClientError as e:
+        return [
+            DeleteObjectResult(
+                object_key=object_key,
+                deleted=False,
+                error_code=e.response["Error"]["Code"],
+                error_message=e.response["Error"].get("Message"),
+            )
+            for object_key in object_keys
+        ]
+
+    results = [
+        DeleteObjectResult(object_key=deleted["Key"], deleted=True)
+        for deleted in response.get("Deleted", [])
+    ]
+    results += [
+        DeleteObjectResult(
+            object_key=error["Key"],
+            deleted=False,
+            error_code=error.get("Code"),
+            error_message=error.get("Message"),
+        )
+        for error in response.get("Errors", [])
+    ]
+    if metadata_cache is not None:
+        for result in results:
+            if result.deleted:
+                metadata_cache.put_missing(bucket_name, result.object_key)
+            else:
+                metadata_cache.invalidate(bucket_name, result.object_key)
+    return results
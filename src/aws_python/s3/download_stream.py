@@ -0,0 +1,70 @@
+"""Stream S3 object bodies to clients in large chunks with a bounded read-ahead.
+
+Handing botocore's ``StreamingBody`` to Starlette directly makes it iterate the body
+synchronously through its thread pool, one 1 KiB chunk per hop. Here a background task
+reads large chunks on the S3 executor into a small queue while earlier chunks are being
+written to the socket, so S3 reads and socket writes overlap. Memory per download stays
+around ``chunk_size * (read_ahead_chunks + 1)``, and the body is always closed, also
+when the client disconnects mid-download.
+"""
+
+import asyncio
+from concurrent.futures import Executor
+from typing import (
+    AsyncGenerator,
+    Optional,
+)
+
+from botocore.response import StreamingBody
+
+from aws_python.s3.async_objects import run_in_s3_executor
+
+DEFAULT_DOWNLOAD_CHUNK_SIZE_BYTES = 1024 * 1024
+DEFAULT_DOWNLOAD_READ_AHEAD_CHUNKS = 2
+
+
+async def iter_s3_body_async(
+    body: StreamingBody,
+    chunk_size: int = DEFAULT_DOWNLOAD_CHUNK_SIZE_BYTES,
+    read_ahead_chunks: int = DEFAULT_DOWNLOAD_READ_AHEAD_CHUNKS,
+    executor: Optional[Executor] = None,
+) -> AsyncGenerator[bytes, None]:
+    """
+    Yield an S3 object's body in chunks, reading ahead while the consumer is busy.
+
+    Args:
+        body (StreamingBody): The `Body` of a `get_object` response. It is closed when the
+            iteration ends, fails or is abandoned.
+        chunk_size (int, optional): Bytes read from S3 per call.
+        read_ahead_chunks (int, optional): Chunks buffered ahead of the consumer.
+        executor (Optional[Executor], optional): Executor running the blocking reads. Defaults to None.
+
+    Yields:
+        bytes: The next chunk of at most `chunk_size` bytes.
+    """
+    queue: asyncio.Queue[bytes | BaseException] = asyncio.Queue(
+        maxsize=read_ahead_chunks
+    )
+
+    async def read_body() -> None:
+        try:
+            while chunk := await run_in_s3_executor(executor, body.read, chunk_size):
+                await queue.put(chunk)
+            # an empty chunk marks the end of the body
+            await queue.put(b"")
+        except Exception as e:
+            await queue.put(e)
+
+    reader = asyncio.create_task(read_body())
+    try:
+        while True:
+            chunk = await queue.get()
+            if isinstance(chunk, BaseException):
+                raise chunk
+            if not chunk:
+                return
+            yield chunk
+    finally:
+        reader.cancel()
+        # a read still running on the executor finishes on its own; closing drops the connection
+        body.close()
@@ -0,0 +1,303 @@
+"""Walk every page of a listing while the caller is still busy with the previous page.
+
+Listing a large prefix is a chain of dependent `list_objects_v2` calls, each waiting for
+the previous continuation token. The next page is requested as soon as the current one
+arrives, so S3's latency overlaps with the caller writing the current page out. At most
+two pages, i.e. 2,000 objects, are held at a time, however many objects are listed.
+With ``max_concurrency`` above 1, the key space is split into ranges that are listed
+concurrently instead, see :func:`aws_python.s3.read_objects.fetch_s3_objects_in_parallel`.
+Every S3 call of such a listing runs on the executor shared by all requests, and only
+holds a thread for the duration of the call, so concurrent listings never use more
+threads and connections than the executor has.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Executor
+from typing import (
+    AsyncGenerator,
+    AsyncIterator,
+    Generator,
+    Optional,
+    TypeVar,
+)
+
+from aws_python.s3.async_objects import (
+    fetch_s3_objects_page_async,
+    run_in_s3_executor,
+)
+from aws_python.s3.metadata_cache import ObjectMetadataCache
+from aws_python.s3.read_objects import (
+    DEFAULT_MAX_KEYS,
+    DEFAULT_PARALLEL_LISTING_MAX_RANGES,
+    DEFAULT_PARALLEL_LISTING_READ_AHEAD_PAGES,
+    S3KeyRange,
+    S3ObjectsPage,
+    fetch_first_s3_key_after,
+    fetch_s3_key_range,
+    find_s3_split_prefix,
+    get_s3_key_sampling_candidates,
+    select_s3_key_range_boundaries,
+    split_s3_key_space,
+)
+
+try:
+    from mypy_boto3_s3 import S3Client
+    from mypy_boto3_s3.type_defs import ObjectTypeDef
+except ImportError:
+    ...
+
+T = TypeVar("T")
+
+
+async def iter_generator_in_executor_async(
+    generator: Generator[T, None, None], executor: Optional[Executor] = None
+) -> AsyncIterator[T]:
+    """
+    Advance a blocking generator on the executor, and close it there once the consumer goes away.
+
+    A generator cannot be closed while `next` is running it on another thread, e.g. when the
+    consumer was cancelled mid-page. Closing waits for that call to return instead, so the
+    generator's cleanup always runs, on an executor thread.
+
+    Args:
+        generator (Generator[T, None, None]): Yields the items. It must not yield None.
+        executor (Optional[Executor], optional): Executor running the generator. Defaults to None.
+
+    Yields:
+        T: The next item of the generator.
+    """
+    running = threading.Lock()
+
+    def advance() -> Optional[T]:
+        with running:
+            return next(generator, None)
+
+    def close() -> None:
+        with running:
+            generator.close()
+
+    try:
+        while (item := await run_in_s3_executor(executor, advance)) is not None:
+            yield item
+    finally:
+        await run_in_s3_executor(executor, close)
+
+
+async def iter_s3_object_pages_async(
+    bucket_name: str,
+    prefix: str = "",
+    page_size: int = DEFAULT_MAX_KEYS,
+    s3_client: Optional["S3Client"] = None,
+    executor: Optional[Executor] = None,
+    metadata_cache: Optional[ObjectMetadataCache] = None,
+    max_concurrency: int = 1,
+) -> AsyncGenerator[list["ObjectTypeDef"], None]:
+    """
+    Yield every object under a prefix page by page, fetching the next page in the background.
+
+    Args:
+        bucket_name (str): Name of the S3 bucket.
+        prefix (str, optional): Prefix the keys start with. Defaults to the whole bucket.
+        page_size (int, optional): Objects per `list_objects_v2` call. S3 returns at most 1,000.
+        s3_client (Optional[S3Client], optional): S3 client. Defaults to None.
+        executor (Optional[Executor], optional): Executor running the blocking S3 calls. Defaults to None.
+        metadata_cache (Optional[ObjectMetadataCache], optional): Cache to populate with the listed objects.
+            Only populated by sequential listings. Defaults to None.
+        max_concurrency (int, optional): Maximum number of key ranges listed at once. Defaults to 1,
+            i.e. one sequential listing.
+
+    Yields:
+        list[ObjectTypeDef]: The objects of the next page, in lexicographic order of their keys.
+    """
+    if max_concurrency > 1:
+        async for files in iter_s3_object_pages_in_parallel_async(
+            bucket_name,
+            prefix=prefix,
+            page_size=page_size,
+            max_concurrency=max_concurrency,
+            s3_client=s3_client,
+            executor=executor,
+        ):
+            yield files
+        return
+
+    def fetch_page(continuation_token: Optional[str]) -> asyncio.Task[S3ObjectsPage]:
+        return asyncio.create_task(
+            fetch_s3_objects_page_async(
+                bucket_name,
+                prefix=prefix,
+                continuation_token=continuation_token,
+                max_keys=page_size,
+                s3_client=s3_client,
+                executor=executor,
+                metadata_cache=metadata_cache,
+            )
+        )
+
+    next_page: Optional[asyncio.Task[S3ObjectsPage]] = fetch_page(None)
+    try:
+        while next_page is not None:
+            page = await next_page
+            next_page = (
+                fetch_page(page.next_continuation_token)
+                if page.next_continuation_token
+                else None
+            )
+            if page.files:
+                yield page.files
+    finally:
+        # the consumer went away, e.g. the client disconnected
+        if next_page is not None:
+            next_page.cancel()
+
+
+async def find_s3_key_range_boundaries_async(
+    bucket_name: str,
+    prefix: str = "",
+    start_after: Optional[str] = None,
+    delimiter: str = "/",
+    max_concurrency: int = 1,
+    s3_client: Optional["S3Client"] = None,
+    executor: Optional[Executor] = None,
+) -> list[str]:
+    """Async variant of :func:`aws_python.s3.read_objects.find_s3_key_range_boundaries`, sampling `max_concurrency` keys at once."""
+    split_prefix, directories = await run_in_s3_executor(
+        executor,
+        find_s3_split_prefix,
+        bucket_name,
+        prefix=prefix,
+        start_after=start_after,
+        delimiter=delimiter,
+        s3_client=s3_client,
+    )
+    if len(directories) > 1:
+        return select_s3_key_range_boundaries(directories, start_after)
+
+    sampling = asyncio.Semaphore(max_concurrency)
+
+    async def first_key_after(candidate: str) -> Optional[str]:
+        async with sampling:
+            return await run_in_s3_executor(
+                executor,
+                fetch_first_s3_key_after,
+                bucket_name,
+                prefix=prefix,
+                start_after=candidate,
+                s3_client=s3_client,
+            )
+
+    sampled_keys = await asyncio.gather(
+        *(
+            first_key_after(candidate)
+            for candidate in get_s3_key_sampling_candidates(split_prefix)
+        )
+    )
+    return select_s3_key_range_boundaries(
+        [key for key in sampled_keys if key is not None], start_after
+    )
+
+
+async def iter_s3_object_pages_in_parallel_async(
+    bucket_name: str,
+    prefix: str = "",
+    page_size: int = DEFAULT_MAX_KEYS,
+    max_concurrency: int = 1,
+    max_ranges: int = DEFAULT_PARALLEL_LISTING_MAX_RANGES,
+    read_ahead_pages: int = DEFAULT_PARALLEL_LISTING_READ_AHEAD_PAGES,
+    delimiter: str = "/",
+    s3_client: Optional["S3Client"] = None,
+    executor: Optional[Executor] = None,
+) -> AsyncGenerator[list["ObjectTypeDef"], None]:
+    """
+    Async variant of :func:`aws_python.s3.read_objects.fetch_s3_objects_in_parallel` running on a shared executor.
+
+    Ranges are listed by tasks instead of threads of their own. A task waiting for the
+    consumer holds no thread, so listings cannot starve the executor they run on.
+
+    Yields:
+        list[ObjectTypeDef]: The next non-empty page of objects, in lexicographic order of their keys.
+    """
+    first_page = await fetch_s3_objects_page_async(
+        bucket_name,
+        prefix=prefix,
+        max_keys=page_size,
+        s3_client=s3_client,
+        executor=executor,
+    )
+    if first_page.files:
+        yield first_page.files
+    if not first_page.next_continuation_token:
+        return
+
+    start_after = first_page.files[-1]["Key"]
+    boundaries = await find_s3_key_range_boundaries_async(
+        bucket_name,
+        prefix=prefix,
+        start_after=start_after,
+        delimiter=delimiter,
+        max_concurrency=max_concurrency,
+        s3_client=s3_client,
+        executor=executor,
+    )
+    key_ranges = split_s3_key_space(boundaries, max_ranges, start_after=start_after)
+    # waiters acquire the semaphore in order, so the range the consumer waits for is always listed
+    listing = asyncio.Semaphore(max_concurrency)
+
+    async def list_key_range(key_range: S3KeyRange, pages: asyncio.Queue) -> None:
+        async with listing:
+            try:
+                range_pages = fetch_s3_key_range(
+                    bucket_name,
+                    key_range,
+                    prefix=prefix,
+                    max_keys=page_size,
+                    s3_client=s3_client,
+                )
+                async for page in iter_generator_in_executor_async(
+                    range_pages, executor
+                ):
+                    await pages.put(page)
+                # None marks the end of the range
+                await pages.put(None)
+            except Exception as e:
+                await pages.put(e)
+
+    range_pages: list[asyncio.Queue] = [
+        asyncio.Queue(maxsize=read_ahead_pages) for _ in key_ranges
+    ]
+    tasks = [
+        asyncio.create_task(list_key_range(key_range, pages))
+        for key_range, pages in zip(key_ranges, range_pages)
+    ]
+    try:
+        for pages in range_pages:
+            while (page := await pages.get()) is not None:
+                if isinstance(page, Exception):
+                    raise page
+                yield page
+    finally:
+        # the consumer went away, e.g. the client disconnected
+        for task in tasks:
+            task.cancel()
+
+
+async def iter_s3_objects_async(
+    bucket_name: str,
+    prefix: str = "",
+    page_size: int = DEFAULT_MAX_KEYS,
+    s3_client: Optional["S3Client"] = None,
+    executor: Optional[Executor] = None,
+    max_concurrency: int = 1,
+) -> AsyncGenerator["ObjectTypeDef", None]:
+    """Yield every object under a prefix, see :func:`iter_s3_object_pages_async`."""
+    async for page in iter_s3_object_pages_async(
+        bucket_name,
+        prefix=prefix,
+        page_size=page_size,
+        s3_client=s3_client,
+        executor=executor,
+        max_concurrency=max_concurrency,
+    ):
+        for s3_object in page:
+            yield s3_object
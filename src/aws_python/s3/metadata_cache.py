@@ -0,0 +1,232 @@
+"""In-process cache of S3 object metadata to save HEAD requests.
+
+Entries expire after a TTL and the least recently used entries are evicted once the
+cache is full. Writes and deletes made through this process update the cache right
+away; writes made by other processes are picked up once the TTL expires, so the TTL
+bounds how stale an answer can be.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import (
+    dataclass,
+    field,
+)
+from datetime import (
+    datetime,
+    timezone,
+)
+from email.utils import parsedate_to_datetime
+from typing import (
+    Callable,
+    Optional,
+)
+
+try:
+    from mypy_boto3_s3.type_defs import (
+        GetObjectOutputTypeDef,
+        HeadObjectOutputTypeDef,
+        ObjectTypeDef,
+        PutObjectOutputTypeDef,
+    )
+except ImportError:
+    ...
+
+DEFAULT_METADATA_CACHE_MAX_ENTRIES = 10_000
+DEFAULT_METADATA_CACHE_TTL_SECONDS = 30.0
+DEFAULT_METADATA_CACHE_NEGATIVE_TTL_SECONDS = 5.0
+
+
+@dataclass(frozen=True)
+class ObjectMetadata:
+    """The subset of an object's metadata needed to answer HEAD requests."""
+
+    content_length: int
+    etag: str
+    last_modified: datetime
+    # listings do not include the content type
+    content_type: Optional[str] = None
+    # user metadata sent as `x-amz-meta-*` headers, not included in listings either
+    metadata: dict[str, str] = field(default_factory=dict)
+    # e.g. `gzip` for objects stored compressed
+    content_encoding: Optional[str] = None
+
+    @classmethod
+    def from_head_object_response(
+        cls, response: "HeadObjectOutputTypeDef | GetObjectOutputTypeDef"
+    ) -> "ObjectMetadata":
+        """Build metadata from a `head_object` or (non-ranged) `get_object` response."""
+        return cls(
+            content_length=response["ContentLength"],
+            etag=response["ETag"],
+            last_modified=response["LastModified"],
+            content_type=response.get("ContentType"),
+            metadata=dict(response.get("Metadata", {})),
+            content_encoding=response.get("ContentEncoding"),
+        )
+
+    @classmethod
+    def from_listed_object(cls, listed_object: "ObjectTypeDef") -> "ObjectMetadata":
+        """Build metadata from an entry of a `list_objects_v2` response."""
+        return cls(
+            content_length=listed_object["Size"],
+            etag=listed_object["ETag"],
+            last_modified=listed_object["LastModified"],
+        )
+
+    @classmethod
+    def from_put_object_response(
+        cls,
+        response: "PutObjectOutputTypeDef",
+        content_length: int,
+        content_type: str,
+        metadata: Optional[dict[str, str]] = None,
+        content_encoding: Optional[str] = None,
+    ) -> "ObjectMetadata":
+        """
+        Build metadata from a `put_object` response.
+
+        S3 stamps `LastModified` when it receives the request, so the response's `Date` header is
+        at most a second later. Erring late is safe: conditional requests may get a full response
+        instead of a 304, never the opposite.
+        """
+        date_header = response["ResponseMetadata"]["HTTPHeaders"].get("date")
+        last_modified = (
+            parsedate_to_datetime(date_header)
+            if date_header
+            else datetime.now(tz=timezone.utc)
+        )
+        return cls(
+            content_length=content_length,
+            etag=response["ETag"],
+            last_modified=last_modified,
+            content_type=content_type,
+            metadata=metadata or {},
+            content_encoding=content_encoding,
+        )
+
+    def to_head_object_response(self) -> dict:
+        """Return the metadata with the same keys as a `head_object` response."""
+        return {
+            "ContentLength": self.content_length,
+            "ContentType": self.content_type,
+            "ETag": self.etag,
+            "LastModified": self.last_modified,
+            "Metadata": self.metadata,
+            "ContentEncoding": self.content_encoding,
+        }
+
+
+@dataclass(frozen=True)
+class _CacheEntry:
+    # None marks an object known not to exist
+    metadata: Optional[ObjectMetadata]
+    expires_at: float
+
+
+class ObjectMetadataCache:
+    """Thread-safe LRU cache of object metadata with a TTL, including negative entries for missing objects."""
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_METADATA_CACHE_MAX_ENTRIES,
+        ttl_seconds: float = DEFAULT_METADATA_CACHE_TTL_SECONDS,
+        negative_ttl_seconds: float = DEFAULT_METADATA_CACHE_NEGATIVE_TTL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._clock = clock
+        self._entries: OrderedDict[tuple[str, str], _CacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Return the number of cached entries, including expired ones not evicted yet."""
+        return len(self._entries)
+
+    def lookup(
+        self, bucket_name: str, object_key: str
+    ) -> tuple[bool, Optional[ObjectMetadata]]:
+        """
+        Look up the metadata of an object.
+
+        Args:
+            bucket_name (str): Name of the S3 bucket.
+            object_key (str): Key of the object.
+
+        Returns:
+            tuple[bool, Optional[ObjectMetadata]]: Whether the object was found in the cache and its
+                metadata. The metadata is None both on a miss and for objects cached as missing.
+        """
+        cache_key = (bucket_name, object_key)
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is None or entry.expires_at <= self._clock():
+                if entry is not None:
+                    del self._entries[cache_key]
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(cache_key)
+            self.hits += 1
+            return True, entry.metadata
+
+    def put(self, bucket_name: str, object_key: str, metadata: ObjectMetadata) -> None:
+        """Cache the metadata of an existing object."""
+        cache_key = (bucket_name, object_key)
+        with self._lock:
+            cached = self._entries.get(cache_key)
+            if (
+                metadata.content_type is None
+                and cached is not None
+                and cached.metadata is not None
+                and cached.metadata.etag == metadata.etag
+            ):
+                # a listing refreshes an entry without erasing the content type we already know
+                metadata = cached.metadata
+            self._set(cache_key, metadata, self.ttl_seconds)
+
+    def put_missing(self, bucket_name: str, object_key: str) -> None:
+        """Cache that an object does not exist."""
+        with self._lock:
+            self._set((bucket_name, object_key), None, self.negative_ttl_seconds)
+
+    def invalidate(self, bucket_name: str, object_key: str) -> None:
+        """Forget anything cached about an object."""
+        with self._lock:
+            self._entries.pop((bucket_name, object_key), None)
+
+    def clear(self) -> None:
+        """Forget all cached entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict[str, int]:
+        """Return the hit and miss counters and the current number of entries."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+            }
+
+    def _set(
+        self,
+        cache_key: tuple[str, str],
+        metadata: Optional[ObjectMetadata],
+        ttl_seconds: float,
+    ) -> None:
+        if ttl_seconds <= 0:
+            self._entries.pop(cache_key, None)
+            return
+        self._entries[cache_key] = _CacheEntry(
+            metadata=metadata, expires_at=self._clock() + ttl_seconds
+        )
+        self._entries.move_to_end(cache_key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
@@ -0,0 +1,204 @@
+"""Stream an upload of unknown size into S3 without holding the whole object in memory.
+
+The incoming bytes are cut into parts of ``part_size`` bytes which are uploaded with
+S3's multipart upload API while the next part is being read. At most
+``max_concurrency`` parts are in flight at once, so peak memory stays around
+``part_size * (max_concurrency + 1)`` regardless of the object size.
+"""
+
+import asyncio
+from concurrent.futures import Executor
+from typing import (
+    AsyncIterable,
+    AsyncIterator,
+    Optional,
+)
+
+from loguru import logger
+
+from aws_python.s3.async_objects import run_in_s3_executor
+from aws_python.s3.metadata_cache import ObjectMetadataCache
+from aws_python.s3.write_objects import (
+    abort_multipart_upload,
+    complete_multipart_upload,
+    create_multipart_upload,
+    upload_part,
+    upload_s3_object,
+)
+
+try:
+    from mypy_boto3_s3 import S3Client
+    from mypy_boto3_s3.type_defs import CompletedPartTypeDef
+except ImportError:
+    ...
+
+# S3 rejects multipart uploads whose parts (except the last one) are smaller than 5 MiB
+MIN_MULTIPART_PART_SIZE_BYTES = 5 * 1024 * 1024
+DEFAULT_MULTIPART_PART_SIZE_BYTES = 8 * 1024 * 1024
+DEFAULT_MULTIPART_MAX_CONCURRENCY = 4
+
+
+async def iter_parts(
+    chunks: AsyncIterable[bytes], part_size: int
+) -> AsyncIterator[bytes]:
+    """
+    Regroup a stream of arbitrarily sized chunks into parts of exactly ``part_size`` bytes.
+
+    Args:
+        chunks (AsyncIterable[bytes]): Source of the object's bytes.
+        part_size (int): Size of every yielded part except the last one.
+
+    Yields:
+        bytes: The next part. The last part holds the remainder and may be smaller.
+    """
+    buffer = bytearray()
+    async for chunk in chunks:
+        buffer += chunk
+        while len(buffer) >= part_size:
+            yield bytes(buffer[:part_size])
+            del buffer[:part_size]
+    if buffer:
+        yield bytes(buffer)
+
+
+async def upload_s3_object_multipart_async(
+    bucket_name: str,
+    object_key: str,
+    chunks: AsyncIterable[bytes],
+    content_type: Optional[str] = None,
+    part_size: int = DEFAULT_MULTIPART_PART_SIZE_BYTES,
+    max_concurrency: int = DEFAULT_MULTIPART_MAX_CONCURRENCY,
+    s3_client: Optional["S3Client"] = None,
+    executor: Optional[Executor] = None,
+    metadata_cache: Optional[ObjectMetadataCache] = None,
+    content_encoding: Optional[str] = None,
+    metadata: Optional[dict[str, str]] = None,
+) -> None:
+    """
+    Upload a stream of bytes to S3, using a multipart upload once it exceeds one part.
+
+    Objects that fit into a single part are written with one `put_object` call. Larger
+    objects are uploaded part by part while the stream is still being read. If reading
+    or uploading fails (or the caller is cancelled), the multipart upload is aborted so
+    no incomplete parts are left behind.
+
+    Args:
+        bucket_name (str): Bucket name.
+        object_key (str): Object key.
+        chunks (AsyncIterable[bytes]): Source of the object's bytes.
+        content_type (Optional[str], optional): Content type in MIME format. Defaults to None.
+        part_size (int, optional): Size of each uploaded part. Must be at least 5 MiB.
+        max_concurrency (int, optional): Maximum number of parts uploaded at once.
+        s3_client (Optional[S3Client], optional): S3 client. Defaults to None.
+        executor (Optional[Executor], optional): Executor running the blocking S3 calls. Defaults to None.
+        metadata_cache (Optional[ObjectMetadataCache], optional): Cache to update for the written object. Defaults to None.
+        content_encoding (Optional[str], optional): Encoding of the streamed bytes, e.g. `gzip`. Defaults to None.
+        metadata (Optional[dict[str, str]], optional): User metadata stored as `x-amz-meta-*` headers. Defaults to None.
+    """
+    if part_size < MIN_MULTIPART_PART_SIZE_BYTES:
+        raise ValueError(
+            f"part_size must be at least {MIN_MULTIPART_PART_SIZE_BYTES} bytes"
+        )
+
+    parts = iter_parts(chunks, part_size)
+    first_part = await anext(parts, b"")
+    second_part = await anext(parts, None)
+
+    if second_part is None:
+        await run_in_s3_executor(
+            executor,
+            upload_s3_object,
+            bucket_name=bucket_name,
+            object_key=object_key,
+            file_content=first_part,
+            content_type=content_type,
+            s3_client=s3_client,
+            metadata_cache=metadata_cache,
+            content_encoding=content_encoding,
+            metadata=metadata,
+        )
+        return
+
+    upload_id: str = await run_in_s3_executor(
+        executor,
+        create_multipart_upload,
+        bucket_name=bucket_name,
+        object_key=object_key,
+        content_type=content_type,
+        s3_client=s3_client,
+        content_encoding=content_encoding,
+        metadata=metadata,
+    )
+    slots = asyncio.Semaphore(max_concurrency)
+    tasks: list[asyncio.Task["CompletedPartTypeDef"]] = []
+
+    async def upload_one_part(part_number: int, part_content: bytes):
+        try:
+            return await run_in_s3_executor(
+                executor,
+                upload_part,
+                bucket_name=bucket_name,
+                object_key=object_key,
+                upload_id=upload_id,
+                part_number=part_number,
+                part_content=part_content,
+                s3_client=s3_client,
+            )
+        finally:
+            slots.release()
+
+    async def all_parts() -> AsyncIterator[bytes]:
+        yield first_part
+        yield second_part
+        async for part in parts:
+            yield part
+
+    completed = False
+    try:
+        part_number = 0
+        async for part_content in all_parts():
+            part_number += 1
+            # wait for a free slot before reading on, so at most `max_concurrency` parts are buffered
+            await slots.acquire()
+            for task in tasks:
+                # parts are only cancelled along with the whole upload, which then fails on its own
+                if task.done() and not task.cancelled() and task.exception():
+                    slots.release()
+                    raise task.exception()  # type: ignore[misc]
+            tasks.append(
+                asyncio.create_task(upload_one_part(part_number, part_content))
+            )
+
+        completed_parts = list(await asyncio.gather(*tasks))
+        await run_in_s3_executor(
+            executor,
+            complete_multipart_upload,
+            bucket_name=bucket_name,
+            object_key=object_key,
+            upload_id=upload_id,
+            parts=completed_parts,
+            s3_client=s3_client,
+            metadata_cache=metadata_cache,
+        )
+        completed = True
+    except BaseException:
+        logger.opt(exception=True).warning(
+            "Aborting multipart upload of {object_key}", object_key=object_key
+        )
+        raise
+    finally:
+        if not completed:
+            try:
+                # let in-flight parts finish first, otherwise they could land after the abort
+                await asyncio.gather(*tasks, return_exceptions=True)
+            finally:
+                await asyncio.shield(
+                    run_in_s3_executor(
+                        executor,
+                        abort_multipart_upload,
+                        bucket_name=bucket_name,
+                        object_key=object_key,
+                        upload_id=upload_id,
+                        s3_client=s3_client,
+                    )
+                )
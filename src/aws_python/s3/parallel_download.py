@@ -0,0 +1,198 @@
+"""Download large objects as several concurrent byte-range GETs, the counterpart of multipart upload.
+
+A single S3 GET stream is capped well below what an instance can receive. Objects are
+cut into ``part_size`` ranges, up to ``max_concurrency`` of them are fetched at once,
+and the parts are yielded in order. Parts that arrive early wait in their tasks, so the
+reorder buffer holds at most ``max_concurrency`` parts and memory stays around
+``part_size * (max_concurrency + 1)``. Every range is pinned to the object's ETag, so a
+concurrent overwrite fails the download instead of mixing two versions.
+"""
+
+import asyncio
+from collections import deque
+from concurrent.futures import Executor
+from typing import (
+    AsyncIterator,
+    Iterator,
+    Optional,
+)
+
+import boto3
+from botocore.exceptions import (
+    BotoCoreError,
+    ClientError,
+)
+from botocore.response import StreamingBody
+from loguru import logger
+
+from aws_python.byte_ranges import ByteRange
+from aws_python.s3.async_objects import run_in_s3_executor
+
+try:
+    from mypy_boto3_s3 import S3Client
+except ImportError:
+    ...
+
+DEFAULT_PARALLEL_DOWNLOAD_PART_SIZE_BYTES = 8 * 1024 * 1024
+DEFAULT_PARALLEL_DOWNLOAD_MAX_CONCURRENCY = 8
+DEFAULT_PARALLEL_DOWNLOAD_MAX_ATTEMPTS = 3
+
+_RETRYABLE_ERROR_CODES = {
+    "InternalError",
+    "RequestTimeout",
+    "ServiceUnavailable",
+    "SlowDown",
+}
+
+
+class IncompleteRangeError(Exception):
+    """S3 returned fewer bytes than requested for a range."""
+
+
+def iter_byte_ranges(object_size: int, part_size: int) -> Iterator[ByteRange]:
+    """Cut an object into consecutive inclusive ranges of ``part_size`` bytes."""
+    for start in range(0, object_size, part_size):
+        yield ByteRange(start=start, end=min(start + part_size, object_size) - 1)
+
+
+def is_retryable_error(error: Exception) -> bool:
+    """Check if fetching a range again may succeed, i.e. the error is not caused by the request itself."""
+    if isinstance(error, ClientError):
+        status_code = error.response.get("ResponseMetadata", {}).get(
+            "HTTPStatusCode", 0
+        )
+        return (
+            status_code >= 500
+            or error.response["Error"]["Code"] in _RETRYABLE_ERROR_CODES
+        )
+    return isinstance(error, (BotoCoreError, IncompleteRangeError))
+
+
+def fetch_s3_object_range(
+    bucket_name: str,
+    object_key: str,
+    byte_range: ByteRange,
+    etag: str,
+    s3_client: Optional["S3Client"] = None,
+) -> bytes:
+    """
+    Fetch one byte range of an object into memory.
+
+    Args:
+        bucket_name (str): Name of the S3 bucket.
+        object_key (str): Key of the object.
+        byte_range (ByteRange): The range to fetch. Both ends must be set.
+        etag (str): ETag the object must still have.
+        s3_client (Optional[S3Client]): Optional S3 client to use. If not provided, a new client will be created.
+
+    Returns:
+        bytes: The content of the range.
+
+    Raises:
+        ClientError: With code `PreconditionFailed` if the object changed.
+        IncompleteRangeError: If the connection ended before the whole range was received.
+    """
+    s3_client = s3_client or boto3.client("s3")
+    response = s3_client.get_object(
+        Bucket=bucket_name,
+        Key=object_key,
+        Range=byte_range.to_range_header(),
+        IfMatch=etag,
+    )
+    content = response["Body"].read()
+    expected_size = byte_range.end - byte_range.start + 1  # type: ignore[operator]
+    if len(content) != expected_size:
+        raise IncompleteRangeError(
+            f"Expected {expected_size} bytes for {byte_range.to_range_header()}, got {len(content)}"
+        )
+    return content
+
+
+async def iter_s3_object_in_parallel_async(
+    bucket_name: str,
+    object_key: str,
+    object_size: int,
+    etag: str,
+    first_body: Optional[StreamingBody] = None,
+    part_size: int = DEFAULT_PARALLEL_DOWNLOAD_PART_SIZE_BYTES,
+    max_concurrency: int = DEFAULT_PARALLEL_DOWNLOAD_MAX_CONCURRENCY,
+    max_attempts: int = DEFAULT_PARALLEL_DOWNLOAD_MAX_ATTEMPTS,
+    s3_client: Optional["S3Client"] = None,
+    executor: Optional[Executor] = None,
+) -> AsyncIterator[bytes]:
+    """
+    Yield an object's content in order, fetching up to ``max_concurrency`` ranges at once.
+
+    Args:
+        bucket_name (str): Name of the S3 bucket.
+        object_key (str): Key of the object.
+        object_size (int): Size of the object in bytes.
+        etag (str): ETag of the object. Ranges of any other version are rejected by S3.
+        first_body (Optional[StreamingBody], optional): Body of a `get_object` call already made for the
+            object. The first part is read from it instead of fetched again. It is closed when the
+            iteration ends. Defaults to None.
+        part_size (int, optional): Size of each range.
+        max_concurrency (int, optional): Maximum number of ranges fetched or buffered at once.
+        max_attempts (int, optional): Attempts per range before giving up on transient errors.
+        s3_client (Optional[S3Client], optional): S3 client. Defaults to None.
+        executor (Optional[Executor], optional): Executor running the blocking S3 calls. Defaults to None.
+
+    Yields:
+        bytes: The next part of the object.
+    """
+
+    def read_first_part(byte_range: ByteRange) -> bytes:
+        content = first_body.read(byte_range.end - byte_range.start + 1)  # type: ignore[union-attr, operator]
+        first_body.close()  # type: ignore[union-attr]
+        if len(content) != byte_range.end - byte_range.start + 1:  # type: ignore[operator]
+            raise IncompleteRangeError("The first body ended early")
+        return content
+
+    async def fetch_part(part_number: int, byte_range: ByteRange) -> bytes:
+        attempt = 1
+        while True:
+            try:
+                if part_number == 0 and first_body is not None and attempt == 1:
+                    return await run_in_s3_executor(
+                        executor, read_first_part, byte_range
+                    )
+                return await run_in_s3_executor(
+                    executor,
+                    fetch_s3_object_range,
+                    bucket_name=bucket_name,
+                    object_key=object_key,
+                    byte_range=byte_range,
+                    etag=etag,
+                    s3_client=s3_client,
+                )
+            except Exception as e:
+                if attempt >= max_attempts or not is_retryable_error(e):
+                    raise
+                logger.opt(exception=e).warning(
+                    "Retrying {range} of {object_key} (attempt {attempt} failed)",
+                    range=byte_range.to_range_header(),
+                    object_key=object_key,
+                    attempt=attempt,
+                )
+                await asyncio.sleep(min(0.1 * 2**attempt, 2.0))
+                attempt += 1
+
+    parts = enumerate(iter_byte_ranges(object_size, part_size))
+    tasks: deque[asyncio.Task[bytes]] = deque()
+    try:
+        for part_number, byte_range in parts:
+            tasks.append(asyncio.create_task(fetch_part(part_number, byte_range)))
+            if len(tasks) == max_concurrency:
+                break
+        while tasks:
+            content = await tasks.popleft()
+            # start the next range before handing this part over, so fetching overlaps sending
+            next_part = next(parts, None)
+            if next_part is not None:
+                tasks.append(asyncio.create_task(fetch_part(*next_part)))
+            yield content
+    finally:
+        for task in tasks:
+            task.cancel()
+        if first_body is not None:
+            first_body.close()
@@ -0,0 +1,232 @@
+"""Presigned S3 URLs that let clients transfer file content directly with S3.
+
+Presigning is a local HMAC computation, no request is sent to S3. URLs for downloading
+and uploading a key are cached until less than half of their validity is left, so hot
+keys reuse one URL (which also lets browsers and CDNs cache the redirect target) and
+every handed-out URL stays usable for at least half the configured expiration.
+"""
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import (
+    datetime,
+    timedelta,
+    timezone,
+)
+from typing import (
+    Callable,
+    Literal,
+    Optional,
+)
+
+import boto3
+
+from aws_python.s3.write_objects import create_multipart_upload
+
+try:
+    from mypy_boto3_s3 import S3Client
+except ImportError:
+    ...
+
+# SigV4 presigned URLs are valid for at most 7 days
+MAX_PRESIGNED_URL_EXPIRATION_SECONDS = 7 * 24 * 60 * 60
+DEFAULT_PRESIGNED_URL_EXPIRATION_SECONDS = 60 * 60
+DEFAULT_PRESIGNED_URL_CACHE_MAX_ENTRIES = 10_000
+# S3 rejects multipart uploads with more parts than this
+MAX_MULTIPART_PARTS = 10_000
+
+PresignedClientMethod = Literal["get_object", "put_object"]
+
+
+@dataclass(frozen=True)
+class PresignedUrl:
+    """A presigned URL and the time it stops working."""
+
+    url: str
+    expires_at: datetime
+
+
+@dataclass(frozen=True)
+class PresignedMultipartUpload:
+    """The URLs a client needs to run a multipart upload against S3 itself."""
+
+    upload_id: str
+    part_size: int
+    part_urls: list[str]
+    complete_url: str
+    abort_url: str
+    expires_at: datetime
+
+
+@dataclass(frozen=True)
+class _CacheEntry:
+    presigned_url: PresignedUrl
+    # clock reading after which the URL is too close to expiring to be handed out again
+    reusable_until: float
+
+
+class PresignedUrlCache:
+    """Thread-safe LRU cache of presigned URLs per client method and object."""
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_PRESIGNED_URL_CACHE_MAX_ENTRIES,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: OrderedDict[tuple[str, str, str], _CacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Return the number of cached URLs, including stale ones not evicted yet."""
+        return len(self._entries)
+
+    def get(
+        self, client_method: PresignedClientMethod, bucket_name: str, object_key: str
+    ) -> Optional[PresignedUrl]:
+        """Return a cached URL that still has at least half of its validity left."""
+        cache_key = (client_method, bucket_name, object_key)
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is None:
+                return None
+            if entry.reusable_until <= self._clock():
+                del self._entries[cache_key]
+                return None
+            self._entries.move_to_end(cache_key)
+            return entry.presigned_url
+
+    def put(
+        self,
+        client_method: PresignedClientMethod,
+        bucket_name: str,
+        object_key: str,
+        presigned_url: PresignedUrl,
+        expires_in: int,
+    ) -> None:
+        """Cache a URL that was just generated with a validity of `expires_in` seconds."""
+        with self._lock:
+            cache_key = (client_method, bucket_name, object_key)
+            self._entries[cache_key] = _CacheEntry(
+                presigned_url=presigned_url,
+                reusable_until=self._clock() + expires_in / 2,
+            )
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Forget all cached URLs."""
+        with self._lock:
+            self._entries.clear()
+
+
+def generate_presigned_object_url(
+    client_method: PresignedClientMethod,
+    bucket_name: str,
+    object_key: str,
+    expires_in: int = DEFAULT_PRESIGNED_URL_EXPIRATION_SECONDS,
+    content_type: Optional[str] = None,
+    s3_client: Optional["S3Client"] = None,
+    presigned_url_cache: Optional[PresignedUrlCache] = None,
+) -> PresignedUrl:
+    """
+    Presign a URL to download (`get_object`) or upload (`put_object`) an object.
+
+    Args:
+        client_method (PresignedClientMethod): The S3 operation the URL grants.
+        bucket_name (str): Name of the S3 bucket.
+        object_key (str): Key of the object.
+        expires_in (int, optional): Validity of the URL in seconds.
+        content_type (Optional[str], optional): Content type an upload must be sent with. Uploads
+            with a content type are not cached, since the signature covers it. Defaults to None.
+        s3_client (Optional[S3Client], optional): S3 client. Defaults to None.
+        presigned_url_cache (Optional[PresignedUrlCache], optional): Cache of URLs generated before. Defaults to None.
+
+    Returns:
+        PresignedUrl: The URL and its expiration time.
+    """
+    use_cache = presigned_url_cache is not None and content_type is None
+    if use_cache:
+        cached = presigned_url_cache.get(client_method, bucket_name, object_key)  # type: ignore[union-attr]
+        if cached is not None:
+            return cached
+
+    s3_client = s3_client or boto3.client("s3")
+    params = {"Bucket": bucket_name, "Key": object_key}
+    if content_type is not None:
+        params["ContentType"] = content_type
+    presigned_url = PresignedUrl(
+        url=s3_client.generate_presigned_url(
+            ClientMethod=client_method, Params=params, ExpiresIn=expires_in
+        ),
+        expires_at=datetime.now(tz=timezone.utc) + timedelta(seconds=expires_in),
+    )
+    if use_cache:
+        presigned_url_cache.put(  # type: ignore[union-attr]
+            client_method, bucket_name, object_key, presigned_url, expires_in
+        )
+    return presigned_url
+
+
+def create_presigned_multipart_upload(
+    bucket_name: str,
+    object_key: str,
+    size_bytes: int,
+    part_size: int,
+    content_type: Optional[str] = None,
+    expires_in: int = DEFAULT_PRESIGNED_URL_EXPIRATION_SECONDS,
+    s3_client: Optional["S3Client"] = None,
+) -> PresignedMultipartUpload:
+    """
+    Start a multipart upload and presign the URLs to upload its parts, complete it and abort it.
+
+    Starting the upload is the only call made to S3. The client uploads part `n` to
+    `part_urls[n - 1]`, then posts the `CompleteMultipartUpload` XML body listing the
+    returned ETags to `complete_url`.
+
+    Args:
+        bucket_name (str): Name of the S3 bucket.
+        object_key (str): Key of the object.
+        size_bytes (int): Size of the object the client is going to upload.
+        part_size (int): Preferred part size. Raised if the object would need more than 10,000 parts.
+        content_type (Optional[str], optional): Content type in MIME format. Defaults to None.
+        expires_in (int, optional): Validity of the URLs in seconds.
+        s3_client (Optional[S3Client], optional): S3 client. Defaults to None.
+
+    Returns:
+        PresignedMultipartUpload: The upload ID and the presigned URLs.
+    """
+    s3_client = s3_client or boto3.client("s3")
+    part_size = max(part_size, math.ceil(size_bytes / MAX_MULTIPART_PARTS))
+    part_count = max(1, math.ceil(size_bytes / part_size))
+    upload_id = create_multipart_upload(
+        bucket_name=bucket_name,
+        object_key=object_key,
+        content_type=content_type,
+        s3_client=s3_client,
+    )
+    params = {"Bucket": bucket_name, "Key": object_key, "UploadId": upload_id}
+
+    def presign(client_method: str, **extra_params) -> str:
+        return s3_client.generate_presigned_url(
+            ClientMethod=client_method,
+            Params={**params, **extra_params},
+            ExpiresIn=expires_in,
+        )
+
+    return PresignedMultipartUpload(
+        upload_id=upload_id,
+        part_size=part_size,
+        part_urls=[
+            presign("upload_part", PartNumber=part_number)
+            for part_number in range(1, part_count + 1)
+        ],
+        complete_url=presign("complete_multipart_upload"),
+        abort_url=presign("abort_multipart_upload"),
+        expires_at=datetime.now(tz=timezone.utc) + timedelta(seconds=expires_in),
+    )
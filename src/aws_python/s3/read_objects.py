@@ -1,14 +1,32 @@
 """Functions for reading objects from an S3 bucket--the "R" in CRUD."""
 
-from typing import Optional
+import math
+import queue
+import threading
+from concurrent.futures import (
+    Executor,
+    ThreadPoolExecutor,
+)
+from datetime import datetime
+from typing import (
+    Generator,
+    NamedTuple,
+    Optional,
+)
 
 import boto3
 from botocore.exceptions import ClientError
 
+from aws_python.s3.metadata_cache import (
+    ObjectMetadata,
+    ObjectMetadataCache,
+)
+
 try:
     from mypy_boto3_s3 import S3Client
     from mypy_boto3_s3.type_defs import (
         GetObjectOutputTypeDef,
+        HeadObjectOutputTypeDef,
         ListObjectsV2OutputTypeDef,
         ObjectTypeDef,
     )
@@ -16,10 +34,18 @@ except ImportError:
     ...
 
 DEFAULT_MAX_KEYS = 1_000
+DEFAULT_PARALLEL_LISTING_MAX_CONCURRENCY = 8
+DEFAULT_PARALLEL_LISTING_MAX_RANGES = 64
+DEFAULT_PARALLEL_LISTING_READ_AHEAD_PAGES = 2
+# directories descended into while looking for a level with several sub-directories
+MAX_BOUNDARY_SEARCH_DEPTH = 8
 
 
 def object_exists_in_s3(
-    bucket_name: str, object_key: str, s3_client: Optional["S3Client"] = None
+    bucket_name: str,
+    object_key: str,
+    s3_client: Optional["S3Client"] = None,
+    metadata_cache: Optional[ObjectMetadataCache] = None,
 ) -> bool:
     """
     Check if an object exists in the S3 bucket using head_object.
@@ -28,24 +54,108 @@ def object_exists_in_s3(
         bucket_name (str): Name of the S3 bucket.
         object_key (str): Key of the object to check.
         s3_client (Optional[S3Client]): Optional S3 client to use. If not provided, a new client will be created.
+        metadata_cache (Optional[ObjectMetadataCache]): Optional cache answering the check without calling S3.
 
     Returns:
         bool: True if the object exists, False otherwise.
     """
+    if metadata_cache is not None:
+        found, metadata = metadata_cache.lookup(bucket_name, object_key)
+        if found:
+            return metadata is not None
+    return _head_object(bucket_name, object_key, s3_client, metadata_cache) is not None
+
+
+def is_not_found_error(error: ClientError) -> bool:
+    """
+    Check if an S3 error means that the requested object does not exist.
+
+    `head_object` has no response body, so S3 reports a bare `404` code; `get_object` reports `NoSuchKey`.
+
+    Args:
+        error (ClientError): Error raised by the S3 client.
+
+    Returns:
+        bool: True if the object does not exist, False for any other error.
+    """
+    return error.response["Error"]["Code"] in {"404", "NoSuchKey", "NotFound"}
+
+
+def is_not_modified_error(error: ClientError) -> bool:
+    """
+    Check if an S3 error is S3 answering `304 Not Modified` to a conditional request.
+
+    Args:
+        error (ClientError): Error raised by the S3 client.
+
+    Returns:
+        bool: True if the object matched the `IfNoneMatch`/`IfModifiedSince` conditions.
+    """
+    return error.response["Error"]["Code"] in {"304", "NotModified"}
+
+
+def fetch_s3_object_metadata(
+    bucket_name: str,
+    object_key: str,
+    s3_client: Optional["S3Client"] = None,
+    metadata_cache: Optional[ObjectMetadataCache] = None,
+) -> Optional["HeadObjectOutputTypeDef"]:
+    """
+    Fetch metadata of an object in the S3 bucket using a single head_object call.
+
+    Args:
+        bucket_name (str): Name of the S3 bucket.
+        object_key (str): Key of the object to describe.
+        s3_client (Optional[S3Client]): Optional S3 client to use. If not provided, a new client will be created.
+        metadata_cache (Optional[ObjectMetadataCache]): Optional cache serving the metadata without calling S3.
+            On a hit only `ContentType`, `ContentLength`, `ETag`, `LastModified`, `Metadata` and `ContentEncoding`
+            are returned.
+
+    Returns:
+        Optional[HeadObjectOutputTypeDef]: Metadata of the object, or None if the object does not exist.
+    """
+    if metadata_cache is not None:
+        found, metadata = metadata_cache.lookup(bucket_name, object_key)
+        if found and metadata is None:
+            return None
+        if found and metadata.content_type is not None:  # type: ignore[union-attr]
+            return metadata.to_head_object_response()  # type: ignore[union-attr, return-value]
+    return _head_object(bucket_name, object_key, s3_client, metadata_cache)
+
+
+def _head_object(
+    bucket_name: str,
+    object_key: str,
+    s3_client: Optional["S3Client"],
+    metadata_cache: Optional[ObjectMetadataCache],
+) -> Optional["HeadObjectOutputTypeDef"]:
+    """Call head_object, mapping a missing object to None and recording the outcome in the cache."""
     s3_client = s3_client or boto3.client("s3")
     try:
-        s3_client.head_object(Bucket=bucket_name, Key=object_key)
-        return True
+        response = s3_client.head_object(Bucket=bucket_name, Key=object_key)
     except ClientError as e:
-        if e.response["Error"]["Code"] == "404":
-            return False
+        if is_not_found_error(e):
+            if metadata_cache is not None:
+                metadata_cache.put_missing(bucket_name, object_key)
+            return None
         raise
 
+    if metadata_cache is not None:
+        metadata_cache.put(
+            bucket_name,
+            object_key,
+            ObjectMetadata.from_head_object_response(response),
+        )
+    return response
+
 
 def fetch_s3_object(
     bucket_name: str,
     object_key: str,
     s3_client: Optional["S3Client"] = None,
+    byte_range: Optional[str] = None,
+    if_none_match: Optional[str] = None,
+    if_modified_since: Optional[datetime] = None,
 ) -> "GetObjectOutputTypeDef":
     """
     Fetch metadata of an object in the S3 bucket.
@@ -54,20 +164,160 @@ def fetch_s3_object(
         bucket_name (str): Name of the S3 bucket.
         object_key (str): Key of the object to fetch.
         s3_client (Optional[S3Client]): Optional S3 client to use. If not provided, a new client will be created.
+        byte_range (Optional[str]): Optional HTTP `Range` value, e.g. `bytes=0-99`, to fetch only part of the object.
+        if_none_match (Optional[str]): Optional ETag; S3 answers 304 instead of the object if it still matches.
+        if_modified_since (Optional[datetime]): Optional date; S3 answers 304 if the object was not modified since.
 
     Returns:
         GetObjectOutputTypeDef: Metadata of the object.
     """
     s3_client = s3_client or boto3.client("s3")
-    response = s3_client.get_object(Bucket=bucket_name, Key=object_key)
+    get_object_kwargs: dict = {}
+    if byte_range:
+        get_object_kwargs["Range"] = byte_range
+    if if_none_match:
+        get_object_kwargs["IfNoneMatch"] = if_none_match
+    if if_modified_since:
+        get_object_kwargs["IfModifiedSince"] = if_modified_since
+    response = s3_client.get_object(
+        Bucket=bucket_name, Key=object_key, **get_object_kwargs
+    )
+    return response
+
+
+def fetch_s3_object_if_exists(
+    bucket_name: str,
+    object_key: str,
+    s3_client: Optional["S3Client"] = None,
+    byte_range: Optional[str] = None,
+    metadata_cache: Optional[ObjectMetadataCache] = None,
+    if_none_match: Optional[str] = None,
+    if_modified_since: Optional[datetime] = None,
+) -> Optional["GetObjectOutputTypeDef"]:
+    """
+    Fetch an object in the S3 bucket using a single get_object call, without checking for it first.
+
+    Args:
+        bucket_name (str): Name of the S3 bucket.
+        object_key (str): Key of the object to fetch.
+        s3_client (Optional[S3Client]): Optional S3 client to use. If not provided, a new client will be created.
+        byte_range (Optional[str]): Optional HTTP `Range` value, e.g. `bytes=0-99`, to fetch only part of the object.
+        metadata_cache (Optional[ObjectMetadataCache]): Optional cache that short-circuits objects known to be missing
+            and is refreshed with the metadata of the fetched object.
+        if_none_match (Optional[str]): Optional ETag; S3 answers 304 instead of the object if it still matches.
+        if_modified_since (Optional[datetime]): Optional date; S3 answers 304 if the object was not modified since.
+
+    Returns:
+        Optional[GetObjectOutputTypeDef]: Metadata and streaming body of the object, or None if the object does not exist.
+
+    Raises:
+        ClientError: With a `304` code if a condition says the caller's copy is current, see `is_not_modified_error`.
+    """
+    if metadata_cache is not None:
+        found, metadata = metadata_cache.lookup(bucket_name, object_key)
+        if found and metadata is None:
+            return None
+
+    try:
+        response = fetch_s3_object(
+            bucket_name,
+            object_key,
+            s3_client,
+            byte_range,
+            if_none_match=if_none_match,
+            if_modified_since=if_modified_since,
+        )
+    except ClientError as e:
+        if is_not_found_error(e):
+            if metadata_cache is not None:
+                metadata_cache.put_missing(bucket_name, object_key)
+            return None
+        raise
+
+    if metadata_cache is not None and not byte_range:
+        metadata_cache.put(
+            bucket_name,
+            object_key,
+            ObjectMetadata.from_head_object_response(response),
+        )
     return response
 
 
+class S3ObjectsPage(NamedTuple):
+    """One page of a `list_objects_v2` listing."""
+
+    files: list["ObjectTypeDef"]
+    # `CommonPrefixes` of a listing with a delimiter, i.e. the sub-directories, ending with the delimiter
+    directories: list[str]
+    next_continuation_token: Optional[str]
+
+
+def fetch_s3_objects_page(
+    bucket_name: str,
+    prefix: Optional[str] = None,
+    delimiter: Optional[str] = None,
+    continuation_token: Optional[str] = None,
+    max_keys: Optional[int] = DEFAULT_MAX_KEYS,
+    s3_client: Optional["S3Client"] = None,
+    metadata_cache: Optional[ObjectMetadataCache] = None,
+    start_after: Optional[str] = None,
+) -> S3ObjectsPage:
+    """
+    Fetch one page of objects, and of sub-directories if a delimiter is given.
+
+    With a delimiter, keys containing it after the prefix are rolled up into one
+    directory entry each, so listing a directory costs O(children) instead of
+    O(descendants).
+
+    Args:
+        bucket_name (str): Name of the S3 bucket to list objects from.
+        prefix (Optional[str]): Prefix to filter objects by.
+        delimiter (Optional[str]): Character grouping keys into directories, usually "/".
+        continuation_token (Optional[str]): Token of the previous page. Pass the same prefix and
+            delimiter again, S3 does not carry them over in the token.
+        max_keys (Optional[int]): Maximum number of files plus directories to return within this page.
+        s3_client (Optional[S3Client]): Optional S3 client to use. If not provided, a new client will be created.
+        metadata_cache (Optional[ObjectMetadataCache]): Optional cache to populate with the listed objects.
+        start_after (Optional[str]): List only keys after this one. Ignored by S3 when continuing a listing.
+
+    Returns:
+        S3ObjectsPage: The files and directories of the page and the next continuation token, if any.
+    """
+    s3_client = s3_client or boto3.client("s3")
+    list_objects_kwargs: dict = {
+        "Bucket": bucket_name,
+        "Prefix": prefix or "",
+        "MaxKeys": max_keys or DEFAULT_MAX_KEYS,
+    }
+    if delimiter:
+        list_objects_kwargs["Delimiter"] = delimiter
+    if continuation_token:
+        list_objects_kwargs["ContinuationToken"] = continuation_token
+    if start_after:
+        list_objects_kwargs["StartAfter"] = start_after
+    response: "ListObjectsV2OutputTypeDef" = s3_client.list_objects_v2(
+        **list_objects_kwargs
+    )
+    files: list["ObjectTypeDef"] = response.get("Contents", [])
+    cache_listed_objects(bucket_name, files, metadata_cache)
+
+    return S3ObjectsPage(
+        files=files,
+        directories=[
+            common_prefix["Prefix"]
+            for common_prefix in response.get("CommonPrefixes", [])
+        ],
+        next_continuation_token=response.get("NextContinuationToken"),
+    )
+
+
 def fetch_s3_objects_using_page_token(
     bucket_name: str,
     continuation_token: str,
     max_keys: int | None = None,
     s3_client: Optional["S3Client"] = None,
+    metadata_cache: Optional[ObjectMetadataCache] = None,
+    prefix: Optional[str] = None,
 ) -> tuple[list["ObjectTypeDef"], Optional[str]]:
     """
     Fetch list of object keys and their metadata using a continuation token.
@@ -77,22 +327,24 @@ def fetch_s3_objects_using_page_token(
         continuation_token (str): Token for fetching the next page of results where the last page left off.
         max_keys (int | None): Maximum number of keys to return within this page.
         s3_client (Optional[S3Client]): Optional S3 client to use. If not provided, a new client will be created.
+        metadata_cache (Optional[ObjectMetadataCache]): Optional cache to populate with the listed objects.
+        prefix (Optional[str]): Prefix the first page was filtered by. S3 does not carry it over in the
+            continuation token, so it must be sent again to keep the listing inside the prefix.
 
     Returns:
         tuple[list[ObjectTypeDef], Optional[str]]: Tuple of a list of objects and the next continuation token.
             1. Possibly empty list of objects in the current page.
             2. Next continuation token if there are more pages, otherwise None.
     """
-    s3_client = s3_client or boto3.client("s3")
-    response: "ListObjectsV2OutputTypeDef" = s3_client.list_objects_v2(
-        Bucket=bucket_name,
-        ContinuationToken=continuation_token,
-        MaxKeys=max_keys or DEFAULT_MAX_KEYS,
+    page = fetch_s3_objects_page(
+        bucket_name,
+        prefix=prefix,
+        continuation_token=continuation_token,
+        max_keys=max_keys,
+        s3_client=s3_client,
+        metadata_cache=metadata_cache,
     )
-    files: list["ObjectTypeDef"] = response.get("Contents", [])
-    next_continuation_token: str | None = response.get("NextContinuationToken")
-
-    return files, next_continuation_token
+    return page.files, page.next_continuation_token
 
 
 def fetch_s3_objects_metadata(
@@ -100,6 +352,7 @@ def fetch_s3_objects_metadata(
     prefix: Optional[str] = None,
     max_keys: Optional[int] = DEFAULT_MAX_KEYS,
     s3_client: Optional["S3Client"] = None,
+    metadata_cache: Optional[ObjectMetadataCache] = None,
 ) -> tuple[list["ObjectTypeDef"], Optional[str]]:
     """
     Fetch list of object keys and their metadata.
@@ -109,17 +362,329 @@ def fetch_s3_objects_metadata(
         prefix (Optional[str]): Prefix to filter objects by.
         max_keys (Optional[int]): Maximum number of keys to return within this page.
         s3_client (Optional[S3Client]): Optional S3 client to use. If not provided, a new client will be created.
+        metadata_cache (Optional[ObjectMetadataCache]): Optional cache to populate with the listed objects.
 
     Returns:
         tuple[list[ObjectTypeDef], Optional[str]]: Tuple of a list of objects and the next continuation token.
             1. Possibly empty list of objects in the current page.
             2. Next continuation token if there are more pages, otherwise None.
     """
+    page = fetch_s3_objects_page(
+        bucket_name,
+        prefix=prefix,
+        max_keys=max_keys,
+        s3_client=s3_client,
+        metadata_cache=metadata_cache,
+    )
+    return page.files, page.next_continuation_token
+
+
+class S3KeyRange(NamedTuple):
+    """The keys `k` with `start_after < k <= end_at` under a prefix. None leaves a side open."""
+
+    start_after: Optional[str]
+    end_at: Optional[str]
+
+
+def fetch_s3_key_range(
+    bucket_name: str,
+    key_range: S3KeyRange,
+    prefix: Optional[str] = None,
+    max_keys: int = DEFAULT_MAX_KEYS,
+    s3_client: Optional["S3Client"] = None,
+) -> Generator[list["ObjectTypeDef"], None, None]:
+    """
+    Yield the objects of a key range page by page.
+
+    Args:
+        bucket_name (str): Name of the S3 bucket to list objects from.
+        key_range (S3KeyRange): The keys to list.
+        prefix (Optional[str]): Prefix to filter objects by.
+        max_keys (int): Maximum number of keys per `list_objects_v2` call.
+        s3_client (Optional[S3Client]): Optional S3 client to use. If not provided, a new client will be created.
+
+    Yields:
+        list[ObjectTypeDef]: The next non-empty page of objects, in lexicographic order.
+    """
+    s3_client = s3_client or boto3.client("s3")
+    continuation_token: Optional[str] = None
+    while True:
+        page = fetch_s3_objects_page(
+            bucket_name,
+            prefix=prefix,
+            continuation_token=continuation_token,
+            max_keys=max_keys,
+            s3_client=s3_client,
+            start_after=key_range.start_after,
+        )
+        files = page.files
+        reached_end = (
+            key_range.end_at is not None
+            and bool(files)
+            and files[-1]["Key"] > key_range.end_at
+        )
+        if reached_end:
+            files = [file for file in files if file["Key"] <= key_range.end_at]  # type: ignore[operator]
+        if files:
+            yield files
+        if reached_end or not page.next_continuation_token:
+            return
+        continuation_token = page.next_continuation_token
+
+
+def find_s3_key_range_boundaries(
+    bucket_name: str,
+    prefix: str = "",
+    start_after: Optional[str] = None,
+    delimiter: str = "/",
+    s3_client: Optional["S3Client"] = None,
+    executor: Optional[Executor] = None,
+) -> list[str]:
+    """
+    Find strings that split the keys under a prefix into ranges of similar size, without listing them all.
+
+    Directories are the natural split points: if the keys below the prefix have several
+    `CommonPrefixes`, those are returned. A prefix with a single directory is descended
+    into. Keys without directories are sampled instead: for each printable ASCII character
+    `c`, the first key after `prefix + c` is looked up with `StartAfter` and `MaxKeys=1`.
+
+    Args:
+        bucket_name (str): Name of the S3 bucket.
+        prefix (str): Prefix the keys start with.
+        start_after (Optional[str]): Only boundaries after this key are returned.
+        delimiter (str): Character grouping keys into directories.
+        s3_client (Optional[S3Client]): Optional S3 client to use. If not provided, a new client will be created.
+        executor (Optional[Executor]): Executor sending the sampling requests concurrently. Defaults to sequential calls.
+
+    Returns:
+        list[str]: Sorted, distinct boundaries. Any boundaries split the keys correctly, these
+            aim to split them evenly.
+    """
     s3_client = s3_client or boto3.client("s3")
-    response = s3_client.list_objects_v2(
-        Bucket=bucket_name, Prefix=prefix or "", MaxKeys=max_keys
+    split_prefix, directories = find_s3_split_prefix(
+        bucket_name,
+        prefix=prefix,
+        start_after=start_after,
+        delimiter=delimiter,
+        s3_client=s3_client,
     )
-    files: list["ObjectTypeDef"] = response.get("Contents", [])
-    next_page_token: str | None = response.get("NextContinuationToken")
+    if len(directories) > 1:
+        return select_s3_key_range_boundaries(directories, start_after)
 
-    return files, next_page_token
+    def first_key_after(candidate: str) -> Optional[str]:
+        return fetch_first_s3_key_after(
+            bucket_name, prefix=prefix, start_after=candidate, s3_client=s3_client
+        )
+
+    sampled_keys = (executor.map if executor is not None else map)(
+        first_key_after, get_s3_key_sampling_candidates(split_prefix)
+    )
+    return select_s3_key_range_boundaries(
+        [key for key in sampled_keys if key is not None], start_after
+    )
+
+
+def find_s3_split_prefix(
+    bucket_name: str,
+    prefix: str = "",
+    start_after: Optional[str] = None,
+    delimiter: str = "/",
+    s3_client: Optional["S3Client"] = None,
+) -> tuple[str, list[str]]:
+    """
+    Descend from a prefix into directories that are the only one on their level.
+
+    Returns:
+        tuple[str, list[str]]: The prefix to split the keys at, and its directories. Keys
+            are split at the directories if there are several, and sampled otherwise.
+    """
+    s3_client = s3_client or boto3.client("s3")
+    split_prefix = prefix
+    for _ in range(MAX_BOUNDARY_SEARCH_DEPTH):
+        page = fetch_s3_objects_page(
+            bucket_name,
+            prefix=split_prefix,
+            delimiter=delimiter,
+            s3_client=s3_client,
+            start_after=start_after,
+        )
+        if len(page.directories) != 1:
+            break
+        split_prefix = page.directories[0]
+    return split_prefix, page.directories
+
+
+def get_s3_key_sampling_candidates(split_prefix: str) -> list[str]:
+    """Return the keys after which keys are sampled, one per printable ASCII character."""
+    return [split_prefix + chr(code) for code in range(0x21, 0x7F)]
+
+
+def fetch_first_s3_key_after(
+    bucket_name: str,
+    prefix: str,
+    start_after: str,
+    s3_client: Optional["S3Client"] = None,
+) -> Optional[str]:
+    """Return the first key under a prefix after `start_after`, or None if there is none."""
+    files = fetch_s3_objects_page(
+        bucket_name,
+        prefix=prefix,
+        max_keys=1,
+        s3_client=s3_client,
+        start_after=start_after,
+    ).files
+    return files[0]["Key"] if files else None
+
+
+def select_s3_key_range_boundaries(
+    boundaries: list[str], start_after: Optional[str]
+) -> list[str]:
+    """Sort and deduplicate boundaries, keeping those after `start_after`."""
+    return sorted(
+        {
+            boundary
+            for boundary in boundaries
+            if start_after is None or boundary > start_after
+        }
+    )
+
+
+def split_s3_key_space(
+    boundaries: list[str], max_ranges: int, start_after: Optional[str] = None
+) -> list[S3KeyRange]:
+    """Cut the key space after `start_after` into at most `max_ranges` ranges at evenly spaced boundaries."""
+    step = max(1, math.ceil((len(boundaries) + 1) / max_ranges))
+    ends: list[Optional[str]] = [
+        boundaries[i] for i in range(step - 1, len(boundaries), step)
+    ]
+    ends.append(None)
+    starts = [start_after, *ends[:-1]]
+    return [
+        S3KeyRange(start_after=start, end_at=end) for start, end in zip(starts, ends)
+    ]
+
+
+def fetch_s3_objects_in_parallel(
+    bucket_name: str,
+    prefix: str = "",
+    max_concurrency: int = DEFAULT_PARALLEL_LISTING_MAX_CONCURRENCY,
+    max_ranges: int = DEFAULT_PARALLEL_LISTING_MAX_RANGES,
+    read_ahead_pages: int = DEFAULT_PARALLEL_LISTING_READ_AHEAD_PAGES,
+    delimiter: str = "/",
+    max_keys: int = DEFAULT_MAX_KEYS,
+    s3_client: Optional["S3Client"] = None,
+) -> Generator[list["ObjectTypeDef"], None, None]:
+    """
+    Yield every object under a prefix in lexicographic order, listing several key ranges at once.
+
+    The ranges are listed on a thread pool of this call's own, see
+    :func:`aws_python.s3.list_objects.iter_s3_object_pages_async` for a variant running on a shared executor.
+
+    `list_objects_v2` continuation tokens make one listing strictly sequential. The first
+    page is fetched as usual, so small listings cost a single call. For larger ones the
+    remaining keys are split into ranges (see :func:`find_s3_key_range_boundaries`),
+    which are listed concurrently with `StartAfter` and yielded one range after the other.
+    Since the ranges are consecutive, that is lexicographic order without a merge. Each
+    range buffers at most `read_ahead_pages` pages ahead of the consumer, so memory stays
+    bounded by `max_concurrency * (read_ahead_pages + 1)` pages.
+
+    Args:
+        bucket_name (str): Name of the S3 bucket to list objects from.
+        prefix (str): Prefix the keys start with.
+        max_concurrency (int): Maximum number of key ranges listed at once.
+        max_ranges (int): Maximum number of key ranges the keys are split into.
+        read_ahead_pages (int): Pages each range buffers ahead of the consumer.
+        delimiter (str): Character grouping keys into directories, used to find the ranges.
+        max_keys (int): Maximum number of keys per `list_objects_v2` call.
+        s3_client (Optional[S3Client]): Optional S3 client to use. If not provided, a new client will be created.
+
+    Yields:
+        list[ObjectTypeDef]: The next non-empty page of objects.
+    """
+    s3_client = s3_client or boto3.client("s3")
+    first_page = fetch_s3_objects_page(
+        bucket_name, prefix=prefix, max_keys=max_keys, s3_client=s3_client
+    )
+    if first_page.files:
+        yield first_page.files
+    if not first_page.next_continuation_token:
+        return
+
+    start_after = first_page.files[-1]["Key"]
+    stopped = threading.Event()
+
+    def put(pages: queue.Queue, item: object) -> None:
+        while not stopped.is_set():
+            try:
+                pages.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def list_key_range(key_range: S3KeyRange, pages: queue.Queue) -> None:
+        try:
+            for page in fetch_s3_key_range(
+                bucket_name,
+                key_range,
+                prefix=prefix,
+                max_keys=max_keys,
+                s3_client=s3_client,
+            ):
+                put(pages, page)
+                if stopped.is_set():
+                    return
+            # None marks the end of the range
+            put(pages, None)
+        except Exception as e:
+            put(pages, e)
+
+    executor = ThreadPoolExecutor(
+        max_workers=max_concurrency, thread_name_prefix="s3-list"
+    )
+    try:
+        boundaries = find_s3_key_range_boundaries(
+            bucket_name,
+            prefix=prefix,
+            start_after=start_after,
+            delimiter=delimiter,
+            s3_client=s3_client,
+            executor=executor,
+        )
+        key_ranges = split_s3_key_space(boundaries, max_ranges, start_after=start_after)
+        range_pages: list[queue.Queue] = [
+            queue.Queue(maxsize=read_ahead_pages) for _ in key_ranges
+        ]
+        # the executor starts ranges in order, so the range the consumer waits for is always running
+        for key_range, pages in zip(key_ranges, range_pages):
+            executor.submit(list_key_range, key_range, pages)
+        for pages in range_pages:
+            while (page := pages.get()) is not None:
+                if isinstance(page, Exception):
+                    raise page
+                yield page
+    finally:
+        stopped.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def cache_listed_objects(
+    bucket_name: str,
+    listed_objects: list["ObjectTypeDef"],
+    metadata_cache: Optional[ObjectMetadataCache],
+) -> None:
+    """
+    Populate the metadata cache with objects returned by list_objects_v2.
+
+    Args:
+        bucket_name (str): Name of the listed S3 bucket.
+        listed_objects (list[ObjectTypeDef]): The `Contents` of a list_objects_v2 response.
+        metadata_cache (Optional[ObjectMetadataCache]): Cache to populate. Nothing happens if None.
+    """
+    if metadata_cache is None:
+        return
+    for listed_object in listed_objects:
+        metadata_cache.put(
+            bucket_name,
+            listed_object["Key"],
+            ObjectMetadata.from_listed_object(listed_object),
+        )
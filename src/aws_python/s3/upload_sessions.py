@@ -0,0 +1,269 @@
+"""Resumable upload sessions driven by the client, on top of S3 multipart uploads.
+
+A session is an S3 multipart upload the client fills part by part through the API, in
+any order and in parallel, and can resume after a failure by listing the parts S3
+already has. Sessions are identified by an opaque ID bundling the object key with S3's
+upload ID, so the API keeps no state of its own: S3 is the source of truth for a
+session's parts.
+
+Sessions that are neither completed nor aborted keep their parts stored (and billed)
+forever, so a sweeper aborts multipart uploads older than a maximum age.
+"""
+
+import asyncio
+import base64
+import json
+from concurrent.futures import Executor
+from datetime import (
+    datetime,
+    timedelta,
+    timezone,
+)
+from typing import (
+    Iterable,
+    Iterator,
+    NamedTuple,
+    Optional,
+)
+
+import boto3
+from botocore.exceptions import (
+    BotoCoreError,
+    ClientError,
+)
+from loguru import logger
+
+from aws_python.s3.async_objects import run_in_s3_executor
+from aws_python.s3.write_objects import abort_multipart_upload
+
+try:
+    from mypy_boto3_s3 import S3Client
+    from mypy_boto3_s3.type_defs import (
+        MultipartUploadTypeDef,
+        PartTypeDef,
+    )
+except ImportError:
+    ...
+
+DEFAULT_UPLOAD_SESSION_MAX_AGE_SECONDS = 24 * 60 * 60
+DEFAULT_UPLOAD_SESSION_SWEEP_INTERVAL_SECONDS = 60 * 60
+
+
+class UploadSession(NamedTuple):
+    """The multipart upload behind an upload session."""
+
+    object_key: str
+    upload_id: str
+
+    def to_session_id(self) -> str:
+        """Serialize the session into the opaque ID handed to clients."""
+        payload = json.dumps(
+            {"file_path": self.object_key, "upload_id": self.upload_id},
+            separators=(",", ":"),
+        )
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    @classmethod
+    def from_session_id(cls, session_id: str) -> "UploadSession":
+        """
+        Parse a session ID from a client.
+
+        Args:
+            session_id (str): ID returned by :meth:`to_session_id`.
+
+        Returns:
+            UploadSession: The object key and S3 upload ID of the session.
+
+        Raises:
+            ValueError: If the ID was not produced by :meth:`to_session_id`.
+        """
+        try:
+            padded = session_id + "=" * (-len(session_id) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            return cls(
+                object_key=str(payload["file_path"]),
+                upload_id=str(payload["upload_id"]),
+            )
+        except (ValueError, KeyError, TypeError) as e:
+            raise ValueError(f"Malformed upload session ID: {session_id}") from e
+
+
+def is_no_such_upload_error(error: ClientError) -> bool:
+    """Check if an S3 error means that the multipart upload was completed, aborted or never existed."""
+    return error.response["Error"]["Code"] == "NoSuchUpload"
+
+
+def list_uploaded_parts(
+    bucket_name: str,
+    object_key: str,
+    upload_id: str,
+    s3_client: Optional["S3Client"] = None,
+) -> list["PartTypeDef"]:
+    """
+    List every part S3 has received for a multipart upload, following `list_parts` pagination.
+
+    Args:
+        bucket_name (str): Bucket name.
+        object_key (str): Object key.
+        upload_id (str): ID returned by `create_multipart_upload`.
+        s3_client (Optional[S3Client], optional): S3 client. Defaults to None.
+
+    Returns:
+        list[PartTypeDef]: The parts in ascending order of their part numbers.
+
+    Raises:
+        ClientError: With a `NoSuchUpload` code if the upload is gone, see `is_no_such_upload_error`.
+    """
+    s3_client = s3_client or boto3.client("s3")
+    parts: list["PartTypeDef"] = []
+    part_number_marker = 0
+    while True:
+        response = s3_client.list_parts(
+            Bucket=bucket_name,
+            Key=object_key,
+            UploadId=upload_id,
+            PartNumberMarker=part_number_marker,
+        )
+        parts.extend(response.get("Parts", []))
+        if not response.get("IsTruncated"):
+            return parts
+        part_number_marker = response["NextPartNumberMarker"]
+
+
+def find_missing_part_numbers(part_numbers: Iterable[int]) -> list[int]:
+    """
+    Find the gaps in a set of part numbers, which must run from 1 without gaps to make up a whole file.
+
+    S3 completes uploads with gaps between the parts, so a part the client failed to upload
+    would silently be left out of the file.
+
+    Args:
+        part_numbers (Iterable[int]): The numbers of the uploaded parts.
+
+    Returns:
+        list[int]: The missing part numbers below the highest uploaded one, in ascending order.
+    """
+    uploaded = set(part_numbers)
+    return [
+        part_number
+        for part_number in range(1, max(uploaded, default=0) + 1)
+        if part_number not in uploaded
+    ]
+
+
+def list_multipart_uploads(
+    bucket_name: str,
+    prefix: str = "",
+    s3_client: Optional["S3Client"] = None,
+) -> Iterator["MultipartUploadTypeDef"]:
+    """
+    Yield the multipart uploads in progress in a bucket, following `list_multipart_uploads` pagination.
+
+    Args:
+        bucket_name (str): Bucket name.
+        prefix (str, optional): Prefix the object keys start with. Defaults to the whole bucket.
+        s3_client (Optional[S3Client], optional): S3 client. Defaults to None.
+
+    Yields:
+        MultipartUploadTypeDef: The key, upload ID and initiation date of the next upload.
+    """
+    s3_client = s3_client or boto3.client("s3")
+    key_marker = upload_id_marker = ""
+    while True:
+        response = s3_client.list_multipart_uploads(
+            Bucket=bucket_name,
+            Prefix=prefix,
+            KeyMarker=key_marker,
+            UploadIdMarker=upload_id_marker,
+        )
+        yield from response.get("Uploads", [])
+        if not response.get("IsTruncated"):
+            return
+        key_marker = response["NextKeyMarker"]
+        upload_id_marker = response["NextUploadIdMarker"]
+
+
+def abort_stale_multipart_uploads(
+    bucket_name: str,
+    max_age_seconds: float = DEFAULT_UPLOAD_SESSION_MAX_AGE_SECONDS,
+    s3_client: Optional["S3Client"] = None,
+    now: Optional[datetime] = None,
+) -> int:
+    """
+    Abort the multipart uploads of a bucket that were started longer ago than the maximum age.
+
+    This includes uploads started for presigned multipart URLs, so the maximum age should
+    exceed the URLs' validity.
+
+    Args:
+        bucket_name (str): Bucket name.
+        max_age_seconds (float, optional): Age after which an upload counts as abandoned.
+        s3_client (Optional[S3Client], optional): S3 client. Defaults to None.
+        now (Optional[datetime], optional): The current time. Defaults to the system clock.
+
+    Returns:
+        int: The number of aborted uploads.
+    """
+    s3_client = s3_client or boto3.client("s3")
+    stale_before = (now or datetime.now(tz=timezone.utc)) - timedelta(
+        seconds=max_age_seconds
+    )
+    aborted = 0
+    for upload in list_multipart_uploads(bucket_name, s3_client=s3_client):
+        if upload["Initiated"] >= stale_before:
+            continue
+        try:
+            abort_multipart_upload(
+                bucket_name,
+                object_key=upload["Key"],
+                upload_id=upload["UploadId"],
+                s3_client=s3_client,
+            )
+        except ClientError as e:
+            # completed or aborted by someone else since it was listed
+            if not is_no_such_upload_error(e):
+                raise
+            continue
+        aborted += 1
+    return aborted
+
+
+async def sweep_stale_multipart_uploads_async(
+    bucket_name: str,
+    max_age_seconds: float = DEFAULT_UPLOAD_SESSION_MAX_AGE_SECONDS,
+    interval_seconds: float = DEFAULT_UPLOAD_SESSION_SWEEP_INTERVAL_SECONDS,
+    s3_client: Optional["S3Client"] = None,
+    executor: Optional[Executor] = None,
+) -> None:
+    """
+    Abort stale multipart uploads once per interval, until cancelled.
+
+    Failed sweeps are logged and retried after the next interval. Running a sweeper in
+    every worker is safe, aborting an upload twice is not an error.
+
+    Args:
+        bucket_name (str): Bucket name.
+        max_age_seconds (float, optional): Age after which an upload counts as abandoned.
+        interval_seconds (float, optional): Seconds between two sweeps.
+        s3_client (Optional[S3Client], optional): S3 client. Defaults to None.
+        executor (Optional[Executor], optional): Executor running the blocking S3 calls. Defaults to None.
+    """
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            aborted = await run_in_s3_executor(
+                executor,
+                abort_stale_multipart_uploads,
+                bucket_name,
+                max_age_seconds=max_age_seconds,
+                s3_client=s3_client,
+            )
+        except (ClientError, BotoCoreError) as e:
+            logger.opt(exception=e).warning("Failed to sweep stale multipart uploads")
+            continue
+        if aborted:
+            logger.info(
+                "Aborted {aborted} multipart uploads older than {max_age_seconds}s",
+                aborted=aborted,
+                max_age_seconds=max_age_seconds,
+            )
@@ -4,8 +4,14 @@ from typing import Optional
 
 import boto3
 
+from aws_python.s3.metadata_cache import (
+    ObjectMetadata,
+    ObjectMetadataCache,
+)
+
 try:
     from mypy_boto3_s3 import S3Client
+    from mypy_boto3_s3.type_defs import CompletedPartTypeDef
 except ImportError:
     ...
 
@@ -16,6 +22,9 @@ def upload_s3_object(
     file_content: bytes,
     content_type: Optional[str] = None,
     s3_client: Optional["S3Client"] = None,
+    metadata_cache: Optional[ObjectMetadataCache] = None,
+    content_encoding: Optional[str] = None,
+    metadata: Optional[dict[str, str]] = None,
 ) -> None:
     """
     Upload a file to an S3 bucket.
@@ -26,12 +35,236 @@ def upload_s3_object(
         file_content (bytes): File content.
         content_type (Optional[str], optional): Content type in MIME format. Defaults to None.
         s3_client (Optional[&quot;S3Client&quot;], optional): S3 client. Defaults to None.
+        metadata_cache (Optional[ObjectMetadataCache], optional): Cache to update with the new object's metadata. Defaults to None.
+        content_encoding (Optional[str], optional): Encoding of `file_content`, e.g. `gzip`. Defaults to None.
+        metadata (Optional[dict[str, str]], optional): User metadata stored as `x-amz-meta-*` headers. Defaults to None.
     """
     content_type = content_type or "application/octet-stream"
     s3_client = s3_client or boto3.client("s3")
-    s3_client.put_object(
+    response = s3_client.put_object(
         Bucket=bucket_name,
         Key=object_key,
         Body=file_content,
         ContentType=content_type,
+        **_get_optional_put_arguments(content_encoding, metadata),
+    )
+    if metadata_cache is not None:
+        metadata_cache.put(
+            bucket_name,
+            object_key,
+            ObjectMetadata.from_put_object_response(
+                response,
+                content_length=len(file_content),
+                content_type=content_type,
+                metadata=metadata,
+                content_encoding=content_encoding,
+            ),
+        )
+
+
+def _get_optional_put_arguments(
+    content_encoding: Optional[str], metadata: Optional[dict[str, str]]
+) -> dict:
+    arguments: dict = {}
+    if content_encoding:
+        arguments["ContentEncoding"] = content_encoding
+    if metadata:
+        arguments["Metadata"] = metadata
+    return arguments
+
+
+def copy_s3_object(
+    bucket_name: str,
+    source_key: str,
+    destination_key: str,
+    s3_client: Optional["S3Client"] = None,
+    metadata_cache: Optional[ObjectMetadataCache] = None,
+    source_etag: Optional[str] = None,
+) -> None:
+    """
+    Copy an object of up to 5 GiB within the bucket, without its bytes leaving S3.
+
+    The copy keeps the source's content type, content encoding and user metadata.
+
+    Args:
+        bucket_name (str): Bucket name.
+        source_key (str): Key of the object to copy.
+        destination_key (str): Key of the copy. An existing object is replaced.
+        s3_client (Optional[S3Client], optional): S3 client. Defaults to None.
+        metadata_cache (Optional[ObjectMetadataCache], optional): Cache to invalidate for the replaced object. Defaults to None.
+        source_etag (Optional[str], optional): Only copy the source if it still has this ETag. Defaults to None.
+
+    Raises:
+        ClientError: With a `PreconditionFailed` code if the source's ETag changed.
+    """
+    s3_client = s3_client or boto3.client("s3")
+    s3_client.copy_object(
+        Bucket=bucket_name,
+        Key=destination_key,
+        CopySource={"Bucket": bucket_name, "Key": source_key},
+        **_get_copy_source_conditions(source_etag),
+    )
+    if metadata_cache is not None:
+        metadata_cache.invalidate(bucket_name, destination_key)
+
+
+def _get_copy_source_conditions(source_etag: Optional[str]) -> dict:
+    return {"CopySourceIfMatch": source_etag} if source_etag else {}
+
+
+def create_multipart_upload(
+    bucket_name: str,
+    object_key: str,
+    content_type: Optional[str] = None,
+    s3_client: Optional["S3Client"] = None,
+    content_encoding: Optional[str] = None,
+    metadata: Optional[dict[str, str]] = None,
+) -> str:
+    """
+    Start a multipart upload.
+
+    Args:
+        bucket_name (str): Bucket name.
+        object_key (str): Object key.
+        content_type (Optional[str], optional): Content type in MIME format. Defaults to None.
+        s3_client (Optional[S3Client], optional): S3 client. Defaults to None.
+        content_encoding (Optional[str], optional): Encoding of the uploaded bytes, e.g. `gzip`. Defaults to None.
+        metadata (Optional[dict[str, str]], optional): User metadata stored as `x-amz-meta-*` headers. Defaults to None.
+
+    Returns:
+        str: The upload ID identifying the multipart upload in the following calls.
+    """
+    content_type = content_type or "application/octet-stream"
+    s3_client = s3_client or boto3.client("s3")
+    response = s3_client.create_multipart_upload(
+        Bucket=bucket_name,
+        Key=object_key,
+        ContentType=content_type,
+        **_get_optional_put_arguments(content_encoding, metadata),
+    )
+    return response["UploadId"]
+
+
+def upload_part(
+    bucket_name: str,
+    object_key: str,
+    upload_id: str,
+    part_number: int,
+    part_content: bytes,
+    s3_client: Optional["S3Client"] = None,
+) -> "CompletedPartTypeDef":
+    """
+    Upload one part of a multipart upload.
+
+    Args:
+        bucket_name (str): Bucket name.
+        object_key (str): Object key.
+        upload_id (str): ID returned by `create_multipart_upload`.
+        part_number (int): 1-based position of the part within the object.
+        part_content (bytes): Part content. All parts but the last must be at least 5 MiB.
+        s3_client (Optional[S3Client], optional): S3 client. Defaults to None.
+
+    Returns:
+        CompletedPartTypeDef: The part number and ETag to pass to `complete_multipart_upload`.
+    """
+    s3_client = s3_client or boto3.client("s3")
+    response = s3_client.upload_part(
+        Bucket=bucket_name,
+        Key=object_key,
+        UploadId=upload_id,
+        PartNumber=part_number,
+        Body=part_content,
+    )
+    return {"PartNumber": part_number, "ETag": response["ETag"]}
+
+
+def upload_part_copy(
+    bucket_name: str,
+    object_key: str,
+    upload_id: str,
+    part_number: int,
+    source_key: str,
+    byte_range: str,
+    s3_client: Optional["S3Client"] = None,
+    source_etag: Optional[str] = None,
+) -> "CompletedPartTypeDef":
+    """
+    Copy a byte range of an object in the bucket as one part of a multipart upload.
+
+    Args:
+        bucket_name (str): Bucket name.
+        object_key (str): Object key of the multipart upload.
+        upload_id (str): ID returned by `create_multipart_upload`.
+        part_number (int): 1-based position of the part within the object.
+        source_key (str): Key of the object to copy from.
+        byte_range (str): Range of the source to copy, e.g. `bytes=0-5242879`. At most 5 GiB.
+        s3_client (Optional[S3Client], optional): S3 client. Defaults to None.
+        source_etag (Optional[str], optional): Only copy from the source if it still has this ETag. Defaults to None.
+
+    Returns:
+        CompletedPartTypeDef: The part number and ETag to pass to `complete_multipart_upload`.
+    """
+    s3_client = s3_client or boto3.client("s3")
+    response = s3_client.upload_part_copy(
+        Bucket=bucket_name,
+        Key=object_key,
+        UploadId=upload_id,
+        PartNumber=part_number,
+        CopySource={"Bucket": bucket_name, "Key": source_key},
+        CopySourceRange=byte_range,
+        **_get_copy_source_conditions(source_etag),
+    )
+    return {"PartNumber": part_number, "ETag": response["CopyPartResult"]["ETag"]}
+
+
+def complete_multipart_upload(
+    bucket_name: str,
+    object_key: str,
+    upload_id: str,
+    parts: list["CompletedPartTypeDef"],
+    s3_client: Optional["S3Client"] = None,
+    metadata_cache: Optional[ObjectMetadataCache] = None,
+) -> None:
+    """
+    Assemble the uploaded parts into the final object.
+
+    Args:
+        bucket_name (str): Bucket name.
+        object_key (str): Object key.
+        upload_id (str): ID returned by `create_multipart_upload`.
+        parts (list[CompletedPartTypeDef]): Uploaded parts, in any order.
+        s3_client (Optional[S3Client], optional): S3 client. Defaults to None.
+        metadata_cache (Optional[ObjectMetadataCache], optional): Cache to invalidate for the replaced object. Defaults to None.
+    """
+    s3_client = s3_client or boto3.client("s3")
+    s3_client.complete_multipart_upload(
+        Bucket=bucket_name,
+        Key=object_key,
+        UploadId=upload_id,
+        MultipartUpload={
+            "Parts": sorted(parts, key=lambda part: part["PartNumber"]),
+        },
+    )
+    if metadata_cache is not None:
+        metadata_cache.invalidate(bucket_name, object_key)
+
+
+def abort_multipart_upload(
+    bucket_name: str,
+    object_key: str,
+    upload_id: str,
+    s3_client: Optional["S3Client"] = None,
+) -> None:
+    """
+    Abort a multipart upload and free the storage used by its uploaded parts.
+
+    Args:
+        bucket_name (str): Bucket name.
+        object_key (str): Object key.
+        upload_id (str): ID returned by `create_multipart_upload`.
+        s3_client (Optional[S3Client], optional): S3 client. Defaults to None.
+    """
+    s3_client = s3_client or boto3.client("s3")
+    s3_client.abort_multipart_upload(
+        Bucket=bucket_name, Key=object_key, UploadId=upload_id
     )
@@ -9,6 +9,7 @@ from pydantic import (
     BaseModel,
     ConfigDict,
     Field,
+    HttpUrl,
     model_validator,
 )
 from typing_extensions import Self
@@ -17,6 +18,8 @@ DEFAULT_GET_FILES_PAGE_SIZE = 10
 DEFAULT_GET_FILES_MIN_PAGE_SIZE = 10
 DEFAULT_GET_FILES_MAX_PAGE_SIZE = 100
 DEFAULT_GET_FILES_DIRECTORY = ""
+# separates directories in file paths, used as the S3 `Delimiter` of shallow listings
+DIRECTORY_DELIMITER = "/"
 
 
 class FileMetadata(BaseModel):
@@ -40,6 +43,181 @@ class PutFileResponse(BaseModel):
     message: str = Field(description="A message about the operation.")
 
 
+class UploadStatus(str, Enum):
+    """The outcome of uploading one file of a batch."""
+
+    CREATED = "created"
+    OVERWRITTEN = "overwritten"
+    FAILED = "failed"
+
+
+class BatchUploadFileResult(PutFileResponse):
+    """The outcome of uploading one file with `POST /v1/files:batchUpload`."""
+
+    status: UploadStatus = Field(
+        description="Whether the file was created, overwritten or not stored."
+    )
+
+
+class BatchUploadFilesResponse(BaseModel):
+    """Response for uploading many files at once."""
+
+    files: list[BatchUploadFileResult] = Field(
+        description="The outcome for each file, in the order the files were sent."
+    )
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "files": [
+                    {
+                        "file_path": "path/to/pyproject.toml",
+                        "message": "File uploaded successfully to path: /path/to/pyproject.toml",
+                        "status": "created",
+                    },
+                    {
+                        "file_path": "path/to/Makefile",
+                        "message": "File already exists at path: /path/to/Makefile",
+                        "status": "overwritten",
+                    },
+                ]
+            }
+        }
+    )
+
+
+class PresignedMultipartUploadUrls(BaseModel):
+    """Presigned URLs to run a multipart upload directly against S3."""
+
+    upload_id: str = Field(description="The ID of the multipart upload.")
+    part_size_bytes: int = Field(
+        description="The size of every part except the last one."
+    )
+    part_urls: list[str] = Field(
+        description="Presigned `PUT` URL for each part. Part `n` is uploaded to `part_urls[n - 1]`."
+    )
+    complete_url: str = Field(
+        description=(
+            "Presigned `POST` URL completing the upload with a `CompleteMultipartUpload` XML body "
+            "listing the part numbers and the `ETag`s returned for the parts."
+        )
+    )
+    abort_url: str = Field(description="Presigned `DELETE` URL aborting the upload.")
+
+
+class PresignedUploadResponse(BaseModel):
+    """Response for asking to upload a file directly to S3."""
+
+    file_path: str = Field(
+        description="The path of the file.",
+        json_schema_extra={"example": "path/to/pyproject.toml"},
+    )
+    message: str = Field(description="A message about the operation.")
+    expires_at: datetime = Field(description="When the presigned URLs stop working.")
+    upload_url: Optional[str] = Field(
+        default=None,
+        description="Presigned `PUT` URL to upload the whole file with a single request.",
+    )
+    multipart_upload: Optional[PresignedMultipartUploadUrls] = Field(
+        default=None,
+        description="Presigned URLs to upload the file in parts, for files larger than one part.",
+    )
+
+
+class CreateUploadSessionRequest(BaseModel):
+    """Request body for `POST /v1/uploads`."""
+
+    file_path: str = Field(
+        min_length=1,
+        description="The path to store the file at once the upload is completed.",
+        json_schema_extra={"example": "path/to/backup.tar"},
+    )
+    content_type: Optional[str] = Field(
+        default=None,
+        description="The MIME type of the file. Defaults to a guess from the path's extension.",
+        json_schema_extra={"example": "application/x-tar"},
+    )
+
+
+class UploadSessionResponse(BaseModel):
+    """An upload session to send a file in parts, which can be retried and resumed one by one."""
+
+    upload_session_id: str = Field(
+        description="The ID of the session, used in the URLs of its parts, completion and abort."
+    )
+    file_path: str = Field(
+        description="The path the file is stored at once the upload is completed.",
+        json_schema_extra={"example": "path/to/backup.tar"},
+    )
+    part_size_bytes: int = Field(
+        description="The recommended size of every part except the last one."
+    )
+    min_part_size_bytes: int = Field(
+        description="The minimum size of every part except the last one."
+    )
+    max_part_size_bytes: int = Field(description="The maximum size of a part.")
+    max_parts: int = Field(description="The highest part number.")
+    expires_at: Optional[datetime] = Field(
+        default=None,
+        description="When an unfinished upload is aborted. None if abandoned uploads are kept.",
+    )
+
+
+class UploadedPart(BaseModel):
+    """A part of an upload session that was stored."""
+
+    part_number: int = Field(
+        description="The position of the part within the file, from 1."
+    )
+    etag: str = Field(description="The entity tag S3 computed for the part.")
+    size_bytes: int = Field(description="The size of the part in bytes.")
+
+
+class ListUploadedPartsResponse(BaseModel):
+    """Response for listing the stored parts of an upload session, e.g. to resume it."""
+
+    upload_session_id: str = Field(description="The ID of the session.")
+    file_path: str = Field(
+        description="The path the file is stored at once the upload is completed.",
+        json_schema_extra={"example": "path/to/backup.tar"},
+    )
+    parts: list[UploadedPart] = Field(
+        description="The stored parts, in ascending order of their part numbers."
+    )
+    missing_part_numbers: list[int] = Field(
+        description="Part numbers below the highest stored one that are still missing."
+    )
+
+
+class PutFileQueryParams(BaseModel):
+    """Query parameters for `PUT /v1/files/:file_path`."""
+
+    redirect: Optional[bool] = Field(
+        default=None,
+        description=(
+            "`true` returns presigned URLs to upload the file directly to S3 instead of sending it in the "
+            "request body. Defaults to the server settings when no file is sent."
+        ),
+    )
+    size_bytes: Optional[int] = Field(
+        default=None,
+        ge=0,
+        description="Size of the file to upload through presigned URLs. Files larger than one part get multipart URLs.",
+    )
+
+
+class GetFileQueryParams(BaseModel):
+    """Query parameters for `GET /v1/files/:file_path`."""
+
+    redirect: Optional[bool] = Field(
+        default=None,
+        description=(
+            "`true` answers with a 307 redirect to a presigned S3 URL, `false` streams the file through the API. "
+            "Defaults to the server settings."
+        ),
+    )
+
+
 class ListFilesResponse(BaseModel):
     """Response for listing files."""
 
@@ -50,6 +228,10 @@ class GetFilesResponse(BaseModel):
     """Response for listing files with pagination."""
 
     files: list[FileMetadata]
+    directories: list[str] = Field(
+        default_factory=list,
+        description="The sub-directories of a shallow listing, each ending with '/'.",
+    )
     next_page_token: Optional[str]
 
     model_config = ConfigDict(
@@ -67,6 +249,7 @@ class GetFilesResponse(BaseModel):
                         "size_bytes": 256,
                     },
                 ],
+                "directories": ["path/to/src/", "path/to/tests/"],
                 "next_page_token": "next_page_token_example",
             }
         }
@@ -76,27 +259,87 @@ class GetFilesResponse(BaseModel):
 class GetFilesQueryParams(BaseModel):
     """Query parameters for listing files."""
 
-    page_size: int = Field(
-        DEFAULT_GET_FILES_PAGE_SIZE,
+    # None marks parameters the client did not send: FastAPI passes defaults explicitly,
+    # so `exclude_unset` cannot tell them apart. The defaults are filled in after validation.
+    page_size: Optional[int] = Field(
+        default=None,
         ge=DEFAULT_GET_FILES_MIN_PAGE_SIZE,
         le=DEFAULT_GET_FILES_MAX_PAGE_SIZE,
+        description=f"Maximum number of files and directories per page. Defaults to {DEFAULT_GET_FILES_PAGE_SIZE}.",
+    )
+    directory: Optional[str] = Field(
+        default=None,
+        description="List only files whose path starts with this prefix. Defaults to all files.",
+    )
+    shallow: Optional[bool] = Field(
+        default=None,
+        description=(
+            "List only the direct children of `directory`: files in it and its sub-directories, "
+            "instead of every file below it. Defaults to false."
+        ),
     )
-    directory: str = DEFAULT_GET_FILES_DIRECTORY
     page_token: Optional[str] = None
 
     @model_validator(mode="after")
     def check_passwords_match(self) -> Self:
-        """Ensure that page_token is mutually exclusive with page_size and directory."""
-        if self.page_token:
-            get_files_query_params: dict = self.model_dump(exclude_unset=True)
-            page_size_set = "page_size" in get_files_query_params.keys()
-            directory_set = "directory" in get_files_query_params.keys()
-            if page_size_set or directory_set:
-                raise ValueError(
-                    "page_token is mutually exclusive with page_size and directory"
-                )
+        """Ensure that page_token is mutually exclusive with page_size, directory and shallow."""
+        if self.page_token and (
+            self.page_size is not None
+            or self.directory is not None
+            or self.shallow is not None
+        ):
+            raise ValueError(
+                "page_token is mutually exclusive with page_size, directory and shallow"
+            )
+        if self.page_size is None:
+            self.page_size = DEFAULT_GET_FILES_PAGE_SIZE
+        if self.directory is None:
+            self.directory = DEFAULT_GET_FILES_DIRECTORY
+        if self.shallow is None:
+            self.shallow = False
         return self
 
+    @property
+    def prefix(self) -> str:
+        """Return the S3 prefix to list, which ends with '/' in a shallow listing of a directory."""
+        directory = self.directory or DEFAULT_GET_FILES_DIRECTORY
+        if self.shallow and directory and not directory.endswith(DIRECTORY_DELIMITER):
+            return f"{directory}{DIRECTORY_DELIMITER}"
+        return directory
+
+
+class ExportFilesQueryParams(BaseModel):
+    """Query parameters for exporting the metadata of all files."""
+
+    directory: str = Field(
+        default=DEFAULT_GET_FILES_DIRECTORY,
+        description="Export only files whose path starts with this prefix. Defaults to all files.",
+    )
+
+
+class ArchiveFormat(str, Enum):
+    """The formats a directory can be downloaded in."""
+
+    ZIP = "zip"
+    TAR = "tar"
+
+
+class ArchiveFilesQueryParams(BaseModel):
+    """Query parameters for downloading the files of a directory as one archive."""
+
+    directory: str = Field(
+        default=DEFAULT_GET_FILES_DIRECTORY,
+        description=(
+            "Archive every file whose path starts with this prefix, named by its path relative to it. "
+            "Defaults to all files."
+        ),
+        json_schema_extra={"example": "path/to/"},
+    )
+    format: ArchiveFormat = Field(
+        default=ArchiveFormat.ZIP,
+        description="The archive format. Entries are stored uncompressed in either format.",
+    )
+
 
 class DeleteFileResponse(BaseModel):
     """Response for deleting a file."""
@@ -104,6 +347,129 @@ class DeleteFileResponse(BaseModel):
     message: str
 
 
+class BatchDeleteFilesRequest(BaseModel):
+    """Request body for `POST /v1/files:batchDelete`."""
+
+    file_paths: Optional[list[str]] = Field(
+        default=None,
+        min_length=1,
+        description="The paths of the files to delete.",
+        json_schema_extra={"example": ["path/to/pyproject.toml", "path/to/Makefile"]},
+    )
+    directory: Optional[str] = Field(
+        default=None,
+        min_length=1,
+        description="Delete every file whose path starts with this prefix.",
+        json_schema_extra={"example": "path/to/"},
+    )
+
+    @model_validator(mode="after")
+    def check_exactly_one_selector(self) -> Self:
+        """Ensure that exactly one of file_paths and directory is set."""
+        if (self.file_paths is None) == (self.directory is None):
+            raise ValueError("Exactly one of file_paths and directory must be set")
+        return self
+
+
+class BatchDeleteFileResult(BaseModel):
+    """The outcome of deleting one file, sent as one line of the `POST /v1/files:batchDelete` response."""
+
+    file_path: str = Field(
+        description="The path of the file.",
+        json_schema_extra={"example": "path/to/pyproject.toml"},
+    )
+    deleted: bool = Field(
+        description="Whether the file is gone. Deleting a missing file succeeds."
+    )
+    error_code: Optional[str] = Field(
+        default=None,
+        description="The S3 error code if the file could not be deleted.",
+        json_schema_extra={"example": "AccessDenied"},
+    )
+    error_message: Optional[str] = Field(
+        default=None,
+        description="The S3 error message if the file could not be deleted.",
+    )
+
+
+class CopyFilesRequest(BaseModel):
+    """Request body for `POST /v1/files:copy` and `POST /v1/files:move`."""
+
+    source_path: Optional[str] = Field(
+        default=None,
+        min_length=1,
+        description="The path of the file to copy.",
+        json_schema_extra={"example": "path/to/pyproject.toml"},
+    )
+    source_directory: Optional[str] = Field(
+        default=None,
+        min_length=1,
+        description="Copy every file in this directory, including sub-directories.",
+        json_schema_extra={"example": "path/to/"},
+    )
+    destination_path: str = Field(
+        min_length=1,
+        description=(
+            "The path of the copy, or with `source_directory` the directory the files are copied into. "
+            "Existing files are replaced."
+        ),
+        json_schema_extra={"example": "new/path/to/pyproject.toml"},
+    )
+
+    @model_validator(mode="after")
+    def check_source_and_destination(self) -> Self:
+        """Ensure that exactly one source is set and that a file or directory is not copied onto itself."""
+        if (self.source_path is None) == (self.source_directory is None):
+            raise ValueError(
+                "Exactly one of source_path and source_directory must be set"
+            )
+        if self.source_directory is not None:
+            # a directory `a` must not match the files of `ab/`
+            self.source_directory = (
+                self.source_directory.rstrip(DIRECTORY_DELIMITER) + DIRECTORY_DELIMITER
+            )
+            self.destination_path = (
+                self.destination_path.rstrip(DIRECTORY_DELIMITER) + DIRECTORY_DELIMITER
+            )
+            # the copies would be listed and copied again
+            if self.destination_path.startswith(self.source_directory):
+                raise ValueError("destination_path must not be inside source_directory")
+        elif self.destination_path == self.source_path:
+            raise ValueError("destination_path must differ from source_path")
+        return self
+
+
+class CopyFileResult(BaseModel):
+    """
+    The outcome of copying or moving one file.
+
+    Sent as the response of a single file, and as one line of the response of a directory.
+    """
+
+    source_path: str = Field(
+        description="The path of the source file.",
+        json_schema_extra={"example": "path/to/pyproject.toml"},
+    )
+    destination_path: str = Field(
+        description="The path of the copy.",
+        json_schema_extra={"example": "new/path/to/pyproject.toml"},
+    )
+    copied: bool = Field(description="Whether the file was copied.")
+    source_deleted: Optional[bool] = Field(
+        default=None,
+        description="For moves, whether the source file was deleted after it was copied.",
+    )
+    error_code: Optional[str] = Field(
+        default=None,
+        description="The S3 error code if the file could not be copied or deleted.",
+        json_schema_extra={"example": "NoSuchKey"},
+    )
+    error_message: Optional[str] = Field(
+        default=None,
+        description="The S3 error message if the file could not be copied or deleted.",
+    )
+
+
 class GeneratedFileType(str, Enum):
     """The type of file generated by OpenAI."""
 
@@ -131,6 +497,28 @@ class GenerateFilesQueryParams(BaseModel):
         description="The type of file to generate.",
         json_schema_extra={"example": "Text"},
     )
+    bypass_cache: bool = Field(
+        default=False,
+        description=(
+            "Call the model even if the same generation is cached. The new file replaces the cached one. "
+            "Only relevant if the generation cache is enabled."
+        ),
+    )
+    run_as_job: bool = Field(
+        default=False,
+        description=(
+            "Return `202 Accepted` right away and generate the file in the background. "
+            "The job's status is reported by `GET /v1/jobs/{job_id}`."
+        ),
+    )
+    webhook_url: Optional[HttpUrl] = Field(
+        default=None,
+        description=(
+            "URL to POST the finished job to, as returned by `GET /v1/jobs/{job_id}`. Only used with `run_as_job`. "
+            "Its host must have public addresses, and be on the server's allowlist if it has one."
+        ),
+        json_schema_extra={"example": "https://example.com/hooks/generated-files"},
+    )
 
     @model_validator(mode="after")
     def validate_file_path_extension(self) -> Self:
@@ -160,6 +548,35 @@ class GenerateFilesQueryParams(BaseModel):
         return self
 
 
+class JobStatus(str, Enum):
+    """Status of a background job."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class GenerationJob(BaseModel):
+    """A file generated in the background, returned by `POST /v1/files/generated` with `run_as_job` and `GET /v1/jobs/:job_id`."""
+
+    job_id: str = Field(
+        description="The ID of the job.",
+        json_schema_extra={"example": "5f0c6b2e9a1d4c3e8b7a6f5e4d3c2b1a"},
+    )
+    status: JobStatus = Field(description="The status of the job.")
+    file_path: str = Field(
+        description="The path the file is generated at. It exists once the job succeeded.",
+        json_schema_extra={"example": "path/to/image.png"},
+    )
+    file_type: GeneratedFileType = Field(description="The type of file generated.")
+    created_at: datetime = Field(description="When the job was queued.")
+    updated_at: datetime = Field(description="When the job's status last changed.")
+    error: Optional[str] = Field(
+        default=None, description="Why the job failed, if it did."
+    )
+
+
 class PutGeneratedFileResponse(BaseModel):
     """Response model for `POST /v1/files/generated/:file_path`."""
 
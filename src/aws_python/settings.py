@@ -1,12 +1,27 @@
 """Settings for the AWS Python project."""
 
+from importlib.util import find_spec
+from typing import (
+    Literal,
+    Optional,
+)
+
 from pydantic import (
     Field,
+    field_validator,
+    model_validator,
 )
 from pydantic_settings import (
     BaseSettings,
     SettingsConfigDict,
 )
+from typing_extensions import Self
+
+from aws_python.compression import (
+    DEFAULT_COMPRESSIBLE_CONTENT_TYPES,
+    DEFAULT_COMPRESSION_MIN_SIZE_BYTES,
+    get_supported_content_encodings,
+)
 
 
 class Settings(BaseSettings):
@@ -18,4 +33,387 @@ class Settings(BaseSettings):
 
     s3_bucket_name: str = Field(...)
 
+    # botocore config for the app-scoped S3 client: https://botocore.amazonaws.com/v1/documentation/api/latest/reference/config.html
+    s3_max_pool_connections: int = Field(
+        default=128,
+        ge=1,
+        description="Maximum number of pooled HTTP connections kept open to S3.",
+    )
+    s3_tcp_keepalive: bool = Field(
+        default=True,
+        description="Enable TCP keep-alive on connections to S3.",
+    )
+    s3_connect_timeout_seconds: float = Field(
+        default=5.0,
+        gt=0,
+        description="Seconds to wait when establishing a connection to S3.",
+    )
+    s3_read_timeout_seconds: float = Field(
+        default=60.0,
+        gt=0,
+        description="Seconds to wait for data on an open connection to S3.",
+    )
+    s3_max_retry_attempts: int = Field(
+        default=3,
+        ge=0,
+        description="Maximum number of retries botocore makes for a failed S3 call.",
+    )
+    s3_retry_mode: Literal["legacy", "standard", "adaptive"] = Field(
+        default="standard",
+        description="botocore retry mode used by the S3 client.",
+    )
+    s3_executor_max_workers: int = Field(
+        default=128,
+        ge=1,
+        description=(
+            "Size of the thread pool running blocking S3 calls, i.e. the number of S3 calls in flight per worker. "
+            "Keep it at or below `s3_max_pool_connections` so threads never wait for a pooled connection."
+        ),
+    )
+    s3_multipart_part_size_bytes: int = Field(
+        default=8 * 1024 * 1024,
+        ge=5 * 1024 * 1024,  # S3's minimum size for all but the last part
+        description="Part size used when streaming uploads into S3 multipart uploads. Smaller uploads use a single PUT.",
+    )
+    s3_multipart_max_concurrency: int = Field(
+        default=4,
+        ge=1,
+        description="Maximum number of parts of one upload sent to S3 at once. Peak memory per upload is about part size x concurrency.",
+    )
+    s3_download_chunk_size_bytes: int = Field(
+        default=1024 * 1024,
+        ge=64 * 1024,
+        le=8 * 1024 * 1024,
+        description="Bytes read from S3 at once when streaming a download. Larger chunks mean fewer thread hops per byte.",
+    )
+    s3_download_read_ahead_chunks: int = Field(
+        default=2,
+        ge=1,
+        description="Chunks of a download read from S3 ahead of the client. Memory per download is about chunk size x (read-ahead + 1).",
+    )
+    s3_parallel_download_threshold_bytes: Optional[int] = Field(
+        default=64 * 1024 * 1024,
+        ge=0,
+        description="Files larger than this are downloaded from S3 as concurrent byte-range GETs. None disables it.",
+    )
+    s3_parallel_download_part_size_bytes: int = Field(
+        default=8 * 1024 * 1024,
+        ge=64 * 1024,
+        description="Size of each byte range of a parallel download.",
+    )
+    s3_parallel_download_max_concurrency: int = Field(
+        default=8,
+        ge=1,
+        description="Ranges of one download fetched or buffered at once. Memory per download is about part size x (concurrency + 1).",
+    )
+    s3_parallel_download_max_attempts: int = Field(
+        default=3,
+        ge=1,
+        description="Attempts per range of a parallel download before transient S3 errors fail the download.",
+    )
+    s3_batch_upload_max_concurrency: int = Field(
+        default=16,
+        ge=1,
+        description="Maximum number of files of one batch upload written to S3 at once.",
+    )
+    s3_batch_delete_max_concurrency: int = Field(
+        default=4,
+        ge=1,
+        description="Maximum number of 1,000-key `delete_objects` batches of one bulk delete sent to S3 at once.",
+    )
+    s3_listing_max_concurrency: int = Field(
+        default=8,
+        ge=1,
+        description=(
+            "Maximum number of key ranges listed at once when walking a whole directory, e.g. for "
+            "exports and bulk deletes. 1 lists sequentially with continuation tokens."
+        ),
+    )
+    s3_copy_max_concurrency: int = Field(
+        default=16,
+        ge=1,
+        description="Maximum number of files of one directory copy or move copied within S3 at once.",
+    )
+    s3_multipart_copy_threshold_bytes: int = Field(
+        default=5 * 1024 * 1024 * 1024,
+        ge=5 * 1024 * 1024,
+        le=5 * 1024 * 1024 * 1024,  # S3's maximum size for `CopyObject`
+        description="Files larger than this are copied as multipart uploads of byte ranges, several parts at once.",
+    )
+    s3_multipart_copy_part_size_bytes: int = Field(
+        default=512 * 1024 * 1024,
+        ge=5 * 1024 * 1024,
+        le=5 * 1024 * 1024 * 1024,
+        description="Size of each part of a multipart copy. Raised for files that would need more than 10,000 parts.",
+    )
+    s3_archive_prefetch_window: int = Field(
+        default=16,
+        ge=1,
+        description=(
+            "Files of a directory archive fetched from S3 ahead of the one being written. Files that fit "
+            "into one download chunk are read in full, so memory per archive is about window x chunk size."
+        ),
+    )
+    upload_session_max_part_size_bytes: int = Field(
+        default=64 * 1024 * 1024,
+        ge=5 * 1024 * 1024,  # S3's minimum size for all but the last part
+        # S3 takes parts of up to 5 GiB, but each part is held in memory per concurrent request
+        le=256 * 1024 * 1024,
+        description=(
+            "Largest part accepted by upload sessions. Each part is buffered in memory while it is sent to S3, "
+            "so memory per concurrent part upload is about this size. 10,000 parts of at most 256 MiB allow "
+            "files of up to about 2.5 TiB."
+        ),
+    )
+    upload_session_max_age_seconds: float = Field(
+        default=24 * 60 * 60,
+        gt=0,
+        description="Seconds after which unfinished multipart uploads, including upload sessions, count as abandoned.",
+    )
+    upload_session_sweep_interval_seconds: Optional[float] = Field(
+        default=60 * 60,
+        gt=0,
+        description=(
+            "Seconds between two sweeps aborting abandoned multipart uploads, freeing the storage of their parts. "
+            "None disables the sweeper, e.g. when the bucket has an `AbortIncompleteMultipartUpload` lifecycle rule."
+        ),
+    )
+    metadata_cache_enabled: bool = Field(
+        default=True,
+        description="Cache object metadata in-process to answer HEAD requests and existence checks without calling S3.",
+    )
+    metadata_cache_max_entries: int = Field(
+        default=10_000,
+        ge=1,
+        description="Maximum number of objects kept in the metadata cache; the least recently used are evicted first.",
+    )
+    metadata_cache_ttl_seconds: float = Field(
+        default=30.0,
+        ge=0,
+        description="Seconds cached metadata stays valid. Bounds how long changes made by other processes go unnoticed.",
+    )
+    metadata_cache_negative_ttl_seconds: float = Field(
+        default=5.0,
+        ge=0,
+        description="Seconds an object is remembered as missing after S3 reported a 404 for it.",
+    )
+    cache_control_header: str = Field(
+        default="no-cache",
+        description=(
+            "`Cache-Control` header sent with files and file metadata. The default lets clients and CDNs keep "
+            "copies but revalidate them with `If-None-Match`/`If-Modified-Since`, which are answered with 304."
+        ),
+    )
+    content_addressed_storage_enabled: bool = Field(
+        default=False,
+        description=(
+            "Store uploaded content once per SHA-256 digest under `content_addressed_blob_prefix`, with the file "
+            "path as a pointer to it, so re-uploads of identical content skip the data upload and the digest is "
+            "the ETag. Listings report the size of the (empty) pointers. Keep it enabled while pointers exist."
+        ),
+    )
+    content_addressed_blob_prefix: str = Field(
+        default=".blobs/sha256/",
+        min_length=1,
+        description="Prefix of the content-addressed blobs, which are hidden from listings.",
+    )
+    compression_enabled: bool = Field(
+        default=False,
+        description=(
+            "Compress uploads matching `compression_content_types` before storing them, with `Content-Encoding` "
+            "recorded on the object. Downloads are sent as stored to clients accepting the encoding and decoded "
+            "on the fly for all others. Listings report the compressed sizes."
+        ),
+    )
+    compression_content_encoding: Literal["gzip", "zstd"] = Field(
+        default="gzip",
+        description="Encoding compressed files are stored in. `zstd` needs the `zstd` extra, `pip install aws-python[zstd]`.",
+    )
+    compression_level: Optional[int] = Field(
+        default=None,
+        ge=1,
+        le=22,
+        description="Compression level, 1-9 for gzip and 1-22 for zstd. None uses the encoding's default.",
+    )
+    compression_min_size_bytes: int = Field(
+        default=DEFAULT_COMPRESSION_MIN_SIZE_BYTES,
+        ge=0,
+        description="Smaller files are stored uncompressed, since encoding them saves less than it costs.",
+    )
+    compression_content_types: list[str] = Field(
+        default=list(DEFAULT_COMPRESSIBLE_CONTENT_TYPES),
+        description="Content types that are compressed, with `*` wildcards, e.g. `text/*`. Others are stored as sent.",
+    )
+    presigned_urls_enabled: bool = Field(
+        default=False,
+        description=(
+            "Redirect downloads to presigned S3 URLs and hand out presigned upload URLs by default, so file content "
+            "bypasses the API. Requests can still opt out with `redirect=false`."
+        ),
+    )
+    presigned_url_size_threshold_bytes: Optional[int] = Field(
+        default=None,
+        ge=0,
+        description="Files larger than this are always transferred through presigned S3 URLs. None disables the threshold.",
+    )
+    presigned_url_expiration_seconds: int = Field(
+        default=3600,
+        ge=60,
+        le=7 * 24 * 60 * 60,  # the maximum validity of SigV4 presigned URLs
+        description="Seconds presigned S3 URLs stay valid.",
+    )
+    presigned_url_cache_max_entries: int = Field(
+        default=10_000,
+        ge=1,
+        description="Maximum number of presigned URLs reused per object while they are still valid for long enough.",
+    )
+
+    openai_max_connections: int = Field(
+        default=100,
+        ge=1,
+        description="Maximum number of connections to OpenAI, and to the hosts of generated files, open at once.",
+    )
+    openai_max_keepalive_connections: int = Field(
+        default=20,
+        ge=0,
+        description="Idle connections kept open for the next generation instead of paying a new TLS handshake.",
+    )
+    openai_keepalive_expiry_seconds: float = Field(
+        default=60,
+        ge=0,
+        description="Seconds an idle connection is kept open.",
+    )
+    openai_http2: bool = Field(
+        default=False,
+        description="Negotiate HTTP/2 with OpenAI, multiplexing concurrent generations over fewer connections. Needs the `http2` extra, `pip install aws-python[http2]`.",
+    )
+    openai_connect_timeout_seconds: float = Field(
+        default=5,
+        gt=0,
+        description="Seconds to wait for a new connection to OpenAI.",
+    )
+    openai_timeout_seconds: float = Field(
+        default=120,
+        gt=0,
+        description="Seconds to wait for each read, write or pooled connection of an OpenAI call. Image generation takes tens of seconds.",
+    )
+    openai_max_retries: int = Field(
+        default=2,
+        ge=0,
+        description="Retries of OpenAI calls failing with connection errors, rate limits or server errors.",
+    )
+    generation_cache_enabled: bool = Field(
+        default=False,
+        description=(
+            "Cache generated files in S3 under `generation_cache_prefix`, keyed by file type, model, prompt and "
+            "parameters, so repeated generations are copied server-side instead of calling OpenAI again."
+        ),
+    )
+    generation_cache_prefix: str = Field(
+        default=".generations/sha256/",
+        min_length=1,
+        description="Prefix of the cached generations, which are hidden from listings.",
+    )
+    generation_cache_ttl_seconds: float = Field(
+        default=7 * 24 * 60 * 60,
+        gt=0,
+        description="How long a cached generation is reused after it was generated.",
+    )
+    generation_cache_max_entries: int = Field(
+        default=10_000,
+        ge=1,
+        description="Maximum number of cached generations each process remembers, to skip looking them up in S3.",
+    )
+    request_coalescing_enabled: bool = Field(
+        default=True,
+        description=(
+            "Collapse concurrent identical work of this process into one call: reads and metadata lookups of the "
+            "same file, and generations with the same generation cache key. Everyone waiting gets its outcome."
+        ),
+    )
+    request_coalescing_max_body_bytes: int = Field(
+        default=1024 * 1024,
+        ge=0,
+        description=(
+            "Largest file whose concurrent downloads share one S3 read, which holds the file in memory once. "
+            "Larger files are streamed from S3 for every client."
+        ),
+    )
+    jobs_queue: Literal["memory", "sqs"] = Field(
+        default="memory",
+        description=(
+            "Queue of the generation jobs. `memory` runs them in this process and loses queued jobs when it stops; "
+            "`sqs` sends them to `jobs_sqs_queue_url`, where the workers of every process take them. "
+            "Under Lambda, use `sqs` with a separate worker, since in-process workers are frozen between invocations."
+        ),
+    )
+    jobs_sqs_queue_url: Optional[str] = Field(
+        default=None,
+        description=(
+            "URL of the SQS queue of the generation jobs, with `jobs_queue=sqs`. "
+            "Point `AWS_ENDPOINT_URL_SQS` at an SQS-compatible stand-in, e.g. ElasticMQ, to run it locally."
+        ),
+    )
+    jobs_queue_max_size: int = Field(
+        default=1_000,
+        ge=1,
+        description="Maximum number of jobs waiting in the in-memory queue. New jobs are refused with `503` beyond it.",
+    )
+    jobs_worker_count: int = Field(
+        default=4,
+        ge=0,
+        description="Number of generation jobs this process runs at once. 0 only queues jobs, for other processes to run.",
+    )
+    jobs_prefix: str = Field(
+        default=".jobs/",
+        min_length=1,
+        description="Prefix of the job records, which are hidden from listings.",
+    )
+    jobs_webhook_max_attempts: int = Field(
+        default=3,
+        ge=1,
+        description="Attempts to deliver a finished job to its webhook before giving up.",
+    )
+    jobs_webhook_allowed_hosts: list[str] = Field(
+        default_factory=list,
+        description=(
+            'Host names and addresses job webhooks may be sent to, e.g. `["hooks.example.com"]`. Any host if empty. '
+            "Either way, webhooks are only sent to public addresses, never to private, loopback or link-local ones."
+        ),
+    )
+    openai_image_response_format: Literal["url", "b64_json"] = Field(
+        default="url",
+        description=(
+            "How OpenAI returns generated images: `url` streams the image from a download link, "
+            "`b64_json` returns it inline, saving the second request for a response a third larger."
+        ),
+    )
+
+    @field_validator("compression_content_encoding")
+    @classmethod
+    def check_content_encoding_is_supported(cls, content_encoding: str) -> str:
+        """Fail at startup rather than on the first upload if the encoding's package is missing."""
+        if content_encoding not in get_supported_content_encodings():
+            raise ValueError(
+                f"`{content_encoding}` compression needs an optional package that is not installed"
+            )
+        return content_encoding
+
+    @field_validator("openai_http2")
+    @classmethod
+    def check_http2_is_supported(cls, http2: bool) -> bool:
+        """Fail at startup rather than on the first generation if `h2` is missing."""
+        if http2 and find_spec("h2") is None:
+            raise ValueError(
+                "HTTP/2 needs the optional `h2` package, install `aws-python[http2]`"
+            )
+        return http2
+
+    @model_validator(mode="after")
+    def check_jobs_sqs_queue_url_is_set(self) -> Self:
+        """Fail at startup rather than on the first job if the SQS queue is missing."""
+        if self.jobs_queue == "sqs" and not self.jobs_sqs_queue_url:
+            raise ValueError("`jobs_queue=sqs` needs `jobs_sqs_queue_url`")
+        return self
+
     model_config = SettingsConfigDict(case_sensitive=False)
@@ -0,0 +1,91 @@
+"""Collapse concurrent calls doing the same work into one, sharing its outcome with every caller.
+
+When many requests need the same thing at once, e.g. the metadata of a popular file or a
+generation of the same prompt, only the first caller for a key runs the work. Callers
+arriving while it is in flight wait for that call instead of starting their own, and all
+of them get its result or its exception. Nothing is cached: once the call finishes, the
+next caller for the key runs the work again.
+
+The work runs in a task of its own, so a caller that goes away (e.g. a client that
+disconnects) does not cancel it for the others. Only when every caller has gone away is
+the work cancelled too.
+"""
+
+import asyncio
+from dataclasses import dataclass
+from typing import (
+    Awaitable,
+    Callable,
+    Generic,
+    Hashable,
+    NamedTuple,
+    TypeVar,
+)
+
+K = TypeVar("K", bound=Hashable)
+T = TypeVar("T")
+
+
+class SingleFlightResult(NamedTuple, Generic[T]):
+    """The outcome of a call, and whether the caller joined a call started by another caller."""
+
+    value: T
+    joined: bool
+
+
+@dataclass
+class _Call(Generic[T]):
+    task: "asyncio.Future[T]"
+    waiters: int = 0
+
+
+class SingleFlight(Generic[K, T]):
+    """Run at most one call per key at a time, sharing its outcome with every concurrent caller.
+
+    Instances belong to one event loop, e.g. an app's `state`.
+    """
+
+    def __init__(self):
+        self._calls: dict[K, _Call[T]] = {}
+
+    def __len__(self) -> int:
+        """Return the number of calls in flight."""
+        return len(self._calls)
+
+    async def run(
+        self, key: K, func: Callable[[], Awaitable[T]]
+    ) -> SingleFlightResult[T]:
+        """
+        Run `func`, or wait for the call already running for the same key.
+
+        Args:
+            key (K): Identifies the work. Calls with equal keys are collapsed.
+            func (Callable[[], Awaitable[T]]): Does the work. Not called if a call for the key is in flight.
+
+        Returns:
+            SingleFlightResult[T]: The value returned by the call, and whether this caller joined another
+                caller's call, e.g. to tell if a returned resource was already consumed by that caller.
+
+        Raises:
+            Exception: Whatever the call raised, to every caller waiting for it.
+        """
+        call = self._calls.get(key)
+        joined = call is not None
+        if call is None:
+            call = _Call(task=asyncio.ensure_future(func()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _: self._forget(key, call))  # type: ignore[arg-type]
+
+        call.waiters += 1
+        try:
+            value = await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                # every caller went away, so nobody needs the outcome anymore
+                call.task.cancel()
+        return SingleFlightResult(value=value, joined=joined)
+
+    def _forget(self, key: K, call: _Call[T]) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
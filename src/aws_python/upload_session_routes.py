@@ -0,0 +1,393 @@
+"""Define the FastAPI routes of upload sessions, which upload large files in parts."""
+
+import mimetypes
+from concurrent.futures import Executor
+from contextlib import contextmanager
+from datetime import (
+    datetime,
+    timedelta,
+    timezone,
+)
+from typing import (
+    Annotated,
+    Iterator,
+    Optional,
+)
+
+from botocore.exceptions import ClientError
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Path,
+    Request,
+    Response,
+    status,
+)
+from loguru import logger
+
+from aws_python.dependencies import (
+    get_metadata_cache,
+    get_s3_client,
+    get_s3_executor,
+)
+from aws_python.routes import (
+    INTERNAL_PATH_RESPONSE,
+    reject_internal_path,
+)
+from aws_python.s3.async_objects import (
+    object_exists_in_s3_async,
+    run_in_s3_executor,
+)
+from aws_python.s3.metadata_cache import ObjectMetadataCache
+from aws_python.s3.multipart_upload import MIN_MULTIPART_PART_SIZE_BYTES
+from aws_python.s3.presigned_urls import MAX_MULTIPART_PARTS
+from aws_python.s3.upload_sessions import (
+    UploadSession,
+    find_missing_part_numbers,
+    is_no_such_upload_error,
+    list_uploaded_parts,
+)
+from aws_python.s3.write_objects import (
+    abort_multipart_upload,
+    complete_multipart_upload,
+    create_multipart_upload,
+    upload_part,
+)
+from aws_python.schemas import (
+    CreateUploadSessionRequest,
+    ListUploadedPartsResponse,
+    PutFileResponse,
+    UploadedPart,
+    UploadSessionResponse,
+)
+from aws_python.settings import Settings
+
+try:
+    from mypy_boto3_s3 import S3Client
+except ImportError:
+    ...
+
+UPLOAD_SESSIONS_ROUTER = APIRouter(tags=["Upload Sessions"])
+
+
+@UPLOAD_SESSIONS_ROUTER.post(
+    "/v1/uploads",
+    status_code=status.HTTP_201_CREATED,
+    responses={
+        status.HTTP_201_CREATED: {
+            "description": "The session was started. Upload the parts next.",
+        },
+        status.HTTP_403_FORBIDDEN: INTERNAL_PATH_RESPONSE,
+    },
+)
+async def create_upload_session(
+    request: Request,
+    body: CreateUploadSessionRequest,
+    s3_client: Annotated["S3Client", Depends(get_s3_client)],
+    s3_executor: Annotated[Executor, Depends(get_s3_executor)],
+) -> UploadSessionResponse:
+    """
+    Start a session to upload a large file in parts.
+
+    Parts can be uploaded in parallel and in any order, and a failed part is retried on its
+    own. After a failure, list the stored parts to resume with the missing ones. Sessions
+    left unfinished for longer than the server's maximum age are aborted.
+    """
+    settings: Settings = request.app.state.settings
+    reject_internal_path(settings, body.file_path)
+    upload_id = await run_in_s3_executor(
+        s3_executor,
+        create_multipart_upload,
+        bucket_name=settings.s3_bucket_name,
+        object_key=body.file_path,
+        content_type=body.content_type or mimetypes.guess_type(body.file_path)[0],
+        s3_client=s3_client,
+    )
+    upload_session = UploadSession(object_key=body.file_path, upload_id=upload_id)
+    logger.info(
+        "Started upload session for path: {file_path}", file_path=body.file_path
+    )
+    return UploadSessionResponse(
+        upload_session_id=upload_session.to_session_id(),
+        file_path=body.file_path,
+        part_size_bytes=settings.s3_multipart_part_size_bytes,
+        min_part_size_bytes=MIN_MULTIPART_PART_SIZE_BYTES,
+        max_part_size_bytes=settings.upload_session_max_part_size_bytes,
+        max_parts=MAX_MULTIPART_PARTS,
+        expires_at=(
+            datetime.now(tz=timezone.utc)
+            + timedelta(seconds=settings.upload_session_max_age_seconds)
+            if settings.upload_session_sweep_interval_seconds is not None
+            else None
+        ),
+    )
+
+
+def get_upload_session(upload_session_id: str) -> UploadSession:
+    """Parse an upload session ID from the URL, answering 404 for IDs the API did not hand out."""
+    try:
+        return UploadSession.from_session_id(upload_session_id)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Upload session not found"
+        ) from e
+
+
+@contextmanager
+def raise_upload_session_not_found() -> Iterator[None]:
+    """Answer 404 if S3 reports that the session's multipart upload was completed, aborted or never started."""
+    try:
+        yield
+    except ClientError as e:
+        if not is_no_such_upload_error(e):
+            raise
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Upload session not found"
+        ) from e
+
+
+async def read_request_body(request: Request, max_size_bytes: int) -> bytearray:
+    """Read a request body into memory, answering 413 as soon as it exceeds the limit."""
+    content_length = request.headers.get("Content-Length")
+    if content_length is not None and content_length.isdigit():
+        if int(content_length) > max_size_bytes:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Parts must not be larger than {max_size_bytes} bytes",
+            )
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > max_size_bytes:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Parts must not be larger than {max_size_bytes} bytes",
+            )
+    # not copied into `bytes`, which would briefly hold the part in memory twice
+    return body
+
+
+@UPLOAD_SESSIONS_ROUTER.put(
+    "/v1/uploads/{upload_session_id}/parts/{part_number}",
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/octet-stream": {
+                    "schema": {"type": "string", "format": "binary"},
+                },
+            },
+        },
+    },
+    responses={
+        status.HTTP_404_NOT_FOUND: {
+            "description": "The upload session does not exist, or was completed or aborted.",
+        },
+        status.HTTP_413_REQUEST_ENTITY_TOO_LARGE: {
+            "description": "The part is larger than the session's `max_part_size_bytes`.",
+        },
+    },
+)
+async def upload_part_of_session(
+    request: Request,
+    upload_session_id: str,
+    part_number: Annotated[int, Path(ge=1, le=MAX_MULTIPART_PARTS)],
+    s3_client: Annotated["S3Client", Depends(get_s3_client)],
+    s3_executor: Annotated[Executor, Depends(get_s3_executor)],
+) -> UploadedPart:
+    """
+    Upload one part of a file, sent as the raw request body.
+
+    Uploading a part number again replaces the part, so failed parts can simply be retried.
+    All parts except the last one must be at least `min_part_size_bytes` large.
+    """
+    settings: Settings = request.app.state.settings
+    upload_session = get_upload_session(upload_session_id)
+    part_content = await read_request_body(
+        request, max_size_bytes=settings.upload_session_max_part_size_bytes
+    )
+    with raise_upload_session_not_found():
+        completed_part = await run_in_s3_executor(
+            s3_executor,
+            upload_part,
+            bucket_name=settings.s3_bucket_name,
+            object_key=upload_session.object_key,
+            upload_id=upload_session.upload_id,
+            part_number=part_number,
+            part_content=part_content,
+            s3_client=s3_client,
+        )
+    return UploadedPart(
+        part_number=part_number,
+        etag=completed_part["ETag"],
+        size_bytes=len(part_content),
+    )
+
+
+@UPLOAD_SESSIONS_ROUTER.get(
+    "/v1/uploads/{upload_session_id}/parts",
+    responses={
+        status.HTTP_404_NOT_FOUND: {
+            "description": "The upload session does not exist, or was completed or aborted.",
+        },
+    },
+)
+async def list_parts_of_session(
+    request: Request,
+    upload_session_id: str,
+    s3_client: Annotated["S3Client", Depends(get_s3_client)],
+    s3_executor: Annotated[Executor, Depends(get_s3_executor)],
+) -> ListUploadedPartsResponse:
+    """List the stored parts of an upload session, e.g. to find the parts left to upload after a failure."""
+    settings: Settings = request.app.state.settings
+    upload_session = get_upload_session(upload_session_id)
+    with raise_upload_session_not_found():
+        parts = await run_in_s3_executor(
+            s3_executor,
+            list_uploaded_parts,
+            bucket_name=settings.s3_bucket_name,
+            object_key=upload_session.object_key,
+            upload_id=upload_session.upload_id,
+            s3_client=s3_client,
+        )
+    return ListUploadedPartsResponse(
+        upload_session_id=upload_session_id,
+        file_path=upload_session.object_key,
+        parts=[
+            UploadedPart(
+                part_number=part["PartNumber"],
+                etag=part["ETag"],
+                size_bytes=part["Size"],
+            )
+            for part in parts
+        ],
+        missing_part_numbers=find_missing_part_numbers(
+            part["PartNumber"] for part in parts
+        ),
+    )
+
+
+@UPLOAD_SESSIONS_ROUTER.post(
+    "/v1/uploads/{upload_session_id}:complete",
+    responses={
+        status.HTTP_200_OK: {
+            "model": PutFileResponse,
+            "description": "The file was assembled from the parts and overwrote an existing file.",
+        },
+        status.HTTP_201_CREATED: {"model": PutFileResponse},
+        status.HTTP_404_NOT_FOUND: {
+            "description": "The upload session does not exist, or was completed or aborted.",
+        },
+        status.HTTP_409_CONFLICT: {
+            "description": "Parts are missing, or a part other than the last is smaller than the minimum part size.",
+        },
+    },
+)
+async def complete_upload_session(
+    request: Request,
+    upload_session_id: str,
+    response: Response,
+    s3_client: Annotated["S3Client", Depends(get_s3_client)],
+    s3_executor: Annotated[Executor, Depends(get_s3_executor)],
+    metadata_cache: Annotated[
+        Optional[ObjectMetadataCache], Depends(get_metadata_cache)
+    ],
+) -> PutFileResponse:
+    """Assemble the uploaded parts, from part 1 on without gaps, into the file and end the session."""
+    settings: Settings = request.app.state.settings
+    upload_session = get_upload_session(upload_session_id)
+    with raise_upload_session_not_found():
+        parts = await run_in_s3_executor(
+            s3_executor,
+            list_uploaded_parts,
+            bucket_name=settings.s3_bucket_name,
+            object_key=upload_session.object_key,
+            upload_id=upload_session.upload_id,
+            s3_client=s3_client,
+        )
+    missing_part_numbers = find_missing_part_numbers(
+        part["PartNumber"] for part in parts
+    )
+    if not parts or missing_part_numbers:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=(
+                f"Upload the missing parts first: {missing_part_numbers}"
+                if parts
+                else "Upload at least one part first"
+            ),
+        )
+
+    object_exists = await object_exists_in_s3_async(
+        bucket_name=settings.s3_bucket_name,
+        object_key=upload_session.object_key,
+        s3_client=s3_client,
+        executor=s3_executor,
+        metadata_cache=metadata_cache,
+    )
+    try:
+        with raise_upload_session_not_found():
+            await run_in_s3_executor(
+                s3_executor,
+                complete_multipart_upload,
+                bucket_name=settings.s3_bucket_name,
+                object_key=upload_session.object_key,
+                upload_id=upload_session.upload_id,
+                parts=[
+                    {"PartNumber": part["PartNumber"], "ETag": part["ETag"]}
+                    for part in parts
+                ],
+                s3_client=s3_client,
+                metadata_cache=metadata_cache,
+            )
+    except ClientError as e:
+        if e.response["Error"]["Code"] != "EntityTooSmall":
+            raise
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"All parts but the last must be at least {MIN_MULTIPART_PART_SIZE_BYTES} bytes",
+        ) from e
+
+    file_path = upload_session.object_key
+    if object_exists:
+        response.status_code = status.HTTP_200_OK
+        message = f"File already exists at path: /{file_path}"
+    else:
+        response.status_code = status.HTTP_201_CREATED
+        message = f"File uploaded successfully to path: /{file_path}"
+    logger.info("response_message: {message}", message=message)
+    return PutFileResponse(file_path=file_path, message=message)
+
+
+@UPLOAD_SESSIONS_ROUTER.delete(
+    "/v1/uploads/{upload_session_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    responses={
+        status.HTTP_204_NO_CONTENT: {
+            "description": "The session was aborted and its parts deleted.",
+        },
+        status.HTTP_404_NOT_FOUND: {
+            "description": "The upload session does not exist, or was completed or aborted.",
+        },
+    },
+)
+async def abort_upload_session(
+    request: Request,
+    upload_session_id: str,
+    s3_client: Annotated["S3Client", Depends(get_s3_client)],
+    s3_executor: Annotated[Executor, Depends(get_s3_executor)],
+) -> Response:
+    """Abort an upload session and delete its uploaded parts."""
+    settings: Settings = request.app.state.settings
+    upload_session = get_upload_session(upload_session_id)
+    with raise_upload_session_not_found():
+        await run_in_s3_executor(
+            s3_executor,
+            abort_multipart_upload,
+            bucket_name=settings.s3_bucket_name,
+            object_key=upload_session.object_key,
+            upload_id=upload_session.upload_id,
+            s3_client=s3_client,
+        )
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -9,9 +9,13 @@ Access the server at `http://localhost:1080`.
 import os
 from io import BytesIO
 from pathlib import Path
+from typing import Any
 
 import uvicorn
-from fastapi import FastAPI
+from fastapi import (
+    Body,
+    FastAPI,
+)
 from fastapi.responses import (
     JSONResponse,
     StreamingResponse,
@@ -21,11 +25,13 @@ MOCK_PORT = int(os.getenv("OPENAI_MOCK_PORT", "1080"))  # Configurable port vari
 
 THIS_DIR = Path(__file__).parent
 SAMPLE_TTS_AUDIO_FPATH = THIS_DIR / "speech.mp3"
+# a 1x1 transparent PNG, returned inline when `response_format` is `b64_json`
+SAMPLE_IMAGE_B64_JSON = "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAQAAAC1HAwCAAAAC0lEQVR42mNkYAAAAAYAAjCB0C8AAAAASUVORK5CYII="  # pragma: allowlist secret
 
 app = FastAPI(docs_url="/")
 
 # Mock response configuration
-mock_responses = [
+mock_responses: list[dict[str, Any]] = [
     {
         "httpRequest": {"method": "POST", "path": "/chat/completions"},
         "httpResponse": {
@@ -91,10 +97,13 @@ async def chat_completions():
 
 
 @app.post("/images/generations")
-async def images_generations():
+async def images_generations(body: dict = Body(...)):
     response_config = mock_responses[1]["httpResponse"]
+    content = response_config["body"]
+    if body.get("response_format") == "b64_json":
+        content = {**content, "data": [{"b64_json": SAMPLE_IMAGE_B64_JSON}]}
     return JSONResponse(
-        content=response_config["body"],
+        content=content,
         status_code=response_config["statusCode"],
         headers=response_config["headers"],
     )
@@ -0,0 +1,118 @@
+"""Test cases for `s3.async_objects`."""
+
+import asyncio
+import threading
+
+import boto3
+import pytest
+
+from aws_python.s3.async_objects import (
+    S3_EXECUTOR_THREAD_NAME_PREFIX,
+    create_s3_executor,
+    delete_s3_object_async,
+    fetch_s3_object_async,
+    fetch_s3_objects_metadata_async,
+    object_exists_in_s3_async,
+    run_in_s3_executor,
+    run_in_s3_executor_or_release,
+    upload_s3_object_async,
+)
+from tests.consts import TEST_BUCKET_NAME
+
+
+def test_async_crud_round_trip(mocked_aws: None) -> None:
+    """Assert that the async variants upload, read, list and delete an object."""
+    s3_client = boto3.client("s3")
+    executor = create_s3_executor(max_workers=4)
+
+    async def round_trip() -> None:
+        await upload_s3_object_async(
+            TEST_BUCKET_NAME,
+            "folder/file.txt",
+            b"content",
+            content_type="text/plain",
+            s3_client=s3_client,
+            executor=executor,
+        )
+        assert await object_exists_in_s3_async(
+            TEST_BUCKET_NAME, "folder/file.txt", s3_client=s3_client, executor=executor
+        )
+
+        response = await fetch_s3_object_async(
+            TEST_BUCKET_NAME, "folder/file.txt", s3_client=s3_client, executor=executor
+        )
+        assert response["Body"].read() == b"content"
+        assert response["ContentType"] == "text/plain"
+
+        files, next_page_token = await fetch_s3_objects_metadata_async(
+            TEST_BUCKET_NAME, prefix="folder/", s3_client=s3_client, executor=executor
+        )
+        assert [file["Key"] for file in files] == ["folder/file.txt"]
+        assert next_page_token is None
+
+        await delete_s3_object_async(
+            TEST_BUCKET_NAME, "folder/file.txt", s3_client=s3_client, executor=executor
+        )
+        assert not await object_exists_in_s3_async(
+            TEST_BUCKET_NAME, "folder/file.txt", s3_client=s3_client, executor=executor
+        )
+
+    try:
+        asyncio.run(round_trip())
+    finally:
+        executor.shutdown()
+
+
+def test_run_in_s3_executor_uses_dedicated_threads() -> None:
+    """Assert that blocking calls run on the S3 executor's threads, not the event loop's."""
+    executor = create_s3_executor(max_workers=2)
+
+    async def get_thread_names() -> tuple[str, str]:
+        worker_thread_name = await run_in_s3_executor(
+            executor, lambda: threading.current_thread().name
+        )
+        return threading.current_thread().name, worker_thread_name
+
+    try:
+        loop_thread_name, worker_thread_name = asyncio.run(get_thread_names())
+    finally:
+        executor.shutdown()
+
+    assert worker_thread_name.startswith(S3_EXECUTOR_THREAD_NAME_PREFIX)
+    assert worker_thread_name != loop_thread_name
+
+
+def test_run_in_s3_executor_or_release_releases_after_cancel() -> None:
+    """Assert that the result of a call whose caller was cancelled is released once the call is done."""
+    executor = create_s3_executor(max_workers=1)
+    started = threading.Event()
+    finish = threading.Event()
+    released: list[str] = []
+
+    def open_resource() -> str:
+        started.set()
+        finish.wait(5)
+        return "resource"
+
+    async def cancel_while_running() -> None:
+        call = asyncio.ensure_future(
+            run_in_s3_executor_or_release(executor, released.append, open_resource)
+        )
+        while not started.is_set():
+            await asyncio.sleep(0.01)
+        call.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await call
+        assert released == []
+        finish.set()
+        for _ in range(100):
+            if released:
+                break
+            await asyncio.sleep(0.01)
+
+    try:
+        asyncio.run(cancel_while_running())
+    finally:
+        executor.shutdown()
+
+    assert released == ["resource"]
@@ -0,0 +1,77 @@
+"""Test cases for `s3.batch_delete`."""
+
+import asyncio
+
+import boto3
+
+from aws_python.s3.batch_delete import (
+    delete_s3_objects_in_batches_async,
+    iter_batches,
+    list_s3_object_keys_async,
+)
+from aws_python.s3.read_objects import fetch_s3_objects_metadata
+from aws_python.s3.write_objects import upload_s3_object
+from tests.consts import TEST_BUCKET_NAME
+
+
+async def collect(async_iterable) -> list:
+    """Collect the items of an async iterable into a list."""
+    return [item async for item in async_iterable]
+
+
+def test_iter_batches_drops_repeated_keys() -> None:
+    """Assert that keys are grouped into batches without duplicates."""
+    batches = asyncio.run(
+        collect(iter_batches(["a", "b", "a", "c", "d"], batch_size=2))
+    )
+    assert batches == [["a", "b"], ["c", "d"]]
+
+
+def test_iter_batches_streams_listed_keys() -> None:
+    """Assert that keys of an async iterable, i.e. a listing, are batched as they arrive, without deduplication."""
+
+    async def iter_keys():
+        for object_key in ["a", "b", "c"]:
+            yield object_key
+
+    batches = asyncio.run(collect(iter_batches(iter_keys(), batch_size=2)))
+    assert batches == [["a", "b"], ["c"]]
+
+
+def test_list_s3_object_keys_async(mocked_aws: None) -> None:
+    """Assert that every key under the prefix is listed across pages."""
+    s3_client = boto3.client("s3")
+    for i in range(1_005):
+        s3_client.put_object(Bucket=TEST_BUCKET_NAME, Key=f"dir/{i:04}.txt", Body=b"")
+    upload_s3_object(TEST_BUCKET_NAME, "other.txt", b"")
+
+    keys = asyncio.run(
+        collect(list_s3_object_keys_async(TEST_BUCKET_NAME, prefix="dir/"))
+    )
+    assert keys == [f"dir/{i:04}.txt" for i in range(1_005)]
+
+
+def test_delete_s3_objects_in_batches_async(mocked_aws: None) -> None:
+    """Assert that a prefix is deleted with several concurrent batches and every key is reported."""
+    s3_client = boto3.client("s3")
+    for i in range(25):
+        s3_client.put_object(Bucket=TEST_BUCKET_NAME, Key=f"dir/{i:02}.txt", Body=b"")
+    upload_s3_object(TEST_BUCKET_NAME, "keep.txt", b"")
+
+    results = asyncio.run(
+        collect(
+            delete_s3_objects_in_batches_async(
+                TEST_BUCKET_NAME,
+                object_keys=list_s3_object_keys_async(TEST_BUCKET_NAME, prefix="dir/"),
+                batch_size=10,
+                max_concurrency=2,
+            )
+        )
+    )
+    assert sorted(result.object_key for result in results) == [
+        f"dir/{i:02}.txt" for i in range(25)
+    ]
+    assert all(result.deleted for result in results)
+
+    files, _ = fetch_s3_objects_metadata(TEST_BUCKET_NAME)
+    assert [file["Key"] for file in files] == ["keep.txt"]
@@ -0,0 +1,49 @@
+"""Test cases for `s3.client`."""
+
+import copy
+
+from botocore.config import Config
+from fastapi.testclient import TestClient
+
+from aws_python.s3.client import create_s3_client
+from aws_python.settings import Settings
+from tests.consts import TEST_BUCKET_NAME
+
+
+def test_create_s3_client_applies_settings(mocked_aws: None, monkeypatch) -> None:
+    """Assert that the botocore config of the S3 client is built from the settings."""
+    settings = Settings(
+        s3_bucket_name=TEST_BUCKET_NAME,
+        s3_max_pool_connections=7,
+        s3_tcp_keepalive=False,
+        s3_connect_timeout_seconds=2,
+        s3_read_timeout_seconds=9,
+        s3_max_retry_attempts=1,
+        s3_retry_mode="standard",
+    )
+    config_kwargs: list[dict] = []
+
+    def config_spy(**kwargs) -> Config:
+        # botocore normalizes the retries dict in place
+        config_kwargs.append(copy.deepcopy(kwargs))
+        return Config(**kwargs)
+
+    monkeypatch.setattr("aws_python.s3.client.Config", config_spy)
+    create_s3_client(settings)
+
+    assert len(config_kwargs) == 1
+    assert config_kwargs[0]["max_pool_connections"] == 7
+    assert config_kwargs[0]["tcp_keepalive"] is False
+    assert config_kwargs[0]["connect_timeout"] == 2
+    assert config_kwargs[0]["read_timeout"] == 9
+    assert config_kwargs[0]["retries"] == {"max_attempts": 1, "mode": "standard"}
+
+
+def test_app_shares_one_s3_client(client: TestClient) -> None:
+    """Assert that the lifespan hook stores a single S3 client on the app state."""
+    s3_client = client.app.state.s3_client  # type: ignore[attr-defined]
+    assert s3_client is not None
+
+    client.put("/v1/files/a.txt", files={"file": ("a.txt", b"a")})
+    client.get("/v1/files/a.txt")
+    assert client.app.state.s3_client is s3_client  # type: ignore[attr-defined]
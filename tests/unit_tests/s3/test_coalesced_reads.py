@@ -0,0 +1,139 @@
+"""Test cases for `s3.coalesced_reads`."""
+
+import asyncio
+import threading
+
+import boto3
+from botocore.response import StreamingBody
+
+from aws_python.s3.coalesced_reads import CoalescedS3Reads
+from aws_python.s3.write_objects import upload_s3_object
+from tests.consts import TEST_BUCKET_NAME
+
+
+def count_calls(s3_client, operation_name: str) -> list:
+    """Record every call of an S3 operation made by the client."""
+    calls: list = []
+    s3_client.meta.events.register(
+        f"before-call.s3.{operation_name}", lambda **kwargs: calls.append(kwargs)
+    )
+    return calls
+
+
+def test_concurrent_reads_share_one_get_object(mocked_aws: None) -> None:
+    """Assert that concurrent reads of a small file share one `get_object` call, each with a body of its own."""
+    upload_s3_object(TEST_BUCKET_NAME, "file.txt", b"content")
+    s3_client = boto3.client("s3")
+    get_object_calls = count_calls(s3_client, "GetObject")
+    coalesced_reads = CoalescedS3Reads()
+
+    async def read_concurrently() -> list:
+        return await asyncio.gather(
+            *(
+                coalesced_reads.fetch_s3_object_if_exists_async(
+                    TEST_BUCKET_NAME, "file.txt", s3_client=s3_client
+                )
+                for _ in range(5)
+            )
+        )
+
+    responses = asyncio.run(read_concurrently())
+    assert len(get_object_calls) == 1
+    assert [response["Body"].read() for response in responses] == [b"content"] * 5
+
+
+def test_concurrent_reads_of_large_file_fetch_their_own_body(
+    mocked_aws: None,
+) -> None:
+    """Assert that a body too large to share is streamed to the first caller and fetched again for the others."""
+    upload_s3_object(TEST_BUCKET_NAME, "large.bin", b"0123456789")
+    s3_client = boto3.client("s3")
+    get_object_calls = count_calls(s3_client, "GetObject")
+    coalesced_reads = CoalescedS3Reads(max_body_bytes=5)
+
+    async def read_concurrently() -> list:
+        return await asyncio.gather(
+            *(
+                coalesced_reads.fetch_s3_object_if_exists_async(
+                    TEST_BUCKET_NAME, "large.bin", s3_client=s3_client
+                )
+                for _ in range(3)
+            )
+        )
+
+    responses = asyncio.run(read_concurrently())
+    assert len(get_object_calls) == 3
+    assert [response["Body"].read() for response in responses] == [b"0123456789"] * 3
+
+
+def test_large_body_is_closed_if_the_first_caller_goes_away(
+    mocked_aws: None, monkeypatch
+) -> None:
+    """Assert that a body too large to share is closed, not leaked, if the caller it was left to was cancelled."""
+    upload_s3_object(TEST_BUCKET_NAME, "large.bin", b"0123456789")
+    s3_client = boto3.client("s3")
+    get_object_started = threading.Event()
+    finish_get_object = threading.Event()
+
+    def block_first_get_object(**kwargs) -> None:
+        if not get_object_started.is_set():
+            get_object_started.set()
+            finish_get_object.wait(5)
+
+    s3_client.meta.events.register("before-call.s3.GetObject", block_first_get_object)
+    opened_bodies: list[StreamingBody] = []
+    closed_bodies: list[StreamingBody] = []
+    s3_client.meta.events.register(
+        "after-call.s3.GetObject",
+        lambda parsed, **kwargs: opened_bodies.append(parsed["Body"]),
+    )
+    close = StreamingBody.close
+
+    def close_spy(self: StreamingBody) -> None:
+        closed_bodies.append(self)
+        close(self)
+
+    monkeypatch.setattr(StreamingBody, "close", close_spy)
+    coalesced_reads = CoalescedS3Reads(max_body_bytes=5)
+
+    async def read_after_first_caller_went_away() -> bytes:
+        def read():
+            return coalesced_reads.fetch_s3_object_if_exists_async(
+                TEST_BUCKET_NAME, "large.bin", s3_client=s3_client
+            )
+
+        first_caller = asyncio.ensure_future(read())
+        joined_caller = asyncio.ensure_future(read())
+        while not get_object_started.is_set():
+            await asyncio.sleep(0.01)
+        first_caller.cancel()
+        finish_get_object.set()
+        response = await joined_caller
+        return response["Body"].read()
+
+    assert asyncio.run(read_after_first_caller_went_away()) == b"0123456789"
+    assert len(opened_bodies) == 2
+    assert opened_bodies[0] in closed_bodies
+
+
+def test_concurrent_metadata_lookups_share_one_head_object(mocked_aws: None) -> None:
+    """Assert that concurrent lookups share one `head_object` call, also for missing files."""
+    upload_s3_object(TEST_BUCKET_NAME, "file.txt", b"content")
+    s3_client = boto3.client("s3")
+    head_object_calls = count_calls(s3_client, "HeadObject")
+    coalesced_reads = CoalescedS3Reads()
+
+    async def look_up_concurrently(object_key: str) -> list:
+        return await asyncio.gather(
+            *(
+                coalesced_reads.fetch_s3_object_metadata_async(
+                    TEST_BUCKET_NAME, object_key, s3_client=s3_client
+                )
+                for _ in range(3)
+            )
+        )
+
+    responses = asyncio.run(look_up_concurrently("file.txt"))
+    assert [response["ContentLength"] for response in responses] == [7] * 3
+    assert asyncio.run(look_up_concurrently("missing.txt")) == [None] * 3
+    assert len(head_object_calls) == 2
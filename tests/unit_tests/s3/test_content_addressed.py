@@ -0,0 +1,80 @@
+"""Test cases for `s3.content_addressed`."""
+
+import asyncio
+import hashlib
+
+import boto3
+
+from aws_python.s3.content_addressed import (
+    ContentAddress,
+    upload_s3_object_content_addressed_async,
+)
+from aws_python.s3.metadata_cache import ObjectMetadataCache
+from aws_python.s3.read_objects import fetch_s3_object_metadata
+from tests.consts import TEST_BUCKET_NAME
+
+
+async def iter_content(content: bytes):
+    """Yield content in two chunks."""
+    yield content[:3]
+    yield content[3:]
+
+
+def test_content_address_metadata_round_trip() -> None:
+    """Assert that a content address survives being stored as user metadata."""
+    content_address = ContentAddress(sha256="ab" * 32, size_bytes=42)
+    assert (
+        ContentAddress.from_metadata(content_address.to_metadata()) == content_address
+    )
+    assert content_address.etag == f'"{"ab" * 32}"'
+    assert ContentAddress.from_metadata({}) is None
+    assert (
+        ContentAddress.from_metadata({"content-sha256": "ab", "content-length": "x"})
+        is None
+    )
+
+
+def test_upload_s3_object_content_addressed_async_deduplicates(
+    mocked_aws: None,
+) -> None:
+    """Assert that identical content is stored once and each path gets a pointer to it."""
+    s3_client = boto3.client("s3")
+    metadata_cache = ObjectMetadataCache()
+    content = b"same content"
+    expected_address = ContentAddress(
+        sha256=hashlib.sha256(content).hexdigest(), size_bytes=len(content)
+    )
+
+    def upload(object_key: str) -> tuple[ContentAddress, bool]:
+        return asyncio.run(
+            upload_s3_object_content_addressed_async(
+                TEST_BUCKET_NAME,
+                object_key,
+                read_chunks=lambda: iter_content(content),
+                content_type="text/plain",
+                s3_client=s3_client,
+                metadata_cache=metadata_cache,
+            )
+        )
+
+    assert upload("a.txt") == (expected_address, True)
+    assert upload("b/c.txt") == (expected_address, False)
+
+    listed_keys = [
+        item["Key"]
+        for item in s3_client.list_objects_v2(Bucket=TEST_BUCKET_NAME)["Contents"]
+    ]
+    assert listed_keys == [expected_address.blob_key(), "a.txt", "b/c.txt"]
+    blob = s3_client.get_object(
+        Bucket=TEST_BUCKET_NAME, Key=expected_address.blob_key()
+    )
+    assert blob["Body"].read() == content
+
+    for object_key in ["a.txt", "b/c.txt"]:
+        for cache in [metadata_cache, None]:
+            pointer = fetch_s3_object_metadata(
+                TEST_BUCKET_NAME, object_key, s3_client=s3_client, metadata_cache=cache
+            )
+            assert pointer["ContentLength"] == 0
+            assert pointer["ContentType"] == "text/plain"
+            assert ContentAddress.from_metadata(pointer["Metadata"]) == expected_address
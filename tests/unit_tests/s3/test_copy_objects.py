@@ -0,0 +1,159 @@
+"""Test cases for `s3.copy_objects`."""
+
+import asyncio
+import os
+
+import boto3
+
+from aws_python.s3.copy_objects import (
+    MultipartCopyOptions,
+    copy_s3_object_async,
+    get_copy_part_ranges,
+    transfer_s3_objects_async,
+)
+from aws_python.s3.list_objects import iter_s3_objects_async
+from aws_python.s3.multipart_upload import MIN_MULTIPART_PART_SIZE_BYTES
+from aws_python.s3.read_objects import fetch_s3_objects_metadata
+from aws_python.s3.write_objects import upload_s3_object
+from tests.consts import TEST_BUCKET_NAME
+
+PART_SIZE = MIN_MULTIPART_PART_SIZE_BYTES
+
+
+async def collect(async_iterable) -> list:
+    """Collect the items of an async iterable into a list."""
+    return [item async for item in async_iterable]
+
+
+def test_get_copy_part_ranges() -> None:
+    """Assert that ranges cover the object and the part size grows to stay within 10,000 parts."""
+    assert get_copy_part_ranges(10, 4) == ["bytes=0-3", "bytes=4-7", "bytes=8-9"]
+    assert len(get_copy_part_ranges(20_001, 1)) == 6_667
+
+
+def test_copy_s3_object_async(mocked_aws: None) -> None:
+    """Assert that a small object is copied with its content type, encoding and metadata."""
+    s3_client = boto3.client("s3")
+    s3_client.put_object(
+        Bucket=TEST_BUCKET_NAME,
+        Key="source.txt",
+        Body=b"content",
+        ContentType="text/plain",
+        ContentEncoding="gzip",
+        Metadata={"key": "value"},
+    )
+
+    asyncio.run(
+        copy_s3_object_async(
+            TEST_BUCKET_NAME, "source.txt", "destination.txt", size_bytes=7
+        )
+    )
+
+    copy = s3_client.get_object(Bucket=TEST_BUCKET_NAME, Key="destination.txt")
+    assert copy["Body"].read() == b"content"
+    assert copy["ContentType"] == "text/plain"
+    assert copy["ContentEncoding"] == "gzip"
+    assert copy["Metadata"] == {"key": "value"}
+
+
+def test_copy_s3_object_multipart_async(mocked_aws: None) -> None:
+    """Assert that an object above the threshold is copied part by part, keeping its metadata."""
+    s3_client = boto3.client("s3")
+    content = os.urandom(2 * PART_SIZE + 1)
+    s3_client.put_object(
+        Bucket=TEST_BUCKET_NAME,
+        Key="large.bin",
+        Body=content,
+        ContentType="application/x-custom",
+        Metadata={"key": "value"},
+    )
+
+    asyncio.run(
+        copy_s3_object_async(
+            TEST_BUCKET_NAME,
+            "large.bin",
+            "copy.bin",
+            size_bytes=len(content),
+            multipart_options=MultipartCopyOptions(
+                threshold_bytes=PART_SIZE, part_size_bytes=PART_SIZE
+            ),
+        )
+    )
+
+    copy = s3_client.get_object(Bucket=TEST_BUCKET_NAME, Key="copy.bin")
+    assert copy["Body"].read() == content
+    assert copy["ContentType"] == "application/x-custom"
+    assert copy["Metadata"] == {"key": "value"}
+    # a multipart ETag ends with the number of parts
+    assert copy["ETag"].endswith('-3"')
+    assert (
+        s3_client.list_multipart_uploads(Bucket=TEST_BUCKET_NAME).get("Uploads", [])
+        == []
+    )
+
+
+def test_transfer_s3_objects_async_moves_directory(mocked_aws: None) -> None:
+    """Assert that moving a directory copies every object under the new prefix and deletes the sources."""
+    for file_path in ("dir/a.txt", "dir/sub/b.txt", "other.txt"):
+        upload_s3_object(TEST_BUCKET_NAME, file_path, file_path.encode())
+
+    results = asyncio.run(
+        collect(
+            transfer_s3_objects_async(
+                TEST_BUCKET_NAME,
+                iter_s3_objects_async(TEST_BUCKET_NAME, prefix="dir/"),
+                source_prefix="dir/",
+                destination_prefix="moved/",
+                delete_sources=True,
+                max_concurrency=1,
+            )
+        )
+    )
+
+    assert sorted(
+        (result.source_key, result.destination_key) for result in results
+    ) == [
+        ("dir/a.txt", "moved/a.txt"),
+        ("dir/sub/b.txt", "moved/sub/b.txt"),
+    ]
+    assert all(result.copied and result.source_deleted for result in results)
+    files, _ = fetch_s3_objects_metadata(TEST_BUCKET_NAME)
+    assert sorted(file["Key"] for file in files) == [
+        "moved/a.txt",
+        "moved/sub/b.txt",
+        "other.txt",
+    ]
+
+
+def test_transfer_s3_objects_async_reports_errors(mocked_aws: None) -> None:
+    """Assert that an object deleted since it was listed is reported instead of failing the whole transfer."""
+    for file_path in ("dir/a.txt", "dir/b.txt"):
+        upload_s3_object(TEST_BUCKET_NAME, file_path, b"content")
+
+    async def listed_then_deleted():
+        async for s3_object in iter_s3_objects_async(TEST_BUCKET_NAME, prefix="dir/"):
+            if s3_object["Key"] == "dir/a.txt":
+                boto3.client("s3").delete_object(
+                    Bucket=TEST_BUCKET_NAME, Key=s3_object["Key"]
+                )
+            yield s3_object
+
+    results = asyncio.run(
+        collect(
+            transfer_s3_objects_async(
+                TEST_BUCKET_NAME,
+                listed_then_deleted(),
+                source_prefix="dir/",
+                destination_prefix="moved/",
+                delete_sources=True,
+            )
+        )
+    )
+
+    results_by_key = {result.source_key: result for result in results}
+    assert not results_by_key["dir/a.txt"].copied
+    assert results_by_key["dir/a.txt"].source_deleted is False
+    assert results_by_key["dir/a.txt"].error_code == "NoSuchKey"
+    assert results_by_key["dir/b.txt"].copied
+    files, _ = fetch_s3_objects_metadata(TEST_BUCKET_NAME)
+    assert [file["Key"] for file in files] == ["moved/b.txt"]
@@ -1,6 +1,13 @@
 """Test cases for `s3.delete_objects`."""
 
-from aws_python.s3.delete_objects import delete_s3_object
+import pytest
+
+from aws_python.s3.delete_objects import (
+    DELETE_OBJECTS_MAX_KEYS,
+    DeleteObjectResult,
+    delete_s3_object,
+    delete_s3_objects,
+)
 from aws_python.s3.read_objects import object_exists_in_s3
 from aws_python.s3.write_objects import upload_s3_object
 from tests.consts import TEST_BUCKET_NAME
@@ -19,3 +26,30 @@ def test_delete_nonexistent_s3_object(mocked_aws: None) -> None:
     delete_s3_object(TEST_BUCKET_NAME, "nonexistent.txt")
     delete_s3_object(TEST_BUCKET_NAME, "nonexistent.txt")
     assert object_exists_in_s3(TEST_BUCKET_NAME, "nonexistent.txt") is False
+
+
+def test_delete_s3_objects(mocked_aws: None) -> None:
+    """Assert that `delete_s3_objects` deletes existing and missing keys in one call."""
+    upload_s3_object(TEST_BUCKET_NAME, "a.txt", b"a")
+    upload_s3_object(TEST_BUCKET_NAME, "b.txt", b"b")
+
+    results = delete_s3_objects(TEST_BUCKET_NAME, ["a.txt", "b.txt", "missing.txt"])
+    assert sorted(results) == [
+        DeleteObjectResult(object_key="a.txt", deleted=True),
+        DeleteObjectResult(object_key="b.txt", deleted=True),
+        DeleteObjectResult(object_key="missing.txt", deleted=True),
+    ]
+    assert object_exists_in_s3(TEST_BUCKET_NAME, "a.txt") is False
+
+
+def test_delete_s3_objects_reports_request_errors(mocked_aws: None) -> None:
+    """Assert that a failed request is reported for every key instead of raising."""
+    results = delete_s3_objects("nonexistent-bucket", ["a.txt", "b.txt"])
+    assert [result.error_code for result in results] == ["NoSuchBucket"] * 2
+    assert not any(result.deleted for result in results)
+
+
+def test_delete_s3_objects_rejects_too_many_keys() -> None:
+    """Assert that batches larger than S3 accepts are rejected."""
+    with pytest.raises(ValueError):
+        delete_s3_objects(TEST_BUCKET_NAME, ["key"] * (DELETE_OBJECTS_MAX_KEYS + 1))
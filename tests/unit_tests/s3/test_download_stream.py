@@ -0,0 +1,69 @@
+"""Test cases for `s3.download_stream`."""
+
+import asyncio
+import io
+
+import pytest
+from botocore.response import StreamingBody
+
+from aws_python.s3.download_stream import iter_s3_body_async
+
+
+class FailingStream(io.BytesIO):
+    """A stream that fails after its first read."""
+
+    def read(self, size: int = -1) -> bytes:
+        """Return the first chunk, then fail."""
+        if self.tell():
+            raise ConnectionResetError("connection reset by S3")
+        return super().read(size)
+
+
+def make_body(stream: io.BytesIO) -> StreamingBody:
+    """Wrap a stream like botocore wraps S3 responses."""
+    return StreamingBody(stream, content_length=len(stream.getvalue()))
+
+
+def test_iter_s3_body_async_yields_large_chunks() -> None:
+    """Assert that the body is read in chunks of the requested size and closed at the end."""
+    stream = io.BytesIO(b"0123456789")
+    body = make_body(stream)
+
+    async def collect() -> list[bytes]:
+        return [
+            chunk
+            async for chunk in iter_s3_body_async(
+                body, chunk_size=4, read_ahead_chunks=1
+            )
+        ]
+
+    assert asyncio.run(collect()) == [b"0123", b"4567", b"89"]
+    assert stream.closed
+
+
+def test_iter_s3_body_async_closes_body_when_abandoned() -> None:
+    """Assert that the body is closed when the consumer stops early, e.g. on client disconnect."""
+    stream = io.BytesIO(b"x" * 100)
+    body = make_body(stream)
+
+    async def read_first_chunk() -> bytes:
+        chunks = iter_s3_body_async(body, chunk_size=10, read_ahead_chunks=2)
+        first_chunk = await anext(chunks)
+        await chunks.aclose()
+        return first_chunk
+
+    assert asyncio.run(read_first_chunk()) == b"x" * 10
+    assert stream.closed
+
+
+def test_iter_s3_body_async_raises_read_errors() -> None:
+    """Assert that errors reading from S3 reach the consumer."""
+    stream = FailingStream(b"x" * 100)
+    body = make_body(stream)
+
+    async def collect() -> list[bytes]:
+        return [chunk async for chunk in iter_s3_body_async(body, chunk_size=10)]
+
+    with pytest.raises(ConnectionResetError):
+        asyncio.run(collect())
+    assert stream.closed
@@ -0,0 +1,153 @@
+"""Test cases for `s3.list_objects`."""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import boto3
+import pytest
+
+from aws_python.s3 import list_objects
+from aws_python.s3.list_objects import (
+    iter_generator_in_executor_async,
+    iter_s3_object_pages_async,
+    iter_s3_objects_async,
+)
+from tests.consts import TEST_BUCKET_NAME
+
+
+async def collect(async_iterable) -> list:
+    """Collect the items of an async iterable into a list."""
+    return [item async for item in async_iterable]
+
+
+def test_iter_s3_object_pages_async(mocked_aws: None) -> None:
+    """Assert that every object under the prefix is yielded once, page by page, in order."""
+    s3_client = boto3.client("s3")
+    for i in range(7):
+        s3_client.put_object(Bucket=TEST_BUCKET_NAME, Key=f"dir/{i}.txt", Body=b"")
+    s3_client.put_object(Bucket=TEST_BUCKET_NAME, Key="other.txt", Body=b"")
+
+    pages = asyncio.run(
+        collect(iter_s3_object_pages_async(TEST_BUCKET_NAME, "dir/", page_size=3))
+    )
+    assert [[item["Key"] for item in page] for page in pages] == [
+        ["dir/0.txt", "dir/1.txt", "dir/2.txt"],
+        ["dir/3.txt", "dir/4.txt", "dir/5.txt"],
+        ["dir/6.txt"],
+    ]
+    assert asyncio.run(collect(iter_s3_objects_async(TEST_BUCKET_NAME, "none/"))) == []
+
+
+def test_iter_s3_object_pages_async_prefetches_next_page(
+    mocked_aws: None, monkeypatch
+) -> None:
+    """Assert that the next page is requested before the consumer asks for it."""
+    s3_client = boto3.client("s3")
+    for i in range(4):
+        s3_client.put_object(Bucket=TEST_BUCKET_NAME, Key=f"{i}.txt", Body=b"")
+    fetched_pages: list[int] = []
+    fetch_page = list_objects.fetch_s3_objects_page_async
+
+    async def fetch_page_spy(*args, **kwargs):
+        page = await fetch_page(*args, **kwargs)
+        fetched_pages.append(len(page.files))
+        return page
+
+    monkeypatch.setattr(list_objects, "fetch_s3_objects_page_async", fetch_page_spy)
+
+    async def consume_first_page() -> None:
+        pages = iter_s3_object_pages_async(TEST_BUCKET_NAME, page_size=2)
+        await anext(pages)
+        # give the prefetch a chance to finish while the consumer is "busy"
+        for _ in range(100):
+            if len(fetched_pages) == 2:
+                break
+            await asyncio.sleep(0.01)
+        assert fetched_pages == [2, 2]
+        await pages.aclose()
+
+    asyncio.run(consume_first_page())
+
+
+def test_iter_s3_objects_async_in_parallel(mocked_aws: None) -> None:
+    """Assert that a parallel listing yields the same objects as a sequential one."""
+    s3_client = boto3.client("s3")
+    for i in range(40):
+        s3_client.put_object(Bucket=TEST_BUCKET_NAME, Key=f"dir{i % 4}/{i}", Body=b"")
+
+    keys = asyncio.run(
+        collect(
+            iter_s3_objects_async(
+                TEST_BUCKET_NAME, page_size=5, s3_client=s3_client, max_concurrency=4
+            )
+        )
+    )
+    assert [item["Key"] for item in keys] == sorted(
+        f"dir{i % 4}/{i}" for i in range(40)
+    )
+
+
+@pytest.mark.parametrize("key_format", ["dir{i_mod_4}/{i}", "flat{i:03d}"])
+def test_iter_s3_objects_async_in_parallel_on_shared_executor(
+    mocked_aws: None, key_format: str
+) -> None:
+    """Assert that a parallel listing runs on the given executor, even one with fewer threads than ranges."""
+    s3_client = boto3.client("s3")
+    keys = sorted(key_format.format(i=i, i_mod_4=i % 4) for i in range(40))
+    for key in keys:
+        s3_client.put_object(Bucket=TEST_BUCKET_NAME, Key=key, Body=b"")
+
+    async def run() -> list[str]:
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            threads_before = threading.active_count()
+            listed = [
+                item["Key"]
+                async for item in iter_s3_objects_async(
+                    TEST_BUCKET_NAME,
+                    page_size=5,
+                    s3_client=s3_client,
+                    executor=executor,
+                    max_concurrency=4,
+                )
+            ]
+            # the only thread started is the executor's own
+            assert threading.active_count() <= threads_before + 1
+            return listed
+
+    assert asyncio.run(asyncio.wait_for(run(), timeout=30)) == keys
+
+
+def test_iter_generator_in_executor_async_closes_after_cancel() -> None:
+    """Assert that a generator cancelled mid-item is closed on the executor once that item is done."""
+    fetching = threading.Event()
+    resume = threading.Event()
+    closed_on: list[str] = []
+
+    def generate():
+        try:
+            yield 1
+            fetching.set()
+            resume.wait(5)
+            yield 2
+        finally:
+            closed_on.append(threading.current_thread().name)
+
+    async def run() -> None:
+        with ThreadPoolExecutor(thread_name_prefix="pages") as executor:
+            items = iter_generator_in_executor_async(generate(), executor)
+            assert await anext(items) == 1
+            consumer = asyncio.ensure_future(anext(items))
+            while not fetching.is_set():
+                await asyncio.sleep(0.01)
+            consumer.cancel()
+            await asyncio.sleep(0.05)
+            # still advancing, so the generator cannot be closed yet
+            assert closed_on == []
+            resume.set()
+            with pytest.raises(asyncio.CancelledError):
+                await consumer
+
+    asyncio.run(run())
+    assert len(closed_on) == 1
+    assert closed_on[0].startswith("pages")
@@ -0,0 +1,133 @@
+"""Test cases for `s3.metadata_cache`."""
+
+from datetime import (
+    datetime,
+    timezone,
+)
+
+import boto3
+
+from aws_python.s3.delete_objects import delete_s3_object
+from aws_python.s3.metadata_cache import (
+    ObjectMetadata,
+    ObjectMetadataCache,
+)
+from aws_python.s3.read_objects import (
+    fetch_s3_object_if_exists,
+    fetch_s3_object_metadata,
+    fetch_s3_objects_metadata,
+    object_exists_in_s3,
+)
+from aws_python.s3.write_objects import upload_s3_object
+from tests.consts import TEST_BUCKET_NAME
+
+METADATA = ObjectMetadata(
+    content_length=3,
+    etag='"etag"',
+    last_modified=datetime(2024, 1, 1, tzinfo=timezone.utc),
+    content_type="text/plain",
+)
+
+
+class FakeClock:
+    """A clock that only moves when told to."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        """Return the current fake time."""
+        return self.now
+
+
+def test_entries_expire_after_ttl() -> None:
+    """Assert that positive and negative entries expire after their own TTLs."""
+    clock = FakeClock()
+    cache = ObjectMetadataCache(ttl_seconds=10, negative_ttl_seconds=1, clock=clock)
+    cache.put(TEST_BUCKET_NAME, "present.txt", METADATA)
+    cache.put_missing(TEST_BUCKET_NAME, "missing.txt")
+
+    assert cache.lookup(TEST_BUCKET_NAME, "present.txt") == (True, METADATA)
+    assert cache.lookup(TEST_BUCKET_NAME, "missing.txt") == (True, None)
+
+    clock.now = 5
+    assert cache.lookup(TEST_BUCKET_NAME, "present.txt") == (True, METADATA)
+    assert cache.lookup(TEST_BUCKET_NAME, "missing.txt") == (False, None)
+
+    clock.now = 10
+    assert cache.lookup(TEST_BUCKET_NAME, "present.txt") == (False, None)
+    assert cache.stats() == {"hits": 3, "misses": 2, "size": 0}
+
+
+def test_least_recently_used_entry_is_evicted() -> None:
+    """Assert that the cache never holds more than `max_entries` entries."""
+    cache = ObjectMetadataCache(max_entries=2)
+    cache.put(TEST_BUCKET_NAME, "a", METADATA)
+    cache.put(TEST_BUCKET_NAME, "b", METADATA)
+    cache.lookup(TEST_BUCKET_NAME, "a")
+    cache.put(TEST_BUCKET_NAME, "c", METADATA)
+
+    assert len(cache) == 2
+    assert cache.lookup(TEST_BUCKET_NAME, "b") == (False, None)
+    assert cache.lookup(TEST_BUCKET_NAME, "a") == (True, METADATA)
+
+
+def test_listing_keeps_known_content_type() -> None:
+    """Assert that a listing entry for an unchanged object keeps the cached content type."""
+    cache = ObjectMetadataCache()
+    cache.put(TEST_BUCKET_NAME, "a", METADATA)
+    cache.put(
+        TEST_BUCKET_NAME,
+        "a",
+        ObjectMetadata(
+            content_length=3, etag='"etag"', last_modified=METADATA.last_modified
+        ),
+    )
+    assert cache.lookup(TEST_BUCKET_NAME, "a") == (True, METADATA)
+
+
+def test_reads_are_served_from_cache(mocked_aws: None) -> None:
+    """Assert that cached metadata answers HEADs and existence checks without calling S3."""
+    cache = ObjectMetadataCache()
+    upload_s3_object(
+        TEST_BUCKET_NAME, "a.txt", b"abc", "text/plain", metadata_cache=cache
+    )
+
+    # remove the object behind the cache's back: cached answers must not notice
+    boto3.client("s3").delete_object(Bucket=TEST_BUCKET_NAME, Key="a.txt")
+    assert object_exists_in_s3(TEST_BUCKET_NAME, "a.txt", metadata_cache=cache)
+    head_object_response = fetch_s3_object_metadata(
+        TEST_BUCKET_NAME, "a.txt", metadata_cache=cache
+    )
+    assert head_object_response is not None
+    assert head_object_response["ContentLength"] == 3
+    assert head_object_response["ContentType"] == "text/plain"
+    assert cache.hits == 2
+
+    # a GET cannot be served from the cache and records the object as missing
+    assert (
+        fetch_s3_object_if_exists(TEST_BUCKET_NAME, "a.txt", metadata_cache=cache)
+        is None
+    )
+    assert not object_exists_in_s3(TEST_BUCKET_NAME, "a.txt", metadata_cache=cache)
+
+
+def test_writes_update_cache(mocked_aws: None) -> None:
+    """Assert that uploads, deletes and listings keep the cache up to date."""
+    cache = ObjectMetadataCache()
+    assert not object_exists_in_s3(TEST_BUCKET_NAME, "a.txt", metadata_cache=cache)
+
+    upload_s3_object(TEST_BUCKET_NAME, "a.txt", b"abc", metadata_cache=cache)
+    found, metadata = cache.lookup(TEST_BUCKET_NAME, "a.txt")
+    assert found and metadata is not None
+    assert metadata.content_length == 3
+
+    delete_s3_object(TEST_BUCKET_NAME, "a.txt", metadata_cache=cache)
+    assert cache.lookup(TEST_BUCKET_NAME, "a.txt") == (True, None)
+
+    boto3.client("s3").put_object(Bucket=TEST_BUCKET_NAME, Key="b.txt", Body=b"bb")
+    fetch_s3_objects_metadata(TEST_BUCKET_NAME, metadata_cache=cache)
+    found, metadata = cache.lookup(TEST_BUCKET_NAME, "b.txt")
+    assert found and metadata is not None
+    assert metadata.content_length == 2
+    assert metadata.content_type is None
@@ -0,0 +1,156 @@
+"""Test cases for `s3.multipart_upload`."""
+
+import asyncio
+from typing import AsyncIterator
+
+import boto3
+import pytest
+
+from aws_python.s3 import multipart_upload
+from aws_python.s3.multipart_upload import (
+    MIN_MULTIPART_PART_SIZE_BYTES,
+    iter_parts,
+    upload_s3_object_multipart_async,
+)
+from tests.consts import TEST_BUCKET_NAME
+
+PART_SIZE = MIN_MULTIPART_PART_SIZE_BYTES
+
+
+async def as_chunks(content: bytes, chunk_size: int) -> AsyncIterator[bytes]:
+    """Yield `content` in chunks of `chunk_size` bytes."""
+    for start in range(0, len(content), chunk_size):
+        end = start + chunk_size
+        yield content[start:end]
+
+
+def test_iter_parts_regroups_chunks() -> None:
+    """Assert that chunks of any size are regrouped into parts of the requested size."""
+
+    async def collect() -> list[bytes]:
+        return [part async for part in iter_parts(as_chunks(b"abcdefghij", 3), 4)]
+
+    assert asyncio.run(collect()) == [b"abcd", b"efgh", b"ij"]
+
+
+def test_small_upload_uses_single_put(mocked_aws: None) -> None:
+    """Assert that an object smaller than one part is uploaded without a multipart upload."""
+    asyncio.run(
+        upload_s3_object_multipart_async(
+            TEST_BUCKET_NAME,
+            "small.txt",
+            as_chunks(b"small content", 4),
+            content_type="text/plain",
+            part_size=PART_SIZE,
+        )
+    )
+
+    response = boto3.client("s3").get_object(Bucket=TEST_BUCKET_NAME, Key="small.txt")
+    assert response["Body"].read() == b"small content"
+    assert response["ContentType"] == "text/plain"
+    assert "-" not in response["ETag"]  # multipart ETags end with -<number of parts>
+
+
+def test_large_upload_uses_multipart_upload(mocked_aws: None) -> None:
+    """Assert that an object spanning several parts is reassembled correctly."""
+    content = bytes(range(256)) * (PART_SIZE * 2 // 256 + 1000)
+
+    asyncio.run(
+        upload_s3_object_multipart_async(
+            TEST_BUCKET_NAME,
+            "large.bin",
+            as_chunks(content, 1024 * 1024),
+            part_size=PART_SIZE,
+            max_concurrency=2,
+        )
+    )
+
+    response = boto3.client("s3").get_object(Bucket=TEST_BUCKET_NAME, Key="large.bin")
+    assert response["Body"].read() == content
+    assert response["ETag"].endswith('-3"')
+
+
+def test_failed_upload_is_aborted(mocked_aws: None) -> None:
+    """Assert that a failure while reading the stream aborts the multipart upload."""
+
+    async def failing_chunks() -> AsyncIterator[bytes]:
+        yield b"x" * PART_SIZE
+        yield b"x" * PART_SIZE
+        raise ConnectionError("client disconnected")
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(
+            upload_s3_object_multipart_async(
+                TEST_BUCKET_NAME, "aborted.bin", failing_chunks(), part_size=PART_SIZE
+            )
+        )
+
+    s3_client = boto3.client("s3")
+    assert "Uploads" not in s3_client.list_multipart_uploads(Bucket=TEST_BUCKET_NAME)
+    assert "Contents" not in s3_client.list_objects_v2(Bucket=TEST_BUCKET_NAME)
+
+
+def test_part_size_below_s3_minimum_is_rejected() -> None:
+    """Assert that part sizes S3 would reject are refused up front."""
+    with pytest.raises(ValueError):
+        asyncio.run(
+            upload_s3_object_multipart_async(
+                TEST_BUCKET_NAME, "key", as_chunks(b"", 1), part_size=1024
+            )
+        )
+
+
+def test_failed_part_is_raised_and_aborted(mocked_aws: None, monkeypatch) -> None:
+    """Assert that a failing part upload raises its own error and aborts the multipart upload."""
+    upload_part = multipart_upload.upload_part
+
+    def failing_upload_part(**kwargs):
+        if kwargs["part_number"] == 2:
+            raise ConnectionError("part upload failed")
+        return upload_part(**kwargs)
+
+    monkeypatch.setattr(multipart_upload, "upload_part", failing_upload_part)
+    content = b"x" * PART_SIZE * 4
+
+    with pytest.raises(ConnectionError, match="part upload failed"):
+        asyncio.run(
+            upload_s3_object_multipart_async(
+                TEST_BUCKET_NAME,
+                "aborted.bin",
+                as_chunks(content, PART_SIZE),
+                part_size=PART_SIZE,
+                max_concurrency=1,
+            )
+        )
+
+    s3_client = boto3.client("s3")
+    assert "Uploads" not in s3_client.list_multipart_uploads(Bucket=TEST_BUCKET_NAME)
+
+
+def test_cancelled_upload_is_aborted(mocked_aws: None) -> None:
+    """Assert that cancelling the caller while parts are in flight aborts the multipart upload."""
+    parts_read = asyncio.Event()
+
+    async def stalled_chunks() -> AsyncIterator[bytes]:
+        yield b"x" * PART_SIZE
+        yield b"x" * PART_SIZE
+        yield b"x" * PART_SIZE
+        parts_read.set()
+        await asyncio.Event().wait()
+
+    async def run() -> None:
+        upload = asyncio.create_task(
+            upload_s3_object_multipart_async(
+                TEST_BUCKET_NAME, "cancelled.bin", stalled_chunks(), part_size=PART_SIZE
+            )
+        )
+        await parts_read.wait()
+        upload.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await upload
+
+    asyncio.run(run())
+
+    s3_client = boto3.client("s3")
+    assert "Uploads" not in s3_client.list_multipart_uploads(Bucket=TEST_BUCKET_NAME)
+    assert "Contents" not in s3_client.list_objects_v2(Bucket=TEST_BUCKET_NAME)
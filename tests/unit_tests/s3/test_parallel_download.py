@@ -0,0 +1,109 @@
+"""Test cases for `s3.parallel_download`."""
+
+import asyncio
+import os
+
+import boto3
+import pytest
+from botocore.exceptions import ClientError
+
+from aws_python.byte_ranges import ByteRange
+from aws_python.s3 import parallel_download
+from aws_python.s3.parallel_download import (
+    IncompleteRangeError,
+    iter_byte_ranges,
+    iter_s3_object_in_parallel_async,
+)
+from tests.consts import TEST_BUCKET_NAME
+
+OBJECT_KEY = "large.bin"
+
+
+def upload_random_object(size_bytes: int) -> tuple[bytes, str]:
+    """Upload an object of random bytes and return its content and ETag."""
+    content = os.urandom(size_bytes)
+    response = boto3.client("s3").put_object(
+        Bucket=TEST_BUCKET_NAME, Key=OBJECT_KEY, Body=content
+    )
+    return content, response["ETag"]
+
+
+def download(etag: str, object_size: int, with_first_body: bool, **kwargs) -> bytes:
+    """Download the test object with the parallel engine."""
+    first_body = (
+        boto3.client("s3").get_object(Bucket=TEST_BUCKET_NAME, Key=OBJECT_KEY)["Body"]
+        if with_first_body
+        else None
+    )
+
+    async def collect() -> bytes:
+        return b"".join(
+            [
+                part
+                async for part in iter_s3_object_in_parallel_async(
+                    TEST_BUCKET_NAME,
+                    object_key=OBJECT_KEY,
+                    object_size=object_size,
+                    etag=etag,
+                    first_body=first_body,
+                    **kwargs,
+                )
+            ]
+        )
+
+    return asyncio.run(collect())
+
+
+def test_iter_byte_ranges() -> None:
+    """Assert that an object is cut into consecutive ranges covering it exactly."""
+    assert list(iter_byte_ranges(object_size=10, part_size=4)) == [
+        ByteRange(0, 3),
+        ByteRange(4, 7),
+        ByteRange(8, 9),
+    ]
+
+
+@pytest.mark.parametrize("with_first_body", [True, False])
+def test_parallel_download_reassembles_parts_in_order(
+    mocked_aws: None, with_first_body: bool
+) -> None:
+    """Assert that parts fetched concurrently are yielded in the object's order."""
+    content, etag = upload_random_object(1_000_000)
+    downloaded = download(
+        etag,
+        len(content),
+        with_first_body,
+        part_size=100_000,
+        max_concurrency=3,
+    )
+    assert downloaded == content
+
+
+def test_parallel_download_retries_failed_ranges(
+    mocked_aws: None, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Assert that a range failing with a transient error is fetched again."""
+    content, etag = upload_random_object(300_000)
+    fetch_s3_object_range = parallel_download.fetch_s3_object_range
+    failed_ranges: list[ByteRange] = []
+
+    def fail_once(**kwargs) -> bytes:
+        if kwargs["byte_range"] not in failed_ranges:
+            failed_ranges.append(kwargs["byte_range"])
+            raise IncompleteRangeError("connection reset")
+        return fetch_s3_object_range(**kwargs)
+
+    monkeypatch.setattr(parallel_download, "fetch_s3_object_range", fail_once)
+    downloaded = download(etag, len(content), False, part_size=100_000)
+    assert downloaded == content
+    assert len(failed_ranges) == 3
+
+
+def test_parallel_download_fails_when_object_changes(mocked_aws: None) -> None:
+    """Assert that ranges of a different version of the object are rejected."""
+    content, etag = upload_random_object(300_000)
+    upload_random_object(300_000)
+
+    with pytest.raises(ClientError) as error:
+        download(etag, len(content), False, part_size=100_000)
+    assert error.value.response["Error"]["Code"] == "PreconditionFailed"
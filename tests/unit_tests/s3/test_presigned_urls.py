@@ -0,0 +1,127 @@
+"""Test cases for `s3.presigned_urls`."""
+
+from datetime import (
+    datetime,
+    timezone,
+)
+from urllib.parse import (
+    parse_qs,
+    urlparse,
+)
+
+import boto3
+import requests
+
+from aws_python.s3.presigned_urls import (
+    MAX_MULTIPART_PARTS,
+    PresignedUrl,
+    PresignedUrlCache,
+    create_presigned_multipart_upload,
+    generate_presigned_object_url,
+)
+from tests.consts import TEST_BUCKET_NAME
+
+
+class FakeClock:
+    """A clock that only moves when told to."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        """Return the current fake time."""
+        return self.now
+
+
+def test_presigned_urls_grant_access(mocked_aws: None):
+    """Assert that presigned PUT and GET URLs upload and download the object."""
+    put_url = generate_presigned_object_url(
+        "put_object", bucket_name=TEST_BUCKET_NAME, object_key="file.txt"
+    )
+    assert requests.put(put_url.url, data=b"Hello, world!").status_code == 200
+
+    get_url = generate_presigned_object_url(
+        "get_object", bucket_name=TEST_BUCKET_NAME, object_key="file.txt"
+    )
+    assert requests.get(get_url.url).content == b"Hello, world!"
+
+
+def test_presigned_urls_are_reused_for_half_their_validity(mocked_aws: None):
+    """Assert that a cached URL is handed out again until half of its validity is used up."""
+    clock = FakeClock()
+    cache = PresignedUrlCache(clock=clock)
+
+    def presign(object_key: str = "file.txt"):
+        return generate_presigned_object_url(
+            "get_object",
+            bucket_name=TEST_BUCKET_NAME,
+            object_key=object_key,
+            expires_in=100,
+            presigned_url_cache=cache,
+        )
+
+    first = presign()
+    clock.now = 49
+    assert presign() is first
+    assert presign("other.txt") is not first
+
+    clock.now = 50
+    assert presign() is not first
+
+
+def test_presigned_url_cache_evicts_least_recently_used():
+    """Assert that the cache is bounded."""
+    cache = PresignedUrlCache(max_entries=1)
+    url = PresignedUrl(
+        url="https://example.com", expires_at=datetime.now(tz=timezone.utc)
+    )
+    cache.put("get_object", TEST_BUCKET_NAME, "a", url, expires_in=100)
+    cache.put("get_object", TEST_BUCKET_NAME, "b", url, expires_in=100)
+    assert len(cache) == 1
+    assert cache.get("get_object", TEST_BUCKET_NAME, "a") is None
+    assert cache.get("get_object", TEST_BUCKET_NAME, "b") is url
+
+
+def test_presigned_multipart_upload(mocked_aws: None):
+    """Assert that the presigned part URLs upload an object once the upload is completed."""
+    part_size = 5 * 1024 * 1024
+    content = b"x" * part_size + b"tail"
+    upload = create_presigned_multipart_upload(
+        bucket_name=TEST_BUCKET_NAME,
+        object_key="large.bin",
+        size_bytes=len(content),
+        part_size=part_size,
+    )
+    assert len(upload.part_urls) == 2
+    assert parse_qs(urlparse(upload.part_urls[1]).query)["partNumber"] == ["2"]
+
+    parts = [content[:part_size], content[part_size:]]
+    etags = [
+        requests.put(url, data=part).headers["ETag"]
+        for url, part in zip(upload.part_urls, parts)
+    ]
+    s3_client = boto3.client("s3")
+    s3_client.complete_multipart_upload(
+        Bucket=TEST_BUCKET_NAME,
+        Key="large.bin",
+        UploadId=upload.upload_id,
+        MultipartUpload={
+            "Parts": [
+                {"PartNumber": i + 1, "ETag": etag} for i, etag in enumerate(etags)
+            ]
+        },
+    )
+    body = s3_client.get_object(Bucket=TEST_BUCKET_NAME, Key="large.bin")["Body"]
+    assert body.read() == content
+
+
+def test_presigned_multipart_upload_raises_part_size_for_huge_files(mocked_aws: None):
+    """Assert that the part size grows so huge files stay within S3's part limit."""
+    upload = create_presigned_multipart_upload(
+        bucket_name=TEST_BUCKET_NAME,
+        object_key="huge.bin",
+        size_bytes=MAX_MULTIPART_PARTS * 10 * 1024 * 1024,
+        part_size=5 * 1024 * 1024,
+    )
+    assert upload.part_size == 10 * 1024 * 1024
+    assert len(upload.part_urls) == MAX_MULTIPART_PARTS
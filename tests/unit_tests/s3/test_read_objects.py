@@ -5,10 +5,16 @@ import pytest
 from botocore.exceptions import ClientError
 
 from aws_python.s3.read_objects import (
+    S3KeyRange,
     fetch_s3_object,
+    fetch_s3_object_if_exists,
+    fetch_s3_object_metadata,
+    fetch_s3_objects_in_parallel,
     fetch_s3_objects_metadata,
+    fetch_s3_objects_page,
     fetch_s3_objects_using_page_token,
     object_exists_in_s3,
+    split_s3_key_space,
 )
 from tests.consts import TEST_BUCKET_NAME
 
@@ -126,6 +132,86 @@ def test_directory_queries(mocked_aws: None) -> None:
     assert next_page_token is None
 
 
+def test_fetch_s3_objects_page_with_delimiter(mocked_aws: None) -> None:
+    """Assert that a delimiter rolls nested keys up into directories, also across pages."""
+    s3_client = boto3.client("s3")
+    for key in [
+        "dir/a.txt",
+        "dir/b.txt",
+        "dir/sub1/c.txt",
+        "dir/sub1/deep/d.txt",
+        "dir/sub2/e.txt",
+        "other/f.txt",
+    ]:
+        s3_client.put_object(Bucket=TEST_BUCKET_NAME, Key=key, Body="content")
+
+    page = fetch_s3_objects_page(TEST_BUCKET_NAME, prefix="dir/", delimiter="/")
+    assert [file["Key"] for file in page.files] == ["dir/a.txt", "dir/b.txt"]
+    assert page.directories == ["dir/sub1/", "dir/sub2/"]
+    assert page.next_continuation_token is None
+
+    keys: list[str] = []
+    directories: list[str] = []
+    continuation_token = None
+    while True:
+        page = fetch_s3_objects_page(
+            TEST_BUCKET_NAME,
+            prefix="dir/",
+            delimiter="/",
+            continuation_token=continuation_token,
+            max_keys=1,
+        )
+        keys.extend(file["Key"] for file in page.files)
+        directories.extend(page.directories)
+        continuation_token = page.next_continuation_token
+        if continuation_token is None:
+            break
+    assert keys == ["dir/a.txt", "dir/b.txt"]
+    assert directories == ["dir/sub1/", "dir/sub2/"]
+
+
+def test_split_s3_key_space() -> None:
+    """Assert that boundaries are thinned out evenly into consecutive key ranges."""
+    assert split_s3_key_space([], max_ranges=4) == [S3KeyRange(None, None)]
+    assert split_s3_key_space(["b", "d"], max_ranges=4, start_after="a") == [
+        S3KeyRange("a", "b"),
+        S3KeyRange("b", "d"),
+        S3KeyRange("d", None),
+    ]
+    assert split_s3_key_space(list("bcdefgh"), max_ranges=4) == [
+        S3KeyRange(None, "c"),
+        S3KeyRange("c", "e"),
+        S3KeyRange("e", "g"),
+        S3KeyRange("g", None),
+    ]
+
+
+@pytest.mark.parametrize("prefix", ["", "dir/", "dir/sub/", "flat", "missing/"])
+def test_fetch_s3_objects_in_parallel(mocked_aws: None, prefix: str) -> None:
+    """Assert that the key ranges listed in parallel add up to the sequential listing."""
+    s3_client = boto3.client("s3")
+    keys = [f"flat{i:03x}" for i in range(0, 300, 7)]
+    keys += [f"dir/{c}{i}.txt" for c in "aBz" for i in range(5)]
+    keys += [f"dir/sub/{i}/file.txt" for i in range(30)]
+    keys += ["dir/sub/", "dir.txt", "~"]
+    for key in keys:
+        s3_client.put_object(Bucket=TEST_BUCKET_NAME, Key=key, Body=b"")
+
+    pages = list(
+        fetch_s3_objects_in_parallel(
+            TEST_BUCKET_NAME,
+            prefix=prefix,
+            max_concurrency=3,
+            max_ranges=5,
+            read_ahead_pages=1,
+            max_keys=4,
+        )
+    )
+    assert all(pages)
+    listed_keys = [file["Key"] for page in pages for file in page]
+    assert listed_keys == sorted(key for key in keys if key.startswith(prefix))
+
+
 def test_fetch_s3_object(mocked_aws: None) -> None:
     """Assert that `fetch_s3_object` returns the correct metadata for an existing object."""
     s3_client = boto3.client("s3")
@@ -158,3 +244,42 @@ def test_object_exists_in_s3_raises_client_error(mocked_aws: None) -> None:
     with pytest.raises(ClientError) as exc_info:
         object_exists_in_s3(TEST_BUCKET_NAME, "testfile.txt", s3_client=s3_client)
     assert exc_info.value.response["Error"]["Code"] == "500"
+
+
+def test_fetch_s3_object_metadata(mocked_aws: None) -> None:
+    """Assert that `fetch_s3_object_metadata` returns head_object metadata, or None for a missing object."""
+    s3_client = boto3.client("s3")
+    s3_client.put_object(
+        Bucket=TEST_BUCKET_NAME,
+        Key="testfile.txt",
+        Body="test content",
+        ContentType="text/plain",
+    )
+
+    response = fetch_s3_object_metadata(TEST_BUCKET_NAME, "testfile.txt")
+    assert response is not None
+    assert response["ContentLength"] == len("test content")
+    assert response["ContentType"] == "text/plain"
+    assert "Body" not in response
+
+    assert fetch_s3_object_metadata(TEST_BUCKET_NAME, "nonexistent.txt") is None
+
+
+def test_fetch_s3_object_if_exists(mocked_aws: None) -> None:
+    """Assert that `fetch_s3_object_if_exists` returns the object, or None for a missing object."""
+    s3_client = boto3.client("s3")
+    s3_client.put_object(
+        Bucket=TEST_BUCKET_NAME, Key="testfile.txt", Body="test content"
+    )
+
+    response = fetch_s3_object_if_exists(TEST_BUCKET_NAME, "testfile.txt")
+    assert response is not None
+    assert response["Body"].read().decode() == "test content"
+
+    response = fetch_s3_object_if_exists(
+        TEST_BUCKET_NAME, "testfile.txt", byte_range="bytes=5-"
+    )
+    assert response is not None
+    assert response["Body"].read().decode() == "content"
+
+    assert fetch_s3_object_if_exists(TEST_BUCKET_NAME, "nonexistent.txt") is None
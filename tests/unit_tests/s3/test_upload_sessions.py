@@ -0,0 +1,81 @@
+"""Test cases for `s3.upload_sessions`."""
+
+from datetime import timedelta
+
+import boto3
+import pytest
+
+from aws_python.s3.upload_sessions import (
+    UploadSession,
+    abort_stale_multipart_uploads,
+    find_missing_part_numbers,
+    list_multipart_uploads,
+    list_uploaded_parts,
+)
+from aws_python.s3.write_objects import (
+    create_multipart_upload,
+    upload_part,
+)
+from tests.consts import TEST_BUCKET_NAME
+
+
+def test_upload_session_id_round_trip() -> None:
+    """Assert that session IDs are URL-safe and carry the key and upload ID."""
+    upload_session = UploadSession(object_key="dir/ä b.tar", upload_id="abc~123")
+    session_id = upload_session.to_session_id()
+    assert "/" not in session_id and "=" not in session_id
+    assert UploadSession.from_session_id(session_id) == upload_session
+
+
+@pytest.mark.parametrize("session_id", ["not-base64!", "bm90IGpzb24", "e30", "W10"])
+def test_upload_session_from_malformed_id(session_id: str) -> None:
+    """Assert that IDs not handed out by the API are rejected."""
+    with pytest.raises(ValueError):
+        UploadSession.from_session_id(session_id)
+
+
+@pytest.mark.parametrize(
+    "part_numbers, expected",
+    [
+        ([], []),
+        ([1, 2, 3], []),
+        ([3, 1], [2]),
+        ([2, 5], [1, 3, 4]),
+    ],
+)
+def test_find_missing_part_numbers(part_numbers, expected) -> None:
+    """Assert that gaps below the highest part number are found."""
+    assert find_missing_part_numbers(part_numbers) == expected
+
+
+def test_list_uploaded_parts(mocked_aws: None) -> None:
+    """Assert that the stored parts are listed in order of their part numbers."""
+    upload_id = create_multipart_upload(TEST_BUCKET_NAME, "file.bin")
+    for part_number in [3, 1]:
+        upload_part(
+            TEST_BUCKET_NAME,
+            "file.bin",
+            upload_id=upload_id,
+            part_number=part_number,
+            part_content=b"x" * part_number,
+        )
+
+    parts = list_uploaded_parts(TEST_BUCKET_NAME, "file.bin", upload_id)
+    assert [(part["PartNumber"], part["Size"]) for part in parts] == [(1, 1), (3, 3)]
+
+
+def test_abort_stale_multipart_uploads(mocked_aws: None) -> None:
+    """Assert that only uploads older than the maximum age are aborted."""
+    s3_client = boto3.client("s3")
+    for object_key in ["a.bin", "b.bin"]:
+        create_multipart_upload(TEST_BUCKET_NAME, object_key, s3_client=s3_client)
+
+    # moto reports a fixed initiation date, so the clock is set relative to it
+    initiated = next(list_multipart_uploads(TEST_BUCKET_NAME))["Initiated"]
+    soon = initiated + timedelta(minutes=10)
+    assert abort_stale_multipart_uploads(TEST_BUCKET_NAME, 3600, s3_client, soon) == 0
+    assert len(list(list_multipart_uploads(TEST_BUCKET_NAME))) == 2
+
+    later = initiated + timedelta(hours=2)
+    assert abort_stale_multipart_uploads(TEST_BUCKET_NAME, 3600, s3_client, later) == 2
+    assert list(list_multipart_uploads(TEST_BUCKET_NAME)) == []
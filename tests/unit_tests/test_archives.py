@@ -0,0 +1,131 @@
+"""Test cases for `archives`."""
+
+import asyncio
+import io
+import tarfile
+import zipfile
+from datetime import (
+    datetime,
+    timezone,
+)
+from typing import AsyncIterator
+
+from aws_python.archives import (
+    ArchiveEntry,
+    iter_prefetched_async,
+    iter_tar_archive_async,
+    iter_zip_archive_async,
+)
+
+LAST_MODIFIED = datetime(2024, 5, 17, 12, 30, 0, tzinfo=timezone.utc)
+FILES = {"a.txt": b"a" * 1_000, "sub/b.bin": b"", "sub/c.txt": b"hello, world"}
+
+
+async def as_async_iterable(items) -> AsyncIterator:
+    """Yield the items of a list."""
+    for item in items:
+        yield item
+
+
+def split(content: bytes, chunk_size: int) -> list[bytes]:
+    """Split content into chunks of `chunk_size` bytes."""
+    return [
+        content[start:end]
+        for start, end in (
+            (start, start + chunk_size) for start in range(0, len(content), chunk_size)
+        )
+    ]
+
+
+def build_archive(iter_archive_async) -> bytes:
+    """Archive `FILES`, each streamed in chunks of 300 bytes."""
+
+    async def build() -> bytes:
+        entries = as_async_iterable(
+            [
+                ArchiveEntry(
+                    name=name,
+                    size_bytes=len(content),
+                    last_modified=LAST_MODIFIED,
+                    chunks=as_async_iterable(split(content, 300)),
+                )
+                for name, content in FILES.items()
+            ]
+        )
+        return b"".join([chunk async for chunk in iter_archive_async(entries)])
+
+    return asyncio.run(build())
+
+
+def test_iter_zip_archive_async() -> None:
+    """Assert that the streamed ZIP archive holds every file uncompressed with its timestamp."""
+    with zipfile.ZipFile(io.BytesIO(build_archive(iter_zip_archive_async))) as archive:
+        assert archive.testzip() is None
+        assert {name: archive.read(name) for name in archive.namelist()} == FILES
+        zip_info = archive.getinfo("a.txt")
+        assert zip_info.compress_type == zipfile.ZIP_STORED
+        assert zip_info.date_time == (2024, 5, 17, 12, 30, 0)
+
+
+def test_iter_tar_archive_async() -> None:
+    """Assert that the streamed TAR archive holds every file and is padded to whole records."""
+    content = build_archive(iter_tar_archive_async)
+    assert len(content) % tarfile.RECORDSIZE == 0
+    with tarfile.open(fileobj=io.BytesIO(content)) as archive:
+        members = archive.getmembers()
+        assert {
+            member.name: archive.extractfile(member).read()  # type: ignore[union-attr]
+            for member in members
+        } == FILES
+        assert members[0].mtime == int(LAST_MODIFIED.timestamp())
+
+
+def test_iter_prefetched_async_keeps_order_within_window() -> None:
+    """Assert that results keep the order of the items and at most `window` fetches run at once."""
+    running = 0
+    max_running = 0
+
+    async def fetch(item: int) -> int:
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        # later items finish first
+        await asyncio.sleep(0.01 / (item + 1))
+        running -= 1
+        return item * 10
+
+    async def collect() -> list[int]:
+        return [
+            result
+            async for result in iter_prefetched_async(
+                as_async_iterable(range(10)), fetch, window=3
+            )
+        ]
+
+    assert asyncio.run(collect()) == [item * 10 for item in range(10)]
+    assert max_running == 3
+
+
+def test_iter_prefetched_async_discards_fetches_finishing_after_cancel() -> None:
+    """Assert that results of fetches still running when the consumer goes away are discarded once they finish."""
+    discarded: list[int] = []
+
+    async def fetch(item: int) -> int:
+        try:
+            # only the first fetch finishes before the consumer goes away
+            await asyncio.sleep(0 if item == 0 else 1)
+        except asyncio.CancelledError:
+            # like a call on an executor thread, which finishes however it is cancelled
+            pass
+        return item
+
+    async def consume_first() -> int:
+        results = iter_prefetched_async(
+            as_async_iterable(range(10)), fetch, window=3, discard=discarded.append
+        )
+        first = await anext(results)
+        await results.aclose()
+        return first
+
+    assert asyncio.run(consume_first()) == 0
+    assert discarded == [1, 2]
@@ -0,0 +1,49 @@
+"""Test cases for `byte_ranges`."""
+
+import pytest
+
+from aws_python.byte_ranges import (
+    MAX_BYTE_RANGES,
+    ByteRange,
+    parse_range_header,
+)
+
+
+@pytest.mark.parametrize(
+    "range_header, expected",
+    [
+        ("bytes=0-99", [ByteRange(0, 99)]),
+        ("bytes=100-", [ByteRange(100, None)]),
+        ("bytes=-500", [ByteRange(None, 500)]),
+        ("bytes=0-0, 5-9,-1", [ByteRange(0, 0), ByteRange(5, 9), ByteRange(None, 1)]),
+        ("BYTES=1-2", [ByteRange(1, 2)]),
+    ],
+)
+def test_parse_valid_range_headers(range_header: str, expected: list) -> None:
+    """Assert that valid single and multi-range headers are parsed."""
+    assert parse_range_header(range_header) == expected
+
+
+@pytest.mark.parametrize(
+    "range_header",
+    [
+        None,
+        "",
+        "bytes=",
+        "bytes=-",
+        "bytes=5-1",
+        "bytes=a-b",
+        "items=0-1",
+        "bytes=" + ",".join(["0-1"] * (MAX_BYTE_RANGES + 1)),
+    ],
+)
+def test_parse_invalid_range_headers(range_header: str | None) -> None:
+    """Assert that malformed or unsupported headers are ignored."""
+    assert parse_range_header(range_header) is None
+
+
+def test_byte_range_to_range_header() -> None:
+    """Assert that ranges are formatted back into `Range` header values."""
+    assert ByteRange(0, 99).to_range_header() == "bytes=0-99"
+    assert ByteRange(100, None).to_range_header() == "bytes=100-"
+    assert ByteRange(None, 500).to_range_header() == "bytes=-500"
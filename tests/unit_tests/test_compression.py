@@ -0,0 +1,157 @@
+"""Test cases for `compression`."""
+
+import asyncio
+import gzip
+
+import pytest
+
+from aws_python.compression import (
+    GZIP,
+    ZSTD,
+    CompressionPolicy,
+    accepts_content_encoding,
+    compress_bytes,
+    compress_chunks_async,
+    decompress_chunks_async,
+    get_decoded_etag,
+    get_supported_content_encodings,
+    parse_accept_encoding,
+)
+
+CONTENT = b'{"level": "info", "message": "request served"}\n' * 5_000
+
+
+async def iter_chunks(content: bytes, chunk_size: int):
+    """Yield content in chunks of `chunk_size` bytes."""
+    for i in range(0, len(content), chunk_size):
+        yield content[i : i + chunk_size]  # noqa: E203
+
+
+async def collect(chunks) -> bytes:
+    """Join the chunks of an async iterator."""
+    return b"".join([chunk async for chunk in chunks])
+
+
+@pytest.mark.parametrize(
+    "content_type, size_bytes, content_encoding, expected",
+    [
+        ("application/json", 10_000, None, True),
+        ("text/plain; charset=utf-8", 10_000, None, True),
+        ("application/vnd.api+json", None, None, True),
+        ("text/plain", 100, None, False),
+        ("image/png", 10_000, None, False),
+        (None, 10_000, None, False),
+        ("text/plain", 10_000, "gzip", False),
+        ("text/plain", 10_000, "identity", True),
+    ],
+)
+def test_compression_policy_should_compress(
+    content_type, size_bytes, content_encoding, expected
+) -> None:
+    """Assert that only compressible, large enough uploads that are not encoded yet are compressed."""
+    policy = CompressionPolicy(min_size_bytes=1024)
+    assert (
+        policy.should_compress(content_type, size_bytes, content_encoding) is expected
+    )
+
+
+@pytest.mark.parametrize("content_encoding", get_supported_content_encodings())
+@pytest.mark.parametrize("chunk_size", [1000, 100_000])
+def test_compress_and_decompress_chunks_async(content_encoding, chunk_size) -> None:
+    """Assert that streamed compression round-trips, with chunks below and above the thread offload size."""
+    compressed = asyncio.run(
+        collect(
+            compress_chunks_async(iter_chunks(CONTENT, chunk_size), content_encoding)
+        )
+    )
+    assert len(compressed) < len(CONTENT) / 10
+    assert compressed == compress_bytes(CONTENT, content_encoding)
+    decompressed = asyncio.run(
+        collect(
+            decompress_chunks_async(
+                iter_chunks(compressed, chunk_size), content_encoding
+            )
+        )
+    )
+    assert decompressed == CONTENT
+
+
+def test_decompress_concatenated_gzip_members() -> None:
+    """Assert that gzip files made of several members, e.g. appended logs, are decoded completely."""
+    compressed = gzip.compress(b"first\n") + gzip.compress(b"second\n")
+    decompressed = asyncio.run(
+        collect(decompress_chunks_async(iter_chunks(compressed, 7), GZIP))
+    )
+    assert decompressed == b"first\nsecond\n"
+
+
+@pytest.mark.parametrize("content_encoding", get_supported_content_encodings())
+def test_decompress_chunks_async_bounds_decoded_chunks(content_encoding) -> None:
+    """Assert that a highly compressed file, e.g. a gzip bomb, is decoded in pieces of about the chunk size."""
+    content = bytes(64 * 1024 * 1024)
+    compressed = compress_bytes(content, content_encoding, level=9)
+    max_chunk_size = 256 * 1024
+
+    async def run() -> tuple[int, int]:
+        size_bytes = largest_chunk_size = 0
+        async for chunk in decompress_chunks_async(
+            iter_chunks(compressed, 100_000), content_encoding, max_chunk_size
+        ):
+            assert chunk == bytes(len(chunk))
+            size_bytes += len(chunk)
+            largest_chunk_size = max(largest_chunk_size, len(chunk))
+        return size_bytes, largest_chunk_size
+
+    size_bytes, largest_chunk_size = asyncio.run(run())
+    assert size_bytes == len(content)
+    assert largest_chunk_size <= 2 * max_chunk_size
+
+
+def test_gzip_is_readable_by_the_standard_library() -> None:
+    """Assert that stored objects are plain gzip files."""
+    assert gzip.decompress(compress_bytes(CONTENT, GZIP, level=1)) == CONTENT
+
+
+def test_zstd_needs_zstandard() -> None:
+    """Assert that zstd is only offered when `zstandard` is installed."""
+    try:
+        import zstandard  # noqa: F401
+    except ImportError:
+        assert ZSTD not in get_supported_content_encodings()
+        with pytest.raises(ValueError):
+            compress_bytes(CONTENT, ZSTD)
+    else:
+        assert ZSTD in get_supported_content_encodings()
+
+
+def test_parse_accept_encoding() -> None:
+    """Assert that codings are lower-cased with their quality values, and malformed ones skipped."""
+    assert parse_accept_encoding("GZIP, zstd;q=0.5, br;q=0, deflate;q=x, ") == {
+        "gzip": 1.0,
+        "zstd": 0.5,
+        "br": 0.0,
+    }
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, expected",
+    [
+        (None, False),
+        ("", False),
+        ("gzip, deflate", True),
+        ("deflate, br", False),
+        ("gzip;q=0", False),
+        ("*", True),
+        ("*, gzip;q=0", False),
+        ("identity", False),
+    ],
+)
+def test_accepts_content_encoding(accept_encoding, expected) -> None:
+    """Assert that the stored encoding is only sent to clients listing it, or `*`, with a non-zero quality."""
+    assert accepts_content_encoding(accept_encoding, GZIP) is expected
+
+
+def test_get_decoded_etag() -> None:
+    """Assert that decoded content gets a weak variant of the stored entity tag."""
+    assert get_decoded_etag('"abc"') == 'W/"abc"'
+    assert get_decoded_etag('W/"abc"') == 'W/"abc"'
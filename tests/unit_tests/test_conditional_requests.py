@@ -0,0 +1,86 @@
+"""Test cases for `conditional_requests`."""
+
+from datetime import (
+    datetime,
+    timezone,
+)
+
+import pytest
+
+from aws_python.conditional_requests import (
+    ConditionalHeaders,
+    format_http_date,
+    is_not_modified,
+    parse_conditional_headers,
+)
+
+ETAG = '"d41d8cd98f00b204e9800998ecf8427e"'
+LAST_MODIFIED = datetime(2022, 1, 1, 12, 0, 0, 500_000, tzinfo=timezone.utc)
+
+
+def test_parse_conditional_headers() -> None:
+    """Assert that tag lists and HTTP dates are parsed, and unconditional requests yield None."""
+    assert parse_conditional_headers({}) is None
+    assert parse_conditional_headers(
+        {"If-None-Match": f'{ETAG}, W/"other"'}
+    ) == ConditionalHeaders(if_none_match=[ETAG, 'W/"other"'], if_modified_since=None)
+    assert parse_conditional_headers(
+        {"If-Modified-Since": "Sat, 01 Jan 2022 12:00:00 GMT"}
+    ) == ConditionalHeaders(
+        if_none_match=None,
+        if_modified_since=datetime(2022, 1, 1, 12, 0, 0, tzinfo=timezone.utc),
+    )
+    assert parse_conditional_headers({"If-Modified-Since": "yesterday"}) is None
+
+
+@pytest.mark.parametrize(
+    "headers, expected",
+    [
+        ({"If-None-Match": ETAG}, True),
+        ({"If-None-Match": f"W/{ETAG}"}, True),
+        ({"If-None-Match": f'"other", {ETAG}'}, True),
+        ({"If-None-Match": "*"}, True),
+        ({"If-None-Match": '"other"'}, False),
+        ({"If-Modified-Since": "Sat, 01 Jan 2022 12:00:00 GMT"}, True),
+        ({"If-Modified-Since": "Sat, 01 Jan 2022 11:59:59 GMT"}, False),
+        # If-Modified-Since is ignored when If-None-Match is present
+        (
+            {
+                "If-None-Match": '"other"',
+                "If-Modified-Since": "Sat, 01 Jan 2022 12:00:00 GMT",
+            },
+            False,
+        ),
+    ],
+)
+def test_is_not_modified(headers: dict[str, str], expected: bool) -> None:
+    """Assert that entity tags take precedence and dates are compared with one second precision."""
+    conditional_headers = parse_conditional_headers(headers)
+    assert (
+        is_not_modified(conditional_headers, etag=ETAG, last_modified=LAST_MODIFIED)
+        is expected
+    )
+
+
+def test_s3_conditions() -> None:
+    """Assert that only conditions S3 can evaluate itself are forwarded."""
+    conditional_headers = parse_conditional_headers(
+        {
+            "If-None-Match": f"W/{ETAG}",
+            "If-Modified-Since": "Sat, 01 Jan 2022 12:00:00 GMT",
+        }
+    )
+    assert conditional_headers is not None
+    assert conditional_headers.s3_if_none_match() == ETAG
+    assert conditional_headers.s3_if_modified_since() is None
+
+    conditional_headers = parse_conditional_headers(
+        {"If-None-Match": f'{ETAG}, "other"'}
+    )
+    assert conditional_headers is not None
+    assert conditional_headers.s3_if_none_match() is None
+
+
+def test_format_http_date() -> None:
+    """Assert that dates are formatted as IMF-fixdate in GMT."""
+    assert format_http_date(LAST_MODIFIED) == "Sat, 01 Jan 2022 12:00:00 GMT"
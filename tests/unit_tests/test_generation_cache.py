@@ -0,0 +1,76 @@
+"""Test cases for `generation_cache`."""
+
+import asyncio
+
+import boto3
+
+from aws_python.generation_cache import (
+    GenerationCache,
+    GenerationKey,
+)
+from aws_python.s3.write_objects import upload_s3_object
+from tests.consts import TEST_BUCKET_NAME
+
+KEY = GenerationKey.from_parameters(
+    file_type="text",
+    model="gpt-3.5-turbo",
+    prompt="Say hello",
+    parameters={"max_tokens": 100, "system_prompt": "Be brief."},
+)
+
+
+def test_generation_key_digest() -> None:
+    """Assert that the digest ignores the order of the parameters and changes with any of them."""
+    reordered = GenerationKey.from_parameters(
+        file_type="text",
+        model="gpt-3.5-turbo",
+        prompt="Say hello",
+        parameters={"system_prompt": "Be brief.", "max_tokens": "100"},
+    )
+    assert reordered == KEY
+    assert reordered.digest == KEY.digest
+    assert KEY._replace(prompt="Say bye").digest != KEY.digest
+    assert KEY._replace(model="gpt-4o").digest != KEY.digest
+
+
+def test_generation_cache_copies_stored_generation(mocked_aws: None) -> None:
+    """Assert that a stored generation is copied to other paths and a miss copies nothing."""
+    cache = GenerationCache(TEST_BUCKET_NAME)
+    upload_s3_object(TEST_BUCKET_NAME, "first.txt", b"hello", content_type="text/plain")
+
+    assert not asyncio.run(cache.copy_cached_async(KEY, "second.txt"))
+    asyncio.run(cache.store_async(KEY, source_key="first.txt", size_bytes=5))
+    assert asyncio.run(cache.copy_cached_async(KEY, "second.txt"))
+    assert asyncio.run(cache.copy_cached_async(KEY, "third.txt"))
+
+    copy = boto3.client("s3").get_object(Bucket=TEST_BUCKET_NAME, Key="second.txt")
+    assert copy["Body"].read() == b"hello"
+    assert copy["ContentType"] == "text/plain"
+    # the second hit was answered by the in-process tier
+    assert cache.local_cache.stats()["hits"] == 1
+
+
+def test_generation_cache_deletes_expired_generation(mocked_aws: None) -> None:
+    """Assert that an expired generation is a miss and is deleted from S3."""
+    cache = GenerationCache(TEST_BUCKET_NAME, ttl_seconds=0.001)
+    upload_s3_object(TEST_BUCKET_NAME, "first.txt", b"hello")
+    asyncio.run(cache.store_async(KEY, source_key="first.txt", size_bytes=5))
+
+    assert not asyncio.run(cache.copy_cached_async(KEY, "second.txt"))
+    s3_objects = boto3.client("s3").list_objects_v2(Bucket=TEST_BUCKET_NAME)
+    assert [s3_object["Key"] for s3_object in s3_objects["Contents"]] == ["first.txt"]
+
+
+def test_generation_cache_misses_generation_deleted_elsewhere(
+    mocked_aws: None,
+) -> None:
+    """Assert that a generation deleted by another process since it was cached in this one is a miss."""
+    cache = GenerationCache(TEST_BUCKET_NAME)
+    upload_s3_object(TEST_BUCKET_NAME, "first.txt", b"hello")
+    asyncio.run(cache.store_async(KEY, source_key="first.txt", size_bytes=5))
+    assert asyncio.run(cache.lookup_async(KEY)) is not None
+
+    boto3.client("s3").delete_object(Bucket=TEST_BUCKET_NAME, Key=cache.object_key(KEY))
+
+    assert not asyncio.run(cache.copy_cached_async(KEY, "second.txt"))
+    assert asyncio.run(cache.lookup_async(KEY)) is None
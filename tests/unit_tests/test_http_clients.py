@@ -0,0 +1,72 @@
+"""Test cases for `http_clients`."""
+
+import asyncio
+from importlib.util import find_spec
+
+import pydantic
+import pytest
+from fastapi.testclient import TestClient
+
+from aws_python.http_clients import (
+    create_http_client,
+    create_openai_client,
+)
+from aws_python.main import create_app
+from aws_python.settings import Settings
+from tests.consts import TEST_BUCKET_NAME
+
+
+def test_create_openai_client_applies_settings(mocked_openai) -> None:
+    """Assert that the OpenAI client sends through the shared HTTP client built from the settings."""
+    settings = Settings(
+        s3_bucket_name=TEST_BUCKET_NAME,
+        openai_max_connections=7,
+        openai_max_keepalive_connections=3,
+        openai_connect_timeout_seconds=2,
+        openai_timeout_seconds=30,
+        openai_max_retries=1,
+    )
+    http_client = create_http_client(settings)
+    openai_client = create_openai_client(settings, http_client)
+
+    pool = http_client._transport._pool  # type: ignore[attr-defined]
+    assert pool._max_connections == 7
+    assert pool._max_keepalive_connections == 3
+    assert openai_client._client is http_client
+    assert openai_client.timeout.connect == 2  # type: ignore[union-attr]
+    assert openai_client.timeout.read == 30  # type: ignore[union-attr]
+    assert openai_client.max_retries == 1
+
+    asyncio.run(openai_client.close())  # type: ignore[union-attr]
+    assert http_client.is_closed
+
+
+def test_create_openai_client_without_api_key(monkeypatch) -> None:
+    """Assert that the app starts without an OpenAI API key, with generating files disabled."""
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    settings = Settings(s3_bucket_name=TEST_BUCKET_NAME)
+    assert create_openai_client(settings, create_http_client(settings)) is None
+
+
+@pytest.mark.skipif(find_spec("h2") is not None, reason="h2 is installed")
+def test_http2_needs_h2() -> None:
+    """Assert that enabling HTTP/2 without `h2` fails at startup."""
+    with pytest.raises(pydantic.ValidationError):
+        Settings(s3_bucket_name=TEST_BUCKET_NAME, openai_http2=True)
+
+
+def test_app_closes_shared_clients(mocked_aws, mocked_openai) -> None:
+    """Assert that the lifespan hook creates the clients once and closes them on shutdown."""
+    with TestClient(
+        create_app(settings=Settings(s3_bucket_name=TEST_BUCKET_NAME))
+    ) as client:
+        http_client = client.app.state.http_client  # type: ignore[attr-defined]
+        assert client.app.state.openai_client._client is http_client  # type: ignore[attr-defined]
+        # every generation reuses the same clients
+        client.post(
+            "/v1/files/generated/a.txt",
+            params={"prompt": "Test Prompt", "file_type": "text"},
+        )
+        assert client.app.state.http_client is http_client  # type: ignore[attr-defined]
+        assert not http_client.is_closed
+    assert http_client.is_closed
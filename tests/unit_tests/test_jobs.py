@@ -0,0 +1,215 @@
+"""Test cases for `jobs`."""
+
+import asyncio
+import json
+
+import boto3
+import httpx
+import pytest
+
+from aws_python.jobs import (
+    InMemoryJobQueue,
+    JobQueueFullError,
+    JobStore,
+    SQSJobQueue,
+    WebhookNotAllowedError,
+    check_webhook_url,
+    run_job_workers,
+    send_webhook,
+)
+from tests.consts import TEST_BUCKET_NAME
+
+# an address literal, so the webhook checks resolve it without DNS
+PUBLIC_WEBHOOK_URL = "https://93.184.215.14/hook"
+
+
+def test_in_memory_job_queue_is_bounded() -> None:
+    """Assert that the in-memory queue hands out jobs in order and refuses jobs beyond its size."""
+
+    async def run() -> list:
+        queue = InMemoryJobQueue(max_size=2)
+        await queue.send({"job": 1})
+        await queue.send({"job": 2})
+        with pytest.raises(JobQueueFullError):
+            await queue.send({"job": 3})
+        messages = [await queue.receive(), await queue.receive()]
+        assert len(queue) == 0
+        return [message.body for message in messages]
+
+    assert asyncio.run(run()) == [{"job": 1}, {"job": 2}]
+
+
+def test_sqs_job_queue(mocked_aws) -> None:
+    """Assert that jobs sent to SQS are received and, once deleted, not delivered again."""
+    sqs_client = boto3.client("sqs")
+    queue_url = sqs_client.create_queue(QueueName="jobs")["QueueUrl"]
+
+    async def run() -> None:
+        queue = SQSJobQueue(queue_url, sqs_client=sqs_client, wait_time_seconds=0)
+        try:
+            await queue.send({"job": 1})
+            message = await queue.receive()
+            assert message.body == {"job": 1}
+            assert message.receipt is not None
+            await queue.delete(message)
+        finally:
+            queue.close()
+
+    asyncio.run(run())
+    attributes = sqs_client.get_queue_attributes(
+        QueueUrl=queue_url,
+        AttributeNames=[
+            "ApproximateNumberOfMessages",
+            "ApproximateNumberOfMessagesNotVisible",
+        ],
+    )["Attributes"]
+    assert attributes["ApproximateNumberOfMessages"] == "0"
+    assert attributes["ApproximateNumberOfMessagesNotVisible"] == "0"
+
+
+def test_job_store_round_trip(mocked_aws) -> None:
+    """Assert that a stored job record is read back, and unknown jobs are None."""
+
+    async def run() -> None:
+        job_store = JobStore(TEST_BUCKET_NAME, prefix=".jobs/")
+        await job_store.put_async("abc", {"status": "queued"})
+        await job_store.put_async("abc", {"status": "running"})
+        assert await job_store.get_async("abc") == {"status": "running"}
+        assert await job_store.get_async("unknown") is None
+
+    asyncio.run(run())
+    s3_object = boto3.client("s3").get_object(
+        Bucket=TEST_BUCKET_NAME, Key=".jobs/abc.json"
+    )
+    assert s3_object["ContentType"] == "application/json"
+
+
+def test_job_workers_survive_failing_jobs() -> None:
+    """Assert that a failing job is logged and the workers go on with the next ones, at most `worker_count` at once."""
+    finished = []
+    running = 0
+    max_running = 0
+
+    async def run_job(body: dict) -> None:
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        try:
+            await asyncio.sleep(0.01)
+            if body["job"] == 0:
+                raise ValueError("failed")
+            finished.append(body["job"])
+        finally:
+            running -= 1
+
+    async def run() -> None:
+        queue = InMemoryJobQueue()
+        for job in range(6):
+            await queue.send({"job": job})
+        workers = asyncio.create_task(run_job_workers(queue, run_job, worker_count=2))
+        while len(finished) < 5:
+            await asyncio.sleep(0.01)
+        workers.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await workers
+
+    asyncio.run(run())
+    assert sorted(finished) == [1, 2, 3, 4, 5]
+    assert max_running == 2
+
+
+def test_send_webhook_retries() -> None:
+    """Assert that a webhook answering with an error is retried, and gives up after `max_attempts`."""
+    payloads = []
+    statuses = iter([503, 200])
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        payloads.append(json.loads(request.content))
+        return httpx.Response(next(statuses, 500))
+
+    async def run() -> tuple[bool, bool]:
+        async with httpx.AsyncClient(
+            transport=httpx.MockTransport(handle)
+        ) as http_client:
+            delivered = await send_webhook(
+                http_client,
+                PUBLIC_WEBHOOK_URL,
+                {"status": "succeeded"},
+                backoff_seconds=0,
+            )
+            given_up = await send_webhook(
+                http_client,
+                PUBLIC_WEBHOOK_URL,
+                {"status": "failed"},
+                max_attempts=2,
+                backoff_seconds=0,
+            )
+            return delivered, given_up
+
+    assert asyncio.run(run()) == (True, False)
+    assert payloads == [{"status": "succeeded"}] * 2 + [{"status": "failed"}] * 2
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "http://169.254.169.254/latest/meta-data/",
+        "http://10.0.0.1/hook",
+        "http://127.0.0.1:8000/hook",
+        "http://[::1]/hook",
+        "http://[::ffff:192.168.0.1]/hook",
+        "http://localhost/hook",
+    ],
+)
+def test_send_webhook_refuses_private_addresses(url: str) -> None:
+    """Assert that webhooks to private, loopback and link-local addresses are refused without sending a request."""
+    requests = []
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200)
+
+    async def run() -> bool:
+        async with httpx.AsyncClient(
+            transport=httpx.MockTransport(handle)
+        ) as http_client:
+            return await send_webhook(
+                http_client, url, {"status": "succeeded"}, backoff_seconds=0
+            )
+
+    assert asyncio.run(run()) is False
+    assert requests == []
+
+
+def test_send_webhook_does_not_follow_redirects() -> None:
+    """Assert that a webhook redirecting elsewhere, e.g. to an internal address, is not followed."""
+    requested_urls = []
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        requested_urls.append(str(request.url))
+        return httpx.Response(
+            302, headers={"Location": "http://169.254.169.254/latest/meta-data/"}
+        )
+
+    async def run() -> bool:
+        async with httpx.AsyncClient(
+            transport=httpx.MockTransport(handle), follow_redirects=True
+        ) as http_client:
+            return await send_webhook(
+                http_client,
+                PUBLIC_WEBHOOK_URL,
+                {"status": "succeeded"},
+                max_attempts=1,
+            )
+
+    assert asyncio.run(run()) is False
+    assert requested_urls == [PUBLIC_WEBHOOK_URL]
+
+
+def test_check_webhook_url_allowlist() -> None:
+    """Assert that only allowed hosts pass when there is an allowlist."""
+    check_webhook_url("https://Hooks.Example.com/done", ["hooks.example.com"])
+    with pytest.raises(WebhookNotAllowedError):
+        check_webhook_url("https://evil.example.com/done", ["hooks.example.com"])
+    with pytest.raises(WebhookNotAllowedError):
+        check_webhook_url("http://169.254.169.254/", ["169.254.169.254"])
@@ -0,0 +1,28 @@
+"""Test cases for `page_tokens`."""
+
+from aws_python.page_tokens import (
+    FilesPageToken,
+    decode_page_token,
+    encode_page_token,
+)
+
+
+def test_page_token_round_trip() -> None:
+    """Assert that a page token decodes to what was encoded and is URL safe."""
+    page_token = FilesPageToken(
+        continuation_token="1ueGcxLPRx1Tr/XYExHnhbYLgveDs2J/wm36Hy4vbOwM=",
+        directory="dir/ü/",
+        page_size=25,
+        shallow=True,
+    )
+    encoded = encode_page_token(page_token)
+    assert all(c.isalnum() or c in "-_" for c in encoded)
+    assert decode_page_token(encoded) == page_token
+
+
+def test_decode_raw_continuation_token() -> None:
+    """Assert that tokens not encoded by the API are taken as S3 continuation tokens."""
+    for raw_token in ["token", "1ueGcxLPRx1Tr/XYExHnhbYLgveDs2J/wm36Hy4vbOwM=", "MTIz"]:
+        assert decode_page_token(raw_token) == FilesPageToken(
+            continuation_token=raw_token, directory=""
+        )
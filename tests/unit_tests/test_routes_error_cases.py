@@ -3,7 +3,10 @@
 from fastapi import status
 from fastapi.testclient import TestClient
 
+from aws_python.main import create_app
+from aws_python.s3.upload_sessions import UploadSession
 from aws_python.schemas import DEFAULT_GET_FILES_MAX_PAGE_SIZE
+from aws_python.settings import Settings
 from tests.consts import TEST_BUCKET_NAME
 from tests.utils import delete_s3_bucket
 
@@ -15,6 +18,15 @@ def test_get_nonexistant_file(client: TestClient):
     assert response.json() == {"detail": "File not found"}
 
 
+def test_get_range_of_nonexistent_file(client: TestClient):
+    """Test requesting a byte range of a non-existent file."""
+    response = client.get(
+        "/v1/files/nonexistant_file.txt", headers={"Range": "bytes=0-1"}
+    )
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert response.json() == {"detail": "File not found"}
+
+
 def test_head_nonexistent_file(client: TestClient):
     """Test getting metadata for a non-existent file."""
     response = client.head("/v1/files/nonexistent_file.txt")
@@ -28,6 +40,15 @@ def test_delete_nonexistent_file(client: TestClient):
     assert response.json() == {"detail": "File not found"}
 
 
+def test_get_file_unsatisfiable_range(client: TestClient):
+    """Test requesting a byte range that starts past the end of the file."""
+    client.put("/v1/files/short.txt", files={"file": ("short.txt", b"short")})
+
+    response = client.get("/v1/files/short.txt", headers={"Range": "bytes=100-200"})
+    assert response.status_code == status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE
+    assert response.headers["Content-Range"] == "bytes */5"
+
+
 def test_get_files_invalid_page_size(client: TestClient):
     """Test getting files with an invalid page size."""
     response = client.get("/v1/files?page_size=-1")
@@ -61,3 +82,242 @@ def test_unforeseen_500_error(client: TestClient):
     response = client.get("/v1/files")
     assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
     assert response.json() == {"detail": "Internal server error"}
+
+
+def test_upload_without_file(client: TestClient):
+    """Test uploading without a file when presigned upload URLs were not requested."""
+    response = client.put("/v1/files/test.txt")
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_batch_delete_requires_exactly_one_selector(client: TestClient):
+    """Test bulk deleting without or with both a list of files and a directory."""
+    response = client.post("/v1/files:batchDelete", json={})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    response = client.post(
+        "/v1/files:batchDelete", json={"file_paths": ["a.txt"], "directory": "dir/"}
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_copy_nonexistent_file(client: TestClient):
+    """Test copying and moving a file that does not exist."""
+    for method in ("copy", "move"):
+        response = client.post(
+            f"/v1/files:{method}",
+            json={"source_path": "missing.txt", "destination_path": "copy.txt"},
+        )
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_copy_onto_itself(client: TestClient):
+    """Test copying a file onto itself and a directory into itself."""
+    response = client.post(
+        "/v1/files:copy", json={"source_path": "a.txt", "destination_path": "a.txt"}
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    response = client.post(
+        "/v1/files:move",
+        json={"source_directory": "dir", "destination_path": "dir/sub/"},
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_batch_upload_with_mismatched_file_paths(client: TestClient):
+    """Test batch uploading with a different number of paths than files."""
+    response = client.post(
+        "/v1/files:batchUpload",
+        files=[
+            ("files", ("a.txt", b"a", "text/plain")),
+            ("files", ("b.txt", b"b", "text/plain")),
+        ],
+        data={"file_paths": ["a.txt"]},
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_upload_session_not_found(client: TestClient):
+    """Test using upload session IDs that were never handed out."""
+    response = client.get("/v1/uploads/not-a-session/parts")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert response.json() == {"detail": "Upload session not found"}
+
+    upload_session_id = UploadSession(
+        object_key="file.bin", upload_id="unknown"
+    ).to_session_id()
+    response = client.get(f"/v1/uploads/{upload_session_id}/parts")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    response = client.delete(f"/v1/uploads/{upload_session_id}")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_complete_upload_session_with_missing_parts(client: TestClient):
+    """Test completing upload sessions without parts, with gaps, or with too small parts."""
+    response = client.post("/v1/uploads", json={"file_path": "file.bin"})
+    upload_session_url = f"/v1/uploads/{response.json()['upload_session_id']}"
+
+    response = client.post(f"{upload_session_url}:complete")
+    assert response.status_code == status.HTTP_409_CONFLICT
+
+    client.put(f"{upload_session_url}/parts/2", content=b"second")
+    response = client.post(f"{upload_session_url}:complete")
+    assert response.status_code == status.HTTP_409_CONFLICT
+    assert response.json() == {"detail": "Upload the missing parts first: [1]"}
+
+    client.put(f"{upload_session_url}/parts/1", content=b"too small")
+    response = client.post(f"{upload_session_url}:complete")
+    assert response.status_code == status.HTTP_409_CONFLICT
+    assert client.head("/v1/files/file.bin").status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_upload_part_too_large(mocked_aws, mocked_openai):
+    """Test uploading a part above the maximum part size, or with an invalid part number."""
+    settings = Settings(
+        s3_bucket_name=TEST_BUCKET_NAME,
+        upload_session_max_part_size_bytes=5 * 1024 * 1024,
+    )
+    with TestClient(create_app(settings=settings)) as client:
+        response = client.post("/v1/uploads", json={"file_path": "file.bin"})
+        upload_session_url = f"/v1/uploads/{response.json()['upload_session_id']}"
+
+        response = client.put(
+            f"{upload_session_url}/parts/1", content=b"x" * (5 * 1024 * 1024 + 1)
+        )
+        assert response.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+        response = client.put(f"{upload_session_url}/parts/0", content=b"x")
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        response = client.put(f"{upload_session_url}/parts/10001", content=b"x")
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_get_nonexistent_job(client: TestClient):
+    """Test getting a job that was never queued, or with an ID the API does not hand out."""
+    response = client.get(f"/v1/jobs/{'0' * 32}")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert response.json() == {"detail": "Job not found"}
+    response = client.get("/v1/jobs/not-a-job")
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_generation_job_queue_full(mocked_aws, mocked_openai):
+    """Test queueing a generation job when the queue cannot take more jobs."""
+    settings = Settings(
+        s3_bucket_name=TEST_BUCKET_NAME, jobs_worker_count=0, jobs_queue_max_size=1
+    )
+    generate_params = {"prompt": "Test Prompt", "file_type": "text", "run_as_job": True}
+    with TestClient(create_app(settings=settings)) as client:
+        response = client.post("/v1/files/generated/first.txt", params=generate_params)
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        response = client.post("/v1/files/generated/second.txt", params=generate_params)
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+
+
+def test_generation_job_with_private_webhook(client: TestClient):
+    """Test queueing a generation job whose webhook points at an internal address."""
+    response = client.post(
+        "/v1/files/generated/job.txt",
+        params={
+            "prompt": "Test Prompt",
+            "file_type": "text",
+            "run_as_job": True,
+            "webhook_url": "http://169.254.169.254/latest/meta-data/",
+        },
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert response.json() == {
+        "detail": "The webhook address 169.254.169.254 is not public"
+    }
+
+
+def test_write_content_addressed_blob(client: TestClient):
+    """Test writing or deleting content-addressed blobs, which other files point at."""
+    blob_path = f".blobs/sha256/{'0' * 64}"
+    forbidden = {"detail": f"The path {blob_path} is reserved for internal use"}
+    client.put("/v1/files/source.txt", files={"file": ("source.txt", b"content")})
+
+    responses = [
+        client.put(f"/v1/files/{blob_path}", files={"file": ("blob", b"forged")}),
+        client.put(f"/v1/files/{blob_path}", params={"redirect": True}),
+        client.post(
+            "/v1/files:batchUpload",
+            files=[("files", ("blob", b"forged"))],
+            data={"file_paths": [blob_path]},
+        ),
+        client.post(
+            "/v1/files:copy",
+            json={"source_path": "source.txt", "destination_path": blob_path},
+        ),
+        client.post(
+            "/v1/files:move",
+            json={"source_path": blob_path, "destination_path": "stolen.txt"},
+        ),
+        client.post("/v1/uploads", json={"file_path": blob_path}),
+        client.delete(f"/v1/files/{blob_path}"),
+    ]
+    for response in responses:
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        assert response.json() == forbidden
+
+    # directories holding the blobs cannot be written to either
+    response = client.post(
+        "/v1/files:copy",
+        json={"source_directory": "dir/", "destination_path": ".blobs/"},
+    )
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+    listed_files = client.get("/v1/files").json()["files"]
+    assert [file["file_path"] for file in listed_files] == ["source.txt"]
+
+
+def test_write_cached_generation(client: TestClient):
+    """Test seeding or replacing cached generations, which are copied to the paths of other requests."""
+    cached_path = f".generations/sha256/{'0' * 64}"
+    client.put("/v1/files/source.txt", files={"file": ("source.txt", b"content")})
+
+    responses = [
+        client.put(f"/v1/files/{cached_path}", files={"file": ("cached", b"forged")}),
+        client.post(
+            "/v1/files:copy",
+            json={"source_path": "source.txt", "destination_path": cached_path},
+        ),
+        client.post(
+            f"/v1/files/generated/{cached_path}.txt",
+            params={"prompt": "Test Prompt", "file_type": "text"},
+        ),
+        client.delete(f"/v1/files/{cached_path}"),
+    ]
+    for response in responses:
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+def test_write_job_record(client: TestClient):
+    """Test forging or deleting the record of a job."""
+    job_id = client.post(
+        "/v1/files/generated/job.txt",
+        params={"prompt": "Test Prompt", "file_type": "text", "run_as_job": True},
+    ).json()["job_id"]
+    record_path = f".jobs/{job_id}.json"
+
+    responses = [
+        client.put(
+            f"/v1/files/{record_path}",
+            files={"file": ("record", b'{"status": "succeeded"}')},
+        ),
+        client.post("/v1/uploads", json={"file_path": record_path}),
+        client.delete(f"/v1/files/{record_path}"),
+    ]
+    for response in responses:
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+    assert client.get(f"/v1/jobs/{job_id}").status_code == status.HTTP_200_OK
+
+
+def test_batch_delete_internal_objects(client: TestClient):
+    """Test deleting internal objects, e.g. content-addressed blobs, in bulk."""
+    response = client.post(
+        "/v1/files:batchDelete",
+        json={"file_paths": ["a.txt", f".blobs/sha256/{'0' * 64}"]},
+    )
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+    response = client.post("/v1/files:batchDelete", json={"directory": ".jobs/"})
+    assert response.status_code == status.HTTP_403_FORBIDDEN
@@ -1,14 +1,39 @@
 """Unit tests for the FastAPI application."""
 
+import asyncio
+import gzip
+import hashlib
+import io
+import json
+import os
+import tarfile
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import boto3
+import pytest
+import requests
+from botocore.exceptions import ClientError
 from fastapi import status
 from fastapi.testclient import TestClient
 
+from aws_python import (
+    generated_file_routes,
+    routes,
+)
+from aws_python.main import create_app
+from aws_python.s3.multipart_upload import upload_s3_object_multipart_async
 from aws_python.schemas import GeneratedFileType
+from aws_python.settings import Settings
+from tests.consts import TEST_BUCKET_NAME
 
 # Constants for testing
 TEST_FILE_PATH = "test.txt"
 TEST_FILE_CONTENT = b"Hello, world!"
 TEST_FILE_CONTENT_TYPE = "text/plain"
+SAMPLE_TTS_AUDIO_PATH = Path(__file__).parents[1] / "mocks" / "speech.mp3"
 
 
 def test_upload_file(client: TestClient) -> None:
@@ -35,6 +60,86 @@ def test_upload_file(client: TestClient) -> None:
     }
 
 
+def test_upload_large_file(client: TestClient) -> None:
+    """Assert that a file larger than one multipart part is streamed to S3 intact."""
+    large_file_content = b"0123456789abcdef" * (
+        1024 * 1024
+    )  # 16 MiB, i.e. two 8 MiB parts
+    response = client.put(
+        "/v1/files/large.bin",
+        files={"file": ("large.bin", large_file_content, "application/octet-stream")},
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+
+    response = client.get("/v1/files/large.bin")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.content == large_file_content
+
+
+def test_batch_upload_files(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Assert that many files are uploaded with one request and each gets a status."""
+    client.put(
+        "/v1/files/existing.txt",
+        files={"file": ("existing.txt", TEST_FILE_CONTENT, TEST_FILE_CONTENT_TYPE)},
+    )
+
+    async def upload_or_fail(**kwargs):
+        if kwargs["object_key"] == "denied.txt":
+            raise ClientError({"Error": {"Code": "AccessDenied"}}, "PutObject")
+        await upload_s3_object_multipart_async(**kwargs)
+
+    monkeypatch.setattr(routes, "upload_s3_object_multipart_async", upload_or_fail)
+
+    response = client.post(
+        "/v1/files:batchUpload",
+        files=[
+            ("files", ("new.txt", b"new", TEST_FILE_CONTENT_TYPE)),
+            ("files", ("existing.txt", b"updated", TEST_FILE_CONTENT_TYPE)),
+            ("files", ("denied.txt", b"x", TEST_FILE_CONTENT_TYPE)),
+        ],
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert [
+        (result["file_path"], result["status"]) for result in response.json()["files"]
+    ] == [
+        ("new.txt", "created"),
+        ("existing.txt", "overwritten"),
+        ("denied.txt", "failed"),
+    ]
+    assert client.get("/v1/files/existing.txt").content == b"updated"
+
+    response = client.post(
+        "/v1/files:batchUpload",
+        files=[("files", ("ignored.txt", b"nested", TEST_FILE_CONTENT_TYPE))],
+        data={"file_paths": ["nested/path.txt"]},
+    )
+    assert response.json()["files"][0]["status"] == "created"
+    assert client.get("/v1/files/nested/path.txt").content == b"nested"
+
+
+def test_get_large_file_in_parallel_ranges(mocked_aws, mocked_openai) -> None:
+    """Assert that files above the threshold are downloaded as concurrent ranges and served intact."""
+    settings = Settings(
+        s3_bucket_name=TEST_BUCKET_NAME,
+        s3_parallel_download_threshold_bytes=100_000,
+        s3_parallel_download_part_size_bytes=64 * 1024,
+    )
+    large_file_content = os.urandom(500_000)
+    with TestClient(create_app(settings=settings)) as client:
+        client.put(
+            "/v1/files/large.bin",
+            files={
+                "file": ("large.bin", large_file_content, "application/octet-stream")
+            },
+        )
+        response = client.get("/v1/files/large.bin")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["Content-Length"] == str(len(large_file_content))
+        assert response.content == large_file_content
+
+
 def test_list_files_with_pagination(client: TestClient) -> None:
     """Assert that files can be listed with pagination."""
     for i in range(15):
@@ -62,6 +167,114 @@ def test_list_files_with_pagination(client: TestClient) -> None:
         assert file_metadata["file_path"] == f"file{i}.txt"
 
 
+def test_list_files_named_like_internal_prefixes(mocked_aws, mocked_openai) -> None:
+    """Assert that files whose paths merely start like an internal prefix are listed, while internal objects are not."""
+    settings = Settings(
+        s3_bucket_name=TEST_BUCKET_NAME,
+        content_addressed_storage_enabled=True,
+        generation_cache_enabled=True,
+    )
+    s3_client = boto3.client("s3")
+    file_paths = [".", ".blobs/sha", ".j", ".jobs", "dir/a.txt"]
+    internal_paths = [".blobs/sha256/abc", ".generations/sha256/abc", ".jobs/abc.json"]
+    for key in file_paths + internal_paths:
+        s3_client.put_object(Bucket=TEST_BUCKET_NAME, Key=key, Body=TEST_FILE_CONTENT)
+
+    with TestClient(create_app(settings=settings)) as client:
+        listed_files = client.get("/v1/files").json()["files"]
+        assert sorted(file["file_path"] for file in listed_files) == file_paths
+        exported_files = [
+            json.loads(line)["file_path"]
+            for line in client.get("/v1/files:export").text.splitlines()
+        ]
+        assert sorted(exported_files) == file_paths
+
+        # directory entries holding an internal prefix are hidden
+        response = client.get("/v1/files?shallow=true")
+        assert response.json()["directories"] == ["dir/"]
+
+        # internal objects, e.g. job records holding webhook URLs, cannot be read as files either
+        for path in internal_paths:
+            response = client.get(f"/v1/files/{path}")
+            assert response.status_code == status.HTTP_404_NOT_FOUND
+            response = client.head(f"/v1/files/{path}")
+            assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert client.get("/v1/files/.jobs").content == TEST_FILE_CONTENT
+
+
+def test_list_files_shallow(client: TestClient) -> None:
+    """Assert that a shallow listing returns the direct children of a directory, page by page."""
+    for file_path in [
+        "dir/a.txt",
+        "dir/b.txt",
+        "dir/sub1/c.txt",
+        "dir/sub1/deep/d.txt",
+        "dir/sub2/e.txt",
+        "dir2/f.txt",
+    ]:
+        client.put(
+            f"/v1/files/{file_path}",
+            files={"file": (file_path, TEST_FILE_CONTENT, TEST_FILE_CONTENT_TYPE)},
+        )
+
+    response = client.get("/v1/files?directory=dir&shallow=true")
+    assert response.status_code == 200
+    data = response.json()
+    assert [file["file_path"] for file in data["files"]] == ["dir/a.txt", "dir/b.txt"]
+    assert data["directories"] == ["dir/sub1/", "dir/sub2/"]
+    assert data["next_page_token"] is None
+
+    response = client.get("/v1/files?directory=dir/")
+    assert len(response.json()["files"]) == 5
+    assert response.json()["directories"] == []
+
+    # later pages keep the directory and the shallow mode of the first one
+    for i in range(12):
+        client.put(
+            f"/v1/files/dir/file{i:02d}.txt",
+            files={"file": (f"file{i}.txt", TEST_FILE_CONTENT, TEST_FILE_CONTENT_TYPE)},
+        )
+    file_paths: list[str] = []
+    directories: list[str] = []
+    response = client.get("/v1/files?directory=dir/&shallow=true&page_size=10")
+    while True:
+        assert response.status_code == 200
+        data = response.json()
+        file_paths.extend(file["file_path"] for file in data["files"])
+        directories.extend(data["directories"])
+        if data["next_page_token"] is None:
+            break
+        response = client.get(f"/v1/files?page_token={data['next_page_token']}")
+    assert len(file_paths) == 14
+    assert all(file_path.count("/") == 1 for file_path in file_paths)
+    assert directories == ["dir/sub1/", "dir/sub2/"]
+
+
+def test_export_files(client: TestClient) -> None:
+    """Assert that the metadata of every file in a directory is streamed as NDJSON."""
+    for i in range(12):
+        client.put(
+            f"/v1/files/dir/file{i:02d}.txt",
+            files={"file": (f"file{i}.txt", TEST_FILE_CONTENT, TEST_FILE_CONTENT_TYPE)},
+        )
+    client.put(
+        "/v1/files/other.txt",
+        files={"file": ("other.txt", TEST_FILE_CONTENT, TEST_FILE_CONTENT_TYPE)},
+    )
+
+    response = client.get("/v1/files:export?directory=dir/")
+    assert response.status_code == 200
+    assert response.headers["Content-Type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["file_path"] for line in lines] == [
+        f"dir/file{i:02d}.txt" for i in range(12)
+    ]
+    assert all(line["size_bytes"] == len(TEST_FILE_CONTENT) for line in lines)
+
+    response = client.get("/v1/files:export")
+    assert len(response.text.splitlines()) == 13
+
+
 def test_get_file_metadata(client: TestClient):
     """Assert that file metadata can be fetched."""
     client.put(
@@ -89,6 +302,416 @@ def test_get_file(client: TestClient):
     assert response.content == TEST_FILE_CONTENT
 
 
+def test_get_file_not_modified(client: TestClient):
+    """Assert that GET and HEAD answer 304 when the client's cached copy is still current."""
+    client.put(
+        f"/v1/files/{TEST_FILE_PATH}",
+        files={"file": (TEST_FILE_PATH, TEST_FILE_CONTENT, TEST_FILE_CONTENT_TYPE)},
+    )
+
+    response = client.get(f"/v1/files/{TEST_FILE_PATH}")
+    etag = response.headers["ETag"]
+    last_modified = response.headers["Last-Modified"]
+    assert response.headers["Cache-Control"] == "no-cache"
+
+    for method in (client.get, client.head):
+        response = method(
+            f"/v1/files/{TEST_FILE_PATH}", headers={"If-None-Match": etag}
+        )
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.content == b""
+        assert response.headers["ETag"] == etag
+
+        response = method(
+            f"/v1/files/{TEST_FILE_PATH}", headers={"If-Modified-Since": last_modified}
+        )
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+        response = method(
+            f"/v1/files/{TEST_FILE_PATH}", headers={"If-None-Match": '"stale"'}
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+    response = client.get(
+        f"/v1/files/{TEST_FILE_PATH}",
+        headers={"If-None-Match": etag, "Range": "bytes=0-4"},
+    )
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+
+def test_get_file_not_modified_without_metadata_cache(client: TestClient):
+    """Assert that conditions are forwarded to S3 when the metadata is not cached."""
+    client.put(
+        f"/v1/files/{TEST_FILE_PATH}",
+        files={"file": (TEST_FILE_PATH, TEST_FILE_CONTENT, TEST_FILE_CONTENT_TYPE)},
+    )
+    etag = client.head(f"/v1/files/{TEST_FILE_PATH}").headers["ETag"]
+    client.app.state.metadata_cache.clear()  # type: ignore[attr-defined]
+
+    response = client.get(
+        f"/v1/files/{TEST_FILE_PATH}", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.headers["ETag"] == etag
+
+
+def test_get_file_single_range(client: TestClient):
+    """Assert that a single byte range is served as 206 Partial Content."""
+    client.put(
+        f"/v1/files/{TEST_FILE_PATH}",
+        files={"file": (TEST_FILE_PATH, TEST_FILE_CONTENT, TEST_FILE_CONTENT_TYPE)},
+    )
+
+    response = client.get(f"/v1/files/{TEST_FILE_PATH}", headers={"Range": "bytes=0-4"})
+    assert response.status_code == status.HTTP_206_PARTIAL_CONTENT
+    assert response.content == TEST_FILE_CONTENT[:5]
+    assert response.headers["Content-Range"] == f"bytes 0-4/{len(TEST_FILE_CONTENT)}"
+    assert response.headers["Accept-Ranges"] == "bytes"
+
+    response = client.get(f"/v1/files/{TEST_FILE_PATH}", headers={"Range": "bytes=-6"})
+    assert response.status_code == status.HTTP_206_PARTIAL_CONTENT
+    assert response.content == TEST_FILE_CONTENT[-6:]
+
+
+def test_get_file_multiple_ranges(client: TestClient):
+    """Assert that multiple byte ranges are served as a multipart/byteranges body."""
+    client.put(
+        f"/v1/files/{TEST_FILE_PATH}",
+        files={"file": (TEST_FILE_PATH, TEST_FILE_CONTENT, TEST_FILE_CONTENT_TYPE)},
+    )
+
+    response = client.get(
+        f"/v1/files/{TEST_FILE_PATH}", headers={"Range": "bytes=0-4, 7-11"}
+    )
+    assert response.status_code == status.HTTP_206_PARTIAL_CONTENT
+    media_type, _, boundary = response.headers["Content-Type"].partition("; boundary=")
+    assert media_type == "multipart/byteranges"
+
+    size = len(TEST_FILE_CONTENT)
+    assert (
+        response.content
+        == (
+            f"\r\n--{boundary}\r\nContent-Type: {TEST_FILE_CONTENT_TYPE}\r\n"
+            f"Content-Range: bytes 0-4/{size}\r\n\r\nHello"
+            f"\r\n--{boundary}\r\nContent-Type: {TEST_FILE_CONTENT_TYPE}\r\n"
+            f"Content-Range: bytes 7-11/{size}\r\n\r\nworld"
+            f"\r\n--{boundary}--\r\n"
+        ).encode()
+    )
+
+
+def test_get_file_ignores_malformed_range(client: TestClient):
+    """Assert that a malformed Range header is ignored and the full file is served."""
+    client.put(
+        f"/v1/files/{TEST_FILE_PATH}",
+        files={"file": (TEST_FILE_PATH, TEST_FILE_CONTENT, TEST_FILE_CONTENT_TYPE)},
+    )
+
+    response = client.get(f"/v1/files/{TEST_FILE_PATH}", headers={"Range": "bytes=9-1"})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.content == TEST_FILE_CONTENT
+    assert response.headers["Accept-Ranges"] == "bytes"
+
+
+def test_get_file_redirects_to_presigned_url(client: TestClient):
+    """Assert that downloads can be redirected to a presigned S3 URL."""
+    client.put(
+        f"/v1/files/{TEST_FILE_PATH}",
+        files={"file": (TEST_FILE_PATH, TEST_FILE_CONTENT, TEST_FILE_CONTENT_TYPE)},
+    )
+
+    response = client.get(
+        f"/v1/files/{TEST_FILE_PATH}?redirect=true", follow_redirects=False
+    )
+    assert response.status_code == status.HTTP_307_TEMPORARY_REDIRECT
+    location = response.headers["Location"]
+    assert TEST_BUCKET_NAME in location and TEST_FILE_PATH in location
+    assert requests.get(location).content == TEST_FILE_CONTENT
+
+    # the URL is reused while it is valid for long enough
+    response = client.get(
+        f"/v1/files/{TEST_FILE_PATH}?redirect=true", follow_redirects=False
+    )
+    assert response.headers["Location"] == location
+
+
+def test_get_file_redirects_above_size_threshold(mocked_aws, mocked_openai):
+    """Assert that files above the configured size are always redirected, unless the request opts out."""
+    settings = Settings(
+        s3_bucket_name=TEST_BUCKET_NAME,
+        presigned_url_size_threshold_bytes=len(TEST_FILE_CONTENT) - 1,
+        metadata_cache_enabled=False,
+    )
+    with TestClient(create_app(settings=settings)) as client:
+        client.put(
+            f"/v1/files/{TEST_FILE_PATH}",
+            files={"file": (TEST_FILE_PATH, TEST_FILE_CONTENT, TEST_FILE_CONTENT_TYPE)},
+        )
+        response = client.get(f"/v1/files/{TEST_FILE_PATH}", follow_redirects=False)
+        assert response.status_code == status.HTTP_307_TEMPORARY_REDIRECT
+
+        response = client.get(f"/v1/files/{TEST_FILE_PATH}?redirect=false")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.content == TEST_FILE_CONTENT
+
+
+def test_content_addressed_storage(mocked_aws, mocked_openai, monkeypatch) -> None:
+    """Assert that identical uploads share one blob and are served with the digest as ETag."""
+    settings = Settings(
+        s3_bucket_name=TEST_BUCKET_NAME, content_addressed_storage_enabled=True
+    )
+    blob_uploads = []
+    upload_multipart = routes.upload_s3_object_multipart_async
+
+    async def count_blob_uploads(*args, **kwargs):
+        blob_uploads.append(kwargs["object_key"])
+        return await upload_multipart(*args, **kwargs)
+
+    monkeypatch.setattr(
+        "aws_python.s3.content_addressed.upload_s3_object_multipart_async",
+        count_blob_uploads,
+    )
+    etag = f'"{hashlib.sha256(TEST_FILE_CONTENT).hexdigest()}"'
+    with TestClient(create_app(settings=settings)) as client:
+        for file_path in ["a.txt", "dir/b.txt", "a.txt"]:
+            response = client.put(
+                f"/v1/files/{file_path}",
+                files={"file": (file_path, TEST_FILE_CONTENT, TEST_FILE_CONTENT_TYPE)},
+            )
+            assert response.status_code in {201, 200}
+        assert len(blob_uploads) == 1
+
+        for file_path in ["a.txt", "dir/b.txt"]:
+            response = client.get(f"/v1/files/{file_path}")
+            assert response.content == TEST_FILE_CONTENT
+            assert response.headers["ETag"] == etag
+            assert response.headers["Content-Type"].startswith(TEST_FILE_CONTENT_TYPE)
+
+            response = client.head(f"/v1/files/{file_path}")
+            assert response.headers["Content-Length"] == str(len(TEST_FILE_CONTENT))
+            assert response.headers["ETag"] == etag
+
+        response = client.get("/v1/files/a.txt", headers={"If-None-Match": etag})
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        response = client.get("/v1/files/a.txt", headers={"Range": "bytes=0-3"})
+        assert response.status_code == status.HTTP_206_PARTIAL_CONTENT
+        assert response.content == TEST_FILE_CONTENT[:4]
+        assert response.headers["ETag"] == etag
+
+        # blobs are not files of their own
+        response = client.get("/v1/files?shallow=true")
+        assert [file["file_path"] for file in response.json()["files"]] == ["a.txt"]
+        assert response.json()["directories"] == ["dir/"]
+        response = client.get("/v1/files:export")
+        assert len(response.text.splitlines()) == 2
+
+        client.delete("/v1/files/a.txt")
+        assert client.get("/v1/files/a.txt").status_code == status.HTTP_404_NOT_FOUND
+        assert client.get("/v1/files/dir/b.txt").content == TEST_FILE_CONTENT
+
+
+def test_content_addressed_storage_reads_pointer_from_get(
+    mocked_aws, mocked_openai
+) -> None:
+    """Assert that uncached pointers are resolved from the `get_object` response, without a `head_object` call."""
+    settings = Settings(
+        s3_bucket_name=TEST_BUCKET_NAME,
+        content_addressed_storage_enabled=True,
+        metadata_cache_enabled=False,
+    )
+    etag = f'"{hashlib.sha256(TEST_FILE_CONTENT).hexdigest()}"'
+    app = create_app(settings=settings)
+    with TestClient(app) as client:
+        client.put(
+            f"/v1/files/{TEST_FILE_PATH}",
+            files={"file": (TEST_FILE_PATH, TEST_FILE_CONTENT, TEST_FILE_CONTENT_TYPE)},
+        )
+        head_object_calls: list = []
+        app.state.s3_client.meta.events.register(
+            "before-call.s3.HeadObject",
+            lambda **kwargs: head_object_calls.append(kwargs),
+        )
+
+        response = client.get(f"/v1/files/{TEST_FILE_PATH}")
+        assert response.content == TEST_FILE_CONTENT
+        assert response.headers["ETag"] == etag
+        response = client.get(
+            f"/v1/files/{TEST_FILE_PATH}", headers={"If-None-Match": etag}
+        )
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert head_object_calls == []
+
+
+def test_compressed_storage(mocked_aws, mocked_openai) -> None:
+    """Assert that compressible uploads are stored compressed and served as stored or decoded per `Accept-Encoding`."""
+    settings = Settings(
+        s3_bucket_name=TEST_BUCKET_NAME,
+        compression_enabled=True,
+        compression_min_size_bytes=1024,
+    )
+    json_content = b'{"message": "hello"}\n' * 1_000
+    with TestClient(create_app(settings=settings)) as client:
+        client.put(
+            "/v1/files/logs.json",
+            files={"file": ("logs.json", json_content, "application/json")},
+        )
+        client.put(
+            "/v1/files/small.txt",
+            files={"file": ("small.txt", TEST_FILE_CONTENT, TEST_FILE_CONTENT_TYPE)},
+        )
+        s3_client = boto3.client("s3")
+        stored = s3_client.get_object(Bucket=TEST_BUCKET_NAME, Key="logs.json")
+        assert stored["ContentEncoding"] == "gzip"
+        stored_body = stored["Body"].read()
+        assert gzip.decompress(stored_body) == json_content
+        assert "ContentEncoding" not in s3_client.head_object(
+            Bucket=TEST_BUCKET_NAME, Key="small.txt"
+        )
+
+        # passed through to clients accepting gzip, httpx decodes it
+        response = client.get(
+            "/v1/files/logs.json", headers={"Accept-Encoding": "gzip"}
+        )
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert response.headers["Vary"] == "Accept-Encoding"
+        assert response.headers["ETag"] == stored["ETag"]
+        assert response.content == json_content
+
+        # decoded on the fly for all others
+        response = client.get(
+            "/v1/files/logs.json", headers={"Accept-Encoding": "identity"}
+        )
+        assert "Content-Encoding" not in response.headers
+        assert response.headers["Content-Length"] == str(len(json_content))
+        assert response.headers["ETag"] == f"W/{stored['ETag']}"
+        assert response.content == json_content
+        response = client.head(
+            "/v1/files/logs.json", headers={"Accept-Encoding": "identity"}
+        )
+        assert response.headers["Content-Length"] == str(len(json_content))
+        assert "Content-Encoding" not in response.headers
+        response = client.head(
+            "/v1/files/logs.json", headers={"Accept-Encoding": "gzip"}
+        )
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert response.headers["Content-Length"] == str(stored["ContentLength"])
+
+        # ranges are served from the stored bytes, or ignored if the content must be decoded
+        response = client.get(
+            "/v1/files/logs.json",
+            headers={"Accept-Encoding": "identity", "Range": "bytes=0-9"},
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.content == json_content
+        with client.stream(
+            "GET",
+            "/v1/files/logs.json",
+            headers={"Accept-Encoding": "gzip", "Range": "bytes=0-9"},
+        ) as response:
+            assert response.status_code == status.HTTP_206_PARTIAL_CONTENT
+            assert response.headers["Content-Encoding"] == "gzip"
+            assert response.headers["Content-Range"] == f"bytes 0-9/{len(stored_body)}"
+            assert b"".join(response.iter_raw()) == stored_body[:10]
+
+        response = client.get(
+            "/v1/files/logs.json",
+            headers={"Accept-Encoding": "identity", "If-None-Match": stored["ETag"]},
+        )
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert client.get("/v1/files/small.txt").content == TEST_FILE_CONTENT
+
+        # uploads sent encoded are stored as sent, and decoded once to record their decoded size
+        client.put(
+            "/v1/files/encoded.json",
+            files={
+                "file": (
+                    "encoded.json",
+                    gzip.compress(json_content),
+                    "application/json",
+                    {"Content-Encoding": "gzip"},
+                )
+            },
+        )
+        response = client.head(
+            "/v1/files/encoded.json", headers={"Accept-Encoding": "identity"}
+        )
+        assert response.headers["Content-Length"] == str(len(json_content))
+
+        # archived decoded, with the decoded size in the TAR header
+        response = client.get("/v1/files:archive", params={"format": "tar"})
+        with tarfile.open(fileobj=io.BytesIO(response.content)) as archive:
+            assert archive.extractfile("logs.json").read() == json_content  # type: ignore[union-attr]
+            assert archive.extractfile("encoded.json").read() == json_content  # type: ignore[union-attr]
+
+
+def test_upload_session(client: TestClient) -> None:
+    """Assert that a file uploaded as parts, out of order and with a retried part, is assembled in order."""
+    first_part = os.urandom(5 * 1024 * 1024)
+    last_part = b"the end"
+    response = client.post("/v1/uploads", json={"file_path": "backups/big.bin"})
+    assert response.status_code == status.HTTP_201_CREATED
+    upload_session = response.json()
+    assert upload_session["file_path"] == "backups/big.bin"
+    assert upload_session["expires_at"] is not None
+    upload_session_url = f"/v1/uploads/{upload_session['upload_session_id']}"
+
+    response = client.put(f"{upload_session_url}/parts/2", content=last_part)
+    assert response.json()["size_bytes"] == len(last_part)
+    response = client.get(f"{upload_session_url}/parts")
+    assert response.json()["missing_part_numbers"] == [1]
+
+    # a retried part replaces the one stored before
+    client.put(f"{upload_session_url}/parts/1", content=b"broken")
+    response = client.put(f"{upload_session_url}/parts/1", content=first_part)
+    assert response.status_code == status.HTTP_200_OK
+    parts = client.get(f"{upload_session_url}/parts").json()["parts"]
+    assert [(part["part_number"], part["size_bytes"]) for part in parts] == [
+        (1, len(first_part)),
+        (2, len(last_part)),
+    ]
+
+    response = client.post(f"{upload_session_url}:complete")
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response.json()["file_path"] == "backups/big.bin"
+    assert client.get("/v1/files/backups/big.bin").content == first_part + last_part
+    assert client.get(f"{upload_session_url}/parts").status_code == 404
+
+
+def test_abort_upload_session(client: TestClient) -> None:
+    """Assert that an aborted session is gone and leaves no file behind."""
+    response = client.post("/v1/uploads", json={"file_path": "aborted.bin"})
+    upload_session_url = f"/v1/uploads/{response.json()['upload_session_id']}"
+    client.put(f"{upload_session_url}/parts/1", content=b"part")
+
+    response = client.delete(upload_session_url)
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    assert client.get(f"{upload_session_url}/parts").status_code == 404
+    assert client.head("/v1/files/aborted.bin").status_code == 404
+
+
+def test_upload_file_with_presigned_url(client: TestClient):
+    """Assert that a presigned PUT URL is returned when no file is sent."""
+    response = client.put(f"/v1/files/{TEST_FILE_PATH}?redirect=true")
+    assert response.status_code == status.HTTP_200_OK
+    upload_url = response.json()["upload_url"]
+    assert response.json()["multipart_upload"] is None
+
+    assert requests.put(upload_url, data=TEST_FILE_CONTENT).status_code == 200
+    response = client.get(f"/v1/files/{TEST_FILE_PATH}")
+    assert response.content == TEST_FILE_CONTENT
+
+
+def test_upload_file_with_presigned_multipart_urls(client: TestClient):
+    """Assert that files larger than one part get a multipart URL set."""
+    size_bytes = 20 * 1024 * 1024
+    response = client.put(f"/v1/files/large.bin?redirect=true&size_bytes={size_bytes}")
+    assert response.status_code == status.HTTP_200_OK
+    multipart_upload = response.json()["multipart_upload"]
+    assert multipart_upload["part_size_bytes"] == 8 * 1024 * 1024
+    assert len(multipart_upload["part_urls"]) == 3
+    assert response.json()["upload_url"] is None
+
+
 def test_delete_file(client: TestClient):
     """Assert that a file can be deleted."""
     client.put(
@@ -103,6 +726,142 @@ def test_delete_file(client: TestClient):
     assert response.status_code == status.HTTP_404_NOT_FOUND
 
 
+def test_batch_delete_files(client: TestClient):
+    """Assert that a list of files and a directory can be deleted in bulk."""
+    for file_path in ("a.txt", "b.txt", "dir/c.txt", "dir/d.txt"):
+        client.put(
+            f"/v1/files/{file_path}",
+            files={"file": (file_path, TEST_FILE_CONTENT, TEST_FILE_CONTENT_TYPE)},
+        )
+
+    response = client.post(
+        "/v1/files:batchDelete", json={"file_paths": ["a.txt", "missing.txt"]}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["Content-Type"] == "application/x-ndjson"
+    results = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(result["file_path"] for result in results) == ["a.txt", "missing.txt"]
+    assert all(result["deleted"] for result in results)
+
+    response = client.post("/v1/files:batchDelete", json={"directory": "dir/"})
+    results = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(result["file_path"] for result in results) == [
+        "dir/c.txt",
+        "dir/d.txt",
+    ]
+
+    remaining_files = client.get("/v1/files").json()["files"]
+    assert [file["file_path"] for file in remaining_files] == ["b.txt"]
+
+
+def test_batch_delete_keeps_internal_objects(client: TestClient):
+    """Assert that deleting a directory sharing its prefix with internal objects leaves them in place."""
+    internal_paths = [
+        ".blobs/sha256/abc",
+        ".generations/sha256/abc",
+        ".jobs/abc.json",
+    ]
+    s3_client = boto3.client("s3")
+    for key in [".j", *internal_paths]:
+        s3_client.put_object(Bucket=TEST_BUCKET_NAME, Key=key, Body=TEST_FILE_CONTENT)
+
+    response = client.post("/v1/files:batchDelete", json={"directory": "."})
+    results = [json.loads(line) for line in response.text.splitlines()]
+    assert [result["file_path"] for result in results] == [".j"]
+    remaining_keys = [
+        s3_object["Key"]
+        for s3_object in s3_client.list_objects_v2(Bucket=TEST_BUCKET_NAME)["Contents"]
+    ]
+    assert remaining_keys == internal_paths
+
+
+def test_copy_and_move_file(client: TestClient):
+    """Assert that a file is copied and moved within S3 with its content type."""
+    client.put(
+        f"/v1/files/{TEST_FILE_PATH}",
+        files={"file": (TEST_FILE_PATH, TEST_FILE_CONTENT, TEST_FILE_CONTENT_TYPE)},
+    )
+
+    response = client.post(
+        "/v1/files:copy",
+        json={"source_path": TEST_FILE_PATH, "destination_path": "copy.txt"},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["copied"]
+    assert response.json()["source_deleted"] is None
+
+    response = client.post(
+        "/v1/files:move",
+        json={"source_path": "copy.txt", "destination_path": "moved/copy.txt"},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["source_deleted"]
+
+    response = client.get("/v1/files/moved/copy.txt")
+    assert response.content == TEST_FILE_CONTENT
+    assert response.headers["Content-Type"].startswith(TEST_FILE_CONTENT_TYPE)
+    assert client.head("/v1/files/copy.txt").status_code == status.HTTP_404_NOT_FOUND
+    assert client.get(f"/v1/files/{TEST_FILE_PATH}").content == TEST_FILE_CONTENT
+
+
+def test_move_directory(client: TestClient):
+    """Assert that every file of a directory is moved and reported on its own line."""
+    for file_path in ("dir/a.txt", "dir/sub/b.txt", "directory.txt"):
+        client.put(
+            f"/v1/files/{file_path}",
+            files={"file": (file_path, TEST_FILE_CONTENT, TEST_FILE_CONTENT_TYPE)},
+        )
+
+    response = client.post(
+        "/v1/files:move",
+        json={"source_directory": "dir", "destination_path": "renamed"},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["Content-Type"] == "application/x-ndjson"
+    results = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(
+        (result["source_path"], result["destination_path"]) for result in results
+    ) == [("dir/a.txt", "renamed/a.txt"), ("dir/sub/b.txt", "renamed/sub/b.txt")]
+    assert all(result["copied"] and result["source_deleted"] for result in results)
+
+    remaining_files = client.get("/v1/files").json()["files"]
+    assert sorted(file["file_path"] for file in remaining_files) == [
+        "directory.txt",
+        "renamed/a.txt",
+        "renamed/sub/b.txt",
+    ]
+
+
+def test_archive_files(client: TestClient):
+    """Assert that a directory is downloaded as one ZIP or TAR archive of paths relative to it."""
+    files = {"dir/a.txt": b"a", "dir/sub/b.txt": b"b" * 10_000}
+    for file_path, content in {**files, "other.txt": b"other"}.items():
+        client.put(
+            f"/v1/files/{file_path}",
+            files={"file": (file_path, content, TEST_FILE_CONTENT_TYPE)},
+        )
+
+    response = client.get("/v1/files:archive", params={"directory": "dir/"})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["Content-Type"] == "application/zip"
+    assert (
+        response.headers["Content-Disposition"]
+        == "attachment; filename*=UTF-8''dir.zip"
+    )
+    with zipfile.ZipFile(io.BytesIO(response.content)) as archive:
+        assert {name: archive.read(name) for name in archive.namelist()} == {
+            "a.txt": b"a",
+            "sub/b.txt": b"b" * 10_000,
+        }
+
+    response = client.get(
+        "/v1/files:archive", params={"directory": "dir/", "format": "tar"}
+    )
+    assert response.headers["Content-Type"] == "application/x-tar"
+    with tarfile.open(fileobj=io.BytesIO(response.content)) as archive:
+        assert archive.getnames() == ["a.txt", "sub/b.txt"]
+
+
 def test_generate_text(client: TestClient):
     """Test generating text using POST method."""
     response = client.post(
@@ -163,5 +922,142 @@ def test_generate_audio(client: TestClient):
 
     response = client.get(f"/v1/files/{audio_file_path}")
     assert response.status_code == status.HTTP_200_OK
-    assert response.content is not None
     assert response.headers["Content-Type"] == "audio/mpeg"
+    assert response.content == SAMPLE_TTS_AUDIO_PATH.read_bytes()
+
+
+def test_generate_image_b64_json(mocked_aws, mocked_openai):
+    """Assert that an image returned inline is stored without downloading it, typed from its extension."""
+    image_file_path = "image.png"
+    settings = Settings(
+        s3_bucket_name=TEST_BUCKET_NAME, openai_image_response_format="b64_json"
+    )
+    with TestClient(create_app(settings=settings)) as client:
+        response = client.post(
+            url=f"/v1/files/generated/{image_file_path}",
+            params={
+                "prompt": "Test Prompt",
+                "file_type": GeneratedFileType.IMAGE.value,
+            },
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+
+        response = client.get(f"/v1/files/{image_file_path}")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.content.startswith(b"\x89PNG")
+        assert response.headers["Content-Type"] == "image/png"
+
+
+def test_generate_text_from_cache(mocked_aws, mocked_openai, monkeypatch):
+    """Assert that a cached generation is copied without calling the model, unless the cache is bypassed."""
+    settings = Settings(s3_bucket_name=TEST_BUCKET_NAME, generation_cache_enabled=True)
+    generate_params = {
+        "prompt": "Test Prompt",
+        "file_type": GeneratedFileType.TEXT.value,
+    }
+    with TestClient(create_app(settings=settings)) as client:
+        response = client.post("/v1/files/generated/first.txt", params=generate_params)
+        assert response.status_code == status.HTTP_201_CREATED
+
+        async def fail_to_generate(*args, **kwargs):
+            raise AssertionError("the model was called")
+
+        monkeypatch.setattr(
+            generated_file_routes, "get_text_chat_completion", fail_to_generate
+        )
+        response = client.post("/v1/files/generated/second.txt", params=generate_params)
+        assert response.status_code == status.HTTP_201_CREATED
+        assert (
+            client.get("/v1/files/second.txt").content
+            == b"This is a mock response from the chat completion endpoint."
+        )
+        # the cached generations are not files of their own
+        listed_files = client.get("/v1/files").json()["files"]
+        assert sorted(file["file_path"] for file in listed_files) == [
+            "first.txt",
+            "second.txt",
+        ]
+
+        # the broad exception handler answers 500 for the failing model
+        response = client.post(
+            "/v1/files/generated/third.txt",
+            params={**generate_params, "bypass_cache": True},
+        )
+        assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+
+
+def test_concurrent_generations_share_one_model_call(client: TestClient, monkeypatch):
+    """Assert that concurrent requests for the same generation call the model once and all get the file."""
+    model_calls = 0
+
+    async def generate_text_slowly(*args, **kwargs) -> str:
+        nonlocal model_calls
+        model_calls += 1
+        await asyncio.sleep(0.2)
+        return "generated once"
+
+    monkeypatch.setattr(
+        generated_file_routes, "get_text_chat_completion", generate_text_slowly
+    )
+    file_paths = [f"generated-{index}.txt" for index in range(3)]
+    with ThreadPoolExecutor(max_workers=len(file_paths)) as executor:
+        responses = list(
+            executor.map(
+                lambda file_path: client.post(
+                    f"/v1/files/generated/{file_path}",
+                    params={
+                        "prompt": "Test Prompt",
+                        "file_type": GeneratedFileType.TEXT.value,
+                    },
+                ),
+                file_paths,
+            )
+        )
+
+    assert [response.status_code for response in responses] == [
+        status.HTTP_201_CREATED
+    ] * 3
+    assert model_calls == 1
+    for file_path in file_paths:
+        assert client.get(f"/v1/files/{file_path}").content == b"generated once"
+
+
+def test_generate_text_as_job(client: TestClient, monkeypatch):
+    """Assert that a generation job is accepted right away, and its status reports the generated file once done."""
+    webhook_payloads = []
+
+    async def send_webhook(http_client, url, payload, **kwargs):
+        webhook_payloads.append((url, payload))
+        return True
+
+    monkeypatch.setattr(generated_file_routes, "send_webhook", send_webhook)
+    response = client.post(
+        "/v1/files/generated/job.txt",
+        params={
+            "prompt": "Test Prompt",
+            "file_type": GeneratedFileType.TEXT.value,
+            "run_as_job": True,
+            "webhook_url": "https://example.com/hook",
+        },
+    )
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    job = response.json()
+    assert job["status"] in ("queued", "running", "succeeded")
+    assert job["file_path"] == "job.txt"
+    assert response.headers["Location"].endswith(f"/v1/jobs/{job['job_id']}")
+
+    for _ in range(100):
+        job = client.get(f"/v1/jobs/{job['job_id']}").json()
+        if job["status"] == "succeeded":
+            break
+        time.sleep(0.05)
+    assert job["status"] == "succeeded"
+    assert job["error"] is None
+    assert (
+        client.get("/v1/files/job.txt").content
+        == b"This is a mock response from the chat completion endpoint."
+    )
+    # the job records are not files of their own
+    listed_files = client.get("/v1/files").json()["files"]
+    assert [file["file_path"] for file in listed_files] == ["job.txt"]
+    assert webhook_payloads == [("https://example.com/hook", job)]
@@ -0,0 +1,91 @@
+"""Test cases for `single_flight`."""
+
+import asyncio
+
+import pytest
+
+from aws_python.single_flight import SingleFlight
+
+
+def test_single_flight_shares_one_call() -> None:
+    """Assert that concurrent callers with the same key share one call, and later callers run it again."""
+    calls = 0
+
+    async def work() -> int:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return calls
+
+    async def run() -> list:
+        single_flight: SingleFlight[str, int] = SingleFlight()
+        results = await asyncio.gather(
+            *(single_flight.run("key", work) for _ in range(5))
+        )
+        assert len(single_flight) == 0
+        results.append(await single_flight.run("key", work))
+        return results
+
+    results = asyncio.run(run())
+    assert [result.value for result in results] == [1, 1, 1, 1, 1, 2]
+    assert [result.joined for result in results] == [False, *[True] * 4, False]
+
+
+def test_single_flight_raises_error_to_every_caller() -> None:
+    """Assert that every caller waiting for a failing call gets its exception."""
+
+    async def fail() -> None:
+        await asyncio.sleep(0.01)
+        raise ValueError("failed")
+
+    async def run() -> list:
+        single_flight: SingleFlight[str, None] = SingleFlight()
+        return await asyncio.gather(
+            *(single_flight.run("key", fail) for _ in range(3)),
+            return_exceptions=True,
+        )
+
+    errors = asyncio.run(run())
+    assert all(isinstance(error, ValueError) for error in errors)
+
+
+def test_single_flight_cancels_call_once_every_caller_left() -> None:
+    """Assert that a cancelled caller leaves the call running for the others, and the last one cancels it."""
+    call_cancelled = False
+
+    async def run() -> None:
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def work() -> str:
+            nonlocal call_cancelled
+            started.set()
+            try:
+                await release.wait()
+            except asyncio.CancelledError:
+                call_cancelled = True
+                raise
+            return "done"
+
+        single_flight: SingleFlight[str, str] = SingleFlight()
+        first = asyncio.create_task(single_flight.run("key", work))
+        second = asyncio.create_task(single_flight.run("key", work))
+        await started.wait()
+
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        release.set()
+        assert (await second).value == "done"
+
+        release.clear()
+        started.clear()
+        third = asyncio.create_task(single_flight.run("key", work))
+        await started.wait()
+        third.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await third
+        await asyncio.sleep(0)
+
+    asyncio.run(run())
+    assert call_cancelled